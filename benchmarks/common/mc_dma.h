@@ -0,0 +1,77 @@
+#ifndef __MC_DMA_H__
+#define __MC_DMA_H__
+
+#include "inttypes.h"
+
+// Driver helpers for the MultiChannelDma. The register addresses of a DMA
+// are generated into <Cluster>_hw_defines.h by the SALAM-Configurator,
+// e.g. DMA_Status and DMA_Ch0_Flags.
+
+#define MC_DMA_COUNT_COMPLETION 0x1
+#define MC_DMA_START            0x1
+#define MC_DMA_RUNNING          0x2
+#define MC_DMA_INT              0x80000000
+
+// Transfer descriptor, see src/hwacc/dma_descriptor.hh
+typedef struct {
+    uint64_t src;
+    uint64_t dst;
+    uint32_t length;        // Bytes per row
+    uint32_t rows;          // 0 is treated as 1
+    uint64_t src_stride;    // Bytes between the starts of source rows
+    uint64_t dst_stride;    // Bytes between the starts of destination rows
+    uint64_t next;          // Next descriptor, 0 ends the chain
+    uint32_t control;       // MC_DMA_COUNT_COMPLETION
+    uint32_t reserved[3];
+} __attribute__((aligned(64))) mc_dma_desc;
+
+// Describe a copy of rows rows of length bytes
+void mcDmaTile(mc_dma_desc * desc, void * dst, void * src, uint32_t length,
+               uint32_t rows, uint64_t dst_stride, uint64_t src_stride) {
+    desc->src = (uintptr_t)src;
+    desc->dst = (uintptr_t)dst;
+    desc->length = length;
+    desc->rows = rows;
+    desc->src_stride = src_stride;
+    desc->dst_stride = dst_stride;
+    desc->next = 0;
+    desc->control = 0;
+}
+
+// Describe a 1-D copy
+void mcDmaCpy(mc_dma_desc * desc, void * dst, void * src, uint32_t len) {
+    mcDmaTile(desc, dst, src, len, 1, 0, 0);
+}
+
+// Run next after desc on the same channel
+void mcDmaChain(mc_dma_desc * desc, mc_dma_desc * next) {
+    desc->next = (uintptr_t)next;
+}
+
+// Start a channel on the chain beginning at first. ch_flags is the
+// address of the channel's Flags register.
+void mcDmaStart(uintptr_t ch_flags, mc_dma_desc * first) {
+    *(volatile uint64_t *)(ch_flags + 8) = (uintptr_t)first;
+    *(volatile uint32_t *)(ch_flags) = MC_DMA_START;
+}
+
+int mcDmaBusy(uintptr_t ch_flags) {
+    return (*(volatile uint32_t *)(ch_flags) &
+            (MC_DMA_START | MC_DMA_RUNNING)) != 0;
+}
+
+// Collect interrupts until count completions, then raise one
+void mcDmaCoalesce(uintptr_t status, uint32_t count) {
+    *(volatile uint32_t *)(status + 4) = count;
+}
+
+uint32_t mcDmaStatus(uintptr_t status) {
+    return *(volatile uint32_t *)(status);
+}
+
+// Clear the given Status bits, MC_DMA_INT clears the interrupt
+void mcDmaAck(uintptr_t status, uint32_t bits) {
+    *(volatile uint32_t *)(status) = bits;
+}
+
+#endif //__MC_DMA_H__
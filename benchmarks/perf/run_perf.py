@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+gem5-SALAM host throughput benchmarks
+
+Runs the benchmarks/sys_validation kernels and measures how fast the
+simulator itself executes them:
+
+    host_seconds_per_cycle  host time spent simulating the accelerators
+                            divided by the accelerator cycles simulated
+    insts_per_host_second   dynamic LLVM instructions committed by the
+                            accelerators per host second
+    peak_rss_mb             peak resident set size of the gem5 process
+
+The host time of an accelerator is its "Simulation Time (Total)", i.e. from
+the launch of its top function to its return. It excludes gem5 start-up,
+IR parsing and the bare-metal driver running on the CPU, so the numbers
+track the accelerator models rather than the rest of the system.
+
+The results are written to a JSON file and compared against a stored
+baseline; any metric that is worse than the baseline by more than the
+threshold is reported as a regression and the script exits with status 1.
+
+Usage:
+    ./benchmarks/perf/run_perf.py                      # all kernels
+    ./benchmarks/perf/run_perf.py --bench gemm,spmv --repeat 3
+    ./benchmarks/perf/run_perf.py --update-baseline    # record a baseline
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+
+PERF_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_M5_PATH = os.path.dirname(os.path.dirname(PERF_DIR))
+SUITE_PATH = os.path.join("benchmarks", "sys_validation")
+DEFAULT_BASELINE = os.path.join(PERF_DIR, "baseline.json")
+
+FORMAT_VERSION = 1
+
+# Metric name -> True if a larger value is better
+METRICS = {
+    "host_seconds_per_cycle": False,
+    "insts_per_host_second": True,
+    "peak_rss_mb": False,
+}
+
+# Printed by LLVMInterface::printResults() once per accelerator
+TOTAL_TIME_RE = re.compile(
+    r"Simulation Time \(Total\):\s+(\d+)h (\d+)m (\d+)s (\d+)ms")
+CYCLES_RE = re.compile(r"^\s+Runtime:\s+(\d+) cycles", re.M)
+INSTS_RE = re.compile(r"^\s+Dynamic Instructions:\s+(\d+)", re.M)
+
+
+def list_benchmarks(m5_path):
+    suite = os.path.join(m5_path, SUITE_PATH)
+    return sorted(name for name in os.listdir(suite)
+                  if os.path.isfile(os.path.join(suite, name, "config.yml")))
+
+
+def parse_output(text):
+    """
+    Sum the accelerator results printed by gem5.
+
+    :returns: (host seconds, accelerator cycles, dynamic instructions,
+        number of accelerators)
+    """
+    seconds = sum(int(h) * 3600 + int(m) * 60 + int(s) + int(ms) / 1000.0
+                  for h, m, s, ms in TOTAL_TIME_RE.findall(text))
+    cycles = sum(int(c) for c in CYCLES_RE.findall(text))
+    insts = sum(int(i) for i in INSTS_RE.findall(text))
+    return seconds, cycles, insts, len(TOTAL_TIME_RE.findall(text))
+
+
+def run_gem5(cmd, outdir, env):
+    """
+    Run one simulation, capturing its output in outdir.
+
+    :returns: (exit status, stdout text, wall seconds, peak RSS in MB)
+    """
+    os.makedirs(outdir, exist_ok=True)
+    stdout_path = os.path.join(outdir, "stdout.txt")
+    with open(stdout_path, "w") as stdout, \
+         open(os.path.join(outdir, "stderr.txt"), "w") as stderr:
+        start = datetime.datetime.now()
+        proc = subprocess.Popen(cmd, stdout=stdout, stderr=stderr, env=env)
+        # wait4 rather than wait so the peak RSS is that of this run alone
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        wall = (datetime.datetime.now() - start).total_seconds()
+    with open(stdout_path) as f:
+        text = f.read()
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 << 20 if sys.platform == "darwin" else 1 << 10
+    return proc.returncode, text, wall, usage.ru_maxrss / scale
+
+
+def gem5_command(args, bench, outdir):
+    bench_path = os.path.join(args.m5_path, SUITE_PATH, bench)
+    return [args.gem5, "--outdir=%s" % outdir,
+            os.path.join(args.m5_path, "configs", "SALAM", "fs_%s.py" % bench),
+            "--mem-size=4GB",
+            "--mem-type=DDR4_2400_8x8",
+            "--kernel=%s" % os.path.join(bench_path, "sw", "main.elf"),
+            "--disk-image=%s" % os.path.join(args.m5_path, "benchmarks",
+                                             "common", "fake.iso"),
+            "--machine-type=VExpress_GEM5_V1",
+            "--dtb-file=none", "--bare-metal",
+            "--cpu-type=DerivO3CPU",
+            "--accpath=%s" % bench_path,
+            "--accbench=%s" % bench,
+            "--caches", "--l2cache"]
+
+
+def prepare(args, bench, env):
+    """Generate the gem5 configs of a benchmark (and build it if asked)."""
+    bench_path = os.path.join(SUITE_PATH, bench)
+    subprocess.run([sys.executable,
+                    os.path.join(args.m5_path, "tools", "SALAM-Configurator",
+                                 "systembuilder.py"),
+                    "--sys-name", bench, "--bench-path", bench_path,
+                    "--m5-path", args.m5_path],
+                   check=True, env=env, stdout=subprocess.DEVNULL)
+    if args.build:
+        subprocess.run(["make", "all", "-C",
+                        os.path.join(args.m5_path, bench_path)],
+                       check=True, env=env, stdout=subprocess.DEVNULL)
+
+
+def measure(args, bench, env):
+    """
+    Run a benchmark args.repeat times and keep the fastest run.
+
+    :returns: A dict of results, or None if the benchmark failed.
+    """
+    best = None
+    for i in range(args.repeat):
+        outdir = os.path.join(args.outdir, bench, "run%d" % i)
+        status, text, wall, rss = run_gem5(gem5_command(args, bench, outdir),
+                                           outdir, env)
+        seconds, cycles, insts, accs = parse_output(text)
+        if status != 0 or accs == 0 or cycles == 0:
+            print("  %s: run %d failed (exit status %d, %d accelerator "
+                  "results); see %s" % (bench, i, status, accs, outdir))
+            return None
+
+        result = {
+            "accelerators": accs,
+            "accel_cycles": cycles,
+            "dynamic_insts": insts,
+            "host_seconds": seconds,
+            "wall_seconds": wall,
+            "host_seconds_per_cycle": seconds / cycles,
+            "insts_per_host_second": insts / seconds if seconds else None,
+            "peak_rss_mb": rss,
+        }
+        if best is None:
+            best = result
+        else:
+            # The simulated work is deterministic; host noise only ever
+            # makes a run slower, so the fastest run is the best estimate.
+            if seconds < best["host_seconds"]:
+                result["peak_rss_mb"] = max(rss, best["peak_rss_mb"])
+                best = result
+            else:
+                best["peak_rss_mb"] = max(rss, best["peak_rss_mb"])
+    return best
+
+
+def host_info(args):
+    try:
+        revision = subprocess.run(["git", "rev-parse", "HEAD"],
+                                  cwd=args.m5_path, capture_output=True,
+                                  text=True).stdout.strip()
+    except OSError:
+        revision = ""
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "system": platform.platform(),
+        "gem5": os.path.abspath(args.gem5),
+        "revision": revision,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results against a baseline.
+
+    :returns: A list of (benchmark, metric, baseline value, new value,
+        relative change, regressed) for every metric present in both.
+    """
+    rows = []
+    for bench, result in sorted(results.items()):
+        base = baseline.get(bench)
+        if result is None or base is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old = base.get(metric)
+            new = result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            rows.append((bench, metric, old, new, change, worse > threshold))
+    return rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Measure the host throughput of gem5-SALAM on the "
+                    "sys_validation kernels.")
+    parser.add_argument("--m5-path", default=os.environ.get("M5_PATH",
+                                                            DEFAULT_M5_PATH),
+                        help="Path to the gem5-SALAM tree (default: $M5_PATH "
+                             "or this checkout)")
+    parser.add_argument("--gem5", default=None,
+                        help="gem5 binary (default: build/ARM/gem5.opt)")
+    parser.add_argument("--bench", default=None,
+                        help="Comma-separated kernels to run (default: all "
+                             "of %s)" % SUITE_PATH)
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per kernel; the fastest is kept")
+    parser.add_argument("--build", action="store_true",
+                        help="Build each kernel before running it")
+    parser.add_argument("--outdir", default="BM_ARM_OUT/perf",
+                        help="Directory for the gem5 outputs")
+    parser.add_argument("--output", default=None,
+                        help="Results JSON file (default: OUTDIR/perf.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change beyond which a metric is a "
+                             "regression (default: 0.10)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store the results as the new baseline")
+    parser.add_argument("--compare-only", metavar="RESULTS", default=None,
+                        help="Compare an existing results file against the "
+                             "baseline instead of running anything")
+    args = parser.parse_args()
+    args.m5_path = os.path.abspath(args.m5_path)
+    if args.gem5 is None:
+        args.gem5 = os.path.join(args.m5_path, "build", "ARM", "gem5.opt")
+    if args.output is None:
+        args.output = os.path.join(args.outdir, "perf.json")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    return args
+
+
+def write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main():
+    args = parse_args()
+
+    if args.compare_only:
+        with open(args.compare_only) as f:
+            report = json.load(f)
+    else:
+        if not os.path.isfile(args.gem5):
+            print("gem5 binary %s not found" % args.gem5)
+            sys.exit(2)
+        available = list_benchmarks(args.m5_path)
+        benches = args.bench.split(",") if args.bench else available
+        unknown = [b for b in benches if b not in available]
+        if unknown:
+            print("Unknown benchmarks: %s (available: %s)"
+                  % (", ".join(unknown), ", ".join(available)))
+            sys.exit(2)
+
+        env = dict(os.environ, M5_PATH=args.m5_path)
+        results = {}
+        for bench in benches:
+            print("Running %s" % bench)
+            try:
+                prepare(args, bench, env)
+            except subprocess.CalledProcessError as e:
+                print("  %s: preparation failed: %s" % (bench, e))
+                results[bench] = None
+                continue
+            results[bench] = measure(args, bench, env)
+            if results[bench]:
+                print("  %(accel_cycles)d cycles, %(host_seconds).3f host s, "
+                      "%(peak_rss_mb).0f MB" % results[bench])
+
+        report = {
+            "version": FORMAT_VERSION,
+            "host": host_info(args),
+            "repeat": args.repeat,
+            "benchmarks": results,
+        }
+        write_json(args.output, report)
+        print("Results written to %s" % args.output)
+
+    failed = sorted(b for b, r in report["benchmarks"].items() if r is None)
+
+    if args.update_baseline:
+        write_json(args.baseline, report)
+        print("Baseline written to %s" % args.baseline)
+        sys.exit(1 if failed else 0)
+
+    if not os.path.isfile(args.baseline):
+        print("No baseline at %s; run with --update-baseline to record one"
+              % args.baseline)
+        sys.exit(1 if failed else 0)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("version") != FORMAT_VERSION:
+        print("Baseline %s has an unsupported format" % args.baseline)
+        sys.exit(2)
+    if baseline["host"].get("node") != report["host"].get("node"):
+        print("WARNING: baseline was recorded on %s; host times are only "
+              "comparable on the same machine" % baseline["host"].get("node"))
+
+    rows = compare(report["benchmarks"], baseline["benchmarks"],
+                   args.threshold)
+    print("")
+    print("%-12s %-24s %14s %14s %9s" % ("benchmark", "metric", "baseline",
+                                          "current", "change"))
+    for bench, metric, old, new, change, regressed in rows:
+        print("%-12s %-24s %14.6g %14.6g %+8.1f%%%s"
+              % (bench, metric, old, new, 100 * change,
+                 "  REGRESSION" if regressed else ""))
+
+    regressions = [row for row in rows if row[-1]]
+    if failed:
+        print("\nFailed: %s" % ", ".join(failed))
+    if regressions:
+        print("\n%d regression(s) beyond %.0f%%"
+              % (len(regressions), 100 * args.threshold))
+    sys.exit(1 if regressions or failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -388,6 +388,12 @@ def addCommonOptions(parser):
     parser.add_argument(
         "-F", "--fast-forward", action="store", type=str, default=None,
         help="Number of instructions to fast forward before switching")
+    parser.add_argument(
+        "--fast-forward-until", action="store", type=str, default=None,
+        choices=["acc-launch", "work-begin"],
+        help="""Fast forward on an atomic CPU until the first write to an
+                accelerator's MMRs (acc-launch) or the first m5_work_begin
+                (work-begin), then switch to --cpu-type and reset stats""")
     parser.add_argument(
         "-S", "--simpoint", action="store_true", default=False,
         help="""Use workload simpoints as an instruction offset for
@@ -76,7 +76,7 @@ def setCPUClass(options):
         if options.restore_with_cpu != options.cpu_type:
             CPUClass = TmpClass
             TmpClass, test_mem_mode = getCPUClass(options.restore_with_cpu)
-    elif options.fast_forward:
+    elif options.fast_forward or options.fast_forward_until:
         CPUClass = TmpClass
         TmpClass = AtomicSimpleCPU
         test_mem_mode = 'atomic'
@@ -435,6 +435,13 @@ def run(options, root, testsys, cpu_class):
     if options.fast_forward and options.checkpoint_restore != None:
         fatal("Can't specify both --fast-forward and --checkpoint-restore")
 
+    if options.fast_forward_until and options.checkpoint_restore != None:
+        fatal("Can't specify both --fast-forward-until and "
+              "--checkpoint-restore")
+
+    if options.fast_forward and options.fast_forward_until:
+        fatal("Can't specify both --fast-forward and --fast-forward-until")
+
     if options.standard_switch and not options.caches:
         fatal("Must specify --caches when using --standard-switch")
 
@@ -497,6 +504,15 @@ def run(options, root, testsys, cpu_class):
         testsys.switch_cpus = switch_cpus
         switch_cpu_list = [(testsys.cpu[i], switch_cpus[i]) for i in range(np)]
 
+        # Arrange for the fast-forward CPUs to stop at the switch point
+        if options.fast_forward_until == "acc-launch":
+            for obj in testsys.descendants():
+                if isinstance(obj, CommInterface):
+                    obj.exit_on_launch = True
+        elif options.fast_forward_until == "work-begin":
+            if options.work_begin_exit_count == None:
+                testsys.work_begin_exit_count = 1
+
     if options.repeat_switch:
         switch_class = getCPUClass(options.cpu_type)[0]
         if switch_class.require_caches() and \
@@ -665,6 +681,15 @@ def run(options, root, testsys, cpu_class):
             print("Switch at instruction count:%s" %
                     str(testsys.cpu[0].max_insts_any_thread))
             exit_event = m5.simulate()
+        elif cpu_class and options.fast_forward_until:
+            print("Switch at %s" % options.fast_forward_until)
+            exit_event = m5.simulate()
+            if exit_event.getCause() not in ("accelerator launch",
+                                             "work started count reach"):
+                # The workload ended before reaching the switch point
+                print('Exiting @ tick %i because %s' %
+                      (m5.curTick(), exit_event.getCause()))
+                return
         else:
             print("Switch at curTick count:%s" % str(10000))
             exit_event = m5.simulate(10000)
@@ -714,7 +739,7 @@ def run(options, root, testsys, cpu_class):
         restoreSimpointCheckpoint()
 
     else:
-        if options.fast_forward:
+        if options.fast_forward or options.fast_forward_until:
             m5.stats.reset()
         print("**** REAL SIMULATION ****")
 
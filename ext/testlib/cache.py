@@ -0,0 +1,186 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+'''
+A cache of suite results which persists across testlib invocations.
+
+A suite which passed is not run again as long as its inputs are unchanged.
+The inputs of a suite are its UID and tags, the files in the directory of the
+test file defining it, the :attr:`TestSuite.cache_inputs` it was given, and
+the :func:`Fixture.cache_inputs` of its fixtures (e.g., the gem5 binary).
+Inputs naming a file or directory stand for its contents. Suites which do not
+set cache_inputs are never cached.
+
+The cache also remembers how long each suite took to run, which the parallel
+runner uses to start the longest suites first.
+'''
+import hashlib
+import os
+import pickle
+
+from testlib.configuration import constants
+from testlib.state import Result
+import testlib.log as log
+
+class ResultCache(object):
+    version = 1
+
+    def __init__(self, path, reuse=True):
+        '''
+        :param path: The pickle file the cache is kept in.
+
+        :param reuse: If False, cached results are not used (but results of
+            this run are still recorded).
+        '''
+        self.path = path
+        self.reuse = reuse
+        self.passed = {}
+        self.durations = {}
+        self._digests = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception:
+            log.test_log.warn('Ignoring unreadable result cache %s'
+                              % self.path)
+            return
+        if data.get('version') != self.version:
+            return
+        self.passed = data['passed']
+        self.durations = data['durations']
+        self._digests = data['digests']
+
+    def save(self):
+        # Forget the digests of files which no longer exist.
+        self._digests = {stamp: digest
+                         for stamp, digest in self._digests.items()
+                         if os.path.exists(stamp[0])}
+        data = {
+            'version': self.version,
+            'passed': self.passed,
+            'durations': self.durations,
+            'digests': self._digests,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = '%s.%d.tmp' % (self.path, os.getpid())
+        with open(tmp, 'wb') as f:
+            pickle.dump(data, f, protocol=constants.pickle_protocol)
+        os.replace(tmp, self.path)
+
+    def _file_digest(self, path, stat):
+        stamp = (path, stat.st_dev, stat.st_ino, stat.st_size,
+                 stat.st_mtime_ns)
+        digest = self._digests.get(stamp)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(block)
+            digest = self._digests[stamp] = sha.hexdigest()
+        return digest
+
+    def _update(self, sha, item):
+        '''Add one input to the key, hashing the contents of paths.'''
+        item = str(item)
+        if os.path.isfile(item):
+            path = os.path.abspath(item)
+            sha.update(b'file\0')
+            sha.update(self._file_digest(path, os.stat(path)).encode())
+        elif os.path.isdir(item):
+            sha.update(b'dir\0')
+            top = os.path.abspath(item)
+            for root, dirs, files in os.walk(top):
+                dirs[:] = sorted(d for d in dirs
+                                 if not d.startswith('.')
+                                 and d != '__pycache__')
+                for name in sorted(files):
+                    if name.startswith('.') or name.endswith('.pyc'):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        # A dangling symlink
+                        continue
+                    sha.update(os.path.relpath(path, top).encode())
+                    sha.update(b'\0')
+                    sha.update(self._file_digest(path, stat).encode())
+        else:
+            sha.update(b'str\0')
+            sha.update(item.encode())
+        sha.update(b'\0')
+
+    def key(self, suite):
+        '''
+        :returns: The key of the given :class:`LoadedSuite` for its current
+            inputs, or None if the suite cannot be cached.
+        '''
+        inputs = suite.cache_inputs
+        if inputs is None:
+            return None
+
+        sha = hashlib.sha256()
+        sha.update(str(suite.uid).encode())
+        sha.update(repr(sorted(suite.tags)).encode())
+        self._update(sha, os.path.dirname(suite.metadata.path))
+        for item in inputs:
+            self._update(sha, item)
+        fixtures = list(suite.fixtures)
+        for test in suite:
+            fixtures.extend(test.fixtures)
+        for fixture in fixtures:
+            for item in fixture.cache_inputs():
+                self._update(sha, item)
+        return sha.hexdigest()
+
+    def has_passed(self, suite, key):
+        '''
+        :returns: True if the suite passed when last run with the given key.
+        '''
+        return (self.reuse and key is not None
+                and self.passed.get(str(suite.uid)) == key)
+
+    def record(self, suite, key, duration):
+        '''Record the outcome of running the given suite.'''
+        uid = str(suite.uid)
+        self.durations[uid] = duration
+        if key is not None and suite.result.value == Result.Passed:
+            self.passed[uid] = key
+        else:
+            self.passed.pop(uid, None)
+
+    def duration(self, suite):
+        '''
+        :returns: How long the suite took to run last time, or None.
+        '''
+        return self.durations.get(str(suite.uid))
@@ -307,6 +307,7 @@ def define_constants(constants):
     constants.gem5_binary_fixture_name = 'gem5'
     constants.xml_filename = 'results.xml'
     constants.pickle_filename = 'results.pickle'
+    constants.cache_filename = 'cache.pickle'
     constants.pickle_protocol = highest_pickle_protocol
 
     # The root directory which all test names will be based off of.
@@ -555,6 +556,24 @@ def define_common_args(config):
             action='store',
             default=1,
             help='Number of threads to spawn to run concurrent tests with.'),
+        Argument(
+            '--processes',
+            action='store_true',
+            default=False,
+            help='Run the concurrent tests of -t in separate processes'
+                 ' rather than threads.'),
+        Argument(
+            '--no-cache',
+            action='store_true',
+            default=False,
+            help='Run every test, even those which passed in an earlier run'
+                 ' with the same inputs.'),
+        Argument(
+            '--cache-path',
+            action='store',
+            default=None,
+            help='The file to keep the result cache in. Defaults to %s in'
+                 ' the result path.' % constants.cache_filename),
         Argument(
             '-v',
             action='count',
@@ -653,6 +672,9 @@ class RunParser(ArgParser):
         common_args.bin_path.add_to(parser)
         common_args.threads.add_to(parser)
         common_args.test_threads.add_to(parser)
+        common_args.processes.add_to(parser)
+        common_args.no_cache.add_to(parser)
+        common_args.cache_path.add_to(parser)
         common_args.isa.add_to(parser)
         common_args.variant.add_to(parser)
         common_args.length.add_to(parser)
@@ -729,6 +751,9 @@ class RerunParser(ArgParser):
         common_args.bin_path.add_to(parser)
         common_args.threads.add_to(parser)
         common_args.test_threads.add_to(parser)
+        common_args.processes.add_to(parser)
+        common_args.no_cache.add_to(parser)
+        common_args.cache_path.add_to(parser)
         common_args.isa.add_to(parser)
         common_args.variant.add_to(parser)
         common_args.length.add_to(parser)
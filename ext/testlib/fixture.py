@@ -76,6 +76,15 @@ class Fixture(object):
     def teardown(self, testitem):
         pass
 
+    def cache_inputs(self):
+        '''
+        Inputs (strings, or paths whose contents are used) which determine
+        the outcome of tests using this fixture, for the result cache.
+
+        .. seealso:: :mod:`testlib.cache`
+        '''
+        return ()
+
     def set_global(self):
         self._is_global = True
 
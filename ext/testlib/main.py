@@ -29,6 +29,7 @@
 import os
 import itertools
 
+import testlib.cache as cache_mod
 import testlib.configuration as configuration
 import testlib.handlers as handlers
 import testlib.loader as loader_mod
@@ -264,13 +265,23 @@ def run_schedule(test_schedule, log_handler):
                 configuration.config.result_path))
     log.test_log.message(terminal.separator())
 
+    cache_path = configuration.config.cache_path
+    if cache_path is None:
+        cache_path = os.path.join(configuration.config.result_path,
+                                  configuration.constants.cache_filename)
+    cache = cache_mod.ResultCache(cache_path,
+                                  reuse=not configuration.config.no_cache)
+
     # Build global fixtures and exectute scheduled test suites.
     if configuration.config.test_threads > 1:
         library_runner = runner.LibraryParallelRunner(test_schedule)
         library_runner.set_threads(configuration.config.test_threads)
+        library_runner.set_processes(configuration.config.processes)
     else:
         library_runner = runner.LibraryRunner(test_schedule)
+    library_runner.set_cache(cache)
     library_runner.run()
+    cache.save()
 
     failed = log_handler.unsuccessful()
 
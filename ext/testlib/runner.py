@@ -38,7 +38,9 @@
 #
 # Authors: Sean Wilson
 
+import multiprocessing
 import multiprocessing.dummy
+import time
 import traceback
 
 import testlib.helper as helper
@@ -165,19 +167,170 @@ class SuiteRunner(RunnerPattern):
                 iter(self.testable))
 
 
-class LibraryRunner(SuiteRunner):
-    pass
+class LibraryRunner(RunnerPattern):
+    cache = None
 
+    def set_cache(self, cache):
+        '''
+        Use the given :class:`testlib.cache.ResultCache` to skip suites that
+        passed with the same inputs before, and to record this run.
+        '''
+        self.cache = cache
+
+    def test(self):
+        suites = list(self.testable)
+        keys = {}
+        if self.cache is not None:
+            cached = set()
+            for suite in suites:
+                keys[suite.uid] = self.cache.key(suite)
+                if self.cache.has_passed(suite, keys[suite.uid]):
+                    mark_cached(suite)
+                    cached.add(suite.uid)
+            if cached:
+                log.test_log.message('Skipping %d suites which passed before'
+                                     ' with the same inputs' % len(cached))
+            suites = [suite for suite in suites if suite.uid not in cached]
+
+        for suite, duration in self.run_suites(suites):
+            if self.cache is not None:
+                self.cache.record(suite, keys[suite.uid], duration)
+
+        self.testable.result = compute_aggregate_result(
+                iter(self.testable))
+
+    def run_suites(self, suites):
+        '''
+        Run the given suites, yielding each with its wall-clock run time
+        as it completes.
+        '''
+        for suite in suites:
+            yield suite, run_suite(suite)
+
+
+class LibraryParallelRunner(LibraryRunner):
+    processes = False
 
-class LibraryParallelRunner(RunnerPattern):
     def set_threads(self, threads):
         self.threads = threads
 
-    def test(self):
+    def set_processes(self, processes):
+        '''
+        Run suites in a pool of processes rather than threads, so that
+        Python-side work in one suite (e.g., verifiers comparing output with
+        gold standards) does not hold up the others.
+        '''
+        self.processes = processes
+
+    def run_suites(self, suites):
+        # Start the suites that took longest last time first, so that the
+        # pool does not end up waiting on one long suite. Suites without a
+        # history are assumed to be long.
+        if self.cache is not None:
+            durations = {suite.uid: self.cache.duration(suite)
+                         for suite in suites}
+            suites = sorted(suites, key=lambda suite:
+                    (durations[suite.uid] is not None,
+                     -(durations[suite.uid] or 0)))
+
+        if self.processes:
+            return self._run_in_processes(suites)
+        return self._run_in_threads(suites)
+
+    def _run_in_threads(self, suites):
         pool = multiprocessing.dummy.Pool(self.threads)
-        pool.map(lambda suite : suite.runner(suite).run(), self.testable)
-        self.testable.result = compute_aggregate_result(
-                iter(self.testable))
+        try:
+            yield from pool.imap_unordered(
+                    lambda suite: (suite, run_suite(suite)), suites)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _run_in_processes(self, suites):
+        global _process_suites
+        if not suites:
+            return
+
+        # Fixtures used by several suites (e.g., downloaded programs) would
+        # otherwise be set up concurrently in each process that needs them.
+        # The gem5 binaries are global fixtures, so they are already built.
+        users = {}
+        for suite in suites:
+            for fixture in suite.fixtures:
+                users.setdefault(id(fixture), [fixture, 0])[1] += 1
+        for fixture, count in users.values():
+            if count > 1 and not fixture.is_global():
+                try:
+                    fixture.setup(self.testable)
+                except Exception:
+                    # Leave it to the suites to report.
+                    log.test_log.debug(traceback.format_exc())
+
+        # Suites are inherited by the forked workers, only their results
+        # are sent back. Log records (and so test output) are forwarded by
+        # the log's multiprocessing handler.
+        _process_suites = suites
+        context = multiprocessing.get_context('fork')
+        pool = context.Pool(self.threads)
+        try:
+            for index, outcome, duration in pool.imap_unordered(
+                    _run_suite_in_process, range(len(suites))):
+                suite = suites[index]
+                _restore_outcome(suite, outcome)
+                yield suite, duration
+        finally:
+            pool.close()
+            pool.join()
+            _process_suites = None
+
+
+def run_suite(suite):
+    '''Run a suite, returning how long it took in seconds.'''
+    start = time.time()
+    suite.runner(suite).run()
+    return time.time() - start
+
+
+def mark_cached(suite):
+    '''Mark a suite and its tests passed without running them.'''
+    reason = 'Passed in an earlier run with the same inputs'
+    for test in suite:
+        test.time = {"user_time" : 0, "system_time" : 0}
+        test.result = Result(Result.Passed, reason)
+        test.status = Status.Complete
+    suite.result = Result(Result.Passed, reason)
+    suite.status = Status.Complete
+
+
+_process_suites = None
+
+def _outcome(testable):
+    return (testable.metadata.result, testable.metadata.status,
+            getattr(testable.metadata, 'time', None))
+
+def _run_suite_in_process(index):
+    suite = _process_suites[index]
+    duration = run_suite(suite)
+    outcome = (_outcome(suite), [_outcome(test) for test in suite])
+    return index, outcome, duration
+
+def _restore_outcome(suite, outcome):
+    '''
+    Copy the outcome of a suite run in another process back into its
+    metadata. The log records were already sent, so the setters (which
+    would log them again) are bypassed.
+    '''
+    def restore(testable, outcome):
+        result, status, test_time = outcome
+        testable.metadata.result = result
+        testable.metadata.status = status
+        if test_time is not None:
+            testable.metadata.time = test_time
+
+    suite_outcome, test_outcomes = outcome
+    restore(suite, suite_outcome)
+    for test, test_outcome in zip(suite, test_outcomes):
+        restore(test, test_outcome)
 
 
 class BrokenFixtureException(Exception):
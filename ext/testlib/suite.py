@@ -36,6 +36,10 @@ class TestSuite(object):
     filtering during list and run selection. All tests held in the suite must
     have a unique name.
 
+    A suite given `cache_inputs` (an iterable of strings and paths) is not
+    rerun while it and its inputs are unchanged since it last passed. See
+    :mod:`testlib.cache`.
+
     ..note::
         The :func:`__new__` method enables collection of test cases, it must
         be called in order for test cases to be collected.
@@ -50,6 +54,7 @@ class TestSuite(object):
     fixtures = []
     tests = []
     tags = set()
+    cache_inputs = None
 
     def __new__(klass, *args, **kwargs):
         obj = super(TestSuite, klass).__new__(klass)
@@ -57,10 +62,12 @@ class TestSuite(object):
         return obj
 
     def __init__(self, name=None, fixtures=tuple(), tests=tuple(),
-                 tags=tuple(), **kwargs):
+                 tags=tuple(), cache_inputs=None, **kwargs):
         self.fixtures = self.fixtures + list(fixtures)
         self.tags = self.tags | set(tags)
         self.tests = self.tests + list(tests)
+        if cache_inputs is not None:
+            self.cache_inputs = list(cache_inputs)
         if name is None:
             name = self.__class__.__name__
         self.name = name
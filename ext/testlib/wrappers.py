@@ -194,6 +194,10 @@ class LoadedSuite(LoadedTestable):
     def tags(self):
         return self.metadata.tags
 
+    @property
+    def cache_inputs(self):
+        return self.obj.cache_inputs
+
 
 class LoadedLibrary(LoadedTestable):
     '''
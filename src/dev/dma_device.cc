@@ -534,6 +534,8 @@ DmaReadFifo::dmaDone()
 
     if (old_active && !isActive())
         onIdle();
+
+    onResponse();
 }
 
 void
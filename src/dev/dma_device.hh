@@ -500,6 +500,17 @@ class DmaReadFifo : public Drainable, public Serializable
      */
     virtual void onIdle() {};
 
+    /**
+     * Response handled callback
+     *
+     * This callback is called every time a DMA response has been
+     * handled, i.e., once its data has been added to the FIFO and new
+     * requests have been issued. It is called after onEndOfBlock() and
+     * onIdle(). Devices can use it to wake up instead of polling the
+     * FIFO.
+     */
+    virtual void onResponse() {};
+
     /** @} */
   private: // Configuration
     /** Maximum request size in bytes */
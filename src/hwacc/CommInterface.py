@@ -23,4 +23,5 @@ class CommInterface(BasicPioDevice):
     premap_data = Param.Bool(False, "Whether or not the memory read/write locations for data predefined")
     data_bases = VectorParam.Addr([0x0], "Base addresses for data if they are predefined")
     enable_debug_msgs = Param.Bool(False, "Whether or not this device will display debug messages")
-    reset_spm = Param.Bool(False, "Reset the ready state of any connected scratchpad memories when finished executing")
\ No newline at end of file
+    reset_spm = Param.Bool(False, "Reset the ready state of any connected scratchpad memories when finished executing")
+    exit_on_launch = Param.Bool(False, "Exit the simulation loop on the first MMR write made while the system is in atomic mode (used to switch CPUs at accelerator launch)")
\ No newline at end of file
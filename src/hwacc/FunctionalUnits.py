@@ -32,6 +32,7 @@ class DoubleMultiplier(SimObject):
 	alias = Param.String("double_multiplier", "Default values set from double_multiplier.yml")
 	stages = Param.UInt32(3, "Default values set from double_multiplier.yml")
 	cycles = Param.UInt32(5, "Default values set from double_multiplier.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from double_multiplier.yml")
 	enum_value = Param.UInt32(9, "Default values set from double_multiplier.yml")
 	int_size = Param.String("none", "Default values set from double_multiplier.yml")
 	int_sign = Param.String("none", "Default values set from double_multiplier.yml")
@@ -49,13 +50,13 @@ class DoubleMultiplier(SimObject):
 	time_units = Param.String("ns", "Default values set from double_multiplier.yml")
 	area_units = Param.String("um^2", "Default values set from double_multiplier.yml")
 	fu_latency = Param.UInt32(5, "Default values set from double_multiplier.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from double_multiplier.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from double_multiplier.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from double_multiplier.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from double_multiplier.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from double_multiplier.yml")
-	area = Param.UInt32(5.981433, "Default values set from double_multiplier.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from double_multiplier.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from double_multiplier.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from double_multiplier.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from double_multiplier.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from double_multiplier.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from double_multiplier.yml")
+	area = Param.Float(5.981433, "Default values set from double_multiplier.yml")
+	path_delay = Param.Float(1.75, "Default values set from double_multiplier.yml")
 
 class BitRegister(SimObject):
 	# SimObject type
@@ -66,6 +67,7 @@ class BitRegister(SimObject):
 	alias = Param.String("bit_register", "Default values set from bit_register.yml")
 	stages = Param.UInt32(0, "Default values set from bit_register.yml")
 	cycles = Param.UInt32(0, "Default values set from bit_register.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from bit_register.yml")
 	enum_value = Param.UInt32(15, "Default values set from bit_register.yml")
 	int_size = Param.String("any", "Default values set from bit_register.yml")
 	int_sign = Param.String("any", "Default values set from bit_register.yml")
@@ -83,13 +85,13 @@ class BitRegister(SimObject):
 	time_units = Param.String("ns", "Default values set from bit_register.yml")
 	area_units = Param.String("um^2", "Default values set from bit_register.yml")
 	fu_latency = Param.UInt32(5, "Default values set from bit_register.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from bit_register.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from bit_register.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from bit_register.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from bit_register.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from bit_register.yml")
-	area = Param.UInt32(5.981433, "Default values set from bit_register.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from bit_register.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from bit_register.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from bit_register.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from bit_register.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from bit_register.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from bit_register.yml")
+	area = Param.Float(5.981433, "Default values set from bit_register.yml")
+	path_delay = Param.Float(1.75, "Default values set from bit_register.yml")
 
 class BitwiseOperations(SimObject):
 	# SimObject type
@@ -100,6 +102,7 @@ class BitwiseOperations(SimObject):
 	alias = Param.String("bitwise_operations", "Default values set from bitwise_operations.yml")
 	stages = Param.UInt32(1, "Default values set from bitwise_operations.yml")
 	cycles = Param.UInt32(1, "Default values set from bitwise_operations.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from bitwise_operations.yml")
 	enum_value = Param.UInt32(4, "Default values set from bitwise_operations.yml")
 	int_size = Param.String("any", "Default values set from bitwise_operations.yml")
 	int_sign = Param.String("any", "Default values set from bitwise_operations.yml")
@@ -117,13 +120,13 @@ class BitwiseOperations(SimObject):
 	time_units = Param.String("ns", "Default values set from bitwise_operations.yml")
 	area_units = Param.String("um^2", "Default values set from bitwise_operations.yml")
 	fu_latency = Param.UInt32(5, "Default values set from bitwise_operations.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from bitwise_operations.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from bitwise_operations.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from bitwise_operations.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from bitwise_operations.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from bitwise_operations.yml")
-	area = Param.UInt32(5.981433, "Default values set from bitwise_operations.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from bitwise_operations.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from bitwise_operations.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from bitwise_operations.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from bitwise_operations.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from bitwise_operations.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from bitwise_operations.yml")
+	area = Param.Float(5.981433, "Default values set from bitwise_operations.yml")
+	path_delay = Param.Float(1.75, "Default values set from bitwise_operations.yml")
 
 class DoubleAdder(SimObject):
 	# SimObject type
@@ -134,6 +137,7 @@ class DoubleAdder(SimObject):
 	alias = Param.String("double_adder", "Default values set from double_adder.yml")
 	stages = Param.UInt32(3, "Default values set from double_adder.yml")
 	cycles = Param.UInt32(5, "Default values set from double_adder.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from double_adder.yml")
 	enum_value = Param.UInt32(6, "Default values set from double_adder.yml")
 	int_size = Param.String("none", "Default values set from double_adder.yml")
 	int_sign = Param.String("none", "Default values set from double_adder.yml")
@@ -151,13 +155,13 @@ class DoubleAdder(SimObject):
 	time_units = Param.String("ns", "Default values set from double_adder.yml")
 	area_units = Param.String("um^2", "Default values set from double_adder.yml")
 	fu_latency = Param.UInt32(5, "Default values set from double_adder.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from double_adder.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from double_adder.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from double_adder.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from double_adder.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from double_adder.yml")
-	area = Param.UInt32(5.981433, "Default values set from double_adder.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from double_adder.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from double_adder.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from double_adder.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from double_adder.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from double_adder.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from double_adder.yml")
+	area = Param.Float(5.981433, "Default values set from double_adder.yml")
+	path_delay = Param.Float(1.75, "Default values set from double_adder.yml")
 
 class FloatDivider(SimObject):
 	# SimObject type
@@ -168,6 +172,7 @@ class FloatDivider(SimObject):
 	alias = Param.String("float_divider", "Default values set from float_divider.yml")
 	stages = Param.UInt32(3, "Default values set from float_divider.yml")
 	cycles = Param.UInt32(16, "Default values set from float_divider.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from float_divider.yml")
 	enum_value = Param.UInt32(8, "Default values set from float_divider.yml")
 	int_size = Param.String("none", "Default values set from float_divider.yml")
 	int_sign = Param.String("none", "Default values set from float_divider.yml")
@@ -185,13 +190,13 @@ class FloatDivider(SimObject):
 	time_units = Param.String("ns", "Default values set from float_divider.yml")
 	area_units = Param.String("um^2", "Default values set from float_divider.yml")
 	fu_latency = Param.UInt32(5, "Default values set from float_divider.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from float_divider.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from float_divider.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from float_divider.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from float_divider.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from float_divider.yml")
-	area = Param.UInt32(5.981433, "Default values set from float_divider.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from float_divider.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from float_divider.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from float_divider.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from float_divider.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from float_divider.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from float_divider.yml")
+	area = Param.Float(5.981433, "Default values set from float_divider.yml")
+	path_delay = Param.Float(1.75, "Default values set from float_divider.yml")
 
 class BitShifter(SimObject):
 	# SimObject type
@@ -202,6 +207,7 @@ class BitShifter(SimObject):
 	alias = Param.String("bit_shifter", "Default values set from bit_shifter.yml")
 	stages = Param.UInt32(1, "Default values set from bit_shifter.yml")
 	cycles = Param.UInt32(1, "Default values set from bit_shifter.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from bit_shifter.yml")
 	enum_value = Param.UInt32(3, "Default values set from bit_shifter.yml")
 	int_size = Param.String("any", "Default values set from bit_shifter.yml")
 	int_sign = Param.String("any", "Default values set from bit_shifter.yml")
@@ -219,13 +225,13 @@ class BitShifter(SimObject):
 	time_units = Param.String("ns", "Default values set from bit_shifter.yml")
 	area_units = Param.String("um^2", "Default values set from bit_shifter.yml")
 	fu_latency = Param.UInt32(5, "Default values set from bit_shifter.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from bit_shifter.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from bit_shifter.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from bit_shifter.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from bit_shifter.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from bit_shifter.yml")
-	area = Param.UInt32(5.981433, "Default values set from bit_shifter.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from bit_shifter.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from bit_shifter.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from bit_shifter.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from bit_shifter.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from bit_shifter.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from bit_shifter.yml")
+	area = Param.Float(5.981433, "Default values set from bit_shifter.yml")
+	path_delay = Param.Float(1.75, "Default values set from bit_shifter.yml")
 
 class IntegerMultiplier(SimObject):
 	# SimObject type
@@ -236,6 +242,7 @@ class IntegerMultiplier(SimObject):
 	alias = Param.String("integer_multiplier", "Default values set from integer_multiplier.yml")
 	stages = Param.UInt32(1, "Default values set from integer_multiplier.yml")
 	cycles = Param.UInt32(1, "Default values set from integer_multiplier.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from integer_multiplier.yml")
 	enum_value = Param.UInt32(2, "Default values set from integer_multiplier.yml")
 	int_size = Param.String("any", "Default values set from integer_multiplier.yml")
 	int_sign = Param.String("any", "Default values set from integer_multiplier.yml")
@@ -253,13 +260,13 @@ class IntegerMultiplier(SimObject):
 	time_units = Param.String("ns", "Default values set from integer_multiplier.yml")
 	area_units = Param.String("um^2", "Default values set from integer_multiplier.yml")
 	fu_latency = Param.UInt32(5, "Default values set from integer_multiplier.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from integer_multiplier.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from integer_multiplier.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from integer_multiplier.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from integer_multiplier.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from integer_multiplier.yml")
-	area = Param.UInt32(5.981433, "Default values set from integer_multiplier.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from integer_multiplier.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from integer_multiplier.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from integer_multiplier.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from integer_multiplier.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from integer_multiplier.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from integer_multiplier.yml")
+	area = Param.Float(5.981433, "Default values set from integer_multiplier.yml")
+	path_delay = Param.Float(1.75, "Default values set from integer_multiplier.yml")
 
 class IntegerAdder(SimObject):
 	# SimObject type
@@ -270,6 +277,7 @@ class IntegerAdder(SimObject):
 	alias = Param.String("integer_adder", "Default values set from integer_adder.yml")
 	stages = Param.UInt32(1, "Default values set from integer_adder.yml")
 	cycles = Param.UInt32(1, "Default values set from integer_adder.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from integer_adder.yml")
 	enum_value = Param.UInt32(1, "Default values set from integer_adder.yml")
 	int_size = Param.String("any", "Default values set from integer_adder.yml")
 	int_sign = Param.String("any", "Default values set from integer_adder.yml")
@@ -287,13 +295,13 @@ class IntegerAdder(SimObject):
 	time_units = Param.String("ns", "Default values set from integer_adder.yml")
 	area_units = Param.String("um^2", "Default values set from integer_adder.yml")
 	fu_latency = Param.UInt32(5, "Default values set from integer_adder.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from integer_adder.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from integer_adder.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from integer_adder.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from integer_adder.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from integer_adder.yml")
-	area = Param.UInt32(5.981433, "Default values set from integer_adder.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from integer_adder.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from integer_adder.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from integer_adder.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from integer_adder.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from integer_adder.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from integer_adder.yml")
+	area = Param.Float(5.981433, "Default values set from integer_adder.yml")
+	path_delay = Param.Float(1.75, "Default values set from integer_adder.yml")
 
 class DoubleDivider(SimObject):
 	# SimObject type
@@ -304,6 +312,7 @@ class DoubleDivider(SimObject):
 	alias = Param.String("double_divider", "Default values set from double_divider.yml")
 	stages = Param.UInt32(3, "Default values set from double_divider.yml")
 	cycles = Param.UInt32(16, "Default values set from double_divider.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from double_divider.yml")
 	enum_value = Param.UInt32(10, "Default values set from double_divider.yml")
 	int_size = Param.String("none", "Default values set from double_divider.yml")
 	int_sign = Param.String("none", "Default values set from double_divider.yml")
@@ -321,13 +330,13 @@ class DoubleDivider(SimObject):
 	time_units = Param.String("ns", "Default values set from double_divider.yml")
 	area_units = Param.String("um^2", "Default values set from double_divider.yml")
 	fu_latency = Param.UInt32(5, "Default values set from double_divider.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from double_divider.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from double_divider.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from double_divider.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from double_divider.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from double_divider.yml")
-	area = Param.UInt32(5.981433, "Default values set from double_divider.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from double_divider.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from double_divider.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from double_divider.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from double_divider.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from double_divider.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from double_divider.yml")
+	area = Param.Float(5.981433, "Default values set from double_divider.yml")
+	path_delay = Param.Float(1.75, "Default values set from double_divider.yml")
 
 class FloatAdder(SimObject):
 	# SimObject type
@@ -338,6 +347,7 @@ class FloatAdder(SimObject):
 	alias = Param.String("float_adder", "Default values set from float_adder.yml")
 	stages = Param.UInt32(3, "Default values set from float_adder.yml")
 	cycles = Param.UInt32(5, "Default values set from float_adder.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from float_adder.yml")
 	enum_value = Param.UInt32(5, "Default values set from float_adder.yml")
 	int_size = Param.String("none", "Default values set from float_adder.yml")
 	int_sign = Param.String("none", "Default values set from float_adder.yml")
@@ -355,13 +365,13 @@ class FloatAdder(SimObject):
 	time_units = Param.String("ns", "Default values set from float_adder.yml")
 	area_units = Param.String("um^2", "Default values set from float_adder.yml")
 	fu_latency = Param.UInt32(5, "Default values set from float_adder.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from float_adder.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from float_adder.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from float_adder.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from float_adder.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from float_adder.yml")
-	area = Param.UInt32(5.981433, "Default values set from float_adder.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from float_adder.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from float_adder.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from float_adder.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from float_adder.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from float_adder.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from float_adder.yml")
+	area = Param.Float(5.981433, "Default values set from float_adder.yml")
+	path_delay = Param.Float(1.75, "Default values set from float_adder.yml")
 
 class FloatMultiplier(SimObject):
 	# SimObject type
@@ -372,6 +382,7 @@ class FloatMultiplier(SimObject):
 	alias = Param.String("float_multiplier", "Default values set from float_multiplier.yml")
 	stages = Param.UInt32(3, "Default values set from float_multiplier.yml")
 	cycles = Param.UInt32(5, "Default values set from float_multiplier.yml")
+	initiation_interval = Param.UInt32(0, "Default values set from float_multiplier.yml")
 	enum_value = Param.UInt32(7, "Default values set from float_multiplier.yml")
 	int_size = Param.String("none", "Default values set from float_multiplier.yml")
 	int_sign = Param.String("none", "Default values set from float_multiplier.yml")
@@ -389,11 +400,11 @@ class FloatMultiplier(SimObject):
 	time_units = Param.String("ns", "Default values set from float_multiplier.yml")
 	area_units = Param.String("um^2", "Default values set from float_multiplier.yml")
 	fu_latency = Param.UInt32(5, "Default values set from float_multiplier.yml")
-	internal_power = Param.UInt32(0.009743773, "Default values set from float_multiplier.yml")
-	switch_power = Param.UInt32(0.007400587, "Default values set from float_multiplier.yml")
-	dynamic_power = Param.UInt32(0.001800732, "Default values set from float_multiplier.yml")
-	dynamic_energy = Param.UInt32(0.009003937, "Default values set from float_multiplier.yml")
-	leakage_power = Param.UInt32(7.395312e-05, "Default values set from float_multiplier.yml")
-	area = Param.UInt32(5.981433, "Default values set from float_multiplier.yml")
-	path_delay = Param.UInt32(1.75, "Default values set from float_multiplier.yml")
+	internal_power = Param.Float(0.009743773, "Default values set from float_multiplier.yml")
+	switch_power = Param.Float(0.007400587, "Default values set from float_multiplier.yml")
+	dynamic_power = Param.Float(0.001800732, "Default values set from float_multiplier.yml")
+	dynamic_energy = Param.Float(0.009003937, "Default values set from float_multiplier.yml")
+	leakage_power = Param.Float(7.395312e-05, "Default values set from float_multiplier.yml")
+	area = Param.Float(5.981433, "Default values set from float_multiplier.yml")
+	path_delay = Param.Float(1.75, "Default values set from float_multiplier.yml")
 
@@ -15,6 +15,7 @@ class FunctionalUnitBase
 		std::string _alias;
 		uint32_t _stages;
 		uint32_t _cycles;
+		uint32_t _initiation_interval;
 		uint32_t _enum_value;
 		std::string _int_size;
 		std::string _int_sign;
@@ -48,6 +49,7 @@ class FunctionalUnitBase
 		FunctionalUnitBase( std::string alias,
 							uint32_t stages,
 							uint32_t cycles,
+							uint32_t initiation_interval,
 							uint32_t enum_value,
 							std::string int_size,
 							std::string int_sign,
@@ -74,6 +76,7 @@ class FunctionalUnitBase
 							_alias(alias),
 							_stages(stages),
 							_cycles(cycles),
+							_initiation_interval(initiation_interval),
 							_enum_value(enum_value),
 							_int_size(int_size),
 							_int_sign(int_sign),
@@ -100,6 +103,7 @@ class FunctionalUnitBase
 		std::string get_alias() { return _alias; }
 		uint32_t get_stages() { return _stages; }
 		uint32_t get_cycles() { return _cycles; }
+		uint32_t get_initiation_interval() { return _initiation_interval; }
 		uint64_t get_in_use() { return _in_use; }
 		uint32_t get_enum_value() { return _enum_value; }
 		std::string get_int_size() { return _int_size; }
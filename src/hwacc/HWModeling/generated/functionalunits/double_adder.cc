@@ -7,6 +7,7 @@ DoubleAdder::DoubleAdder(const DoubleAdderParams &params) :
 	FunctionalUnitBase( params.alias,
 						params.stages,
 						params.cycles,
+						params.initiation_interval,
 						params.enum_value,
 						params.int_size,
 						params.int_sign,
@@ -1,6 +1,7 @@
 #ifndef __HWMODEL_HW_MODEL_HH__
 #define __HWMODEL_HW_MODEL_HH__
 
+#include "hwacc/functional_unit_table.hh"
 #include "params/HWInterface.hh"
 #include "sim/sim_object.hh"
 
@@ -34,11 +35,17 @@ class HWInterface : public SimObject
         SALAMPowerModel *salam_power_model;
         SimulatorConfig *simulator_config;
 
+        FunctionalUnitTable fuTable;
+
         HWInterface();
         HWInterface(const HWInterfaceParams &params);
+        void buildFunctionalUnitTable();
         bool availableFunctionalUnit(uint64_t functional_unit);
-        void clearFunctionalUnit(uint64_t functional_unit);
-        
+        void advanceFunctionalUnits() { fuTable.advance(); }
+        uint64_t functionalUnitsInUse(uint64_t functional_unit) {
+            return fuTable.inUse(functional_unit);
+        }
+
 
 };
 
@@ -30,6 +30,7 @@
 #include "debug/DeviceMMR.hh"
 #include "debug/DMA.hh"
 #include "debug/LLVMInterface.hh"
+#include "debug/MultiChannelDma.hh"
 #include "debug/NoncoherentDma.hh"
 #include "debug/LLVMParse.hh"
 #include "debug/Runtime.hh"
@@ -147,14 +147,7 @@ SALAM::Instruction::ready()
 bool
 SALAM::Instruction::launch()
 {
-    if (hasFunctionalUnit()) {
-        if(!hw_interface->availableFunctionalUnit(getFunctionalUnit())) {
-            return false;
-            std::cout << "Waiting on next available FU\n"; 
-        } else {
-            
-        }
-    }
+    // Functional units are arbitrated by the runtime before launch
     launched = true;
     if (getCycleCount() == 0) { // Instruction ready to be committed
         if (dbg) DPRINTFS(Runtime, owner, "||  0 Cycle Instruction\n");
@@ -178,14 +171,6 @@ SALAM::Instruction::commit()
         committed = true;
         if (dbg) DPRINTFS(Runtime, owner, "||==Return: %s\n", committed ? "true" : "false");
         if (dbg) DPRINTFS(Runtime, owner, "||==commit================\n");
-        //std::cout << "\n\n\nTest 3 - FU[" << getFunctionalUnit() << "]\n\n\n";
-        if (hasFunctionalUnit()) {
-            //std::cout << "\n\n\nTest 2\n\n\n";
-            hw_interface->clearFunctionalUnit(getFunctionalUnit());
-           // hw_interface->functional_units->
-        } else {
-            // 
-        }
         return true;
     } else {
         if (dbg) DPRINTFS(Runtime, owner, "||  Remaining Cycles: %i\n", getCycleCount() - getCurrentCycle());
@@ -24,6 +24,8 @@ class MemoryRequest {
     Tick readLeft;
     Tick readDone;
     Tick totalLength;
+    // When the compute unit handed this request to the CommInterface
+    Tick issueTick = 0;
 
     uint8_t *buffer;
     bool *readsDone;
@@ -42,6 +44,8 @@ class MemoryRequest {
     RequestPort * getCarrierPort() { return port; }
     uint8_t * getBuffer() { return buffer; }
     Addr getAddress() { return address; }
+    void setIssueTick(Tick tick) { issueTick = tick; }
+    Tick getIssueTick() { return issueTick; }
     std::string printBuffer();
 };
 
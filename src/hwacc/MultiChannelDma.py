@@ -0,0 +1,17 @@
+from m5.params import *
+from m5.proxy import *
+from m5.objects.Device import DmaDevice
+
+class MultiChannelDma(DmaDevice) :
+    type = 'MultiChannelDma'
+    cxx_header = 'hwacc/multichannel_dma.hh'
+    devicename = Param.String("multichannel_dma", "Name of DMA device")
+    cluster_dma = RequestPort("Cluster-side DMA port")
+    pio_addr = Param.Addr("Device Address")
+    pio_delay = Param.Latency('100ns', "PIO Latency")
+    num_channels = Param.Unsigned(4, "Number of independent channels. The MMR size is 32*(num_channels+1) Bytes")
+    buffer_size = Param.UInt64(1024, "Buffer size of each channel")
+    max_pending = Param.Unsigned(8, "Maximum number of pending DMA requests per buffer")
+    max_req_size = Param.Unsigned(Parent.cache_line_size, "Maximum size of a DMA request")
+    gic = Param.BaseGic(Parent.any, "Gic on which to trigger interrupts")
+    int_num = Param.UInt32(200, "Interrupt number that connects to GIC")
@@ -14,4 +14,7 @@ class ScratchpadMemory(AbstractMemory):
     read_on_invalid = Param.Bool(False, "Enable reads on invalid memory segments when ready mode is used")
     write_on_valid = Param.Bool(True, "Enable writes on valid memory sectors when ready mode is used")
     reset_on_scratchpad_read = Param.Bool(True, "Reset ready bit on private scratchpad memory read")
-    bandwidth = Param.MemoryBandwidth('12GB/s', "Combined read and write bandwidth per port")
\ No newline at end of file
+    bandwidth = Param.MemoryBandwidth('12GB/s', "Combined read and write bandwidth per port")
+    num_banks = Param.Unsigned(1, "Number of banks the array is split into")
+    bank_interleave = Param.Unsigned(8, "Bytes mapped to a bank before moving to the next one")
+    bank_ports = Param.Unsigned(0, "Accesses each bank accepts per cycle, 0 for no bank conflicts")
@@ -0,0 +1,108 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+
+#ifndef __HWACC_BANK_ARBITER_HH__
+#define __HWACC_BANK_ARBITER_HH__
+
+#include <algorithm>
+#include <vector>
+
+#include "base/types.hh"
+
+/**
+ * Bank occupancy of a banked memory. Consecutive blocks of interleave
+ * bytes map to consecutive banks, and each bank accepts up to ports
+ * accesses per cycle. Accesses are granted in the order they ask for
+ * their banks within a cycle.
+ */
+class BankArbiter
+{
+  private:
+    const unsigned banks;
+    const gem5::Addr interleave;
+    const unsigned ports;
+
+    // Cycle each bank was last used in, and how many times
+    std::vector<gem5::Tick> cycle;
+    std::vector<unsigned> uses;
+
+  public:
+    BankArbiter(unsigned _banks, gem5::Addr _interleave, unsigned _ports)
+        : banks(_banks), interleave(_interleave), ports(_ports),
+          cycle(_banks, gem5::MaxTick), uses(_banks, 0)
+    {}
+
+    /** Is there a limit on the accesses per bank and cycle? */
+    bool enabled() const { return ports != 0; }
+
+    unsigned numBanks() const { return banks; }
+
+    /** @return The bank holding the byte at offset. */
+    unsigned
+    bankOf(gem5::Addr offset) const
+    {
+        return (offset / interleave) % banks;
+    }
+
+    /**
+     * Call f once for every bank holding a byte of the size bytes at
+     * offset.
+     */
+    template <typename F>
+    void
+    forEachBank(gem5::Addr offset, gem5::Addr size, F f) const
+    {
+        const gem5::Addr first = offset / interleave;
+        const gem5::Addr last = (offset + size - 1) / interleave;
+        const gem5::Addr count =
+            std::min<gem5::Addr>(last - first + 1, banks);
+        for (gem5::Addr block = first; block < first + count; block++)
+            f(block % banks);
+    }
+
+    /** Can bank accept another access in cycle? */
+    bool
+    available(unsigned bank, gem5::Tick when) const
+    {
+        return !enabled() || cycle[bank] != when || uses[bank] < ports;
+    }
+
+    /** Record an access to bank in cycle. */
+    void
+    use(unsigned bank, gem5::Tick when)
+    {
+        if (cycle[bank] != when) {
+            cycle[bank] = when;
+            uses[bank] = 0;
+        }
+        uses[bank]++;
+    }
+};
+
+#endif // __HWACC_BANK_ARBITER_HH__
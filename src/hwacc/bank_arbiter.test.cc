@@ -0,0 +1,90 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include <gtest/gtest.h>
+
+#include <vector>
+
+#include "hwacc/bank_arbiter.hh"
+
+namespace
+{
+
+std::vector<unsigned>
+banksOf(const BankArbiter &arbiter, gem5::Addr offset, gem5::Addr size)
+{
+    std::vector<unsigned> banks;
+    arbiter.forEachBank(offset, size,
+                        [&banks](unsigned bank) { banks.push_back(bank); });
+    return banks;
+}
+
+} // anonymous namespace
+
+TEST(BankArbiterTest, Interleaving)
+{
+    BankArbiter arbiter(4, 8, 1);
+    EXPECT_EQ(0, arbiter.bankOf(0));
+    EXPECT_EQ(0, arbiter.bankOf(7));
+    EXPECT_EQ(1, arbiter.bankOf(8));
+    EXPECT_EQ(3, arbiter.bankOf(31));
+    EXPECT_EQ(0, arbiter.bankOf(32));
+
+    EXPECT_EQ(std::vector<unsigned>({2}), banksOf(arbiter, 16, 4));
+    // An unaligned access straddles two banks
+    EXPECT_EQ(std::vector<unsigned>({1, 2}), banksOf(arbiter, 12, 8));
+    EXPECT_EQ(std::vector<unsigned>({3, 0}), banksOf(arbiter, 24, 16));
+    // A wide access uses every bank once
+    EXPECT_EQ(std::vector<unsigned>({1, 2, 3, 0}), banksOf(arbiter, 8, 64));
+}
+
+TEST(BankArbiterTest, PortsPerCycle)
+{
+    BankArbiter arbiter(2, 4, 2);
+    EXPECT_TRUE(arbiter.available(0, 1000));
+    arbiter.use(0, 1000);
+    EXPECT_TRUE(arbiter.available(0, 1000));
+    arbiter.use(0, 1000);
+    // Both ports of bank 0 are taken, bank 1 is still free
+    EXPECT_FALSE(arbiter.available(0, 1000));
+    EXPECT_TRUE(arbiter.available(1, 1000));
+    // The ports are free again on the next cycle
+    EXPECT_TRUE(arbiter.available(0, 2000));
+    arbiter.use(0, 2000);
+    arbiter.use(0, 2000);
+    EXPECT_FALSE(arbiter.available(0, 2000));
+}
+
+TEST(BankArbiterTest, Unlimited)
+{
+    BankArbiter arbiter(1, 64, 0);
+    EXPECT_FALSE(arbiter.enabled());
+    for (int i = 0; i < 16; i++)
+        arbiter.use(0, 1000);
+    EXPECT_TRUE(arbiter.available(0, 1000));
+}
@@ -1,7 +1,9 @@
 #include "hwacc/comm_interface.hh"
 #include "base/trace.hh"
+#include "debug/Drain.hh"
 #include "mem/packet.hh"
 #include "mem/packet_access.hh"
+#include "sim/sim_exit.hh"
 #include "sim/system.hh"
 
 #include <stdio.h>
@@ -31,7 +33,8 @@ CommInterface::CommInterface(const CommInterfaceParams &p) :
     tickEvent(this),
     cacheLineSize(p.cache_line_size),
     clock_period(p.clock_period),
-    reset_spm(p.reset_spm) {
+    reset_spm(p.reset_spm),
+    exitOnLaunch(p.exit_on_launch) {
     processDelay = 1000 * clock_period;
     FLAG_OFFSET = 0;
     CONFIG_OFFSET = flag_size;
@@ -192,13 +195,16 @@ CommInterface::recvPacket(PacketPtr pkt) {
     }
     //if (pkt->req) delete pkt->req;
     delete pkt;
+    signalDrainIfQuiescent();
 }
 
 void
 CommInterface::checkMMR() {
     if (!computationNeeded) {
         if (debug()) DPRINTF(CommInterface, "Checking MMR to see if Run bit set\n");
-        if (*mmreg & 0x01) {
+        // A launch requested while the system is draining is started once
+        // it resumes, so checkpoints can be taken at the launch
+        if ((*mmreg & 0x01) && drainState() == DrainState::Running) {
             *mmreg &= 0xfe;
             *mmreg |= 0x02;
             computationNeeded = true;
@@ -379,7 +385,6 @@ CommInterface::processMemoryRequests() {
                 if (port->readReq && port->readReq->needToRead) {
                     if (debug()) DPRINTF(CommInterfaceQueues, "Trying read on available memory port\n");
                     tryRead(port);
-                    accRdQ.push_back(port->readReq);
                     // if (!port->readReq->needToRead)
                     //     port->readReq = NULL;
                 }
@@ -391,7 +396,6 @@ CommInterface::processMemoryRequests() {
                 if (port->readReq && port->readReq->needToRead) {
                     if (debug()) DPRINTF(CommInterfaceQueues, "Trying read on available memory port\n");
                     tryRead(port);
-                    accRdQ.push_back(port->readReq);
                     // if (!port->readReq->needToRead)
                     //     port->readReq = NULL;
                 }
@@ -424,7 +428,6 @@ CommInterface::processMemoryRequests() {
                 if (port->writeReq && port->writeReq->needToWrite) {
                     if (debug()) DPRINTF(CommInterfaceQueues, "Trying write on available memory port\n");
                     tryWrite(port);
-                    accWrQ.push_back(port->writeReq);
                     // if (!port->writeReq->needToWrite)
                     //     port->writeReq = NULL;
                 }
@@ -436,7 +439,6 @@ CommInterface::processMemoryRequests() {
                 if (port->writeReq && port->writeReq->needToWrite) {
                     if (debug()) DPRINTF(CommInterfaceQueues, "Trying write on available memory port\n");
                     tryWrite(port);
-                    accWrQ.push_back(port->writeReq);
                     // if (!port->writeReq->needToWrite)
                     //     port->writeReq = NULL;
                 }
@@ -487,6 +489,7 @@ CommInterface::tryRead(MemSidePort * port) {
     PacketPtr pkt = new Packet(req, MemCmd::ReadReq);
     pkt->allocate();
     readReq->pkt = pkt;
+    accRdQ.insert(pkt, readReq);
     port->sendPacket(pkt);
 
     readReq->currentReadAddr += size;
@@ -542,6 +545,7 @@ CommInterface::tryWrite(MemSidePort * port) {
     uint8_t *pkt_data = (uint8_t *)req->getExtraData();
     pkt->dataDynamic(pkt_data);
     writeReq->pkt = pkt;
+    accWrQ.insert(pkt, writeReq);
     port->sendPacket(pkt);
 
     writeReq->currentWriteAddr += size;
@@ -582,6 +586,7 @@ CommInterface::tryRead(SPMPort * port) {
     PacketPtr pkt = new Packet(req, MemCmd::ReadReq);
     pkt->allocate();
     readReq->pkt = pkt;
+    accRdQ.insert(pkt, readReq);
     port->sendPacket(pkt);
 
     readReq->currentReadAddr += size;
@@ -637,6 +642,7 @@ CommInterface::tryWrite(SPMPort * port) {
     uint8_t *pkt_data = (uint8_t *)req->getExtraData();
     pkt->dataDynamic(pkt_data);
     writeReq->pkt = pkt;
+    accWrQ.insert(pkt, writeReq);
     port->sendPacket(pkt);
 
     writeReq->currentWriteAddr += size;
@@ -670,6 +676,7 @@ CommInterface::tryRead(RegPort * port) {
     PacketPtr pkt = new Packet(req, MemCmd::ReadReq);
     pkt->allocate();
     readReq->pkt = pkt;
+    accRdQ.insert(pkt, readReq);
     readReq->currentReadAddr += size;
     readReq->readLeft -= size;
     if (readReq->readLeft <= 0) readReq->needToRead = false;
@@ -709,6 +716,7 @@ CommInterface::tryWrite(RegPort * port) {
     uint8_t *pkt_data = (uint8_t *)req->getExtraData();
     pkt->dataDynamic(pkt_data);
     writeReq->pkt = pkt;
+    accWrQ.insert(pkt, writeReq);
     writeReq->currentWriteAddr += size;
     writeReq->writeLeft -= size;
     if (writeReq->writeLeft <= 0) writeReq->needToWrite = false;
@@ -727,7 +735,6 @@ CommInterface::enqueueRead(MemoryRequest * req) {
         // We want to immediately handle register requests
         // and bypass memory queues
         auto regport = getValidRegPort(req->getAddress());
-        accRdQ.push_back(req); // Add it to active read queue
         regport->setReadReq(req);
         req->setCarrierPort(regport);
         tryRead(regport);
@@ -752,7 +759,6 @@ CommInterface::enqueueWrite(MemoryRequest * req) {
         // We want to immediately handle register requests
         // and bypass memory queues
         auto regport = getValidRegPort(req->getAddress());
-        accWrQ.push_back(req); // Add it to active write queue
         regport->setWriteReq(req);
         req->setCarrierPort(regport);
         tryWrite(regport);
@@ -785,6 +791,7 @@ CommInterface::finish() {
             port->setReadyStatus(false);
         }
     }
+    signalDrainIfQuiescent();
 }
 
 Tick
@@ -832,6 +839,14 @@ CommInterface::write(PacketPtr pkt) {
     if (debug()) DPRINTF(DeviceMMR, "Packet val %d\n", pkt->get<uint8_t>(endian));
     pkt->writeData(mmreg + (pkt->req->getPaddr() - io_addr));
 
+    // Hand control back to the config script so it can switch the host
+    // from its fast-forward CPU before the accelerator starts. Once the
+    // system has left atomic mode there is nothing left to switch.
+    if (exitOnLaunch && sys->isAtomicMode()) {
+        exitOnLaunch = false;
+        exitSimLoop("accelerator launch");
+    }
+
     std::stringstream mm;
     for (int i = io_size-1; i >= 0; i--) {
         if ((i >= flag_size+config_size) && ((i-flag_size-config_size)%8 == 0))
@@ -942,41 +957,61 @@ CommInterface::getPort(const std::string& if_name, PortID idx) {
 
 MemoryRequest *
 CommInterface::findMemRequest(PacketPtr pkt, bool isRead) {
-    if (isRead) {
-        for (auto it=accRdQ.begin(); it!=accRdQ.end(); ++it) {
-            if ((*it)->pkt == pkt) {
-                return (*it);
-            }
-        }
-    } else {
-        for (auto it=accWrQ.begin(); it!=accWrQ.end(); ++it) {
-            if ((*it)->pkt == pkt) {
-                return (*it);
-            }
-        }
-    }
-    panic("Could not find memory request in request queues");
-    return NULL;
+    MemoryRequest * req = isRead ? accRdQ.find(pkt) : accWrQ.find(pkt);
+    if (!req)
+        panic("Could not find memory request in request queues");
+    return req;
 }
 
 void
 CommInterface::clearMemRequest(MemoryRequest * req, bool isRead) {
     if (isRead) {
-        for (auto it=accRdQ.begin(); it!=accRdQ.end(); ++it) {
-            if ((*it) == req) {
-                it=accRdQ.erase(it);
-                break;
-            }
-        }
+        accRdQ.erase(req->pkt);
     } else {
-        for (auto it=accWrQ.begin(); it!=accWrQ.end(); ++it) {
-            if ((*it) == req) {
-                it=accWrQ.erase(it);
-                break;
-            }
-        }
+        accWrQ.erase(req->pkt);
+    }
+}
+
+void
+CommInterface::startup() {}
+
+void
+CommInterface::signalDrainIfQuiescent() {
+    if (drainState() == DrainState::Draining && quiescent()) {
+        DPRINTF(Drain, "CommInterface finished its kernel, drained\n");
+        signalDrainDone();
+    }
+}
+
+DrainState
+CommInterface::drain() {
+    // The compute unit's runtime state is not checkpointed, so a running
+    // kernel completes before the accelerator reports itself drained
+    if (!quiescent()) {
+        DPRINTF(Drain, "CommInterface is running a kernel, waiting to drain\n");
+        return DrainState::Draining;
     }
+    return DrainState::Drained;
+}
+
+void
+CommInterface::drainResume() {
+    // Start a launch that was held while draining or restored from a
+    // checkpoint
+    if ((*mmreg & 0x01) && !computationNeeded && !tickEvent.scheduled())
+        schedule(tickEvent, nextCycle());
+}
+
+void
+CommInterface::serialize(CheckpointOut &cp) const {
+    assert(quiescent());
+
+    arrayParamOut(cp, "mmreg", mmreg, io_size);
+    SERIALIZE_SCALAR(int_flag);
 }
 
 void
-CommInterface::startup() {}
\ No newline at end of file
+CommInterface::unserialize(CheckpointIn &cp) {
+    arrayParamIn(cp, "mmreg", mmreg, io_size);
+    UNSERIALIZE_SCALAR(int_flag);
+}
\ No newline at end of file
@@ -6,6 +6,7 @@
 #include "dev/arm/base_gic.hh"
 #include "hwacc/compute_unit.hh"
 #include "hwacc/LLVMRead/src/mem_request.hh"
+#include "hwacc/inflight_requests.hh"
 #include "hwacc/stream_port.hh"
 #include "hwacc/scratchpad_memory.hh"
 #include "hwacc/LLVMRead/src/debug_flags.hh"
@@ -161,8 +162,9 @@ class CommInterface : public BasicPioDevice
 
     std::list<MemoryRequest*> readQueue;
     std::list<MemoryRequest*> writeQueue;
-    std::list<MemoryRequest*> accRdQ;
-    std::list<MemoryRequest*> accWrQ;
+    // Requests with a packet in flight, keyed by the packet
+    InFlightRequests accRdQ;
+    InFlightRequests accWrQ;
 
     int requestsInQueues;
 
@@ -241,9 +243,17 @@ class CommInterface : public BasicPioDevice
     int clock_period;
 
     bool reset_spm;
+    bool exitOnLaunch;
 
     ComputeUnit *cu;
 
+    // No kernel is running and no memory request is queued or in flight
+    bool quiescent() const {
+        return !computationNeeded && readQueue.empty() && writeQueue.empty()
+            && accRdQ.empty() && accWrQ.empty();
+    }
+    void signalDrainIfQuiescent();
+
   public:
     PARAMS(CommInterface);
 
@@ -286,6 +296,11 @@ class CommInterface : public BasicPioDevice
     std::string getName() const { return name(); }
 
     virtual bool isBaseCommInterface() { return true; }
+
+    DrainState drain() override;
+    void drainResume() override;
+    void serialize(CheckpointOut &cp) const override;
+    void unserialize(CheckpointIn &cp) override;
   protected:
 };
 
@@ -0,0 +1,111 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+
+#ifndef __HWACC_DMA_DESCRIPTOR_HH__
+#define __HWACC_DMA_DESCRIPTOR_HH__
+
+#include <cstdint>
+
+#include "base/types.hh"
+
+/**
+ * A transfer descriptor of the MultiChannelDma, as stored (little endian)
+ * in memory. Each descriptor moves a 2-D block of rows rows of length
+ * bytes, and descriptors are chained through next.
+ *
+ * | Offset | Field      | Size    |
+ * |--------|------------|---------|
+ * | 0x00   | src        | 8 Bytes |
+ * | 0x08   | dst        | 8 Bytes |
+ * | 0x10   | length     | 4 Bytes |
+ * | 0x14   | rows       | 4 Bytes |
+ * | 0x18   | src_stride | 8 Bytes |
+ * | 0x20   | dst_stride | 8 Bytes |
+ * | 0x28   | next       | 8 Bytes |
+ * | 0x30   | control    | 4 Bytes |
+ * | 0x34   | Unused     | 12 Bytes|
+ *
+ * length - Bytes per row.
+ * rows - Number of rows. '0' is treated as a single row.
+ * src_stride/dst_stride - Bytes between the starts of consecutive rows.
+ * next - Address of the next descriptor. '0' ends the chain.
+ * control - Bit 0 counts the completion of this descriptor towards the
+ *     interrupt coalescing of the DMA. The end of a chain always counts.
+ */
+struct DmaDescriptor
+{
+    static constexpr unsigned Size = 64;
+    static constexpr uint32_t CountCompletion = 0x1;
+
+    gem5::Addr src;
+    gem5::Addr dst;
+    uint32_t length;
+    uint32_t rows;
+    gem5::Addr srcStride;
+    gem5::Addr dstStride;
+    gem5::Addr next;
+    uint32_t control;
+
+    /** Decode a descriptor from the Size bytes at data. */
+    static DmaDescriptor
+    decode(const uint8_t *data)
+    {
+        DmaDescriptor desc;
+        desc.src = field<uint64_t>(data, 0x00);
+        desc.dst = field<uint64_t>(data, 0x08);
+        desc.length = field<uint32_t>(data, 0x10);
+        desc.rows = field<uint32_t>(data, 0x14);
+        desc.srcStride = field<uint64_t>(data, 0x18);
+        desc.dstStride = field<uint64_t>(data, 0x20);
+        desc.next = field<uint64_t>(data, 0x28);
+        desc.control = field<uint32_t>(data, 0x30);
+        if (desc.rows == 0)
+            desc.rows = 1;
+        return desc;
+    }
+
+    /** Total number of bytes moved. */
+    uint64_t bytes() const { return uint64_t(length) * rows; }
+
+    gem5::Addr srcRow(uint32_t row) const { return src + row * srcStride; }
+    gem5::Addr dstRow(uint32_t row) const { return dst + row * dstStride; }
+
+  private:
+    template <typename T>
+    static T
+    field(const uint8_t *data, unsigned offset)
+    {
+        T value = 0;
+        for (unsigned i = sizeof(T); i > 0; i--)
+            value = (value << 8) | data[offset + i - 1];
+        return value;
+    }
+};
+
+#endif // __HWACC_DMA_DESCRIPTOR_HH__
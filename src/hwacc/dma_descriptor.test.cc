@@ -0,0 +1,97 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include <gtest/gtest.h>
+
+#include <cstdint>
+#include <vector>
+
+#include "hwacc/dma_descriptor.hh"
+
+namespace
+{
+
+void
+put(std::vector<uint8_t> &data, unsigned offset, uint64_t value,
+    unsigned size)
+{
+    for (unsigned i = 0; i < size; i++)
+        data[offset + i] = (value >> (8 * i)) & 0xff;
+}
+
+} // anonymous namespace
+
+TEST(DmaDescriptorTest, Decode)
+{
+    std::vector<uint8_t> data(DmaDescriptor::Size, 0xa5);
+    put(data, 0x00, 0x80001000, 8);
+    put(data, 0x08, 0x10021040, 8);
+    put(data, 0x10, 96, 4);
+    put(data, 0x14, 16, 4);
+    put(data, 0x18, 0x400, 8);
+    put(data, 0x20, 0x60, 8);
+    put(data, 0x28, 0x80200040, 8);
+    put(data, 0x30, DmaDescriptor::CountCompletion, 4);
+
+    const DmaDescriptor desc = DmaDescriptor::decode(data.data());
+    EXPECT_EQ(0x80001000, desc.src);
+    EXPECT_EQ(0x10021040, desc.dst);
+    EXPECT_EQ(96, desc.length);
+    EXPECT_EQ(16, desc.rows);
+    EXPECT_EQ(0x400, desc.srcStride);
+    EXPECT_EQ(0x60, desc.dstStride);
+    EXPECT_EQ(0x80200040, desc.next);
+    EXPECT_EQ(DmaDescriptor::CountCompletion, desc.control);
+    EXPECT_EQ(96 * 16, desc.bytes());
+}
+
+TEST(DmaDescriptorTest, Rows)
+{
+    std::vector<uint8_t> data(DmaDescriptor::Size, 0);
+    put(data, 0x00, 0x1000, 8);
+    put(data, 0x08, 0x2000, 8);
+    put(data, 0x10, 64, 4);
+
+    // A descriptor without rows is a plain 1-D copy
+    DmaDescriptor desc = DmaDescriptor::decode(data.data());
+    EXPECT_EQ(1, desc.rows);
+    EXPECT_EQ(64, desc.bytes());
+    EXPECT_EQ(0, desc.next);
+
+    // A tile of 3 rows out of a 256-byte wide matrix, packed at the
+    // destination
+    put(data, 0x14, 3, 4);
+    put(data, 0x18, 256, 8);
+    put(data, 0x20, 64, 8);
+    desc = DmaDescriptor::decode(data.data());
+    EXPECT_EQ(0x1000, desc.srcRow(0));
+    EXPECT_EQ(0x1200, desc.srcRow(2));
+    EXPECT_EQ(0x2000, desc.dstRow(0));
+    EXPECT_EQ(0x2080, desc.dstRow(2));
+    EXPECT_EQ(192, desc.bytes());
+}
@@ -180,6 +180,8 @@ DmaWriteFifo::dmaDone()
 
     if (old_active && !isActive())
         onIdle();
+
+    onResponse();
 }
 
 void
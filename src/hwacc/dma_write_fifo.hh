@@ -144,6 +144,17 @@ class DmaWriteFifo : public Drainable, public Serializable
      */
     virtual void onIdle() {};
 
+    /**
+     * Response handled callback
+     *
+     * This callback is called every time a DMA response has been
+     * handled, i.e., once its request has retired and new requests
+     * have been issued from the FIFO. It is called after onEndOfBlock() and
+     * onIdle(). Devices can use it to wake up instead of polling the
+     * FIFO.
+     */
+    virtual void onResponse() {};
+
     /** @} */
   private: // Configuration
     /** Maximum request size in bytes */
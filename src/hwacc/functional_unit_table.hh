@@ -0,0 +1,146 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+
+#ifndef __HWACC_FUNCTIONAL_UNIT_TABLE_HH__
+#define __HWACC_FUNCTIONAL_UNIT_TABLE_HH__
+
+#include <algorithm>
+#include <cstdint>
+#include <vector>
+
+/**
+ * Arbitration of the functional units of one accelerator launch, indexed
+ * by functional unit enum value. Each issue holds one instance of its
+ * unit for the unit's initiation interval. Releases are kept in a wheel
+ * indexed by cycle, so advancing a cycle only touches the units issued
+ * one interval earlier. Types without a unit are never stalled.
+ */
+class FunctionalUnitTable
+{
+  private:
+    struct Slot
+    {
+        bool present = false;
+        uint64_t limit = 0;
+        uint64_t inUse = 0;
+        // Cycles an issue holds one instance of the unit
+        uint32_t interval = 1;
+        // Instructions of the static graph using the unit
+        uint64_t instructions = 0;
+    };
+
+    std::vector<Slot> slots;
+    // Units to release, indexed by cycle modulo the longest interval + 1
+    std::vector<std::vector<uint32_t>> releases;
+    uint64_t cycle;
+
+    Slot &
+    slot(uint64_t unit)
+    {
+        if (unit >= slots.size())
+            slots.resize(unit + 1);
+        return slots[unit];
+    }
+
+  public:
+    FunctionalUnitTable() { clear(); }
+
+    /**
+     * Start a launch: forget every unit, its instruction count and the
+     * issues still holding it.
+     */
+    void
+    clear()
+    {
+        slots.clear();
+        releases.assign(2, std::vector<uint32_t>());
+        cycle = 0;
+    }
+
+    /** Record one more instruction of the static graph using unit. */
+    void countInstruction(uint64_t unit) { slot(unit).instructions++; }
+
+    /**
+     * Add a unit once the static graph has been counted, before the
+     * first issue. A limit of 0 allows one instance per instruction
+     * using the unit.
+     */
+    void
+    addUnit(uint32_t unit, uint64_t limit, uint32_t interval)
+    {
+        Slot &s = slot(unit);
+        s.present = true;
+        s.limit = limit ? limit : s.instructions;
+        s.interval = std::max<uint32_t>(interval, 1);
+        if (releases.size() < s.interval + 1)
+            releases.resize(s.interval + 1);
+    }
+
+    /**
+     * Claim an instance of unit for its initiation interval.
+     * @return False if every instance is held.
+     */
+    bool
+    acquire(uint64_t unit)
+    {
+        if (unit >= slots.size() || !slots[unit].present)
+            return true;
+        Slot &s = slots[unit];
+        if (s.inUse >= s.limit)
+            return false;
+        s.inUse++;
+        releases[(cycle + s.interval) % releases.size()].push_back(unit);
+        return true;
+    }
+
+    /** Move to the next cycle, releasing the units due in it. */
+    void
+    advance()
+    {
+        cycle++;
+        auto &due = releases[cycle % releases.size()];
+        for (auto unit : due)
+            slots[unit].inUse--;
+        due.clear();
+    }
+
+    uint64_t
+    inUse(uint64_t unit) const
+    {
+        return unit < slots.size() ? slots[unit].inUse : 0;
+    }
+
+    uint64_t
+    limit(uint64_t unit) const
+    {
+        return unit < slots.size() ? slots[unit].limit : 0;
+    }
+};
+
+#endif // __HWACC_FUNCTIONAL_UNIT_TABLE_HH__
@@ -0,0 +1,136 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include <gtest/gtest.h>
+
+#include "hwacc/functional_unit_table.hh"
+
+TEST(FunctionalUnitTableTest, ReleasedAfterInterval)
+{
+    FunctionalUnitTable table;
+    table.addUnit(3, 2, 4);
+    EXPECT_TRUE(table.acquire(3));
+    EXPECT_TRUE(table.acquire(3));
+    // Both instances are held for four cycles
+    EXPECT_FALSE(table.acquire(3));
+    for (int i = 0; i < 3; i++) {
+        table.advance();
+        EXPECT_EQ(2, table.inUse(3));
+        EXPECT_FALSE(table.acquire(3));
+    }
+    table.advance();
+    EXPECT_EQ(0, table.inUse(3));
+    EXPECT_TRUE(table.acquire(3));
+    EXPECT_EQ(1, table.inUse(3));
+}
+
+TEST(FunctionalUnitTableTest, Pipelined)
+{
+    FunctionalUnitTable table;
+    table.addUnit(0, 1, 1);
+    for (int i = 0; i < 8; i++) {
+        EXPECT_TRUE(table.acquire(0));
+        EXPECT_FALSE(table.acquire(0));
+        table.advance();
+    }
+    EXPECT_EQ(0, table.inUse(0));
+}
+
+TEST(FunctionalUnitTableTest, MixedIntervals)
+{
+    FunctionalUnitTable table;
+    table.addUnit(0, 1, 1);
+    table.addUnit(1, 2, 5);
+    // One unit 1 instance issued on cycle 0, the other on cycle 2
+    EXPECT_TRUE(table.acquire(1));
+    for (int cycle = 0; cycle < 12; cycle++) {
+        if (cycle == 2) {
+            EXPECT_TRUE(table.acquire(1));
+        }
+        // Unit 0 is free again every cycle
+        EXPECT_TRUE(table.acquire(0));
+        const int held = (cycle < 5) + (cycle >= 2 && cycle < 7);
+        EXPECT_EQ(held, table.inUse(1)) << "cycle " << cycle;
+        table.advance();
+    }
+    EXPECT_EQ(0, table.inUse(1));
+}
+
+TEST(FunctionalUnitTableTest, NoUnit)
+{
+    FunctionalUnitTable table;
+    table.countInstruction(7);
+    table.addUnit(2, 1, 3);
+    // Types without a unit never stall, counted or not
+    for (int i = 0; i < 4; i++) {
+        EXPECT_TRUE(table.acquire(7));
+        EXPECT_TRUE(table.acquire(40));
+    }
+    EXPECT_EQ(0, table.inUse(7));
+}
+
+TEST(FunctionalUnitTableTest, CountedLimit)
+{
+    FunctionalUnitTable table;
+    for (int i = 0; i < 3; i++)
+        table.countInstruction(1);
+    table.countInstruction(2);
+    table.addUnit(1, 0, 2);
+    // A configured limit wins over the count
+    table.addUnit(2, 4, 2);
+    EXPECT_EQ(3, table.limit(1));
+    EXPECT_EQ(4, table.limit(2));
+    for (int i = 0; i < 3; i++)
+        EXPECT_TRUE(table.acquire(1));
+    EXPECT_FALSE(table.acquire(1));
+}
+
+TEST(FunctionalUnitTableTest, LimitsResetBetweenLaunches)
+{
+    FunctionalUnitTable table;
+    for (int launch = 0; launch < 3; launch++) {
+        // Each launch counts the same static graph again
+        table.clear();
+        for (int i = 0; i < 3; i++)
+            table.countInstruction(5);
+        table.addUnit(5, 0, 10);
+        EXPECT_EQ(3, table.limit(5)) << "launch " << launch;
+        // Nothing is held by the issues of the previous launch
+        EXPECT_EQ(0, table.inUse(5)) << "launch " << launch;
+        for (int i = 0; i < 3; i++)
+            EXPECT_TRUE(table.acquire(5));
+        EXPECT_FALSE(table.acquire(5));
+        // The launch ends before its units come back
+        for (int i = 0; i < 4; i++)
+            table.advance();
+    }
+    // Only the last launch's issues come back, once
+    for (int i = 0; i < 20; i++)
+        table.advance();
+    EXPECT_EQ(0, table.inUse(5));
+}
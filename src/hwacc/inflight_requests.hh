@@ -0,0 +1,76 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#ifndef __HWACC_INFLIGHT_REQUESTS_HH__
+#define __HWACC_INFLIGHT_REQUESTS_HH__
+
+#include <cstddef>
+#include <unordered_map>
+
+namespace gem5
+{
+class Packet;
+}
+
+class MemoryRequest;
+
+/**
+ * The memory requests of a CommInterface with a packet in flight, keyed by
+ * that packet. A request sends one packet at a time, so each request is
+ * in the table at most once, and responses are matched in constant time.
+ */
+class InFlightRequests
+{
+  private:
+    std::unordered_map<const gem5::Packet *, MemoryRequest *> requests;
+
+  public:
+    /** Track a packet sent on behalf of req. */
+    void
+    insert(const gem5::Packet *pkt, MemoryRequest *req)
+    {
+        requests[pkt] = req;
+    }
+
+    /** @return The request that sent pkt, or nullptr if it is unknown. */
+    MemoryRequest *
+    find(const gem5::Packet *pkt) const
+    {
+        auto it = requests.find(pkt);
+        return (it == requests.end()) ? nullptr : it->second;
+    }
+
+    /** Stop tracking pkt once its response has been handled. */
+    void erase(const gem5::Packet *pkt) { requests.erase(pkt); }
+
+    size_t size() const { return requests.size(); }
+    bool empty() const { return requests.empty(); }
+    void clear() { requests.clear(); }
+};
+
+#endif // __HWACC_INFLIGHT_REQUESTS_HH__
@@ -0,0 +1,113 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include <gtest/gtest.h>
+
+#include <algorithm>
+#include <random>
+#include <vector>
+
+#include "hwacc/inflight_requests.hh"
+
+namespace
+{
+
+// The table never dereferences its keys or values, so distinct addresses
+// stand in for packets and memory requests.
+const gem5::Packet *
+packet(const std::vector<char> &storage, size_t i)
+{
+    return reinterpret_cast<const gem5::Packet *>(&storage[i]);
+}
+
+MemoryRequest *
+request(std::vector<char> &storage, size_t i)
+{
+    return reinterpret_cast<MemoryRequest *>(&storage[i]);
+}
+
+} // anonymous namespace
+
+TEST(InFlightRequestsTest, UnknownPacket)
+{
+    std::vector<char> packets(1);
+    InFlightRequests table;
+    EXPECT_TRUE(table.empty());
+    EXPECT_EQ(nullptr, table.find(packet(packets, 0)));
+    // Erasing an unknown packet is harmless
+    table.erase(packet(packets, 0));
+    EXPECT_TRUE(table.empty());
+}
+
+TEST(InFlightRequestsTest, ManyInFlight)
+{
+    const size_t count = 20000;
+    std::vector<char> packets(count), requests(count);
+    InFlightRequests table;
+
+    for (size_t i = 0; i < count; i++)
+        table.insert(packet(packets, i), request(requests, i));
+    ASSERT_EQ(count, table.size());
+
+    // Responses come back in any order
+    std::vector<size_t> order(count);
+    for (size_t i = 0; i < count; i++)
+        order[i] = i;
+    std::shuffle(order.begin(), order.end(), std::mt19937(0));
+
+    for (size_t n = 0; n < count; n++) {
+        size_t i = order[n];
+        ASSERT_EQ(request(requests, i), table.find(packet(packets, i)));
+        table.erase(packet(packets, i));
+        ASSERT_EQ(nullptr, table.find(packet(packets, i)));
+        ASSERT_EQ(count - n - 1, table.size());
+    }
+    EXPECT_TRUE(table.empty());
+}
+
+TEST(InFlightRequestsTest, PacketAddressReused)
+{
+    // A request sends its next packet once the previous one is retired, and
+    // the allocator may hand out the retired packet's address again.
+    const size_t count = 4096;
+    std::vector<char> packets(count), requests(2 * count);
+    InFlightRequests table;
+
+    for (size_t i = 0; i < count; i++)
+        table.insert(packet(packets, i), request(requests, i));
+    for (size_t i = 0; i < count; i += 2) {
+        table.erase(packet(packets, i));
+        table.insert(packet(packets, i), request(requests, count + i));
+    }
+    ASSERT_EQ(count, table.size());
+    for (size_t i = 0; i < count; i++) {
+        MemoryRequest *expected = (i % 2) ? request(requests, i) :
+                                            request(requests, count + i);
+        EXPECT_EQ(expected, table.find(packet(packets, i)));
+    }
+}
@@ -1,5 +1,6 @@
 // LLVMInterface Includes
 #include "hwacc/llvm_interface.hh"
+#include "debug/Drain.hh"
 
 LLVMInterface::LLVMInterface(const LLVMInterfaceParams &p):
     ComputeUnit(p),
@@ -21,7 +22,9 @@ LLVMInterface::LLVMInterface(const LLVMInterfaceParams &p):
     validationCoalescedWaits(0),
     totalCoalescedWaitLatency(0),
     validationResponseEvent(
-        [this]{ processValidationResponse(); }, name())
+        [this]{ processValidationResponse(
+            drainState() == DrainState::Draining); }, name()),
+    llvmStats(this)
 {
     clock_period = clock_period * 1000;
     dbg = comm->debug();
@@ -49,8 +52,10 @@ LLVMInterface::ActiveFunction::scheduleBB(std::shared_ptr<SALAM::BasicBlock> bb)
     bool needToScheduleBranch = false;
     std::shared_ptr<SALAM::BasicBlock> nextBB;
     auto instruction_list = *(bb->Instructions());
+    owner->addDynamicInsts(instruction_list.size());
     for (auto inst : instruction_list) {
         std::shared_ptr<SALAM::Instruction> clone_inst = inst->clone();
+        owner->llvmStats.opcodeInsts[clone_inst->getOpode()]++;
         if (dbg) DPRINTFS(Runtime, owner,  "\t\t Instruction Cloned [UID: %d] \n", inst->getUID());
         if (clone_inst->isBr()) {
             if (dbg) DPRINTFS(Runtime, owner,  "\t\t Branch Instruction Found\n");
@@ -120,9 +125,11 @@ LLVMInterface::ActiveFunction::processQueues()
             (queue_iter->second)->reset();
             queue_iter = computeQueue.erase(queue_iter);
             hw_cycle_stats.compCommited++;
+            owner->llvmStats.computeCommitted++;
         } else {
             ++queue_iter;
             hw_cycle_stats.compFUStall++;
+            owner->llvmStats.computeFUStalls++;
         }
     }
     if (canReturn()) {
@@ -189,6 +196,7 @@ LLVMInterface::ActiveFunction::processQueues()
                             activeWrite->addRuntimeUser(inst);
                             ++queue_iter;
                             hw_cycle_stats.loadRawStall++;
+                            owner->llvmStats.loadRAWStalls++;
                         }
                     } else if ((inst)->isStore()) {
                         // WAR Protection
@@ -236,12 +244,19 @@ LLVMInterface::ActiveFunction::processQueues()
                         } else {
                             ++queue_iter;
                         }
+                    } else if (!hw->availableFunctionalUnit(inst->getFunctionalUnit())) {
+                        // Every instance of its functional unit is busy
+                        ++queue_iter;
+                        owner->llvmStats.issueFUStalls++;
+                        owner->llvmStats.chargeIssueStall(inst.get());
                     } else {
                         auto computeStart = std::chrono::high_resolution_clock::now();
+                        owner->llvmStats.chargeInstruction(inst.get());
                         if (!(inst)->launch()) {
                             if (dbg) DPRINTFS(Runtime, owner,  "\t\t  | Added to Compute Queue: %s - UID[%i]\n", llvm::Instruction::getOpcodeName((inst)->getOpode()), (inst)->getUID());
                             computeQueue.insert({(inst)->getUID(), inst});
                             hw_cycle_stats.compLaunched++;
+                            owner->llvmStats.computeLaunched++;
                         }
                         auto computeStop = std::chrono::high_resolution_clock::now();
                         owner->addComputeTime(computeStop-computeStart);
@@ -261,7 +276,7 @@ LLVMInterface::ActiveFunction::processQueues()
     if (owner->hw->hw_statistics->use_cycle_tracking()) {
         auto hwStart = std::chrono::high_resolution_clock::now();
         for (auto fu : hw->functional_units->functional_unit_list) {
-            std::cout << fu->get_alias() << " - " << fu->get_in_use() << "\n";
+            std::cout << fu->get_alias() << " - " << hw->functionalUnitsInUse(fu->get_enum_value()) << "\n";
         }
 
 
@@ -301,16 +316,31 @@ LLVMInterface::tick()
         "   Cycle", cycle,
         "********************************************************************************");
     cycle++;
+    llvmStats.cycles++;
+    hw->advanceFunctionalUnits();
 
     // Process Queues in Active Functions
+    size_t reserved = 0, computing = 0, reading = 0, writing = 0;
     for (auto func_iter = activeFunctions.begin(); func_iter != activeFunctions.end();) {
         func_iter->processQueues();
         if (!(func_iter->hasReturned())) {
+            reserved += func_iter->reservation.size();
+            computing += func_iter->computeQueue.size();
+            reading += func_iter->readQueue.size();
+            writing += func_iter->writeQueue.size();
             func_iter++;
         } else {
             func_iter = activeFunctions.erase(func_iter);
         }
     }
+    llvmStats.reservationDepth.sample(reserved);
+    llvmStats.computeQueueDepth.sample(computing);
+    llvmStats.readQueueDepth.sample(reading);
+    llvmStats.writeQueueDepth.sample(writing);
+    for (size_t i = 0; i < llvmStats.fus.size(); i++) {
+        llvmStats.fuOccupancy[i] +=
+            hw->functionalUnitsInUse(llvmStats.fus[i]->get_enum_value());
+    }
     if (activeFunctions.empty()) {
         // We are finished executing all functions. Signal completion to the CommInterface
         running = false;
@@ -323,6 +353,8 @@ LLVMInterface::tick()
     }
     auto tickStop = std::chrono::high_resolution_clock::now();
     simTime = simTime + (tickStop - tickStart);
+    llvmStats.hostActiveSeconds +=
+        std::chrono::duration<float>(tickStop - tickStart).count();
 }
 
 
@@ -590,11 +622,14 @@ LLVMInterface::constructStaticGraph() {
     }
     auto parseStop = std::chrono::high_resolution_clock::now();
     setupTime = parseStop - parseStart;
+    llvmStats.hostSetupSeconds += setupTime.count();
 }
 
 void
 LLVMInterface::launchRead(MemoryRequest * memReq, ActiveFunction * func) {
     globalReadQueue.insert({memReq, func});
+    memReq->setIssueTick(curTick());
+    llvmStats.memReads++;
     comm->enqueueRead(memReq);
 }
 
@@ -662,6 +697,8 @@ LLVMInterface::ActiveFunction::launchRead(
 void
 LLVMInterface::launchWrite(MemoryRequest * memReq, ActiveFunction * func) {
     globalWriteQueue.insert({memReq, func});
+    memReq->setIssueTick(curTick());
+    llvmStats.memWrites++;
     comm->enqueueWrite(memReq);
 }
 
@@ -729,6 +766,7 @@ LLVMInterface::readCommit(MemoryRequest * req) {
     // if (DTRACE(Trace)) DPRINTF(Runtime, "Trace: %s \n", __PRETTY_FUNCTION__);
     auto queue_iter = globalReadQueue.find(req);
     if (queue_iter != globalReadQueue.end()) {
+        llvmStats.readLatency.sample(curTick() - req->getIssueTick());
         queue_iter->second->readCommit(req);
         DPRINTF(Runtime, "Global Read Commit\n");
         // delete queue_iter->first; // The CommInterface will ultimately delete this memory request
@@ -752,6 +790,7 @@ LLVMInterface::ActiveFunction::readCommit(MemoryRequest * req) {
             uint8_t * readBuff = req->getBuffer();
             load_inst->setRegisterValue(readBuff);
             load_inst->compute();
+            owner->llvmStats.chargeInstruction(load_inst.get());
             if (dbg) DPRINTFS(Runtime, owner,  "Local Read Commit\n");
             load_inst->commit();
             readQueue.erase(queue_iter);
@@ -772,6 +811,7 @@ LLVMInterface::writeCommit(MemoryRequest * req) {
     // if (DTRACE(Trace)) DPRINTF(Runtime, "Trace: %s \n", __PRETTY_FUNCTION__);
     auto queue_iter = globalWriteQueue.find(req);
     if (queue_iter != globalWriteQueue.end()) {
+        llvmStats.writeLatency.sample(curTick() - req->getIssueTick());
         queue_iter->second->writeCommit(req);
         // delete queue_iter->first; // The CommInterface will ultimately delete this memory request
         globalWriteQueue.erase(queue_iter);
@@ -790,6 +830,7 @@ LLVMInterface::ActiveFunction::writeCommit(MemoryRequest * req) {
     if (map_iter != writeQueueMap.end()) {
         auto queue_iter = writeQueue.find(map_iter->second);
         if (queue_iter != writeQueue.end()) {
+            owner->llvmStats.chargeInstruction(queue_iter->second.get());
             queue_iter->second->commit();
             Addr addressWritten = map_iter->first->getAddress();
             untrackWrite(addressWritten);
@@ -819,7 +860,13 @@ LLVMInterface::initialize() {
     queueProcessTime = std::chrono::seconds(0);
     computeTime = std::chrono::seconds(0);
     hwTime = std::chrono::seconds(0);
+    dynamicInsts = 0;
+    // createInstruction counts the instances of each unit the static graph
+    // needs, so start from zero on every launch
+    hw->fuTable.clear();
     constructStaticGraph();
+    hw->buildFunctionalUnitTable();
+    llvmStats.updateStaticModel();
     timeStart = std::chrono::high_resolution_clock::now();
     if (dbg) DPRINTF(LLVMInterface, "================================================================\n");
     launchTopFunction();
@@ -888,65 +935,88 @@ LLVMInterface::finalize() {
     functions.clear();
     values.clear();
     comm->finish();
+    if (drainState() == DrainState::Draining) {
+        DPRINTF(Drain, "LLVMInterface finished its kernel, drained\n");
+        signalDrainDone();
+    }
 }
 
-void
-LLVMInterface::printResults() {
-
-
-    std::map<uint64_t, uint64_t> totals_reads;
-    std::map<uint64_t, uint64_t> totals_writes;
-
-    std::cout << "********************************************************************************" << std::endl;
-    std::cout << name() << std::endl;
-
-    for (auto it : values) {
-        if (it->isInstruction()) {
-            //std::cout << "Instruction: " << llvm::Instruction::getOpcodeName(it->getOpode()) << "\n";
-            if (it->getReg()) {
-                totals_reads[it->getOpode()] += it->getReg()->getReads();
-                totals_writes[it->getOpode()] += it->getReg()->getWrites();
-            }
-        }
+DrainState
+LLVMInterface::drain() {
+    // Validations are answered by the kernel driver on the CPUs, which may
+    // drain before this accelerator. Answer any still outstanding now so
+    // the kernel they hold up can complete.
+    if (!pendingValidations.empty()) {
+        DPRINTF(Drain, "LLVMInterface answering %d pending validations\n",
+                pendingValidations.size());
+        reschedule(validationResponseEvent, curTick(), true);
+    }
+    // The active functions and their queues hold live instruction graph
+    // state that is not checkpointed, so a running kernel completes first
+    if (running) {
+        DPRINTF(Drain, "LLVMInterface is running a kernel, waiting to drain\n");
+        return DrainState::Draining;
     }
+    return DrainState::Drained;
+}
 
-    /*
-    for(const auto& count : hw->opcodes->usage) {
-        if (count.second) std::cout << "\nInstruction: " << llvm::Instruction::getOpcodeName(count.first) << "\n\tIR Count: " << count.second << "\n\tTotal Reads: " << totals_reads[count.first] << "\n\tTotal Writes: " << totals_writes[count.first];
+void
+LLVMInterface::serialize(CheckpointOut &cp) const {
+    assert(!running);
+
+    // The validation caches persist across kernel launches
+    std::vector<uint64_t> validatedProcesses;
+    for (const auto &proc : validatedPagesPerProcess)
+        validatedProcesses.push_back(proc.first);
+    SERIALIZE_CONTAINER(validatedProcesses);
+    for (const auto &proc : validatedPagesPerProcess) {
+        ScopedCheckpointSection sec(cp, csprintf("process%d", proc.first));
+        arrayParamOut(cp, "validatedPages", proc.second);
     }
-    std::cout << "\n";
-    */
 
-   //hw->hw_statistics->print();
+    SERIALIZE_SCALAR(nextValidationRequestId);
+    SERIALIZE_SCALAR(totalKernelValidations);
+    SERIALIZE_SCALAR(totalKernelValidationLatency);
+    SERIALIZE_SCALAR(kernelValidationDenied);
+    SERIALIZE_SCALAR(validationCacheHits);
+    SERIALIZE_SCALAR(validationCoalescedWaits);
+    SERIALIZE_SCALAR(totalCoalescedWaitLatency);
+}
 
+void
+LLVMInterface::unserialize(CheckpointIn &cp) {
+    std::vector<uint64_t> validatedProcesses;
+    UNSERIALIZE_CONTAINER(validatedProcesses);
+    validatedPagesPerProcess.clear();
+    for (auto pid : validatedProcesses) {
+        ScopedCheckpointSection sec(cp, csprintf("process%d", pid));
+        arrayParamIn(cp, "validatedPages", validatedPagesPerProcess[pid]);
+    }
 
-    double adder_area = (hw->opcodes->get_usage(13) + hw->opcodes->get_usage(20) + hw->opcodes->get_usage(15)) *  1.794430e+02;
-    double adder_reads = (totals_reads[13] + totals_reads[15]);
-    double adder_writes = (totals_writes[13] + totals_writes[15]);
-    double adder_power_static = adder_reads*2.380803e-03;
-    double adder_power_dynamic =  adder_writes*(8.115300e-03+6.162853e-03);
+    UNSERIALIZE_SCALAR(nextValidationRequestId);
+    UNSERIALIZE_SCALAR(totalKernelValidations);
+    UNSERIALIZE_SCALAR(totalKernelValidationLatency);
+    UNSERIALIZE_SCALAR(kernelValidationDenied);
+    UNSERIALIZE_SCALAR(validationCacheHits);
+    UNSERIALIZE_SCALAR(validationCoalescedWaits);
+    UNSERIALIZE_SCALAR(totalCoalescedWaitLatency);
+}
 
-    double bitwise_area = (hw->opcodes->get_usage(29) + hw->opcodes->get_usage(30) + hw->opcodes->get_usage(25) + hw->opcodes->get_usage(26) + hw->opcodes->get_usage(27) + hw->opcodes->get_usage(28)) * 5.036996e+01;
-    double bitwise_reads = (totals_reads[25] + totals_reads[26] + totals_reads[27] + totals_reads[28] + totals_reads[29] + totals_reads[30]);
-    double bitwise_writes = (totals_writes[25] + totals_writes[26] + totals_writes[27] + totals_writes[28] + totals_writes[29] + totals_writes[30]);
-    double bitwise_power_static = bitwise_reads*6.111633e-04;
-    double bitwise_power_dynamic = bitwise_writes*(1.680942e-03+1.322420e-03);
+void
+LLVMInterface::printResults() {
 
-    double multiplier_area = (hw->opcodes->get_usage(17) + hw->opcodes->get_usage(19) + hw->opcodes->get_usage(20))*4.595000e+03;
-    double multiplier_reads = totals_reads[17] + totals_reads[19] + totals_reads[20];
-    double multiplier_writes = totals_writes[17] + totals_writes[19] + totals_writes[20];
-    double multiplier_power_static = multiplier_reads*4.817683e-02;
-    double multiplier_power_dynamic = multiplier_writes*(5.725752e-01+8.662890e-01);
 
-    double reg_area = hw->opcodes->get_usage(34)*32*5.981433e+00;
-    double reg_reads = totals_reads[34]*32;
-    double reg_writes = totals_writes[34]*32;
-    double register_power_static = reg_reads*7.395312e-05;
-    double register_power_dynamic = reg_writes*(1.322600e-03+1.792126e-04);
+    std::cout << "********************************************************************************" << std::endl;
+    std::cout << name() << std::endl;
 
-    double total_area = adder_area + bitwise_area + multiplier_area + reg_area;
-    double total_power_static = adder_power_static + bitwise_power_static + multiplier_power_static + register_power_static;
-    double total_power_dynamic = adder_power_dynamic + bitwise_power_dynamic + multiplier_power_dynamic + register_power_dynamic;
+    // The power model is accumulated as instructions issue, see
+    // LLVMInterfaceStats::chargeInstruction
+    double total_area = llvmStats.areaTotal;
+    double total_power_static = llvmStats.leakageTotal;
+    double total_energy_dynamic = llvmStats.fuDynamicEnergy.total() +
+                                  llvmStats.registerDynamicEnergy.value();
+    double total_power_dynamic = cycle ?
+        total_energy_dynamic / (cycle * clock_period / 1000.0) : 0.0;
 
     std::cout << "Total Area: " << total_area;
     std::cout << "\nTotal Power Static: " << total_power_static << "\n";
@@ -1040,6 +1110,7 @@ LLVMInterface::printResults() {
     std::cout << "   Runtime:                         " << (cycle*cycle_time*(1e-3)) << " us" << std::endl;
     std::cout << "   Stalls:                          " << stalls << " cycles" << std::endl;
     std::cout << "   Executed Nodes:                  " << (cycle-stalls-1) << " cycles" << std::endl;
+    std::cout << "   Dynamic Instructions:            " << dynamicInsts << std::endl;
     std::cout << std::endl;
 
     // Print kernel validation statistics
@@ -1150,14 +1221,7 @@ LLVMInterface::createInstruction(llvm::Instruction * inst, uint64_t id) {
         if(OpCode == hw_inst->get_opcode_num()) {
             //std::cout << "\n\n\nTest 4\n\n\n";
             functional_unit = hw_inst->get_functional_unit();
-            for (auto hw_fu : hw->functional_units->functional_unit_list) {
-                //std::cout << "\n\n\nTest 5\n\n\n";
-                if(hw_fu->get_enum_value() == functional_unit) {
-                    //std::cout << "\n\n\nTest 6\n\n\n";
-                    hw_fu->inc_functional_unit_limit();
-                    break;
-                }
-            }
+            hw->fuTable.countInstruction(functional_unit);
             break;
         }
     }
@@ -1265,6 +1329,7 @@ LLVMInterface::sendValidationRequest(uint64_t addr, size_t size, bool isRead,
     // Queue the request
     pendingValidations.push_back(req);
     totalKernelValidations++;
+    llvmStats.kernelValidations++;
 
     // Send interrupt to CPU/kernel if GIC is available
     BaseGic* gic = comm->getGic();
@@ -1275,8 +1340,11 @@ LLVMInterface::sendValidationRequest(uint64_t addr, size_t size, bool isRead,
         gic->sendInt(validationIntNum);
     }
 
-    // Schedule validation response event
-    if (!validationResponseEvent.scheduled()) {
+    // Schedule validation response event. While draining, the CPUs may
+    // not answer, so the request is answered straight away (see drain).
+    if (drainState() == DrainState::Draining) {
+        reschedule(validationResponseEvent, curTick(), true);
+    } else if (!validationResponseEvent.scheduled()) {
         schedule(validationResponseEvent,
                  curTick() + kernelValidationLatency);
         DPRINTF(LLVMInterface,
@@ -1286,7 +1354,7 @@ LLVMInterface::sendValidationRequest(uint64_t addr, size_t size, bool isRead,
 }
 
 void
-LLVMInterface::processValidationResponse()
+LLVMInterface::processValidationResponse(bool flush)
 {
     // Process pending validation requests
     Tick currentTick = curTick();
@@ -1295,7 +1363,8 @@ LLVMInterface::processValidationResponse()
         PendingValidationRequest& req = pendingValidations.front();
 
         // Check if this request has waited long enough
-        if (currentTick < req.requestTime + kernelValidationLatency) {
+        if (!flush &&
+            currentTick < req.requestTime + kernelValidationLatency) {
             // Not ready yet, reschedule
             schedule(validationResponseEvent,
                      req.requestTime + kernelValidationLatency);
@@ -1314,6 +1383,7 @@ LLVMInterface::processValidationResponse()
 
         Tick validationTime = currentTick - req.requestTime;
         totalKernelValidationLatency += validationTime;
+        llvmStats.kernelValidationLatency += validationTime;
 
         DPRINTF(LLVMInterface,
                 "[KD->AIA] Response #%llu: %s addr=0x%016lx, "
@@ -1381,6 +1451,8 @@ LLVMInterface::processValidationResponse()
                     validationCoalescedWaits++;
                     Tick waitLatency = currentTick - waiting.queueTime;
                     totalCoalescedWaitLatency += waitLatency;
+                    llvmStats.validationCoalescedWaits++;
+                    llvmStats.coalescedWaitLatency += waitLatency;
 
                     DPRINTF(LLVMInterface,
                             "[AIA] Processing waiting %s at 0x%016lx "
@@ -1423,6 +1495,7 @@ LLVMInterface::processValidationResponse()
         } else {
             // Access denied by kernel
             kernelValidationDenied++;
+            llvmStats.kernelValidationsDenied++;
             panic("[SECURITY] Kernel denied %s: addr=0x%016lx, pid=%llu",
                   req.isRead ? "READ" : "WRITE", req.addr, req.pid);
         }
@@ -1506,3 +1579,208 @@ LLVMInterface::printKernelValidationStats()
     std::cout << "   Cache hit rate:                  " << cacheHitRate << "%" << std::endl;
     std::cout << std::endl;
 }
+
+LLVMInterface::LLVMInterfaceStats::LLVMInterfaceStats(LLVMInterface *_owner)
+    : statistics::Group(_owner), owner(_owner),
+    ADD_STAT(cycles, statistics::units::Cycle::get(),
+             "Number of accelerator cycles simulated"),
+    ADD_STAT(dynamicInsts, statistics::units::Count::get(),
+             "Number of LLVM instructions scheduled (each commits once)"),
+    ADD_STAT(opcodeInsts, statistics::units::Count::get(),
+             "Number of LLVM instructions scheduled by opcode"),
+    ADD_STAT(computeLaunched, statistics::units::Count::get(),
+             "Number of instructions added to the compute queue"),
+    ADD_STAT(computeCommitted, statistics::units::Count::get(),
+             "Number of instructions committed from the compute queue"),
+    ADD_STAT(computeFUStalls, statistics::units::Count::get(),
+             "Number of cycles compute queue entries waited on their "
+             "functional unit"),
+    ADD_STAT(issueFUStalls, statistics::units::Count::get(),
+             "Number of times an instruction waited for a free functional "
+             "unit"),
+    ADD_STAT(loadRAWStalls, statistics::units::Count::get(),
+             "Number of times a load waited on an in-flight store"),
+    ADD_STAT(fuOccupancy, statistics::units::Cycle::get(),
+             "Sum over cycles of the busy units of each functional unit type"),
+    ADD_STAT(fuAvgOccupancy, statistics::units::Ratio::get(),
+             "Average number of busy units of each functional unit type",
+             fuOccupancy / cycles),
+    ADD_STAT(reservationDepth, statistics::units::Count::get(),
+             "Instructions in the reservation queues per cycle"),
+    ADD_STAT(computeQueueDepth, statistics::units::Count::get(),
+             "Instructions in the compute queues per cycle"),
+    ADD_STAT(readQueueDepth, statistics::units::Count::get(),
+             "Loads in flight per cycle"),
+    ADD_STAT(writeQueueDepth, statistics::units::Count::get(),
+             "Stores in flight per cycle"),
+    ADD_STAT(memReads, statistics::units::Count::get(),
+             "Number of memory reads issued"),
+    ADD_STAT(memWrites, statistics::units::Count::get(),
+             "Number of memory writes issued"),
+    ADD_STAT(readLatency, statistics::units::Tick::get(),
+             "Latency of memory reads, from issue to commit"),
+    ADD_STAT(writeLatency, statistics::units::Tick::get(),
+             "Latency of memory writes, from issue to commit"),
+    ADD_STAT(hostSetupSeconds, statistics::units::Second::get(),
+             "Host time spent parsing the LLVM IR"),
+    ADD_STAT(hostActiveSeconds, statistics::units::Second::get(),
+             "Host time spent in accelerator cycles"),
+    ADD_STAT(hostSchedulingSeconds, statistics::units::Second::get(),
+             "Host time spent scheduling basic blocks"),
+    ADD_STAT(hostQueueSeconds, statistics::units::Second::get(),
+             "Host time spent processing the runtime queues"),
+    ADD_STAT(hostComputeSeconds, statistics::units::Second::get(),
+             "Host time spent launching compute instructions"),
+    ADD_STAT(kernelValidations, statistics::units::Count::get(),
+             "Number of kernel validation requests sent"),
+    ADD_STAT(kernelValidationsDenied, statistics::units::Count::get(),
+             "Number of accesses denied by kernel validation"),
+    ADD_STAT(validationCacheHits, statistics::units::Count::get(),
+             "Number of accesses to an already validated page"),
+    ADD_STAT(validationCoalescedWaits, statistics::units::Count::get(),
+             "Number of accesses that waited on an in-flight validation"),
+    ADD_STAT(kernelValidationLatency, statistics::units::Tick::get(),
+             "Total latency of kernel validation requests"),
+    ADD_STAT(coalescedWaitLatency, statistics::units::Tick::get(),
+             "Total latency of accesses waiting on in-flight validations"),
+    ADD_STAT(fuAccesses, statistics::units::Count::get(),
+             "Number of operations issued to each functional unit type"),
+    ADD_STAT(fuIssueStalls, statistics::units::Count::get(),
+             "Number of times an instruction waited for a free instance of "
+             "each functional unit type"),
+    ADD_STAT(fuDynamicEnergy, statistics::units::Unspecified::get(),
+             "Dynamic energy of each functional unit type (pJ)"),
+    ADD_STAT(registerReadBits, statistics::units::Count::get(),
+             "Number of register bits read by issued instructions"),
+    ADD_STAT(registerWriteBits, statistics::units::Count::get(),
+             "Number of register bits written by issued instructions"),
+    ADD_STAT(registerDynamicEnergy, statistics::units::Unspecified::get(),
+             "Dynamic energy of the registers (pJ)"),
+    ADD_STAT(dynamicEnergy, statistics::units::Unspecified::get(),
+             "Dynamic energy of the functional units and registers (pJ)"),
+    ADD_STAT(area, statistics::units::Unspecified::get(),
+             "Estimated functional unit and register area (um^2)"),
+    ADD_STAT(staticPower, statistics::units::Unspecified::get(),
+             "Estimated static power (mW)"),
+    ADD_STAT(dynamicPower, statistics::units::Unspecified::get(),
+             "Average dynamic power over the simulated cycles (mW)")
+{
+}
+
+void
+LLVMInterface::LLVMInterfaceStats::regStats()
+{
+    using namespace statistics;
+
+    Group::regStats();
+
+    opcodeInsts.init(llvm::Instruction::OtherOpsEnd).flags(total | nozero);
+    for (unsigned op = 1; op < llvm::Instruction::OtherOpsEnd; op++) {
+        opcodeInsts.subname(op, llvm::Instruction::getOpcodeName(op));
+    }
+
+    // The generated FU list may name a unit more than once
+    for (auto fu : owner->hw->functional_units->functional_unit_list) {
+        if (std::find(fus.begin(), fus.end(), fu) == fus.end())
+            fus.push_back(fu);
+    }
+    fuOccupancy.init(std::max<size_t>(fus.size(), 1));
+    fuAccesses.init(std::max<size_t>(fus.size(), 1)).flags(total | nozero);
+    fuIssueStalls.init(std::max<size_t>(fus.size(), 1))
+        .flags(total | nozero);
+    fuDynamicEnergy.init(std::max<size_t>(fus.size(), 1))
+        .flags(total | nozero);
+    for (size_t i = 0; i < fus.size(); i++) {
+        fuOccupancy.subname(i, fus[i]->get_alias());
+        fuAvgOccupancy.subname(i, fus[i]->get_alias());
+        fuAccesses.subname(i, fus[i]->get_alias());
+        fuIssueStalls.subname(i, fus[i]->get_alias());
+        fuDynamicEnergy.subname(i, fus[i]->get_alias());
+
+        uint32_t unit = fus[i]->get_enum_value();
+        if (unit >= fuIndex.size())
+            fuIndex.resize(unit + 1, -1);
+        fuIndex[unit] = i;
+        if (unit == REGISTER)
+            registerUnit = fus[i];
+    }
+
+    dynamicEnergy = sum(fuDynamicEnergy) + registerDynamicEnergy;
+    // pJ per ns is mW
+    dynamicPower = dynamicEnergy / (cycles * constant(owner->clock_period / 1000.0));
+    area.scalar(areaTotal);
+    staticPower.scalar(leakageTotal);
+}
+
+void
+LLVMInterface::LLVMInterfaceStats::updateStaticModel()
+{
+    // Each unit is charged for the instances this launch's static graph
+    // allocated, one per instruction mapped to it
+    std::vector<uint64_t> units(fus.size(), 0);
+    for (auto value : owner->values) {
+        if (!value->isInstruction())
+            continue;
+        auto inst = std::static_pointer_cast<SALAM::Instruction>(value);
+        uint64_t unit = inst->getFunctionalUnit();
+        if (unit < fuIndex.size() && fuIndex[unit] >= 0)
+            units[fuIndex[unit]]++;
+    }
+
+    areaTotal = 0;
+    leakageTotal = 0;
+    for (size_t i = 0; i < fus.size(); i++) {
+        if (fus[i] == registerUnit)
+            continue;
+        areaTotal += units[i] * fus[i]->get_area();
+        leakageTotal += units[i] * fus[i]->get_leakage_power();
+    }
+
+    // The register profile is per bit, with one register per result
+    if (registerUnit) {
+        uint64_t bits = 0;
+        for (auto value : owner->values) {
+            if (value->isInstruction() && value->getReg())
+                bits += value->getSize();
+        }
+        areaTotal += bits * registerUnit->get_area();
+        leakageTotal += bits * registerUnit->get_leakage_power();
+    }
+}
+
+void
+LLVMInterface::LLVMInterfaceStats::chargeIssueStall(SALAM::Instruction *inst)
+{
+    uint64_t unit = inst->getFunctionalUnit();
+    if (unit < fuIndex.size() && fuIndex[unit] >= 0)
+        fuIssueStalls[fuIndex[unit]]++;
+}
+
+void
+LLVMInterface::LLVMInterfaceStats::chargeInstruction(SALAM::Instruction *inst)
+{
+    uint64_t unit = inst->getFunctionalUnit();
+    if (unit < fuIndex.size() && fuIndex[unit] >= 0) {
+        auto fu = fus[fuIndex[unit]];
+        fuAccesses[fuIndex[unit]]++;
+        fuDynamicEnergy[fuIndex[unit]] += fu->get_dynamic_energy();
+    }
+
+    uint64_t readBits = 0;
+    for (auto &op : *(inst->getOperands()))
+        readBits += op.getSize();
+    uint64_t writeBits = inst->getReg() ? inst->getSize() : 0;
+    registerReadBits += readBits;
+    registerWriteBits += writeBits;
+    if (registerUnit) {
+        registerDynamicEnergy +=
+            (readBits + writeBits) * registerUnit->get_dynamic_energy();
+    }
+
+    reservationDepth.init(16);
+    computeQueueDepth.init(16);
+    readQueueDepth.init(16);
+    writeQueueDepth.init(16);
+    readLatency.init(16);
+    writeLatency.init(16);
+}
@@ -31,6 +31,9 @@
 #include <llvm/Support/SourceMgr.h>
 #include <llvm/Transforms/Utils/Cloning.h>
 
+// gem5 Includes
+#include "base/statistics.hh"
+
 // SALAM Includes
 #include "hwacc/HWModeling/src/hw_interface.hh"
 #include "hwacc/LLVMRead/src/basic_block.hh"
@@ -48,6 +51,8 @@ class LLVMInterface : public ComputeUnit {
     int32_t clock_period;
     int cycle;
     int stalls;
+    // Instructions scheduled by all functions, each commits exactly once
+    uint64_t dynamicInsts;
 
     bool running;
     bool loadOpScheduled;
@@ -241,6 +246,74 @@ class LLVMInterface : public ComputeUnit {
 
     std::vector<std::shared_ptr<SALAM::Function>> functions;
     std::vector<std::shared_ptr<SALAM::Value>> values;
+
+    struct LLVMInterfaceStats : public statistics::Group
+    {
+        LLVMInterfaceStats(LLVMInterface *owner);
+        void regStats() override;
+
+        LLVMInterface *owner;
+        /** Functional units sampled for occupancy, in stat index order */
+        std::vector<FunctionalUnitBase *> fus;
+        /** Stat index of each functional unit enum value, -1 if none */
+        std::vector<int> fuIndex;
+        /** The unit whose per-bit profile models the register file */
+        FunctionalUnitBase *registerUnit = nullptr;
+        /** Static model totals, rebuilt with the static graph */
+        double areaTotal = 0;
+        double leakageTotal = 0;
+
+        void updateStaticModel();
+        void chargeInstruction(SALAM::Instruction *inst);
+        void chargeIssueStall(SALAM::Instruction *inst);
+
+        statistics::Scalar cycles;
+        statistics::Scalar dynamicInsts;
+        statistics::Vector opcodeInsts;
+        statistics::Scalar computeLaunched;
+        statistics::Scalar computeCommitted;
+        statistics::Scalar computeFUStalls;
+        statistics::Scalar issueFUStalls;
+        statistics::Scalar loadRAWStalls;
+
+        statistics::Vector fuOccupancy;
+        statistics::Formula fuAvgOccupancy;
+
+        statistics::Histogram reservationDepth;
+        statistics::Histogram computeQueueDepth;
+        statistics::Histogram readQueueDepth;
+        statistics::Histogram writeQueueDepth;
+
+        statistics::Scalar memReads;
+        statistics::Scalar memWrites;
+        statistics::Histogram readLatency;
+        statistics::Histogram writeLatency;
+
+        statistics::Scalar hostSetupSeconds;
+        statistics::Scalar hostActiveSeconds;
+        statistics::Scalar hostSchedulingSeconds;
+        statistics::Scalar hostQueueSeconds;
+        statistics::Scalar hostComputeSeconds;
+
+        statistics::Scalar kernelValidations;
+        statistics::Scalar kernelValidationsDenied;
+        statistics::Scalar validationCacheHits;
+        statistics::Scalar validationCoalescedWaits;
+        statistics::Scalar kernelValidationLatency;
+        statistics::Scalar coalescedWaitLatency;
+
+        statistics::Vector fuAccesses;
+        statistics::Vector fuIssueStalls;
+        statistics::Vector fuDynamicEnergy;
+        statistics::Scalar registerReadBits;
+        statistics::Scalar registerWriteBits;
+        statistics::Scalar registerDynamicEnergy;
+        statistics::Formula dynamicEnergy;
+        statistics::Value area;
+        statistics::Value staticPower;
+        statistics::Formula dynamicPower;
+    } llvmStats;
+
   protected:
     // const std::string name() const { return comm->getName() + ".compute"; }
     virtual bool debug() { return comm->debug(); }
@@ -253,6 +326,9 @@ class LLVMInterface : public ComputeUnit {
     void startup();
     void initialize();
     void finalize();
+    DrainState drain() override;
+    void serialize(CheckpointOut &cp) const override;
+    void unserialize(CheckpointIn &cp) override;
     void debug(uint64_t flags);
     bool getLockstepStatus() { return lockstep; }
     void readCommit(MemoryRequest *req);
@@ -271,16 +347,23 @@ class LLVMInterface : public ComputeUnit {
     uint32_t getSchedulingThreshold() { return scheduling_threshold; }
     void addSchedulingTime(std::chrono::duration<float> timeDelta) {
         schedulingTime = schedulingTime + timeDelta;
+        llvmStats.hostSchedulingSeconds += timeDelta.count();
     }
     void addQueueTime(std::chrono::duration<float> timeDelta) {
         queueProcessTime = queueProcessTime + timeDelta;
+        llvmStats.hostQueueSeconds += timeDelta.count();
     }
     void addComputeTime(std::chrono::duration<float> timeDelta) {
         computeTime = computeTime + timeDelta;
+        llvmStats.hostComputeSeconds += timeDelta.count();
     }
     void addHWTime(std::chrono::duration<float> timeDelta) {
         hwTime = hwTime + timeDelta;
     }
+    void addDynamicInsts(uint64_t count) {
+        dynamicInsts += count;
+        llvmStats.dynamicInsts += count;
+    }
 
     // Kernel validation functions
     bool isKernelValidationEnabled() { return enableKernelValidation; }
@@ -299,7 +382,10 @@ class LLVMInterface : public ComputeUnit {
         }
         return false;
     }
-    void incrementValidationCacheHits() { validationCacheHits++; }
+    void incrementValidationCacheHits() {
+        validationCacheHits++;
+        llvmStats.validationCacheHits++;
+    }
     void queueWaitingInstruction(uint64_t addr,
                                  std::shared_ptr<SALAM::Instruction> inst,
                                  ActiveFunction* func, bool isRead,
@@ -307,7 +393,9 @@ class LLVMInterface : public ComputeUnit {
     void sendValidationRequest(uint64_t addr, size_t size, bool isRead,
                                std::shared_ptr<SALAM::Instruction> inst,
                                ActiveFunction* func);
-    void processValidationResponse();
+    // Answer the pending validations. With flush set (while draining),
+    // those still within the kernel validation latency are answered too.
+    void processValidationResponse(bool flush = false);
     bool validateWithKernel(uint64_t addr, size_t size, uint64_t pid);
     void printKernelValidationStats();
 };
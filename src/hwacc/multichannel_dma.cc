@@ -0,0 +1,290 @@
+//------------------------------------------//
+#include "hwacc/multichannel_dma.hh"
+//------------------------------------------//
+
+MultiChannelDma::Channel::Channel(MultiChannelDma *dma, int _id)
+    : id(_id),
+    state(Idle),
+    readFifo(nullptr),
+    writeFifo(nullptr),
+    fetchEvent([this, dma]{ dma->descriptorFetched(this); },
+               dma->name() + ".channel" + std::to_string(_id) + ".fetch"),
+    readRow(0),
+    writeRow(0),
+    copied(0) {
+    uint8_t *regs = dma->mmreg + MCDMA_BLOCK_SIZE*(id+1);
+    FLAGS = (uint32_t *)(regs+MCDMA_CH_FLAGS_OFF);
+    DESC_ADDR = (uint64_t *)(regs+MCDMA_CH_DESC_OFF);
+    DONE = (uint32_t *)(regs+MCDMA_CH_DONE_OFF);
+    size_t size = dma->bufferSize/2;
+    memSideReadFifo = new WakeupDmaReadFifo<MultiChannelDma>(dma, dma->dmaPort, size, dma->maxReqSize, dma->maxPending);
+    memSideWriteFifo = new WakeupDmaWriteFifo<MultiChannelDma>(dma, dma->dmaPort, size, dma->maxReqSize, dma->maxPending);
+    accSideReadFifo = new WakeupDmaReadFifo<MultiChannelDma>(dma, dma->accPort, size, dma->maxReqSize, dma->maxPending);
+    accSideWriteFifo = new WakeupDmaWriteFifo<MultiChannelDma>(dma, dma->accPort, size, dma->maxReqSize, dma->maxPending);
+}
+
+MultiChannelDma::MultiChannelDma(const MultiChannelDmaParams &p)
+    : DmaDevice(p),
+    devname(p.devicename),
+    pioAddr(p.pio_addr),
+    pioDelay(p.pio_delay),
+    pioSize(MCDMA_BLOCK_SIZE*(p.num_channels+1)),
+    bufferSize(p.buffer_size),
+    maxPending(p.max_pending),
+    maxReqSize(p.max_req_size),
+    xferBuffer(p.max_req_size),
+    gic(p.gic),
+    intNum(p.int_num),
+    tickEvent([this]{tick();}, name()),
+    accPort(this, sys, p.sid, p.ssid),
+    accRangesValid(false) {
+    // Bit 31 of STATUS is the interrupt
+    fatal_if(p.num_channels == 0 || p.num_channels > 31,
+             "%s: num_channels must be between 1 and 31\n", name());
+    mmreg = new uint8_t[pioSize];
+    for (Addr i=0; i<pioSize; i++)
+        mmreg[i]=0;
+    STATUS = (uint32_t *)(mmreg+MCDMA_STATUS_OFF);
+    COALESCE = (uint32_t *)(mmreg+MCDMA_COALESCE_OFF);
+    EVENTS = (uint32_t *)(mmreg+MCDMA_EVENTS_OFF);
+    for (unsigned i=0; i<p.num_channels; i++)
+        channels.push_back(new Channel(this, i));
+}
+
+AddrRangeList
+MultiChannelDma::getAddrRanges() const
+{
+    assert(pioSize != 0);
+    AddrRangeList ranges;
+    DPRINTF(AddrRanges, "registering range: %#x-%#x\n", pioAddr, pioSize);
+    ranges.push_back(RangeSize(pioAddr, pioSize));
+    return ranges;
+}
+
+// Is addr behind the cluster port? The ranges are fixed once the system
+// is connected, so they are only queried once.
+bool
+MultiChannelDma::onAccSide(Addr addr) {
+    if (!accRangesValid) {
+        accRanges = accPort.getAddrRanges();
+        accRangesValid = true;
+    }
+    for (const auto &range : accRanges) {
+        if (range.contains(addr)) return true;
+    }
+    return false;
+}
+
+void
+MultiChannelDma::fetchDescriptor(Channel *ch, Addr addr) {
+    DPRINTF(MultiChannelDma, "Channel %d: Fetching descriptor at 0x%016x\n",
+            ch->id, addr);
+    ch->state = Channel::Fetching;
+    DmaPort &port = onAccSide(addr) ? accPort : dmaPort;
+    port.dmaAction(MemCmd::ReadReq, addr, DmaDescriptor::Size,
+                   &ch->fetchEvent, ch->descData, 0);
+}
+
+void
+MultiChannelDma::descriptorFetched(Channel *ch) {
+    ch->desc = DmaDescriptor::decode(ch->descData);
+    DPRINTF(MultiChannelDma, "Channel %d: SRC:0x%016x, DST:0x%016x, "
+            "LEN:%d, ROWS:%d, SRC_STRIDE:%d, DST_STRIDE:%d\n", ch->id,
+            ch->desc.src, ch->desc.dst, ch->desc.length, ch->desc.rows,
+            ch->desc.srcStride, ch->desc.dstStride);
+    ch->readFifo = onAccSide(ch->desc.src) ?
+        ch->accSideReadFifo : ch->memSideReadFifo;
+    ch->writeFifo = onAccSide(ch->desc.dst) ?
+        ch->accSideWriteFifo : ch->memSideWriteFifo;
+    ch->readRow = 0;
+    ch->writeRow = 0;
+    ch->copied = 0;
+    ch->state = Channel::Transfer;
+    wakeup();
+}
+
+void
+MultiChannelDma::finishDescriptor(Channel *ch) {
+    (*ch->DONE)++;
+    DPRINTF(MultiChannelDma, "Channel %d: Descriptor %d done\n", ch->id,
+            *ch->DONE);
+    if (ch->desc.control & DmaDescriptor::CountCompletion)
+        (*EVENTS)++;
+    if (ch->desc.next != 0) {
+        fetchDescriptor(ch, ch->desc.next);
+    } else {
+        DPRINTF(MultiChannelDma, "Channel %d: End of chain\n", ch->id);
+        ch->state = Channel::Idle;
+        *ch->FLAGS &= ~MCDMA_CH_RUNNING;
+        *STATUS |= 1 << ch->id;
+        (*EVENTS)++;
+    }
+}
+
+// Move a channel along by one step: start it, hand the next rows to its
+// FIFOs, copy one request worth of data between them, or retire its
+// descriptor once the last write has completed
+void
+MultiChannelDma::advance(Channel *ch) {
+    if (ch->state == Channel::Idle) {
+        if ((*ch->FLAGS&MCDMA_CH_START) == MCDMA_CH_START) {
+            *ch->FLAGS &= ~MCDMA_CH_START;
+            *ch->FLAGS |= MCDMA_CH_RUNNING;
+            *ch->DONE = 0;
+            fetchDescriptor(ch, *ch->DESC_ADDR);
+        }
+        return;
+    }
+    if (ch->state != Channel::Transfer)
+        return;
+
+    const DmaDescriptor &desc = ch->desc;
+    if (ch->readRow < desc.rows && ch->readFifo->atEndOfBlock()) {
+        ch->readFifo->startFill(desc.srcRow(ch->readRow), desc.length);
+        ch->readRow++;
+    }
+    if (ch->writeRow < desc.rows && ch->writeFifo->atEndOfBlock()) {
+        ch->writeFifo->startEmpty(desc.dstRow(ch->writeRow), desc.length);
+        ch->writeRow++;
+    }
+    if (ch->copied < desc.bytes()) {
+        size_t toWrite = MIN(maxReqSize, desc.bytes() - ch->copied);
+        if (ch->writeFifo->canFill(toWrite) &&
+            ch->readFifo->tryGet(xferBuffer.data(), toWrite)) {
+            ch->writeFifo->fill(xferBuffer.data(), toWrite);
+            ch->copied += toWrite;
+        }
+    } else if (ch->writeRow == desc.rows && !ch->writeFifo->isActive()) {
+        finishDescriptor(ch);
+    }
+}
+
+// Can the next tick move the channel along? Only the FIFOs, descriptor
+// fetches and MMR writes change the answer, and all of them wake the DMA
+// up.
+bool
+MultiChannelDma::canAdvance(Channel *ch) {
+    if (ch->state == Channel::Idle)
+        return (*ch->FLAGS&MCDMA_CH_START) == MCDMA_CH_START;
+    if (ch->state != Channel::Transfer)
+        return false;
+
+    const DmaDescriptor &desc = ch->desc;
+    if (ch->readRow < desc.rows && ch->readFifo->atEndOfBlock())
+        return true;
+    if (ch->writeRow < desc.rows && ch->writeFifo->atEndOfBlock())
+        return true;
+    if (ch->copied < desc.bytes()) {
+        size_t toWrite = MIN(maxReqSize, desc.bytes() - ch->copied);
+        return ch->writeFifo->canFill(toWrite) &&
+               ch->readFifo->size() >= toWrite;
+    }
+    return ch->writeRow == desc.rows && !ch->writeFifo->isActive();
+}
+
+bool
+MultiChannelDma::canProgress() {
+    for (auto ch : channels) {
+        if (canAdvance(ch)) return true;
+    }
+    return false;
+}
+
+// Raise the interrupt once enough completions have been collected, or
+// once the last running channel has finished
+void
+MultiChannelDma::signalCompletions() {
+    if (*EVENTS == 0)
+        return;
+    bool running = false;
+    for (auto ch : channels)
+        running |= (ch->state != Channel::Idle);
+    if (*EVENTS >= std::max<uint32_t>(*COALESCE, 1) || !running) {
+        DPRINTF(MultiChannelDma, "Raising interrupt for %d completions\n",
+                *EVENTS);
+        *EVENTS = 0;
+        *STATUS |= MCDMA_STATUS_INT;
+        gic->sendInt(intNum);
+    }
+}
+
+void
+MultiChannelDma::wakeup() {
+    if (!tickEvent.scheduled() && canProgress()) {
+        schedule(tickEvent, nextCycle());
+    }
+}
+
+void
+MultiChannelDma::tick() {
+    for (auto ch : channels)
+        advance(ch);
+    signalCompletions();
+    if (!tickEvent.scheduled() && canProgress()) {
+        schedule(tickEvent, nextCycle());
+    }
+}
+
+Tick
+MultiChannelDma::read(PacketPtr pkt) {
+    DPRINTF(DeviceMMR, "The address range associated with this DMA was read!\n");
+
+    Addr offset = pkt->req->getPaddr() - pioAddr;
+    panic_if(offset + pkt->getSize() > pioSize,
+             "%s: Read of %d bytes at offset %d is out of range\n",
+             name(), pkt->getSize(), offset);
+
+    pkt->setData(mmreg + offset);
+
+    pkt->makeAtomicResponse();
+    return pioDelay;
+}
+
+Tick
+MultiChannelDma::write(PacketPtr pkt) {
+    DPRINTF(DeviceMMR,
+        "The address range associated with this DMA was written to!\n");
+
+    Addr offset = pkt->req->getPaddr() - pioAddr;
+    panic_if(offset + pkt->getSize() > pioSize,
+             "%s: Write of %d bytes at offset %d is out of range\n",
+             name(), pkt->getSize(), offset);
+
+    if (offset < MCDMA_STATUS_OFF + sizeof(uint32_t)) {
+        // Status bits are cleared by writing 1s. A wider write may also
+        // cover the registers after STATUS, which are written as usual.
+        uint64_t data = pkt->getUintX(ByteOrder::little);
+        uint32_t clear = 0;
+        for (unsigned i = 0; i < pkt->getSize(); i++) {
+            uint8_t byte = data >> (8 * i);
+            Addr reg = offset + i;
+            if (reg < MCDMA_STATUS_OFF + sizeof(uint32_t)) {
+                clear |= uint32_t(byte) << (8 * (reg - MCDMA_STATUS_OFF));
+            } else {
+                mmreg[reg] = byte;
+            }
+        }
+        if ((clear&MCDMA_STATUS_INT) && (*STATUS&MCDMA_STATUS_INT)) {
+            gic->clearInt(intNum);
+        }
+        *STATUS &= ~clear;
+    } else {
+        pkt->writeData(mmreg + offset);
+    }
+    DPRINTF(DeviceMMR, "STATUS Reg:0x%08x\n", *STATUS);
+
+    if (!tickEvent.scheduled()) {
+        schedule(tickEvent, nextCycle());
+    }
+    pkt->makeAtomicResponse();
+    return pioDelay;
+}
+
+Port &
+MultiChannelDma::getPort(const std::string &if_name, PortID idx)
+{
+    if (if_name == "cluster_dma") {
+        return accPort;
+    }
+    return DmaDevice::getPort(if_name, idx);
+}
@@ -0,0 +1,150 @@
+#ifndef __HWACC_MULTICHANNEL_DMA_HH__
+#define __HWACC_MULTICHANNEL_DMA_HH__
+//------------------------------------------//
+#include <vector>
+
+#include "dev/arm/base_gic.hh"
+#include "dev/dma_device.hh"
+#include "hwacc/LLVMRead/src/debug_flags.hh"
+#include "hwacc/dma_descriptor.hh"
+#include "hwacc/wakeup_dma_fifo.hh"
+#include "mem/packet.hh"
+#include "mem/packet_access.hh"
+#include "params/MultiChannelDma.hh"
+//------------------------------------------//
+
+/*
+    DMA engine with several independent channels. Each channel walks a
+    chain of descriptors in memory (see DmaDescriptor), so a whole set of
+    2-D tiles can be moved with a single launch. Completions of all
+    channels share one interrupt, which can be coalesced.
+
+    Memory Mapped Registers 32*(NumChannels+1) Bytes
+    | Channel N-1 | ... | Channel 0 | Global  |
+    |-------------|-----|-----------|---------|
+    |  32 Bytes   |     | 32 Bytes  | 32 Bytes|
+
+    Global Registers
+    | Unused   | Events  | Coalesce | Status  |
+    |----------|---------|----------|---------|
+    | 20 Bytes | 4 Bytes | 4 Bytes  | 4 Bytes |
+
+    Status - Bit c is set when channel c reaches the end of its chain. Bit
+        31 is set when the interrupt is raised. Writing a 1 to a bit
+        clears it, and clearing bit 31 clears the interrupt.
+    Coalesce - Number of completions to collect before raising the
+        interrupt. '0' behaves as '1'. The collected completions are
+        also signalled once no channel is running.
+    Events - Completions collected since the interrupt was last raised.
+
+    Channel Registers
+    | Unused   | Done    | DescAddr | Unused  | Flags   |
+    |----------|---------|----------|---------|---------|
+    | 12 Bytes | 4 Bytes | 8 Bytes  | 4 Bytes | 4 Bytes |
+
+    Flags - Bit 0 (Start) starts the channel on the chain at DescAddr. Bit
+        1 (Running) is set until the channel reaches the end of the chain.
+    DescAddr - Address of the first descriptor of the chain.
+    Done - Number of descriptors of the chain completed so far.
+*/
+
+#define MCDMA_BLOCK_SIZE        32
+#define MCDMA_STATUS_OFF        0
+#define MCDMA_COALESCE_OFF      4
+#define MCDMA_EVENTS_OFF        8
+#define MCDMA_CH_FLAGS_OFF      0
+#define MCDMA_CH_DESC_OFF       8
+#define MCDMA_CH_DONE_OFF       16
+
+#define MCDMA_STATUS_INT        0x80000000
+#define MCDMA_CH_START          0x1
+#define MCDMA_CH_RUNNING        0x2
+
+class MultiChannelDma : public DmaDevice
+{
+  private:
+    struct Channel
+    {
+        enum State { Idle, Fetching, Transfer };
+
+        int id;
+        State state;
+
+        // Registers of the channel, inside mmreg
+        uint32_t * FLAGS;
+        uint64_t * DESC_ADDR;
+        uint32_t * DONE;
+
+        DmaReadFifo *memSideReadFifo;
+        DmaReadFifo *accSideReadFifo;
+        DmaWriteFifo *memSideWriteFifo;
+        DmaWriteFifo *accSideWriteFifo;
+        DmaReadFifo *readFifo;
+        DmaWriteFifo *writeFifo;
+
+        // Descriptor being fetched or transferred
+        uint8_t descData[DmaDescriptor::Size];
+        EventFunctionWrapper fetchEvent;
+        DmaDescriptor desc;
+
+        // Next rows handed to the FIFOs and bytes moved between them
+        uint32_t readRow;
+        uint32_t writeRow;
+        uint64_t copied;
+
+        Channel(MultiChannelDma *dma, int _id);
+    };
+
+    std::string devname;
+    Addr pioAddr;
+    Tick pioDelay;
+    Addr pioSize;
+    size_t bufferSize;
+    unsigned maxPending;
+    unsigned maxReqSize;
+    // Staging area for one FIFO-to-FIFO transfer, shared by the channels
+    std::vector<uint8_t> xferBuffer;
+    BaseGic * gic;
+    uint32_t intNum;
+
+    uint8_t * mmreg;
+    uint32_t * STATUS;
+    uint32_t * COALESCE;
+    uint32_t * EVENTS;
+
+    std::vector<Channel *> channels;
+
+    EventFunctionWrapper tickEvent;
+
+    DmaPort accPort;
+    // Ranges behind accPort, fetched on the first transfer
+    AddrRangeList accRanges;
+    bool accRangesValid;
+    bool onAccSide(Addr addr);
+
+    void fetchDescriptor(Channel *ch, Addr addr);
+    void descriptorFetched(Channel *ch);
+    void finishDescriptor(Channel *ch);
+    void advance(Channel *ch);
+    bool canAdvance(Channel *ch);
+    bool canProgress();
+    void signalCompletions();
+
+  public:
+    PARAMS(MultiChannelDma);
+    MultiChannelDma(const MultiChannelDmaParams &p);
+    ~MultiChannelDma() {}
+
+    AddrRangeList getAddrRanges() const;
+
+    void tick();
+    void wakeup();
+
+    Tick read(PacketPtr pkt);
+    Tick write(PacketPtr pkt);
+
+    Port &getPort(const std::string &if_name,
+                  PortID idx=InvalidPortID) override;
+};
+
+#endif //__HWACC_MULTICHANNEL_DMA_HH__
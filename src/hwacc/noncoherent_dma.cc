@@ -11,15 +11,18 @@ NoncoherentDma::NoncoherentDma(const NoncoherentDmaParams &p)
     bufferSize(p.buffer_size),
     maxPending(p.max_pending),
     maxReqSize(p.max_req_size),
+    xferBuffer(p.max_req_size),
     gic(p.gic),
     intNum(p.int_num),
     clock_period(p.clock_period),
     tickEvent([this]{tick();}, name()),
-    accPort(this, sys, p.sid, p.ssid) {
-    memSideReadFifo = new DmaReadFifo(dmaPort, size_t(bufferSize/2), maxReqSize, maxPending);
-    memSideWriteFifo = new DmaWriteFifo(dmaPort, size_t(bufferSize/2), maxReqSize, maxPending);
-    accSideReadFifo = new DmaReadFifo(accPort, size_t(bufferSize/2), maxReqSize, maxPending);
-    accSideWriteFifo = new DmaWriteFifo(accPort, size_t(bufferSize/2), maxReqSize, maxPending);
+    tickGrid(p.clock_period*1000),
+    accPort(this, sys, p.sid, p.ssid),
+    accRangesValid(false) {
+    memSideReadFifo = new WakeupDmaReadFifo<NoncoherentDma>(this, dmaPort, size_t(bufferSize/2), maxReqSize, maxPending);
+    memSideWriteFifo = new WakeupDmaWriteFifo<NoncoherentDma>(this, dmaPort, size_t(bufferSize/2), maxReqSize, maxPending);
+    accSideReadFifo = new WakeupDmaReadFifo<NoncoherentDma>(this, accPort, size_t(bufferSize/2), maxReqSize, maxPending);
+    accSideWriteFifo = new WakeupDmaWriteFifo<NoncoherentDma>(this, accPort, size_t(bufferSize/2), maxReqSize, maxPending);
     readFifo = nullptr;
     writeFifo = nullptr;
     mmreg = new uint8_t[pioSize];
@@ -43,12 +46,22 @@ NoncoherentDma::getAddrRanges() const
     return ranges;
 }
 
+// The ranges behind the cluster port are fixed once the system is
+// connected, so query them once instead of on every transfer
+const AddrRangeList &
+NoncoherentDma::getAccRanges() {
+    if (!accRangesValid) {
+        accRanges = accPort.getAddrRanges();
+        accRangesValid = true;
+    }
+    return accRanges;
+}
+
 // Select the appropriate DmaReadFifo based on which port holds
 // the active read address
 DmaReadFifo *
 NoncoherentDma::getActiveReadFifo() {
-    AddrRangeList accPortRanges = accPort.getAddrRanges();
-    for (auto range : accPortRanges) {
+    for (const auto &range : getAccRanges()) {
         if (range.contains(activeSrc)) return accSideReadFifo;
     }
     return memSideReadFifo;
@@ -58,15 +71,35 @@ NoncoherentDma::getActiveReadFifo() {
 // the active write address
 DmaWriteFifo *
 NoncoherentDma::getActiveWriteFifo() {
-    AddrRangeList accPortRanges = accPort.getAddrRanges();
-    for (auto range : accPortRanges) {
+    for (const auto &range : getAccRanges()) {
         if (range.contains(activeDst)) return accSideWriteFifo;
     }
     return memSideWriteFifo;
 }
 
+// Can the next tick move the active transfer along? Only the FIFOs and
+// MMR writes change the answer, and both wake the DMA up.
+bool
+NoncoherentDma::canProgress() {
+    if (writesLeft > 0) {
+        size_t toWrite = MIN(maxReqSize, writesLeft);
+        return writeFifo->canFill(toWrite) && readFifo->size() >= toWrite;
+    }
+    return !writeFifo->isActive();
+}
+
+// Called by the FIFOs after each DMA response. A transfer waiting on
+// them resumes on the tick the polling loop would have reached.
+void
+NoncoherentDma::wakeup() {
+    if (running && !tickEvent.scheduled() && canProgress()) {
+        schedule(tickEvent, tickGrid.next(curTick()));
+    }
+}
+
 void
 NoncoherentDma::tick() {
+    tickGrid.ran(curTick());
     if (!running && ((*FLAGS&0x01)==0x01)) {
         running = true;
         *FLAGS &= 0xFE;
@@ -88,13 +121,10 @@ NoncoherentDma::tick() {
     if (running) {
         if (writesLeft > 0) {
             int toWrite = MIN(maxReqSize, writesLeft);
-            if (writeFifo->canFill(toWrite)) {
-                uint8_t * data = new uint8_t[toWrite];
-                if (readFifo->tryGet(data, toWrite)) {
-                    writeFifo->fill(data, toWrite);
-                    writesLeft -= toWrite;
-                }
-                delete[] data;
+            if (writeFifo->canFill(toWrite) &&
+                readFifo->tryGet(xferBuffer.data(), toWrite)) {
+                writeFifo->fill(xferBuffer.data(), toWrite);
+                writesLeft -= toWrite;
             }
         } else {
             if (!writeFifo->isActive()) {
@@ -109,8 +139,10 @@ NoncoherentDma::tick() {
         }
     }
 	last_flag = *FLAGS;
-    if (!tickEvent.scheduled() && running) {
-        schedule(tickEvent, curTick() + clock_period*1000);
+    // Sleep while the transfer waits on memory rather than polling the
+    // FIFOs every cycle. wakeup() resumes it.
+    if (!tickEvent.scheduled() && running && canProgress()) {
+        schedule(tickEvent, tickGrid.next(curTick()));
     }
 }
 
@@ -158,7 +190,10 @@ NoncoherentDma::write(PacketPtr pkt) {
     pkt->writeData(mmreg + (pkt->req->getPaddr() - pioAddr));
 
     if (!tickEvent.scheduled()) {
-        schedule(tickEvent, curTick() + clock_period*1000);
+        if (!running) {
+            tickGrid.start(curTick() + clock_period*1000);
+        }
+        schedule(tickEvent, tickGrid.next(curTick()));
     }
     pkt->makeAtomicResponse();
     return pioDelay;
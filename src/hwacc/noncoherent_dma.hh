@@ -1,10 +1,13 @@
 #ifndef __HWACC_NONCOHERENT_DMA_HH__
 #define __HWACC_NONCOHERENT_DMA_HH__
 //------------------------------------------//
+#include <vector>
+
 #include "dev/arm/base_gic.hh"
 #include "dev/dma_device.hh"
 #include "hwacc/LLVMRead/src/debug_flags.hh"
-#include "hwacc/dma_write_fifo.hh"
+#include "hwacc/poll_grid.hh"
+#include "hwacc/wakeup_dma_fifo.hh"
 #include "mem/packet.hh"
 #include "mem/packet_access.hh"
 #include "params/NoncoherentDma.hh"
@@ -32,6 +35,8 @@ class NoncoherentDma : public DmaDevice
     size_t bufferSize;
     unsigned maxPending;
     unsigned maxReqSize;
+    // Staging area for one FIFO-to-FIFO transfer, sized maxReqSize
+    std::vector<uint8_t> xferBuffer;
     BaseGic * gic;
     uint32_t intNum;
     int clock_period;
@@ -52,11 +57,18 @@ class NoncoherentDma : public DmaDevice
     Tick start_time;
 
     EventFunctionWrapper tickEvent;
+    // Ticks the transfer loop runs on while it is awake
+    PollGrid tickGrid;
 
   protected:
     DmaPort accPort;
+    // Ranges behind accPort, fetched on the first transfer
+    AddrRangeList accRanges;
+    bool accRangesValid;
+    const AddrRangeList & getAccRanges();
     DmaReadFifo * getActiveReadFifo();
     DmaWriteFifo * getActiveWriteFifo();
+    bool canProgress();
   public:
     PARAMS(NoncoherentDma);
     NoncoherentDma(const NoncoherentDmaParams &p);
@@ -65,6 +77,7 @@ class NoncoherentDma : public DmaDevice
     AddrRangeList getAddrRanges() const;
 
     void tick();
+    void wakeup();
 
     Tick read(PacketPtr pkt);
     Tick write(PacketPtr pkt);
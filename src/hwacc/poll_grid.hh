@@ -0,0 +1,74 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+
+#ifndef __HWACC_POLL_GRID_HH__
+#define __HWACC_POLL_GRID_HH__
+
+#include "base/intmath.hh"
+#include "base/types.hh"
+
+/**
+ * The ticks a device polling every period would run on. A device that
+ * sleeps while it cannot make progress uses this to wake up on the tick
+ * its polling loop would have noticed the change, so skipping the idle
+ * ticks does not change its timing.
+ */
+class PollGrid
+{
+  private:
+    const gem5::Tick period;
+    gem5::Tick base;
+    gem5::Tick last;
+
+  public:
+    explicit PollGrid(gem5::Tick _period)
+        : period(_period), base(0), last(gem5::MaxTick)
+    {}
+
+    /** (Re)start the polling loop with its first tick at when. */
+    void start(gem5::Tick when) { base = when; }
+
+    /** Record that the loop ran on now. */
+    void ran(gem5::Tick now) { last = now; }
+
+    /**
+     * @return The first tick of the loop at or after now that has not
+     * run yet.
+     */
+    gem5::Tick
+    next(gem5::Tick now) const
+    {
+        gem5::Tick when = base;
+        if (now > base)
+            when += gem5::divCeil(now - base, period) * period;
+        return when == last ? when + period : when;
+    }
+};
+
+#endif // __HWACC_POLL_GRID_HH__
@@ -0,0 +1,168 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+#include <gtest/gtest.h>
+
+#include <random>
+#include <vector>
+
+#include "hwacc/poll_grid.hh"
+
+using gem5::Tick;
+
+namespace
+{
+
+/*
+ * A DMA engine copies one chunk per tick out of a FIFO that responses
+ * fill at the given ticks (in order). Responses on the same tick as the
+ * engine are handled first, as with the DMA completion events. A
+ * Transfer records the ticks chunks were copied on and how many times
+ * the engine ticked.
+ *
+ * These tests cover PollGrid and the wake-up schedule on this model
+ * engine only. They do not run NoncoherentDma or StreamDma themselves:
+ * that needs a full gem5 build and a CPU program to start a transfer,
+ * which unit tests here do not have. The devices' canProgress() and
+ * wakeup() logic, and the event ordering with real DMA completions, are
+ * not covered by a regression test.
+ */
+struct Transfer
+{
+    std::vector<Tick> copies;
+    unsigned ticks = 0;
+};
+
+// The engine ticks every period until it has copied every chunk
+Transfer
+polled(Tick start, Tick period, const std::vector<Tick> &arrivals)
+{
+    Transfer xfer;
+    size_t arrived = 0;
+    for (Tick now = start; xfer.copies.size() < arrivals.size();
+         now += period) {
+        xfer.ticks++;
+        while (arrived < arrivals.size() && arrivals[arrived] <= now)
+            arrived++;
+        if (arrived > xfer.copies.size())
+            xfer.copies.push_back(now);
+    }
+    return xfer;
+}
+
+// The engine sleeps while the FIFO is empty and responses wake it up
+Transfer
+woken(Tick start, Tick period, const std::vector<Tick> &arrivals)
+{
+    Transfer xfer;
+    PollGrid grid(period);
+    grid.start(start);
+    Tick scheduled = start;
+    bool pending = true;
+    size_t arrived = 0;
+    while (xfer.copies.size() < arrivals.size()) {
+        if (arrived < arrivals.size() &&
+            (!pending || arrivals[arrived] <= scheduled)) {
+            const Tick now = arrivals[arrived++];
+            if (!pending) {
+                scheduled = grid.next(now);
+                pending = true;
+            }
+        } else {
+            const Tick now = scheduled;
+            pending = false;
+            grid.ran(now);
+            xfer.ticks++;
+            if (arrived > xfer.copies.size())
+                xfer.copies.push_back(now);
+            if (arrived > xfer.copies.size()) {
+                scheduled = grid.next(now);
+                pending = true;
+            }
+        }
+    }
+    return xfer;
+}
+
+} // anonymous namespace
+
+TEST(PollGridTest, Next)
+{
+    PollGrid grid(1000);
+    grid.start(5000);
+    EXPECT_EQ(5000, grid.next(0));
+    EXPECT_EQ(5000, grid.next(5000));
+    EXPECT_EQ(6000, grid.next(5001));
+    EXPECT_EQ(9000, grid.next(8999));
+    // A tick that already ran is not handed out again
+    grid.ran(9000);
+    EXPECT_EQ(10000, grid.next(9000));
+    EXPECT_EQ(10000, grid.next(9500));
+    // Restarting the loop moves the grid
+    grid.start(10250);
+    EXPECT_EQ(11250, grid.next(10300));
+}
+
+TEST(PollGridTest, ResponsesOnTicks)
+{
+    const Tick period = 1000;
+    std::vector<Tick> arrivals;
+    for (Tick t = 4000; t < 60000; t += 7 * period)
+        arrivals.push_back(t);
+    arrivals.push_back(arrivals.back());
+
+    const Transfer expected = polled(1000, period, arrivals);
+    const Transfer actual = woken(1000, period, arrivals);
+    EXPECT_EQ(expected.copies, actual.copies);
+    EXPECT_LT(actual.ticks, expected.ticks);
+}
+
+TEST(PollGridTest, SameTimingFewerTicks)
+{
+    // Bursts of responses separated by long memory latencies
+    const Tick period = 1000;
+    std::mt19937 rng(0);
+    std::uniform_int_distribution<Tick> gap(0, 3 * period);
+    std::uniform_int_distribution<Tick> latency(40 * period, 80 * period);
+    std::vector<Tick> arrivals;
+    Tick now = 2500;
+    for (int burst = 0; burst < 50; burst++) {
+        now += latency(rng);
+        for (int i = 0; i < 8; i++) {
+            now += gap(rng);
+            arrivals.push_back(now);
+        }
+    }
+
+    const Transfer expected = polled(1500, period, arrivals);
+    const Transfer actual = woken(1500, period, arrivals);
+    EXPECT_EQ(expected.copies, actual.copies);
+    // Only the ticks that copy something, and one per wakeup, are left
+    EXPECT_LE(actual.ticks, 2 * arrivals.size());
+    EXPECT_LT(actual.ticks * 5, expected.ticks);
+}
@@ -30,7 +30,13 @@ ScratchpadMemory::ScratchpadMemory(const ScratchpadMemoryParams &p) :
     latency(p.latency),
     latency_var(p.latency_var),
     bandwidth(p.bandwidth),
-    dequeueEvent([this]{ dequeue(); }, name()) {
+    dequeueEvent([this]{ dequeue(); }, name()),
+    banks(p.num_banks, p.bank_interleave, p.bank_ports),
+    conflictEvent([this]{ retryConflicts(); }, name() + ".conflict"),
+    spmStats(this) {
+    fatal_if(p.num_banks == 0, "%s: num_banks must be at least 1\n", name());
+    fatal_if(p.bank_interleave == 0,
+             "%s: bank_interleave must be at least 1\n", name());
     ready = new bool[range.size()];
     if (readyMode) {
         for (auto i=0;i<range.size();i++) {
@@ -312,6 +318,15 @@ ScratchpadMemory::recvTimingReq(PacketPtr pkt, PortID recvPort, bool validateAcc
         return false;
     }
 
+    // if another request took one of our banks this cycle, try again
+    // on the next one
+    if (!claimBanks(pkt)) {
+        retryReq[idx] = true;
+        if (!conflictEvent.scheduled())
+            schedule(conflictEvent, clockEdge(Cycles(1)));
+        return false;
+    }
+
     // technically the packet only reaches us after the header delay,
     // and since this is a memory controller we also need to
     // deserialise the payload before performing any write operation
@@ -394,6 +409,47 @@ ScratchpadMemory::release()
     }
 }
 
+bool
+ScratchpadMemory::claimBanks(PacketPtr pkt)
+{
+    if (!banks.enabled())
+        return true;
+
+    // requests are granted in the order they arrive within a cycle
+    const Tick cycle = clockEdge();
+    const Addr offset = pkt->getAddr() - range.start();
+    bool conflict = false;
+    banks.forEachBank(offset, pkt->getSize(), [&](unsigned bank) {
+        if (!banks.available(bank, cycle)) {
+            spmStats.bankConflicts[bank]++;
+            conflict = true;
+        }
+    });
+    if (conflict)
+        return false;
+
+    banks.forEachBank(offset, pkt->getSize(), [&](unsigned bank) {
+        banks.use(bank, cycle);
+        spmStats.bankAccesses[bank]++;
+    });
+    return true;
+}
+
+void
+ScratchpadMemory::retryConflicts()
+{
+    // ports that are still busy are retried once they are released
+    for (unsigned idx = 0; idx < retryReq.size(); idx++) {
+        if (retryReq[idx] && !isBusy[idx]) {
+            retryReq[idx] = false;
+            if (idx==0)
+                port.sendRetryReq();
+            else
+                spm_ports[idx-1]->sendRetryReq();
+        }
+    }
+}
+
 void
 ScratchpadMemory::dequeue()
 {
@@ -475,6 +531,48 @@ ScratchpadMemory::drain()
     }
 }
 
+void
+ScratchpadMemory::serialize(CheckpointOut &cp) const
+{
+    assert(packetQueue.empty());
+
+    // The contents are checkpointed with the rest of the physical memory,
+    // only the ready bits are kept here. They are stored as the offsets
+    // at which the ready bit flips, starting from not ready.
+    std::vector<Addr> readyFlips;
+    if (readyMode) {
+        bool current = false;
+        for (Addr i = 0; i < range.size(); i++) {
+            if (ready[i] != current) {
+                readyFlips.push_back(i);
+                current = ready[i];
+            }
+        }
+    }
+    SERIALIZE_CONTAINER(readyFlips);
+    SERIALIZE_SCALAR(initial);
+}
+
+void
+ScratchpadMemory::unserialize(CheckpointIn &cp)
+{
+    std::vector<Addr> readyFlips;
+    UNSERIALIZE_CONTAINER(readyFlips);
+    UNSERIALIZE_SCALAR(initial);
+
+    if (readyMode) {
+        bool current = false;
+        auto flip = readyFlips.begin();
+        for (Addr i = 0; i < range.size(); i++) {
+            if (flip != readyFlips.end() && *flip == i) {
+                current = !current;
+                ++flip;
+            }
+            ready[i] = current;
+        }
+    }
+}
+
 ScratchpadMemory::MemoryPort::MemoryPort(const std::string& _name,
                                      ScratchpadMemory& _memory)
     : ResponsePort(_name, &_memory), memory(_memory)
@@ -523,4 +621,34 @@ ScratchpadMemory::MemoryPort::recvRespRetry()
 // ScratchpadMemoryParams::create()
 // {
 //     return new ScratchpadMemory(this);
-// }
\ No newline at end of file
+// }
+
+ScratchpadMemory::ScratchpadStats::ScratchpadStats(ScratchpadMemory *_owner)
+    : statistics::Group(_owner), owner(_owner),
+    ADD_STAT(bankAccesses, statistics::units::Count::get(),
+             "Number of requests granted by each bank"),
+    ADD_STAT(bankConflicts, statistics::units::Count::get(),
+             "Number of requests refused by each bank for lack of ports"),
+    ADD_STAT(bankConflictRate, statistics::units::Ratio::get(),
+             "Conflicts per granted request of each bank")
+{
+}
+
+void
+ScratchpadMemory::ScratchpadStats::regStats()
+{
+    using namespace statistics;
+
+    Group::regStats();
+
+    const unsigned num_banks = owner->banks.numBanks();
+    bankAccesses.init(num_banks).flags(total | nozero);
+    bankConflicts.init(num_banks).flags(total | nozero);
+    for (unsigned bank = 0; bank < num_banks; bank++) {
+        bankAccesses.subname(bank, "bank" + std::to_string(bank));
+        bankConflicts.subname(bank, "bank" + std::to_string(bank));
+        bankConflictRate.subname(bank, "bank" + std::to_string(bank));
+    }
+    bankConflictRate.flags(total | nozero);
+    bankConflictRate = bankConflicts / bankAccesses;
+}
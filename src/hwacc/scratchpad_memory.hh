@@ -1,6 +1,8 @@
 #ifndef __HWACC_SCRATCHPAD_MEMORY_HH__
 #define __HWACC_SCRATCHPAD_MEMORY_HH__
 
+#include "base/statistics.hh"
+#include "hwacc/bank_arbiter.hh"
 #include "mem/abstract_mem.hh"
 #include "mem/port.hh"
 
@@ -207,6 +209,39 @@ class ScratchpadMemory : public AbstractMemory
     EventFunctionWrapper dequeueEvent;
     // std::vector<Tick> dequeueTick;
 
+    /**
+     * Banks of the array and the accesses each of them accepts per
+     * cycle. Requests that find one of their banks taken are retried on
+     * the next cycle.
+     */
+    BankArbiter banks;
+
+    /**
+     * Claim the banks touched by pkt for the current cycle.
+     *
+     * @return false if one of them has no port left this cycle
+     */
+    bool claimBanks(PacketPtr pkt);
+
+    /**
+     * Send a retry to the ports that lost a bank in the last cycle.
+     */
+    void retryConflicts();
+
+    EventFunctionWrapper conflictEvent;
+
+    struct ScratchpadStats : public statistics::Group
+    {
+        ScratchpadStats(ScratchpadMemory *owner);
+        void regStats() override;
+
+        ScratchpadMemory *owner;
+
+        statistics::Vector bankAccesses;
+        statistics::Vector bankConflicts;
+        statistics::Formula bankConflictRate;
+    } spmStats;
+
     /**
      * Detemine the latency.
      *
@@ -222,6 +257,8 @@ class ScratchpadMemory : public AbstractMemory
 
   public:
     DrainState drain() override;
+    void serialize(CheckpointOut &cp) const override;
+    void unserialize(CheckpointIn &cp) override;
 
     Port &getPort(const std::string &if_name,
                   PortID idx=InvalidPortID) override;
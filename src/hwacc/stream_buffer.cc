@@ -93,28 +93,9 @@ bool StreamBuffer::tvalid(size_t len, bool isRead) {
 Tick
 StreamBuffer::streamRead(PacketPtr pkt) {
     DPRINTF(StreamBuffer, "A read request of size %d was received by this stream buffer\n", pkt->getSize());
-    uint8_t *buff = new uint8_t[pkt->getSize()];
-    readStream(buff, pkt->getSize());
-    uint64_t data = *(uint64_t *)buff;
-    delete[] buff;
-
-    switch(pkt->getSize()) {
-      case 1:
-        pkt->set<uint8_t>(data, endian);
-        break;
-      case 2:
-        pkt->set<uint16_t>(data, endian);
-        break;
-      case 4:
-        pkt->set<uint32_t>(data, endian);
-        break;
-      case 8:
-        pkt->set<uint64_t>(data, endian);
-        break;
-      default:
-        panic("Read size too big?\n");
-        break;
-    }
+    // The buffer holds the bytes exactly as they were written to the
+    // stream, so they can be copied straight into the packet
+    readStream(pkt->getPtr<uint8_t>(), pkt->getSize());
     Tick duration = pkt->getSize() * bandwidth;
     pkt->makeAtomicResponse();
     return duration;
@@ -123,10 +104,7 @@ StreamBuffer::streamRead(PacketPtr pkt) {
 Tick
 StreamBuffer::streamWrite(PacketPtr pkt) {
     DPRINTF(StreamBuffer, "A write request of size %d was received by this stream buffer\n", pkt->getSize());
-    uint8_t * data = new uint8_t[pkt->getSize()];
-    pkt->writeData(data);
-    writeStream(data, pkt->getSize());
-    delete data;
+    writeStream(pkt->getPtr<uint8_t>(), pkt->getSize());
     pkt->makeAtomicResponse();
     return streamDelay;
 }
@@ -25,9 +25,10 @@ StreamDma::StreamDma(const StreamDmaParams &p)
     rdInt(p.rd_int),
     wrInt(p.wr_int),
     tickEvent(this),
+    lastTick(MaxTick),
     bandwidth(p.bandwidth) {
-    readFifo = new DmaReadFifo(dmaPort, rdBufferSize, maxReqSize, maxPending);
-    writeFifo = new DmaWriteFifo(dmaPort, wrBufferSize, maxReqSize, maxPending);
+    readFifo = new WakeupDmaReadFifo<StreamDma>(this, dmaPort, rdBufferSize, maxReqSize, maxPending);
+    writeFifo = new WakeupDmaWriteFifo<StreamDma>(this, dmaPort, wrBufferSize, maxReqSize, maxPending);
     mmreg = new uint8_t[32];
     for (int i=0; i<pioSize; i++)
         mmreg[i]=0;
@@ -77,8 +78,35 @@ StreamDma::getStatusAddrRanges() const {
     return statusRanges;
 }
 
+// The clock edge the polling loop would have ticked on next
+Tick
+StreamDma::nextPollTick() const {
+    Tick edge = clockEdge();
+    return (edge == lastTick) ? clockEdge(Cycles(1)) : edge;
+}
+
+// Would the next tick start or finish a frame? Only the FIFOs and MMR
+// writes change the answer, and both wake the DMA up.
+bool
+StreamDma::canProgress() const {
+    return (!rdRunning && ((*FLAGS&RD_START_MASK)==RD_START_MASK)) ||
+           (!wrRunning && ((*FLAGS&WR_START_MASK)==WR_START_MASK)) ||
+           (rdRunning && !readFifo->isActive()) ||
+           (wrRunning && !writeFifo->isActive());
+}
+
+// Called by the FIFOs after each DMA response, and after stream accesses
+// which may complete a frame when bypassing the caches.
+void
+StreamDma::wakeup() {
+    if (running && !tickEvent.scheduled() && canProgress()) {
+        schedule(tickEvent, nextPollTick());
+    }
+}
+
 void
 StreamDma::tick() {
+    lastTick = curTick();
 
     if (!rdRunning && ((*FLAGS&RD_START_MASK)==RD_START_MASK)) {
         rdRunning = true;
@@ -160,8 +188,10 @@ StreamDma::tick() {
     }
 
     running = rdRunning || wrRunning;
-    if (!tickEvent.scheduled() && running) {
-        schedule(tickEvent, nextCycle());
+    // Sleep while the frames are in flight rather than polling the FIFOs
+    // every cycle. wakeup() resumes the DMA.
+    if (!tickEvent.scheduled() && running && canProgress()) {
+        schedule(tickEvent, nextPollTick());
     }
 }
 
@@ -219,7 +249,7 @@ StreamDma::read(PacketPtr pkt) {
     }
 
     if (!tickEvent.scheduled()) {
-        schedule(tickEvent, nextCycle());
+        schedule(tickEvent, running ? nextPollTick() : nextCycle());
     }
     pkt->makeAtomicResponse();
     return pioDelay;
@@ -243,7 +273,7 @@ StreamDma::write(PacketPtr pkt) {
     }
 
     if (!tickEvent.scheduled()) {
-        schedule(tickEvent, nextCycle());
+        schedule(tickEvent, running ? nextPollTick() : nextCycle());
     }
     pkt->makeAtomicResponse();
     return pioDelay;
@@ -275,6 +305,7 @@ StreamDma::streamRead(PacketPtr pkt) {
         panic("Read size too big?\n");
         break;
     }
+    wakeup();
     Tick duration = pkt->getSize() * bandwidth;
 
     pkt->makeAtomicResponse();
@@ -289,6 +320,7 @@ StreamDma::streamWrite(PacketPtr pkt) {
     pkt->writeData(data);
     writeFifo->fill(data, pkt->getSize());
     delete data;
+    wakeup();
 
     pkt->makeAtomicResponse();
     return pioDelay;
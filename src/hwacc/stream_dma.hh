@@ -2,7 +2,7 @@
 #define __HWACC_STREAM_DMA_HH__
 //------------------------------------------//
 #include "hwacc/LLVMRead/src/debug_flags.hh"
-#include "hwacc/dma_write_fifo.hh"
+#include "hwacc/wakeup_dma_fifo.hh"
 #include "params/StreamDma.hh"
 #include "dev/dma_device.hh"
 #include "dev/arm/base_gic.hh"
@@ -118,6 +118,10 @@ class StreamDma : public DmaDevice {
     };
 
     TickEvent tickEvent;
+    // Last tick the event ran on
+    Tick lastTick;
+    Tick nextPollTick() const;
+    bool canProgress() const;
 
     const double bandwidth;
 
@@ -168,6 +172,7 @@ class StreamDma : public DmaDevice {
     AddrRangeList getStatusAddrRanges() const;
 
     void tick();
+    void wakeup();
 
     Tick read(PacketPtr pkt);
     Tick write(PacketPtr pkt);
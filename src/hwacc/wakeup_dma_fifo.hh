@@ -0,0 +1,73 @@
+/*
+ * Copyright (c) 2026 The Regents of the University of California
+ * All rights reserved.
+ *
+ * Redistribution and use in source and binary forms, with or without
+ * modification, are permitted provided that the following conditions are
+ * met: redistributions of source code must retain the above copyright
+ * notice, this list of conditions and the following disclaimer;
+ * redistributions in binary form must reproduce the above copyright
+ * notice, this list of conditions and the following disclaimer in the
+ * documentation and/or other materials provided with the distribution;
+ * neither the name of the copyright holders nor the names of its
+ * contributors may be used to endorse or promote products derived from
+ * this software without specific prior written permission.
+ *
+ * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ * "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ * LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ * A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ * OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ * SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ * LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ * DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ * THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ * (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ * OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ */
+
+
+#ifndef __HWACC_WAKEUP_DMA_FIFO_HH__
+#define __HWACC_WAKEUP_DMA_FIFO_HH__
+
+#include "dev/dma_device.hh"
+#include "hwacc/dma_write_fifo.hh"
+
+/**
+ * DMA FIFOs that call Device::wakeup() every time they have handled a
+ * response, so that the device can sleep while it waits on memory instead
+ * of polling the FIFO.
+ */
+template <class Device>
+class WakeupDmaReadFifo : public DmaReadFifo
+{
+  private:
+    Device *dev;
+
+  public:
+    WakeupDmaReadFifo(Device *_dev, DmaPort &port, size_t size,
+                      unsigned max_req_size, unsigned max_pending)
+        : DmaReadFifo(port, size, max_req_size, max_pending), dev(_dev)
+    {}
+
+  protected:
+    void onResponse() override { dev->wakeup(); }
+};
+
+template <class Device>
+class WakeupDmaWriteFifo : public DmaWriteFifo
+{
+  private:
+    Device *dev;
+
+  public:
+    WakeupDmaWriteFifo(Device *_dev, DmaPort &port, size_t size,
+                       unsigned max_req_size, unsigned max_pending)
+        : DmaWriteFifo(port, size, max_req_size, max_pending), dev(_dev)
+    {}
+
+  protected:
+    void onResponse() override { dev->wakeup(); }
+};
+
+#endif // __HWACC_WAKEUP_DMA_FIFO_HH__
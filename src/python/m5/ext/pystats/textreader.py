@@ -0,0 +1,296 @@
+# Copyright (c) 2021 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+A reader for the gem5 text statistics format (`stats.txt`/`stats.txt.gz`).
+
+The file is scanned once, in large blocks, to record the byte range of every
+`Begin/End Simulation Statistics` dump. Dumps are then only read and parsed
+when they are asked for, so a window late in a long periodic-dump run can be
+inspected without parsing everything before it.
+
+Usage
+-----
+```
+from m5.ext.pystats.textreader import TextStatsReader
+
+with TextStatsReader("m5out/stats.txt") as reader:
+    names, values = reader.to_numpy("system.cpu*.ipc", "simTicks")
+    # values.shape == (len(reader), len(names))
+```
+"""
+
+import gzip
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import translate
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+BEGIN_MARKER = b"---------- Begin Simulation Statistics ----------"
+END_MARKER = b"---------- End Simulation Statistics   ----------"
+
+# A statistic line is "<name> <value> [<more columns>] # <description>".
+# Names never start with '-' (the dump markers) or '#'.
+_stat_line = re.compile(rb"^([^\s#-]\S*)[ \t]+(\S+)", re.MULTILINE)
+
+def _to_float(values: Sequence[bytes]) -> np.ndarray:
+    try:
+        return np.array(values, dtype=np.bytes_).astype(np.float64)
+    except ValueError:
+        out = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except ValueError:
+                out[i] = np.nan
+        return out
+
+class TextStatsReader:
+    """
+    Indexed, lazily parsed view of a gem5 text statistics file.
+
+    Each dump is addressed by its position in the file. `reader[i]` returns a
+    dict mapping stat names to float values for dump `i`; the most recently
+    used dumps are kept in a small cache. `to_numpy` selects stats by glob (or
+    regular expression) and returns a dumps x stats float64 array, with NaN
+    wherever a stat is absent from a dump.
+
+    A trailing dump without an end marker (e.g., from a simulation that is
+    still running) is included in the index.
+    """
+
+    def __init__(self, path: str, cache_size: int = 8,
+                 block_size: int = 1 << 24):
+        self.path = path
+        self._cache_size = cache_size
+        self._cache = OrderedDict() # type: OrderedDict
+        if path.endswith(".gz"):
+            self._file = gzip.open(path, "rb")
+        else:
+            self._file = open(path, "rb")
+        self.offsets = self._build_index(block_size)
+
+    def __enter__(self) -> "TextStatsReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def _build_index(self, block_size: int) -> np.ndarray:
+        """
+        Scan the whole file once and return an (N, 2) array holding the
+        [start, end) byte offsets of the body of each dump.
+        """
+        offsets = []
+        begin = None
+        pos = 0
+        tail = b""
+        keep = max(len(BEGIN_MARKER), len(END_MARKER)) - 1
+        self._file.seek(0)
+        while True:
+            block = self._file.read(block_size)
+            if not block:
+                break
+            buf = tail + block
+            base = pos - len(tail)
+            i = 0
+            while True:
+                marker = BEGIN_MARKER if begin is None else END_MARKER
+                j = buf.find(marker, i)
+                if j < 0:
+                    break
+                if begin is None:
+                    begin = base + j + len(marker)
+                else:
+                    offsets.append((begin, base + j))
+                    begin = None
+                i = j + len(marker)
+            tail = buf[max(i, len(buf) - keep):]
+            pos += len(block)
+
+        if begin is not None and pos > begin:
+            offsets.append((begin, pos))
+
+        return np.array(offsets, dtype=np.int64).reshape(-1, 2)
+
+    def _read(self, index: int) -> bytes:
+        start, end = self.offsets[index]
+        self._file.seek(int(start))
+        return self._file.read(int(end - start))
+
+    def _parse(self, index: int) -> Dict[str, float]:
+        pairs = _stat_line.findall(self._read(index))
+        values = _to_float([value for _, value in pairs])
+        return dict(zip((name.decode() for name, _ in pairs),
+                        values.tolist()))
+
+    def __getitem__(self, index: int) -> Dict[str, float]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Dump {index} out of range")
+
+        dump = self._cache.get(index)
+        if dump is not None:
+            self._cache.move_to_end(index)
+            return dump
+
+        dump = self._parse(index)
+        self._cache[index] = dump
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return dump
+
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def names(self, dump: int = 0) -> List[str]:
+        """Names of all statistics in a dump, in file order."""
+        return list(self[dump].keys())
+
+    def select(self, *patterns: str, regex: bool = False,
+               dump: int = 0) -> List[str]:
+        """
+        Names in a dump matching any of the given glob patterns (or regular
+        expressions when `regex` is True), in file order.
+        """
+        matcher = self._matcher(patterns, regex)
+        return [name for name in self[dump] if matcher(name)]
+
+    def to_numpy(self, *patterns: str, regex: bool = False,
+                 dumps: Optional[Iterable[int]] = None,
+                 processes: int = 1) -> Tuple[List[str], np.ndarray]:
+        """
+        Extract the selected statistics from the selected dumps.
+
+        With no patterns every statistic is returned. Dumps are read in file
+        order regardless of the order they are given in, so compressed files
+        are decompressed in a single forward pass. With `processes` > 1 the
+        dumps are split into contiguous chunks that are parsed in parallel.
+
+        :returns: A list of stat names and a float64 array of shape
+            (len(dumps), len(names)).
+        """
+        if dumps is None:
+            dumps = range(len(self))
+        dumps = [index + len(self) if index < 0 else index for index in dumps]
+        order = sorted(set(dumps))
+        ranges = [tuple(self.offsets[index]) for index in order]
+
+        if processes > 1 and len(order) > 1:
+            chunk = -(-len(order) // processes)
+            with ProcessPoolExecutor(processes) as pool:
+                futures = [pool.submit(_extract, self.path,
+                                       ranges[i:i + chunk], patterns, regex)
+                           for i in range(0, len(order), chunk)]
+                parsed = [row for f in futures for row in f.result()]
+        else:
+            parsed = _extract(self._file, ranges, patterns, regex)
+
+        columns = {} # type: Dict[str, int]
+        rows = {}
+        layout = None
+        for index, (names, values) in zip(order, parsed):
+            if layout is None or layout[0] != names:
+                cols = [columns.setdefault(name, len(columns))
+                        for name in names]
+                layout = (names, np.array(cols, dtype=np.intp))
+            rows[index] = (layout[1], values)
+
+        out = np.full((len(dumps), len(columns)), np.nan)
+        for i, index in enumerate(dumps):
+            cols, values = rows[index]
+            out[i, cols] = values
+        return list(columns.keys()), out
+
+    @staticmethod
+    def _matcher(patterns: Sequence[str], regex: bool):
+        if regex:
+            expr = "|".join(f"(?:{p})" for p in patterns)
+        else:
+            expr = "|".join(translate(p) for p in patterns)
+        compiled = re.compile(expr)
+        seen = {} # type: Dict[str, bool]
+
+        # Stat names repeat in every dump; only run the expression once each.
+        def matcher(name: str) -> bool:
+            match = seen.get(name)
+            if match is None:
+                match = seen[name] = compiled.fullmatch(name) is not None
+            return match
+
+        return matcher
+
+def _extract(source, ranges: Sequence[Tuple[int, int]],
+             patterns: Sequence[str], regex: bool
+            ) -> List[Tuple[Tuple[str, ...], np.ndarray]]:
+    """
+    Parse the dumps at the given byte ranges of `source` (an open file or a
+    path) and return the selected names and values of each.
+
+    This bypasses the dump cache so a bulk read does not evict useful entries.
+    Consecutive dumps nearly always share a layout, in which case the
+    selection of the previous dump is reused and the same names tuple is
+    returned (which also keeps the result cheap to pickle).
+    """
+    if isinstance(source, str):
+        opener = gzip.open if source.endswith(".gz") else open
+        with opener(source, "rb") as f:
+            return _extract(f, ranges, patterns, regex)
+
+    matcher = TextStatsReader._matcher(patterns, regex) if patterns else None
+    result = []
+    layout = None
+    for start, end in ranges:
+        source.seek(int(start))
+        pairs = _stat_line.findall(source.read(int(end - start)))
+        raw_names, values = zip(*pairs) if pairs else ((), ())
+        if layout is None or layout[0] != raw_names:
+            keep, names = [], []
+            for pos, name in enumerate(raw_names):
+                name = name.decode()
+                if matcher is None or matcher(name):
+                    keep.append(pos)
+                    names.append(name)
+            layout = (raw_names, np.array(keep, dtype=np.intp), tuple(names))
+        _, keep, names = layout
+        if len(keep) == len(values):
+            result.append((names, _to_float(values)))
+        else:
+            result.append((names,
+                           _to_float(np.array(values, dtype=np.bytes_)[keep])))
+    return result
@@ -197,6 +197,9 @@ class Gem5Fixture(SConsFixture):
                              'PROTOCOL=' + protocol ]
         self.set_global()
 
+    def cache_inputs(self):
+        return (self.path,)
+
 class MakeFixture(Fixture):
     def __init__(self, directory, *args, **kwargs):
         name = 'make -C %s' % directory
@@ -286,6 +289,9 @@ class DownloadedProgram(UniqueFixture):
         self.name = "Downloaded:" + self.filename
         self.gzip_decompress = gzip_decompress
 
+    def cache_inputs(self):
+        return (self.filename,)
+
     def _download(self):
         import errno
         log.test_log.debug("Downloading " + self.url + " to " + self.path)
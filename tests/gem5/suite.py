@@ -43,7 +43,7 @@ import sys
 
 from testlib.test_util import TestFunction
 from testlib.suite import TestSuite
-from testlib.helper import log_call
+from testlib.helper import log_call, absdirpath, joinpath
 from testlib.configuration import constants, config
 from .fixture import TempdirFixture, Gem5Fixture, VariableFixture
 
@@ -88,6 +88,17 @@ def gem5_verify_config(name,
     fixtures = list(fixtures)
     testsuites = []
 
+    # What the result cache needs to know to skip a gem5 run which passed
+    # before. Most configs import from the top-level configs directory.
+    cache_inputs = [config, os.path.dirname(config),
+                    joinpath(absdirpath(__file__), os.pardir, os.pardir,
+                             'configs')]
+    cache_inputs.extend(config_args)
+    if isinstance(gem5_args, str):
+        cache_inputs.append(gem5_args)
+    elif gem5_args is not None:
+        cache_inputs.extend(gem5_args)
+
     for host in valid_hosts:
         for opt in valid_variants:
             for isa in valid_isas:
@@ -136,7 +147,8 @@ def gem5_verify_config(name,
                     name=_name,
                     fixtures=_fixtures,
                     tags=tags,
-                    tests=tests))
+                    tests=tests,
+                    cache_inputs=cache_inputs))
     return testsuites
 
 def _create_test_run_gem5(config, config_args, gem5_args):
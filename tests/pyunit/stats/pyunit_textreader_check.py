@@ -0,0 +1,121 @@
+# Copyright (c) 2021 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import gzip
+import math
+import os
+import tempfile
+import unittest
+
+try:
+    from m5.ext.pystats.textreader import TextStatsReader
+    have_numpy = True
+except ImportError:
+    have_numpy = False
+
+_dump_template = """
+---------- Begin Simulation Statistics ----------
+simSeconds                                   {seconds}                       # Number of seconds simulated (Second)
+simTicks                                     {ticks}                       # Number of ticks simulated (Tick)
+system.cpu0.ipc                              {ipc}                       # IPC: instructions per cycle ((Count/Cycle))
+system.cpu1.ipc                              nan                       # IPC: instructions per cycle ((Count/Cycle))
+system.cpu0.op_class::IntAlu                 {alu}     50.00%     50.00% # Class of executed instruction (Count)
+{extra}
+---------- End Simulation Statistics   ----------
+"""
+
+def _dump(i, extra=""):
+    return _dump_template.format(seconds=i * 1e-6, ticks=i * 1000000,
+                                 ipc=0.5 + i, alu=10 * i, extra=extra)
+
+@unittest.skipUnless(have_numpy, "numpy is required by the text reader")
+class TextReaderTestSuite(unittest.TestCase):
+    """Test cases for the indexed stats.txt reader"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.text = _dump(1) + _dump(2, "system.late  7  # Late (Count)") \
+            + _dump(3)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write(self, name, text):
+        path = os.path.join(self.dir.name, name)
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(path, "wt") as f:
+            f.write(text)
+        return path
+
+    def test_index(self):
+        path = self._write("stats.txt", self.text)
+        # A tiny block size makes the markers straddle block boundaries.
+        with TextStatsReader(path, block_size=7) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(reader[1]["simTicks"], 2000000)
+            self.assertEqual(reader[-1]["system.cpu0.op_class::IntAlu"], 30)
+            self.assertTrue(math.isnan(reader[0]["system.cpu1.ipc"]))
+            with self.assertRaises(IndexError):
+                reader[3]
+
+    def test_gzip(self):
+        path = self._write("stats.txt.gz", self.text)
+        with TextStatsReader(path) as reader:
+            self.assertEqual(len(reader), 3)
+            self.assertEqual(reader[2]["simTicks"], 3000000)
+            self.assertEqual(reader[0]["simTicks"], 1000000)
+
+    def test_truncated_dump(self):
+        text = self.text + _dump(4).rsplit("----------", 2)[0]
+        path = self._write("stats.txt", text)
+        with TextStatsReader(path) as reader:
+            self.assertEqual(len(reader), 4)
+            self.assertEqual(reader[3]["simTicks"], 4000000)
+
+    def test_select(self):
+        path = self._write("stats.txt", self.text)
+        with TextStatsReader(path) as reader:
+            self.assertEqual(reader.select("system.cpu*.ipc"),
+                             ["system.cpu0.ipc", "system.cpu1.ipc"])
+            self.assertEqual(reader.select(r"sim(Ticks|Seconds)",
+                                           regex=True),
+                             ["simSeconds", "simTicks"])
+
+    def test_to_numpy(self):
+        path = self._write("stats.txt", self.text)
+        with TextStatsReader(path) as reader:
+            names, values = reader.to_numpy("simTicks", "system.late")
+            self.assertEqual(names, ["simTicks", "system.late"])
+            self.assertEqual(values.shape, (3, 2))
+            self.assertEqual(list(values[:, 0]), [1e6, 2e6, 3e6])
+            self.assertEqual(values[1, 1], 7)
+            self.assertTrue(math.isnan(values[0, 1]))
+
+            names, values = reader.to_numpy("simTicks", dumps=[2, 0])
+            self.assertEqual(list(values[:, 0]), [3e6, 1e6])
+
+            names, values = reader.to_numpy()
+            self.assertEqual(len(names), 6)
@@ -0,0 +1,154 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import argparse
+import importlib.util
+import io
+import os
+import random
+import tempfile
+import unittest
+
+try:
+    import numpy
+    have_numpy = True
+except ImportError:
+    have_numpy = False
+
+_script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       os.pardir, os.pardir, os.pardir,
+                       "util", "streamline", "m5stats2streamline.py")
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location("m5stats2streamline",
+                                                  _script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+_stats_template = """
+---------- Begin Simulation Statistics ----------
+final_tick                                {tick}                       # Number of ticks from beginning of simulation
+sim_freq                                  1000000000000                       # Frequency of simulated ticks
+system.cpu0.numCycles                     {cycles0}                       # number of cpu cycles simulated
+system.cpu1.numCycles                     {cycles1}                       # number of cpu cycles simulated
+system.cpu0.numCycles                     999                       # duplicate, ignored
+system.l2.overall_misses::total           {misses}     50.00%     50.00% # not a plain scalar
+system.mem.bytes_read                     {read}                       # Number of bytes read
+---------- End Simulation Statistics   ----------
+"""
+
+@unittest.skipUnless(have_numpy, "numpy is required by the bulk encoder")
+class StreamlineTestSuite(unittest.TestCase):
+    """Test cases for the Streamline .apc frame encoding"""
+
+    def setUp(self):
+        self.m = _load_script()
+        self.m.args = argparse.Namespace(verbose=False)
+        self.random = random.Random(5)
+
+    def edge_values(self):
+        values = [0, -1, 1, -(1 << 63), (1 << 63) - 1]
+        for k in range(1, 64):
+            values += [(1 << k) - 1, 1 << k, -(1 << k), -(1 << k) - 1]
+        values += [self.random.randint(-(1 << 63), (1 << 63) - 1)
+                   for _ in range(1000)]
+        return [v for v in values if -(1 << 63) <= v < (1 << 63)]
+
+    def test_packedArray(self):
+        values = self.edge_values()
+        encoded, lengths = self.m.packedArray(values)
+        golden = [self.m.packed32(v) for v in values]
+        self.assertEqual(lengths.tolist(), [len(g) for g in golden])
+        self.assertEqual(bytes(encoded), bytes(b for g in golden for b in g))
+
+    def test_encodeFrames(self):
+        values = self.edge_values()
+        n = len(values)
+        core = [self.random.randrange(4) for _ in range(n)]
+        key = [self.random.randrange(1, 300) for _ in range(n)]
+        timestamp = sorted(self.random.randrange(1 << 40) for _ in range(n))
+        blob = self.m.encodeFrames("Counter", core,
+                                   [timestamp, core, key, values])
+        self.assertIsInstance(blob, bytearray)
+        golden = []
+        for args in zip(timestamp, core, key, values):
+            golden += self.m.counterFrame(*args)
+        self.assertEqual(bytes(blob), bytes(golden))
+
+    def _stats(self, num_timestamps):
+        m = self.m
+        m.num_cpus = 2
+        m.ticks_in_ns = 1000
+        m.end_tick = 1 << 62
+        stats = m.Stats()
+        stats.register("system.cpu#.numCycles", "cpu", 0, True)
+        stats.register("system.mem.bytes_read", "mem", 0, False)
+        stats.createStatsIndex()
+        for n in range(num_timestamps):
+            stats.tick_list.append((n + 1) * 1000000)
+            stats.stats_list[0].append_value(n * 3, 0)
+            stats.stats_list[0].append_value(-n, 1)
+            stats.stats_list[1].append_value(n << 40)
+        return stats
+
+    def test_writeCounters(self):
+        stats = self._stats(100)
+        # Force several blocks
+        self.m.counter_block_frames = 7
+        bulk = io.BytesIO()
+        self.m.writeCounters(bulk, stats)
+
+        self.m.np = None
+        golden = io.BytesIO()
+        self.m.writeCounters(golden, stats)
+
+        self.assertTrue(golden.getvalue())
+        self.assertEqual(bulk.getvalue(), golden.getvalue())
+
+    def test_readGem5Stats(self):
+        stats = self._stats(0)
+        self.m.ticks_in_ns = -1
+        text = "".join(_stats_template.format(
+                           tick=(n + 1) * 1000, cycles0=10 * n,
+                           cycles1=10 * n + 1, misses=n, read=2.5e3 * n)
+                       for n in range(3))
+        # The last window is cut short, so missing stats read as zero
+        text += "\n---------- Begin Simulation Statistics ----------\n" \
+            "final_tick    4000    # Number of ticks\n" \
+            "---------- End Simulation Statistics   ----------\n"
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "stats.txt")
+            with open(path, "w") as f:
+                f.write(text)
+            self.m.readGem5Stats(stats, path)
+
+        cycles, read = stats.stats_list
+        self.assertEqual(self.m.ticks_in_ns, 1000)
+        self.assertEqual(stats.tick_list, [1000, 2000, 3000, 4000])
+        self.assertEqual(cycles.values, [[0, 10, 20, 0], [1, 11, 21, 0]])
+        self.assertEqual(read.values, [0, 2500, 5000, 0])
+        self.assertEqual(cycles.description, "number of cpu cycles simulated")
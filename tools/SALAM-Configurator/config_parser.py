@@ -63,6 +63,29 @@ class AccCluster:
                         )
                     aligned_inc = int(pio_size) + (64 - (int(pio_size) % 64))
                     top_address = top_address + aligned_inc
+                elif 'MultiChannel' in device_dict['Type']:
+                    channels = device_dict.get('Channels', 4)
+                    # A 32 byte global block and 32 bytes per channel
+                    pio_size = 32 * (channels + 1)
+                    pio_masters = []
+                    if 'PIOMaster' in device_dict:
+                        pio_masters.extend(
+                            (device_dict['PIOMaster'].split(',')))
+                    dma_class.append(
+                        DMA(
+                            name=device_dict['Name'],
+                            pio=pio_size,
+                            pio_masters=pio_masters,
+                            address=top_address,
+                            dmaType=device_dict['Type'],
+                            int_num=device_dict.get('InterruptNum'),
+                            size=device_dict.get('BufferSize', 1024),
+                            maxReq=device_dict.get('MaxReqSize', 64),
+                            channels=channels
+                        )
+                    )
+                    aligned_inc = int(pio_size) + (64 - (int(pio_size) % 64))
+                    top_address = top_address + aligned_inc
                 elif 'Stream' in device_dict['Type']:
                     pio_size = 32
                     statusSize = 4
@@ -445,7 +468,8 @@ class DMA:
         dmaType: str,
         int_num=None,
         size: int = 64,
-        maxReq: int = 4
+        maxReq: int = 4,
+        channels: int = 1
     ):
         self.name = name.lower()
         self.pio = pio
@@ -455,6 +479,7 @@ class DMA:
         self.dmaType = dmaType
         self.int_num = int_num
         self.maxReq = maxReq
+        self.channels = channels
 
         for master in self.pio_masters:
             count = 0
@@ -467,10 +492,18 @@ class DMA:
         lines = []
         dmaPath = "clstr." + self.name + "."
         systemPath = "clstr."
-        lines.append("# Noncoherent DMA")
-        lines.append("clstr." + self.name + " = NoncoherentDma(pio_addr="
-                     + hex(self.address) + ", pio_size = " + str(self.pio)
-                     + ", gic=gic, int_num=" + str(self.int_num) + ")")
+        if "MultiChannel" in self.dmaType:
+            lines.append("# Multi-channel DMA")
+            lines.append("clstr." + self.name + " = MultiChannelDma(pio_addr="
+                         + hex(self.address) + ", num_channels = "
+                         + str(self.channels) + ", gic=gic)")
+            if self.int_num is not None:
+                lines.append(dmaPath + "int_num = " + str(self.int_num))
+        else:
+            lines.append("# Noncoherent DMA")
+            lines.append("clstr." + self.name + " = NoncoherentDma(pio_addr="
+                         + hex(self.address) + ", pio_size = " + str(self.pio)
+                         + ", gic=gic, int_num=" + str(self.int_num) + ")")
         lines.append(dmaPath + "cluster_dma = " +
                      systemPath + "local_bus.cpu_side_ports")
         lines.append(dmaPath + "max_req_size = " + str(self.maxReq))
@@ -508,6 +541,10 @@ class Variable:
             self.resetOnRead = kwargs.get('ResetOnRead', True)
             self.readOnInvalid = kwargs.get('ReadOnInvalid', False)
             self.writeOnValid = kwargs.get('WriteOnValid', True)
+            # Banking, left to the ScratchpadMemory defaults if not given
+            self.banks = kwargs.get('Banks')
+            self.bankInterleave = kwargs.get('BankInterleave')
+            self.bankPorts = kwargs.get('BankPorts')
             # Append the default connection here... probably need to be more elegant
             self.connections.append(PortedConnection(self.accName, self.ports))
             # Append other connections to the connections list
@@ -585,6 +622,15 @@ class Variable:
                          "read_on_invalid = " + str(self.readOnInvalid))
             lines.append("clstr." + self.name.lower() + "." +
                          "write_on_valid = " + str(self.writeOnValid))
+            if self.banks is not None:
+                lines.append("clstr." + self.name.lower() + "." +
+                             "num_banks = " + str(self.banks))
+            if self.bankInterleave is not None:
+                lines.append("clstr." + self.name.lower() + "." +
+                             "bank_interleave = " + str(self.bankInterleave))
+            if self.bankPorts is not None:
+                lines.append("clstr." + self.name.lower() + "." +
+                             "bank_ports = " + str(self.bankPorts))
             lines.append("clstr." + self.name.lower() + "." +
                          "port" + " = " + "clstr.local_bus.mem_side_ports")
             for con in self.connections:
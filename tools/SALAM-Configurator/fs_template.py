@@ -230,7 +230,7 @@ def build_test_system(np):
         # FutureCPUClass is in the Simulation module. If the check passes then the
         # elastic trace probe is attached to the switch CPUs.
         if args.elastic_trace_en and args.checkpoint_restore == None and \
-            not args.fast_forward:
+            not args.fast_forward and not args.fast_forward_until:
             CpuConfig.config_etrace(TestCPUClass, test_sys.cpu, args)
 
         CacheConfig.config_cache(args, test_sys)
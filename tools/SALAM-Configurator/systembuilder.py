@@ -210,6 +210,24 @@ def gen_header(header_list, clusters, working_dir: str):
                             "#define " + dma.name.upper() + "_WrAddr " + hex(dma.address + 9) + "\n")
                         current_header.append(
                             "#define " + dma.name.upper() + "_CopyLen " + hex(dma.address + 17) + "\n")
+                    elif dma.dmaType == "MultiChannel":
+                        current_header.append(
+                            "//" + dma.dmaType + "DMA" + "\n")
+                        current_header.append(
+                            "#define " + dma.name.upper() + "_Status " + hex(dma.address) + "\n")
+                        current_header.append(
+                            "#define " + dma.name.upper() + "_Coalesce " + hex(dma.address + 4) + "\n")
+                        current_header.append(
+                            "#define " + dma.name.upper() + "_Events " + hex(dma.address + 8) + "\n")
+                        for ch in range(dma.channels):
+                            chAddress = dma.address + 32 * (ch + 1)
+                            chName = dma.name.upper() + "_Ch" + str(ch)
+                            current_header.append(
+                                "#define " + chName + "_Flags " + hex(chAddress) + "\n")
+                            current_header.append(
+                                "#define " + chName + "_DescAddr " + hex(chAddress + 8) + "\n")
+                            current_header.append(
+                                "#define " + chName + "_Done " + hex(chAddress + 16) + "\n")
                     elif dma.dmaType == "Stream":
                         current_header.append(
                             "//" + dma.dmaType + "DMA" + "\n")
@@ -36,6 +36,8 @@ class HWModel():
         self.alias = self.data['functional_unit']['parameters']['alias']
         self.stages = self.data['functional_unit']['parameters']['stages']
         self.cycles = self.data['functional_unit']['parameters']['cycles']
+        # Cycles between issues to one unit, 0 derives it from cycles/stages
+        self.initiation_interval = self.data['functional_unit']['parameters'].get('initiation_interval', 0)
         self.enum_value = self.data['functional_unit']['parameters']['enum_value']
         self.int_size = self.data['functional_unit']['parameters']['datatypes']['integer']['size']
         self.int_sign = self.data['functional_unit']['parameters']['datatypes']['integer']['sign']
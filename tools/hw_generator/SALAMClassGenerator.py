@@ -94,6 +94,7 @@ class FunctionalUnitGenerator():
         self.new_source.write("\tFunctionalUnitBase( params.alias,\n")
         self.new_source.write("\t\t\t\t\t\tparams.stages,\n")
         self.new_source.write("\t\t\t\t\t\tparams.cycles,\n")
+        self.new_source.write("\t\t\t\t\t\tparams.initiation_interval,\n")
         self.new_source.write("\t\t\t\t\t\tparams.enum_value,\n")
         self.new_source.write("\t\t\t\t\t\tparams.int_size,\n")
         self.new_source.write("\t\t\t\t\t\tparams.int_sign,\n")
@@ -198,6 +199,7 @@ class FunctionalUnitGenerator():
             self.base_header_file.write("\t\tstd::string _alias;\n")
             self.base_header_file.write("\t\tuint32_t _stages;\n")
             self.base_header_file.write("\t\tuint32_t _cycles;\n")
+            self.base_header_file.write("\t\tuint32_t _initiation_interval;\n")
             self.base_header_file.write("\t\tuint32_t _enum_value;\n")
             self.base_header_file.write("\t\tstd::string _int_size;\n")
             self.base_header_file.write("\t\tstd::string _int_sign;\n")
@@ -236,6 +238,7 @@ class FunctionalUnitGenerator():
             self.base_header_file.write("\t\tFunctionalUnitBase( std::string alias,\n")
             self.base_header_file.write("\t\t\t\t\t\t\tuint32_t stages,\n")
             self.base_header_file.write("\t\t\t\t\t\t\tuint32_t cycles,\n")
+            self.base_header_file.write("\t\t\t\t\t\t\tuint32_t initiation_interval,\n")
             self.base_header_file.write("\t\t\t\t\t\t\tuint32_t enum_value,\n")
             self.base_header_file.write("\t\t\t\t\t\t\tstd::string int_size,\n")
             self.base_header_file.write("\t\t\t\t\t\t\tstd::string int_sign,\n")
@@ -262,6 +265,7 @@ class FunctionalUnitGenerator():
             self.base_header_file.write("\t\t\t\t\t\t\t_alias(alias),\n")
             self.base_header_file.write("\t\t\t\t\t\t\t_stages(stages),\n")
             self.base_header_file.write("\t\t\t\t\t\t\t_cycles(cycles),\n")
+            self.base_header_file.write("\t\t\t\t\t\t\t_initiation_interval(initiation_interval),\n")
             self.base_header_file.write("\t\t\t\t\t\t\t_enum_value(enum_value),\n")
             self.base_header_file.write("\t\t\t\t\t\t\t_int_size(int_size),\n")
             self.base_header_file.write("\t\t\t\t\t\t\t_int_sign(int_sign),\n")
@@ -290,6 +294,7 @@ class FunctionalUnitGenerator():
             self.base_header_file.write("\t\tstd::string get_alias() { return _alias; }\n")
             self.base_header_file.write("\t\tuint32_t get_stages() { return _stages; }\n")
             self.base_header_file.write("\t\tuint32_t get_cycles() { return _cycles; }\n")
+            self.base_header_file.write("\t\tuint32_t get_initiation_interval() { return _initiation_interval; }\n")
             self.base_header_file.write("\t\tuint32_t get_enum_value() { return _enum_value; }\n")
             self.base_header_file.write("\t\tstd::string get_int_size() { return _int_size; }\n")
             self.base_header_file.write("\t\tstd::string get_int_sign() { return _int_sign; }\n")
@@ -365,6 +370,7 @@ class FunctionalUnitGenerator():
             self.simobject_file.write("\talias = Param.String(\"" + self.alias + "\", \"Default values set from " + self.alias + ".yml\")\n")
             self.simobject_file.write("\tstages = Param.UInt32(" + str(self.hwmodel.stages) + ", \"Default values set from " + self.alias + ".yml\")\n")
             self.simobject_file.write("\tcycles = Param.UInt32(" + str(self.hwmodel.cycles) + ", \"Default values set from " + self.alias + ".yml\")\n")
+            self.simobject_file.write("\tinitiation_interval = Param.UInt32(" + str(self.hwmodel.initiation_interval) + ", \"Default values set from " + self.alias + ".yml\")\n")
             self.simobject_file.write("\tenum_value = Param.UInt32(" + str(self.hwmodel.enum_value) + ", \"Default values set from " + self.alias + ".yml\")\n")
             self.simobject_file.write("\tint_size = Param.String(\"" + str(self.hwmodel.int_size) + "\", \"Default values set from " + self.alias + ".yml\")\n")
             self.simobject_file.write("\tint_sign = Param.String(\"" + str(self.hwmodel.int_sign) + "\", \"Default values set from " + self.alias + ".yml\")\n")
@@ -382,13 +388,13 @@ class FunctionalUnitGenerator():
             self.simobject_file.write("\ttime_units = Param.String(\"" + str(self.hwmodel.time_units) + "\", \"Default values set from " + self.alias + ".yml\")\n")
             self.simobject_file.write("\tarea_units = Param.String(\"" + str(self.hwmodel.area_units) + "\", \"Default values set from " + self.alias + ".yml\")\n")
             self.simobject_file.write("\tfu_latency = Param.UInt32(" + str(self.hwmodel.fu_latency) + ", \"Default values set from " + self.alias + ".yml\")\n")
-            self.simobject_file.write("\tinternal_power = Param.UInt32(" + str(self.hwmodel.internal_power) + ", \"Default values set from " + self.alias + ".yml\")\n")
-            self.simobject_file.write("\tswitch_power = Param.UInt32(" + str(self.hwmodel.switch_power) + ", \"Default values set from " + self.alias + ".yml\")\n")
-            self.simobject_file.write("\tdynamic_power = Param.UInt32(" + str(self.hwmodel.dynamic_power) + ", \"Default values set from " + self.alias + ".yml\")\n")
-            self.simobject_file.write("\tdynamic_energy = Param.UInt32(" + str(self.hwmodel.dynamic_energy) + ", \"Default values set from " + self.alias + ".yml\")\n")
-            self.simobject_file.write("\tleakage_power = Param.UInt32(" + str(self.hwmodel.leakage_power) + ", \"Default values set from " + self.alias + ".yml\")\n")
-            self.simobject_file.write("\tarea = Param.UInt32(" + str(self.hwmodel.area) + ", \"Default values set from " + self.alias + ".yml\")\n")
-            self.simobject_file.write("\tpath_delay = Param.UInt32(" + str(self.hwmodel.path_delay) + ", \"Default values set from " + self.alias + ".yml\")\n\n")
+            self.simobject_file.write("\tinternal_power = Param.Float(" + str(self.hwmodel.internal_power) + ", \"Default values set from " + self.alias + ".yml\")\n")
+            self.simobject_file.write("\tswitch_power = Param.Float(" + str(self.hwmodel.switch_power) + ", \"Default values set from " + self.alias + ".yml\")\n")
+            self.simobject_file.write("\tdynamic_power = Param.Float(" + str(self.hwmodel.dynamic_power) + ", \"Default values set from " + self.alias + ".yml\")\n")
+            self.simobject_file.write("\tdynamic_energy = Param.Float(" + str(self.hwmodel.dynamic_energy) + ", \"Default values set from " + self.alias + ".yml\")\n")
+            self.simobject_file.write("\tleakage_power = Param.Float(" + str(self.hwmodel.leakage_power) + ", \"Default values set from " + self.alias + ".yml\")\n")
+            self.simobject_file.write("\tarea = Param.Float(" + str(self.hwmodel.area) + ", \"Default values set from " + self.alias + ".yml\")\n")
+            self.simobject_file.write("\tpath_delay = Param.Float(" + str(self.hwmodel.path_delay) + ", \"Default values set from " + self.alias + ".yml\")\n\n")
 
     def instruction_simobject(self, instruction):
         self.functional_unit = instruction['functional_unit']
@@ -8,6 +8,9 @@ BUILD=False
 DEBUG=False
 PRINT_TO_FILE=False
 VALGRIND=False
+# Boot and run the driver's setup on an atomic CPU, switching to the
+# detailed CPU at acc-launch or work-begin
+FF_UNTIL=""
 
 while [[ $# -gt 0 ]]; do
   case $1 in
@@ -26,6 +29,11 @@ while [[ $# -gt 0 ]]; do
       shift # past argument
       shift # past value
       ;;
+    --fast-forward-until)
+      FF_UNTIL="$2"
+      shift # past argument
+      shift # past value
+      ;;
     -f|--flags)
       FLAGS="$2"
       shift # past argument
@@ -95,6 +103,10 @@ SYS_OPTS="--mem-size=4GB \
           --dtb-file=none --bare-metal \
           --cpu-type=DerivO3CPU"
 
+if [ "$FF_UNTIL" != "" ]; then
+	SYS_OPTS+=" --fast-forward-until=$FF_UNTIL"
+fi
+
 CACHE_OPTS="--caches --l2cache"
 
 OUTDIR=BM_ARM_OUT/$BENCH_PATH/
@@ -26,10 +26,52 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+"""Combine several checkpoints into one multiprogrammed checkpoint
+
+The CPUs of each input checkpoint are renamed cpu<i> and their page tables
+are relocated after the memory of the checkpoints before them. The memory
+images are copied in parallel, one input checkpoint per process, streaming
+through a small buffer so memory use does not grow with the images.
+
+With --no-compress the memory image is written as a sparse file: pages
+which are all zero are left as holes rather than written. Otherwise each
+process writes a gzip member of its part of the image and the members are
+concatenated, which gem5 reads as a single stream.
+
+With --page-store, the pages go to a content-addressed store shared by any
+number of aggregated checkpoints, and the checkpoint only gets a manifest of
+which page goes where. Use --materialize to write out its memory image
+before simulating it.
+"""
+
 from configparser import ConfigParser
 import gzip
+import hashlib
+import mmap
+import multiprocessing
+import os
+import re
+import struct
+import sys
+import uuid
+import zlib
+
+PAGE_SIZE = 1 << 12
+# Memory images are streamed in chunks of this many pages
+CHUNK_PAGES = 256
+CHUNK_SIZE = CHUNK_PAGES * PAGE_SIZE
+ZERO_PAGE = bytes(PAGE_SIZE)
+ZERO_CHUNK = bytes(CHUNK_SIZE)
+
+PMEM_FILE = "system.physmem.store0.pmem"
+MANIFEST_FILE = PMEM_FILE + ".manifest"
+MANIFEST_MAGIC = b"G5PGMAN1"
 
-import sys, re, os
+_manifest_header = struct.Struct("<8sQ")
+# Page number, page digest
+_manifest_entry = struct.Struct("<Q16s")
+# Page digest, offset in the pack
+_index_entry = struct.Struct("<16sQ")
 
 class myCP(ConfigParser):
     def __init__(self):
@@ -38,20 +80,187 @@ class myCP(ConfigParser):
     def optionxform(self, optionstr):
         return optionstr
 
-def aggregate(output_dir, cpts, no_compress, memory_size):
-    merged_config = None
-    page_ptr = 0
+def _digest(page):
+    return hashlib.blake2b(page, digest_size=16).digest()
+
+def _read_pages(cpt, pages):
+    """Yield the first pages of a checkpoint's memory image in chunks of at
+    most CHUNK_PAGES pages, padding a short image with zeros."""
+    path = os.path.join(cpt, PMEM_FILE)
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    with (gzip.open if compressed else open)(path, "rb") as f:
+        left = pages * PAGE_SIZE
+        while left:
+            want = min(left, CHUNK_SIZE)
+            chunk = f.read(want)
+            if len(chunk) < want:
+                chunk += bytes(want - len(chunk))
+            left -= want
+            yield chunk
+
+def _nonzero_runs(chunk):
+    """Yield the [start, end) byte offsets of the runs of pages in a chunk
+    which are not all zero."""
+    if chunk == (ZERO_CHUNK if len(chunk) == CHUNK_SIZE
+                 else bytes(len(chunk))):
+        return
+    start = None
+    for offset in range(0, len(chunk), PAGE_SIZE):
+        if chunk[offset:offset + PAGE_SIZE] == ZERO_PAGE:
+            if start is not None:
+                yield start, offset
+                start = None
+        elif start is None:
+            start = offset
+    if start is not None:
+        yield start, len(chunk)
+
+_zero_blocks = {}
 
-    output_path = output_dir
-    if not os.path.isdir(output_path):
-        os.system("mkdir -p " + output_path)
+class GzipMemberWriter(object):
+    """Write a single gzip member to a file.
 
-    agg_mem_file = open(output_path + "/system.physmem.store0.pmem", "wb+")
-    agg_config_file = open(output_path + "/m5.cpt", "wb+")
+    Whole chunks of zeros are common in memory images and slow to compress,
+    so they are written as a deflate block compressed once up front. Flushing
+    the compressor with Z_FULL_FLUSH before the block keeps the stream valid.
+    """
+    def __init__(self, f, level=6):
+        self.f = f
+        self.level = level
+        self.crc = 0
+        self.size = 0
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED,
+                                           -zlib.MAX_WBITS)
+        # Magic, deflate, no flags, no mtime, no extra flags, unknown OS
+        f.write(b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff")
 
-    if not no_compress:
-        merged_mem = gzip.GzipFile(fileobj= agg_mem_file, mode="wb")
+    def _zero_block(self):
+        block = _zero_blocks.get(self.level)
+        if block is None:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED,
+                                          -zlib.MAX_WBITS)
+            block = compressor.compress(ZERO_CHUNK) + \
+                    compressor.flush(zlib.Z_FULL_FLUSH)
+            _zero_blocks[self.level] = block
+        return block
 
+    def write(self, data):
+        self.crc = zlib.crc32(data, self.crc)
+        self.size += len(data)
+        if len(data) == CHUNK_SIZE and data == ZERO_CHUNK:
+            self.f.write(self.compressor.flush(zlib.Z_FULL_FLUSH))
+            self.f.write(self._zero_block())
+        else:
+            self.f.write(self.compressor.compress(data))
+
+    def write_zeros(self, size):
+        while size:
+            n = min(size, CHUNK_SIZE)
+            self.write(ZERO_CHUNK if n == CHUNK_SIZE else bytes(n))
+            size -= n
+
+    def close(self):
+        self.f.write(self.compressor.flush())
+        self.f.write(struct.pack("<II", self.crc & 0xffffffff,
+                                 self.size & 0xffffffff))
+
+def _copy_sparse(cpt, pages, first_page, path):
+    """Copy the pages of a checkpoint into a sparse image, skipping zero
+    pages. Returns the number of pages written."""
+    if not pages:
+        return 0
+    offset = first_page * PAGE_SIZE
+    base = offset - offset % mmap.ALLOCATIONGRANULARITY
+    fd = os.open(path, os.O_RDWR)
+    try:
+        image = mmap.mmap(fd, offset + pages * PAGE_SIZE - base,
+                          offset=base)
+    finally:
+        os.close(fd)
+
+    written = 0
+    pos = offset - base
+    with image:
+        for chunk in _read_pages(cpt, pages):
+            for start, end in _nonzero_runs(chunk):
+                image[pos + start:pos + end] = chunk[start:end]
+                written += (end - start) // PAGE_SIZE
+            pos += len(chunk)
+    return written
+
+def _copy_gzip(cpt, pages, path):
+    """Compress the pages of a checkpoint into a gzip member."""
+    with open(path, "wb") as f:
+        writer = GzipMemberWriter(f)
+        for chunk in _read_pages(cpt, pages):
+            writer.write(chunk)
+        writer.close()
+    return pages
+
+# Digests of the pages already in the page store, set before forking the
+# processes which add to it
+_stored_pages = frozenset()
+
+def _copy_to_store(cpt, pages, first_page, store, manifest):
+    """Add the pages of a checkpoint to the page store, writing the manifest
+    entries for its non-zero pages. Returns the number of pages added."""
+    name = os.path.join(store, "pack-%s" % uuid.uuid4().hex)
+    added = {}
+    page_no = first_page
+    with open(name + ".pack", "wb") as pack, open(manifest, "wb") as entries:
+        for chunk in _read_pages(cpt, pages):
+            for start, end in _nonzero_runs(chunk):
+                for offset in range(start, end, PAGE_SIZE):
+                    page = chunk[offset:offset + PAGE_SIZE]
+                    digest = _digest(page)
+                    if digest not in _stored_pages and digest not in added:
+                        added[digest] = pack.tell()
+                        pack.write(page)
+                    entries.write(_manifest_entry.pack(
+                        page_no + offset // PAGE_SIZE, digest))
+            page_no += len(chunk) // PAGE_SIZE
+
+    if not added:
+        os.remove(name + ".pack")
+        return 0
+    # The index is what makes a pack visible, so write it last.
+    with open(name + ".idx.tmp", "wb") as index:
+        for digest in sorted(added):
+            index.write(_index_entry.pack(digest, added[digest]))
+    os.replace(name + ".idx.tmp", name + ".idx")
+    return len(added)
+
+def _copy_pages(task):
+    mode, cpt, pages, first_page, target = task
+    if mode == "sparse":
+        return _copy_sparse(cpt, pages, first_page, target)
+    elif mode == "gzip":
+        return _copy_gzip(cpt, pages, target)
+    else:
+        return _copy_to_store(cpt, pages, first_page, *target)
+
+def load_page_store(store):
+    """Return a dict from page digest to the pack file and offset holding
+    the page."""
+    pages = {}
+    for name in sorted(os.listdir(store)):
+        if not name.endswith(".idx"):
+            continue
+        pack = os.path.join(store, name[:-len(".idx")] + ".pack")
+        with open(os.path.join(store, name), "rb") as f:
+            for digest, offset in _index_entry.iter_unpack(f.read()):
+                pages.setdefault(digest, (pack, offset))
+    return pages
+
+def _merge_configs(cpts, agg_config_file):
+    """Write the merged m5.cpt, returning the first page and page count of
+    each checkpoint's memory, the total number of pages, the latest tick,
+    and the merged config of the last checkpoint (to which the system and
+    globals are added)."""
+    merged_config = None
+    page_ptr = 0
+    first_pages = []
     max_curtick = 0
     num_digits = len(str(len(cpts)-1))
 
@@ -59,7 +268,8 @@ def aggregate(output_dir, cpts, no_compress, memory_size):
         print(arg)
         merged_config = myCP()
         config = myCP()
-        config.readfp(open(cpts[i] + "/m5.cpt"))
+        with open(os.path.join(arg, "m5.cpt")) as f:
+            config.read_file(f)
 
         for sec in config.sections():
             if re.compile("cpu").search(sec):
@@ -69,12 +279,13 @@ def aggregate(output_dir, cpts, no_compress, memory_size):
                 items = config.items(sec)
                 for item in items:
                     if item[0] == "paddr":
-                        merged_config.set(newsec, item[0], int(item[1]) + (page_ptr << 12))
+                        merged_config.set(newsec, item[0],
+                                str(int(item[1]) + (page_ptr << 12)))
                         continue
                     merged_config.set(newsec, item[0], item[1])
 
                 if re.compile("workload.FdMap256$").search(sec):
-                    merged_config.set(newsec, "M5_pid", i)
+                    merged_config.set(newsec, "M5_pid", str(i))
 
             elif sec == "system":
                 pass
@@ -91,55 +302,135 @@ def aggregate(output_dir, cpts, no_compress, memory_size):
         if i != len(cpts)-1:
             merged_config.write(agg_config_file)
 
-        ### memory stuff
         pages = int(config.get("system", "pagePtr"))
+        first_pages.append((page_ptr, pages))
         page_ptr = page_ptr + pages
         print("pages to be read: ", pages)
 
-        f = open(cpts[i] + "/system.physmem.store0.pmem", "rb")
-        gf = gzip.GzipFile(fileobj=f, mode="rb")
+    return first_pages, page_ptr, max_curtick, merged_config
 
-        x = 0
-        while x < pages:
-            bytesRead = gf.read(1 << 12)
-            if not no_compress:
-                merged_mem.write(bytesRead)
-            else:
-                agg_mem_file.write(bytesRead)
-            x += 1
-
-        gf.close()
-        f.close()
+def aggregate(output_dir, cpts, no_compress, memory_size, jobs=None,
+              page_store=None):
+    os.makedirs(output_dir, exist_ok=True)
+    agg_config_file = open(os.path.join(output_dir, "m5.cpt"), "w")
+    first_pages, page_ptr, max_curtick, merged_config = \
+        _merge_configs(cpts, agg_config_file)
 
     merged_config.add_section("system")
-    merged_config.set("system", "pagePtr", page_ptr)
-    merged_config.set("system", "nextPID", len(cpts))
-
-    file_size = page_ptr * 4 * 1024
-    dummy_data = "".zfill(4096)
-    while file_size < memory_size:
-        if not no_compress:
-            merged_mem.write(dummy_data)
-        else:
-            agg_mem_file.write(dummy_data)
-        file_size += 4 * 1024
-        page_ptr += 1
+    merged_config.set("system", "pagePtr", str(page_ptr))
+    merged_config.set("system", "nextPID", str(len(cpts)))
+
+    # Pad the image up to the memory size
+    data_pages = page_ptr
+    if memory_size:
+        page_ptr = max(page_ptr, -(-memory_size // PAGE_SIZE))
+
+    mem_path = os.path.join(output_dir, PMEM_FILE)
+    if page_store:
+        global _stored_pages
+        os.makedirs(page_store, exist_ok=True)
+        _stored_pages = frozenset(load_page_store(page_store))
+        parts = [os.path.join(output_dir, "%s.%d" % (MANIFEST_FILE, i))
+                 for i in range(len(cpts))]
+        tasks = [("store", cpt, pages, first, (page_store, part))
+                 for cpt, (first, pages), part
+                 in zip(cpts, first_pages, parts)]
+    elif no_compress:
+        with open(mem_path, "wb") as f:
+            f.truncate(page_ptr * PAGE_SIZE)
+        parts = []
+        tasks = [("sparse", cpt, pages, first, mem_path)
+                 for cpt, (first, pages) in zip(cpts, first_pages)]
+    else:
+        parts = ["%s.%d" % (mem_path, i) for i in range(len(cpts))]
+        tasks = [("gzip", cpt, pages, first, part)
+                 for cpt, (first, pages), part
+                 in zip(cpts, first_pages, parts)]
+
+    # Fork so the workers see _stored_pages without pickling it
+    context = multiprocessing.get_context("fork")
+    with context.Pool(jobs) as pool:
+        copied = sum(pool.imap(_copy_pages, tasks))
+
+    if page_store:
+        with open(os.path.join(output_dir, MANIFEST_FILE), "wb") as manifest:
+            manifest.write(_manifest_header.pack(MANIFEST_MAGIC, page_ptr))
+            for part in parts:
+                with open(part, "rb") as f:
+                    manifest.write(f.read())
+                os.remove(part)
+        print("%d of %d pages added to the page store" %
+              (copied, data_pages))
+    elif no_compress:
+        print("%d of %d pages written" % (copied, data_pages))
+    else:
+        with open(mem_path, "wb") as image:
+            for part in parts:
+                with open(part, "rb") as f:
+                    while True:
+                        block = f.read(1 << 24)
+                        if not block:
+                            break
+                        image.write(block)
+                os.remove(part)
+            if page_ptr > data_pages:
+                writer = GzipMemberWriter(image)
+                writer.write_zeros((page_ptr - data_pages) * PAGE_SIZE)
+                writer.close()
 
     print("WARNING: ")
     print("Make sure the simulation using this checkpoint has at least ", end=' ')
     print(page_ptr, "x 4K of memory")
-    merged_config.set("system.physmem.store0", "range_size", page_ptr * 4 * 1024)
+    merged_config.set("system.physmem.store0", "range_size",
+                      str(page_ptr * PAGE_SIZE))
 
     merged_config.add_section("Globals")
-    merged_config.set("Globals", "curTick", max_curtick)
+    merged_config.set("Globals", "curTick", str(max_curtick))
 
     merged_config.write(agg_config_file)
+    agg_config_file.close()
 
-    if not no_compress:
-        merged_mem.close()
-        agg_mem_file.close()
-    else:
-        agg_mem_file.close()
+def materialize(output_dir, page_store, no_compress):
+    """Write the memory image of a checkpoint aggregated into a page store
+    from its manifest."""
+    with open(os.path.join(output_dir, MANIFEST_FILE), "rb") as f:
+        magic, total_pages = _manifest_header.unpack(
+            f.read(_manifest_header.size))
+        if magic != MANIFEST_MAGIC:
+            sys.exit("%s is not a page manifest" % f.name)
+        entries = f.read()
+
+    stored = load_page_store(page_store)
+    packs = {}
+    def read_page(digest):
+        try:
+            pack, offset = stored[digest]
+        except KeyError:
+            sys.exit("Page %s is missing from the page store" %
+                     digest.hex())
+        if pack not in packs:
+            packs[pack] = open(pack, "rb")
+        return os.pread(packs[pack].fileno(), PAGE_SIZE, offset)
+
+    mem_path = os.path.join(output_dir, PMEM_FILE)
+    with open(mem_path, "wb") as image:
+        if no_compress:
+            image.truncate(total_pages * PAGE_SIZE)
+            for page_no, digest in _manifest_entry.iter_unpack(entries):
+                os.pwrite(image.fileno(), read_page(digest),
+                          page_no * PAGE_SIZE)
+        else:
+            writer = GzipMemberWriter(image)
+            next_page = 0
+            for page_no, digest in _manifest_entry.iter_unpack(entries):
+                writer.write_zeros((page_no - next_page) * PAGE_SIZE)
+                writer.write(read_page(digest))
+                next_page = page_no + 1
+            writer.write_zeros((total_pages - next_page) * PAGE_SIZE)
+            writer.close()
+
+    for f in packs.values():
+        f.close()
 
 if __name__ == "__main__":
     from argparse import ArgumentParser
@@ -147,17 +438,35 @@ if __name__ == "__main__":
                             "hold the checkpoints to be combined>")
     parser.add_argument("-o", "--output-dir", action="store",
                         help="Output directory")
-    parser.add_argument("-c", "--no-compress", action="store_true")
+    parser.add_argument("-c", "--no-compress", action="store_true",
+                        help="Write an uncompressed, sparse memory image")
     parser.add_argument("--cpts", nargs='+')
     parser.add_argument("--memory-size", action="store", type=int)
+    parser.add_argument("-j", "--jobs", action="store", type=int,
+                        help="Number of checkpoints to copy in parallel "
+                        "(default: the number of CPUs)")
+    parser.add_argument("--page-store", action="store",
+                        help="Store the memory pages in this "
+                        "content-addressed store rather than in the "
+                        "checkpoint")
+    parser.add_argument("--materialize", action="store_true",
+                        help="Write the memory image of the checkpoint in "
+                        "the output directory from the page store")
 
     # Assume x86 ISA.  Any other ISAs would need extra stuff in this script
     # to appropriately parse their page tables and understand page sizes.
     options = parser.parse_args()
+    if options.materialize:
+        if not options.page_store:
+            parser.error("--materialize needs a --page-store")
+        materialize(options.output_dir, options.page_store,
+                    options.no_compress)
+        sys.exit(0)
+
     print(options.cpts, len(options.cpts))
     if len(options.cpts) <= 1:
         parser.error("You must specify atleast two checkpoint files that "\
                      "need to be combined.")
 
     aggregate(options.output_dir, options.cpts, options.no_compress,
-              options.memory_size)
+              options.memory_size, options.jobs, options.page_store)
@@ -68,9 +68,18 @@
 # upgrader. This can be especially valuable when maintaining private
 # upgraders in private branches.
 
+# Any number of checkpoint files, directories (with -r, searched for m5.cpt
+# files) and glob patterns can be given; they are upgraded in parallel (-j).
+# Checkpoints whose tags are already up to date are found without parsing
+# them, and --dry-run prints what would change without writing anything.
+
 
 import configparser
+import contextlib
+import difflib
 import glob, types, sys, os
+import io
+import multiprocessing
 import os.path as osp
 
 verbose_print = False
@@ -82,11 +91,15 @@ def verboseprint(*args):
         print(arg, end=' ')
     print("\n")
 
+class UpgradeError(Exception):
+    pass
+
 class Upgrader:
     tag_set = set()
     untag_set = set() # tags to remove by downgrading
     by_tag = {}
     legacy = {}
+    plans = {} # tags of a checkpoint -> upgraders to apply to it
     def __init__(self, filename):
         self.filename = filename
         exec(open(filename).read(), {}, self.__dict__)
@@ -155,6 +168,42 @@ class Upgrader:
     def get(tag):
         return Upgrader.by_tag[tag]
 
+    @staticmethod
+    def plan(tags):
+        """Return the tags of the migrations to apply to a checkpoint with
+        the given tags, in an order respecting their dependences.
+
+        Checkpoints upgraded together nearly always have the same tags, so
+        the plan is only worked out once for each set of tags.
+        """
+        key = frozenset(tags)
+        if key in Upgrader.plans:
+            return Upgrader.plans[key]
+
+        # Apply migrations for tags not in checkpoint and tags present for
+        # which downgraders are present, respecting dependences
+        tags = set(tags)
+        to_apply = (Upgrader.tag_set - tags) | (Upgrader.untag_set & tags)
+        order = []
+        while to_apply:
+            ready = sorted(t for t in to_apply if Upgrader.get(t).ready(tags))
+            if not ready:
+                raise UpgradeError(
+                    "could not apply these upgrades: {}\n"
+                    "update dependences impossible to resolve; "
+                    "aborting".format(' '.join(sorted(to_apply))))
+
+            for tag in ready:
+                if tag in Upgrader.tag_set:
+                    tags.add(tag)
+                else:
+                    tags.remove(tag)
+            order.extend(ready)
+            to_apply -= set(ready)
+
+        Upgrader.plans[key] = order
+        return order
+
     @staticmethod
     def load_all():
         util_dir = osp.dirname(osp.abspath(__file__))
@@ -182,51 +231,50 @@ class Upgrader:
                           "nonexistent tag '{}'".format(tag, dep))
                     sys.exit(1)
 
+def read_version(path):
+    """Find the version information of a checkpoint without parsing all
+    of it, returning its legacy version number (or None) and its tags."""
+    found = {}
+    section = None
+    with open(path, 'r') as cpt_file:
+        for line in cpt_file:
+            if line.startswith('['):
+                section = line.strip()[1:-1]
+                continue
+            if section not in ('root', 'Globals', 'root.globals'):
+                continue
+            key, sep, value = line.partition('=')
+            if sep and key.strip() in ('cpt_ver', 'version_tags'):
+                found[(section, key.strip())] = value.strip()
+
+    if ('root', 'cpt_ver') in found:
+        return int(found[('root', 'cpt_ver')]), set()
+    # @todo The 'Globals' option is deprecated, and should be removed in the
+    # future
+    for section in ('Globals', 'root.globals'):
+        if (section, 'version_tags') in found:
+            return None, set(found[(section, 'version_tags')].split())
+    raise UpgradeError("fatal: no version information in checkpoint")
+
 def process_file(path, **kwargs):
+    """Upgrade a checkpoint file, returning True if it was changed.
+
+    With dry_run, print a diff of the changes instead of making them.
+    """
     if not osp.isfile(path):
         import errno
         raise IOError(errno.ENOENT, "No such file", path)
 
     verboseprint("Processing file %s...." % path)
 
-    if kwargs.get('backup', True):
-        import shutil
-        shutil.copyfile(path, path + '.bak')
-
-    cpt = configparser.ConfigParser()
-
-    # gem5 is case sensitive with paramaters
-    cpt.optionxform = str
-
-    # Read the current data
-    cpt_file = open(path, 'r')
-    cpt.read_file(cpt_file)
-    cpt_file.close()
-
-    change = False
-
-    # Make sure we know what we're starting from
-    if cpt.has_option('root','cpt_ver'):
-        cpt_ver = cpt.getint('root','cpt_ver')
-
+    # Skip checkpoints which are up to date before parsing them
+    cpt_ver, tags = read_version(path)
+    if cpt_ver is not None:
         # Legacy linear checkpoint version
         # convert to list of tags before proceeding
-        tags = set([])
         for i in range(2, cpt_ver+1):
             tags.add(Upgrader.legacy[i].tag)
         verboseprint("performed legacy version -> tags conversion")
-        change = True
-
-        cpt.remove_option('root', 'cpt_ver')
-    # @todo The 'Globals' option is deprecated, and should be removed in the
-    # future
-    elif cpt.has_option('Globals','version_tags'):
-        tags = set((''.join(cpt.get('Globals','version_tags'))).split())
-    elif cpt.has_option('root.globals','version_tags'):
-        tags = set((''.join(cpt.get('root.globals','version_tags'))).split())
-    else:
-        print("fatal: no version information in checkpoint")
-        exit(1)
 
     verboseprint("has tags", ' '.join(tags))
     # If the current checkpoint has a tag we don't know about, we have
@@ -237,35 +285,105 @@ def process_file(path, **kwargs):
         print("warning: upgrade script does not recognize the following "
               "tags in this checkpoint:", ' '.join(unknown_tags))
 
-    # Apply migrations for tags not in checkpoint and tags present for which
-    # downgraders are present, respecting dependences
-    to_apply = (Upgrader.tag_set - tags) | (Upgrader.untag_set & tags)
-    while to_apply:
-        ready = set([ t for t in to_apply if Upgrader.get(t).ready(tags) ])
-        if not ready:
-            print("could not apply these upgrades:", ' '.join(to_apply))
-            print("update dependences impossible to resolve; aborting")
-            exit(1)
+    plan = Upgrader.plan(tags)
+    if cpt_ver is None and not plan:
+        verboseprint("...nothing to do")
+        return False
 
-        for tag in ready:
-            Upgrader.get(tag).update(cpt, tags)
-            change = True
+    cpt = configparser.ConfigParser()
 
-        to_apply -= ready
+    # gem5 is case sensitive with paramaters
+    cpt.optionxform = str
 
-    if not change:
-        verboseprint("...nothing to do")
-        return
+    # Read the current data
+    with open(path, 'r') as cpt_file:
+        cpt.read_file(cpt_file)
 
-    cpt.set('root.globals', 'version_tags', ' '.join(tags))
+    dry_run = kwargs.get('dry_run', False)
+    if dry_run:
+        before = io.StringIO()
+        cpt.write(before)
+
+    if cpt_ver is not None:
+        cpt.remove_option('root', 'cpt_ver')
+
+    for tag in plan:
+        Upgrader.get(tag).update(cpt, tags)
+
+    cpt.set('root.globals', 'version_tags', ' '.join(sorted(tags)))
+
+    if dry_run:
+        after = io.StringIO()
+        cpt.write(after)
+        sys.stdout.writelines(difflib.unified_diff(
+            before.getvalue().splitlines(True),
+            after.getvalue().splitlines(True), path, path + ' (upgraded)'))
+        return True
+
+    if kwargs.get('backup', True):
+        import shutil
+        shutil.copyfile(path, path + '.bak')
 
     # Write the old data back
     verboseprint("...completed")
-    cpt.write(open(path, 'w'))
+    with open(path + '.tmp', 'w') as cpt_file:
+        cpt.write(cpt_file)
+    os.replace(path + '.tmp', path)
+    return True
+
+def find_checkpoints(pattern, recurse):
+    """Return the checkpoint files named by a file, a directory or a glob
+    pattern."""
+    path = osp.expandvars(osp.expanduser(pattern))
+    if glob.has_magic(path):
+        paths = sorted(glob.glob(path, recursive=True))
+        if not paths:
+            raise UpgradeError("Error: nothing matches {}".format(path))
+    else:
+        paths = [path]
+
+    files = []
+    for path in paths:
+        # Process a single file if we have it
+        if osp.isfile(path):
+            files.append(path)
+        # Process an entire directory
+        elif osp.isdir(path):
+            cpt_file = osp.join(path, 'm5.cpt')
+            if recurse:
+                # Visit every file and see if it matches
+                for root, dirs, names in os.walk(path):
+                    dirs.sort()
+                    if 'm5.cpt' in names:
+                        files.append(osp.join(root, 'm5.cpt'))
+            # Maybe someone passed a cpt.XXXXXXX directory and not m5.cpt
+            elif osp.isfile(cpt_file):
+                files.append(cpt_file)
+            elif not glob.has_magic(pattern):
+                raise UpgradeError(
+                    "Error: checkpoint file not found in {} \n"
+                    "and recurse not specified".format(path))
+        else:
+            raise UpgradeError("Error: {} does not exist".format(path))
+    return files
+
+def _process_captured(job):
+    """Process a checkpoint file, capturing what it prints so the output
+    of files processed in parallel is not interleaved."""
+    path, kwargs = job
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            changed = process_file(path, **kwargs)
+        except (UpgradeError, OSError, configparser.Error) as e:
+            print("{}: {}".format(path, e))
+            changed = None
+    return changed, output.getvalue()
 
 if __name__ == '__main__':
     from argparse import ArgumentParser, SUPPRESS
-    parser = ArgumentParser(usage="%(prog)s [args] <filename or directory>")
+    parser = ArgumentParser(
+        usage="%(prog)s [args] <filenames, directories or glob patterns>")
     parser.add_argument(
         "-r", "--recurse", action="store_true",
         help="Recurse through all subdirectories modifying "\
@@ -274,6 +392,14 @@ if __name__ == '__main__':
         "-N", "--no-backup", action="store_false",
         dest="backup", default=True,
         help="Do no backup each checkpoint before modifying it")
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true",
+        help="Print the changes each checkpoint needs rather than "\
+             "making them")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="Number of checkpoints to upgrade in parallel "\
+             "(0 for one per CPU)")
     parser.add_argument(
         "-v", "--verbose", action="store_true",
         help="Print out debugging information as")
@@ -281,7 +407,7 @@ if __name__ == '__main__':
         "--get-cc-file", action="store_true",
         # used during build; generate src/sim/tags.cc and exit
         help=SUPPRESS)
-    parser.add_argument("checkpoint", nargs='?')
+    parser.add_argument("checkpoint", nargs='*')
 
     args = parser.parse_args()
     verbose_print = args.verbose
@@ -307,29 +433,42 @@ if __name__ == '__main__':
         parser.error("You must specify a checkpoint file to modify or a "
                      "directory of checkpoints to recursively update")
 
-    # Deal with shell variables and ~
-    path = osp.expandvars(osp.expanduser(args.checkpoint))
-
-    # Process a single file if we have it
-    if osp.isfile(path):
-        process_file(path, **vars(args))
-    # Process an entire directory
-    elif osp.isdir(path):
-        cpt_file = osp.join(path, 'm5.cpt')
-        if args.recurse:
-            # Visit very file and see if it matches
-            for root,dirs,files in os.walk(path):
-                for name in files:
-                    if name == 'm5.cpt':
-                        process_file(osp.join(root,name), **vars(args))
-                for dir in dirs:
-                    pass
-        # Maybe someone passed a cpt.XXXXXXX directory and not m5.cpt
-        elif osp.isfile(cpt_file):
-            process_file(cpt_file, **vars(args))
-        else:
-            print("Error: checkpoint file not found in {} ".format(path))
-            print("and recurse not specified")
-            sys.exit(1)
-    sys.exit(0)
-
+    files = []
+    try:
+        for pattern in args.checkpoint:
+            files.extend(find_checkpoints(pattern, args.recurse))
+    except UpgradeError as e:
+        print(e)
+        sys.exit(1)
+
+    # Patterns may overlap (e.g. 'c*' and '*/m5.cpt'). Each file must only
+    # be processed once, or parallel workers race on its temporary file.
+    unique = {}
+    for path in files:
+        unique.setdefault(osp.realpath(path), path)
+    files = list(unique.values())
+
+    kwargs = { 'backup': args.backup, 'dry_run': args.dry_run }
+    jobs = [ (path, kwargs) for path in files ]
+    processes = min(args.jobs or os.cpu_count(), len(jobs))
+    if processes > 1:
+        # The upgraders are exec'd functions, which the workers can only
+        # get by being forked after they are loaded.
+        pool = multiprocessing.get_context('fork').Pool(processes)
+        results = pool.imap(_process_captured, jobs)
+    else:
+        results = map(_process_captured, jobs)
+
+    counts = { True: 0, False: 0, None: 0 }
+    for changed, output in results:
+        sys.stdout.write(output)
+        counts[changed] += 1
+    if processes > 1:
+        pool.close()
+        pool.join()
+
+    if len(files) > 1:
+        print("{} {}, {} up to date, {} failed".format(
+            counts[True], "to upgrade" if args.dry_run else "upgraded",
+            counts[False], counts[None]))
+    sys.exit(1 if counts[None] else 0)
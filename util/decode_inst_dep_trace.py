@@ -67,6 +67,9 @@
 # This script is used to dump protobuf traces of the instruction dependency
 # graph to ASCII format.
 #
+# For large traces, util/protobulk.py decodes to columnar NumPy files in
+# bulk and in parallel.
+#
 # The ASCII trace format uses one line per instruction with the format
 # instruction sequence number, (optional) pc, (optional) weight, type
 # (optional) flags, (optional) phys addr, (optional) size, comp delay,
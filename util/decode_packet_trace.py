@@ -37,6 +37,9 @@
 
 # This script is used to dump protobuf packet traces to ASCII
 # format.
+#
+# For large traces, util/protobulk.py decodes to columnar NumPy files in
+# bulk and in parallel.
 
 import os
 import protolib
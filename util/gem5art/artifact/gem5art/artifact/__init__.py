@@ -26,7 +26,7 @@
 
 """This is the gem5 artifact package"""
 
-from .artifact import Artifact
+from .artifact import Artifact, hashFiles
 from .common_queries import (
     getByName,
     getDiskImages,
@@ -42,4 +42,5 @@ __all__ = [
     "getLinuxBinaries",
     "getgem5Binaries",
     "getDBConnection",
+    "hashFiles",
 ]
@@ -36,12 +36,14 @@ Some common queries can be found in common_queries.py
 
 from abc import ABC, abstractmethod
 
+from contextlib import contextmanager
 import copy
 import json
 import os
 from pathlib import Path
+import re
 import shutil
-from typing import Any, Dict, Iterable, Union, Type, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, Union, Type, List, Tuple
 from urllib.parse import urlparse
 from uuid import UUID
 
@@ -54,6 +56,14 @@ except ModuleNotFoundError:
     # If pymongo isn't installed, then disable support for it
     MONGO_SUPPORT = False
 
+try:
+    import fcntl
+
+    LOCK_SUPPORT = True
+except ModuleNotFoundError:
+    # Not available on Windows. ArtifactFileDB will not lock its file
+    LOCK_SUPPORT = False
+
 
 class ArtifactDB(ABC):
     """
@@ -218,10 +228,19 @@ class ArtifactMongoDB(ArtifactDB):
 class ArtifactFileDB(ArtifactDB):
     """
     This is a file-based database where Artifacts (as defined in artifacts.py)
-    are stored in a JSON file.
+    are stored in a JSON lines file.
+
+    The file is an append-only journal with one serialized artifact per line,
+    so registering an artifact only appends a line instead of rewriting the
+    whole database. Lookups by `_id`, `hash`, `name`, and `type` use
+    in-memory indexes built from the journal. Files written by older versions
+    (a single JSON list) are still read and are rewritten as a journal when
+    the database is opened.
 
-    This database stores a list of serialized artifacts in a JSON file.
-    This database is not thread-safe.
+    Writers hold an exclusive lock (fcntl.flock on `<file>.lock`), and read
+    any lines appended by other processes before adding their own, so
+    several processes (e.g., parallel gem5Runs) can share one database. Where
+    fcntl is not available the database is not process-safe.
 
     If the user specifies a valid path in the environment variable
     GEM5ART_STORAGE then this database will copy all artifacts to that
@@ -234,14 +253,24 @@ class ArtifactFileDB(ArtifactDB):
                 return str(obj)
             return ArtifactFileDB.ArtifactEncoder(self, obj)
 
+    # Compact the journal when it has at least this many lines that do not
+    # hold a live artifact (duplicates, truncated writes, legacy format)
+    compact_threshold = 1000
+
     _json_file: Path
+    _lock_file: Path
     _uuid_artifact_map: Dict[str, Dict[str, str]]
     _hash_uuid_map: Dict[str, List[str]]
+    _name_uuid_map: Dict[str, List[str]]
+    _type_uuid_map: Dict[str, List[str]]
+    _file_id: Tuple[int, int]
+    _offset: int
+    _stale: int
     _storage_enabled: bool
     _storage_path: Path
 
     def __init__(self, uri: str) -> None:
-        """Initialize the file-driven database from a JSON file.
+        """Initialize the file-driven database from a JSON lines file.
         If the file doesn't exist, a new file will be created.
         """
         parsed_uri = urlparse(uri)
@@ -252,6 +281,9 @@ class ArtifactFileDB(ArtifactDB):
         #           (netloc='path', path='/to/file')
         # so, the filepath would be netloc+path for both cases
         self._json_file = Path(parsed_uri.netloc) / Path(parsed_uri.path)
+        self._lock_file = self._json_file.with_name(
+            self._json_file.name + ".lock"
+        )
         storage_path = os.environ.get("GEM5ART_STORAGE", "")
         self._storage_enabled = True if storage_path else False
         self._storage_path = Path(storage_path)
@@ -266,9 +298,12 @@ class ArtifactFileDB(ArtifactDB):
         if self._storage_enabled:
             os.makedirs(self._storage_path, exist_ok=True)
 
-        self._uuid_artifact_map, self._hash_uuid_map = self._load_from_file(
-            self._json_file
-        )
+        self._reset()
+        with self._locked(exclusive=True):
+            self._json_file.touch()
+            self._load_from_file(self._json_file)
+            if self._stale >= self.compact_threshold or self._is_legacy():
+                self._save_to_file(self._json_file)
 
     def put(self, key: UUID, artifact: Dict[str, Union[str, UUID]]) -> None:
         """Insert the artifact into the database with the key."""
@@ -287,6 +322,7 @@ class ArtifactFileDB(ArtifactDB):
 
     def __contains__(self, key: Union[UUID, str]) -> bool:
         """Key can be a UUID or a string. Returns true if item in DB"""
+        self._refresh()
         if isinstance(key, UUID):
             return self.has_uuid(key)
         return self.has_hash(key)
@@ -295,6 +331,7 @@ class ArtifactFileDB(ArtifactDB):
         """Key can be a UUID or a string. Returns a dictionary to construct
         an artifact.
         """
+        self._refresh()
         artifact: List[Dict[str, str]] = []
         if isinstance(key, UUID):
             artifact = list(self.get_artifact_by_uuid(key))
@@ -312,27 +349,151 @@ class ArtifactFileDB(ArtifactDB):
         dst_path = path
         shutil.copy2(src_path, dst_path)
 
-    def _load_from_file(
-        self, json_file: Path
-    ) -> Tuple[Dict[str, Dict[str, str]], Dict[str, List[str]]]:
-        uuid_mapping: Dict[str, Dict[str, str]] = {}
-        hash_mapping: Dict[str, List[str]] = {}
-        if json_file.exists():
-            with open(json_file, "r") as f:
-                j = json.load(f)
-                for an_artifact in j:
-                    the_uuid = an_artifact["_id"]
-                    the_hash = an_artifact["hash"]
-                    uuid_mapping[the_uuid] = an_artifact
-                    if not the_hash in hash_mapping:
-                        hash_mapping[the_hash] = []
-                    hash_mapping[the_hash].append(the_uuid)
-        return uuid_mapping, hash_mapping
+    def searchByName(self, name: str, limit: int) -> Iterable[Dict[str, Any]]:
+        """Returns an iterable of all artifacts in the database that match
+        some name."""
+        return self.find_exact({"name": name}, limit)
+
+    def searchByType(self, typ: str, limit: int) -> Iterable[Dict[str, Any]]:
+        """Returns an iterable of all artifacts in the database that match
+        some type."""
+        return self.find_exact({"type": typ}, limit)
+
+    def searchByNameType(
+        self, name: str, typ: str, limit: int
+    ) -> Iterable[Dict[str, Any]]:
+        """Returns an iterable of all artifacts in the database that match
+        some name and type."""
+        return self.find_exact({"type": typ, "name": name}, limit)
+
+    def searchByLikeNameType(
+        self, name: str, typ: str, limit: int
+    ) -> Iterable[Dict[str, Any]]:
+        """Returns an iterable of all artifacts in the database that match
+        some type and a regex name."""
+        self._refresh()
+        pattern = re.compile(name)
+        count = 0
+        for the_uuid in list(self._type_uuid_map.get(typ, [])):
+            artifact = self._uuid_artifact_map[the_uuid]
+            if 0 < limit <= count:
+                return
+            if pattern.search(str(artifact.get("name", ""))):
+                count += 1
+                yield artifact
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        """Hold the database lock file while in this context."""
+        if not LOCK_SUPPORT:
+            yield
+            return
+        with open(self._lock_file, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _reset(self) -> None:
+        self._uuid_artifact_map = {}
+        self._hash_uuid_map = {}
+        self._name_uuid_map = {}
+        self._type_uuid_map = {}
+        self._file_id = (0, 0)
+        self._offset = 0
+        self._stale = 0
+
+    def _index(self, an_artifact: Dict[str, str]) -> bool:
+        """Add an artifact to the in-memory indexes. Returns False if an
+        artifact with the same _id is already indexed."""
+        the_uuid = str(an_artifact["_id"])
+        if the_uuid in self._uuid_artifact_map:
+            return False
+        self._uuid_artifact_map[the_uuid] = an_artifact
+        for index, key in (
+            (self._hash_uuid_map, "hash"),
+            (self._name_uuid_map, "name"),
+            (self._type_uuid_map, "type"),
+        ):
+            value = an_artifact.get(key)
+            if isinstance(value, str):
+                index.setdefault(value, []).append(the_uuid)
+        return True
+
+    def _is_legacy(self) -> bool:
+        """True if the file is in the old single JSON list format."""
+        with open(self._json_file, "rb") as f:
+            return f.read(64).lstrip()[:1] == b"["
+
+    def _load_from_file(self, json_file: Path) -> None:
+        """Read any part of the file that has not been read yet. If the file
+        was replaced (e.g., compacted by another process) it is reread from
+        the start. Should be called with the lock held."""
+        try:
+            st = os.stat(json_file)
+        except FileNotFoundError:
+            return
+        if (st.st_dev, st.st_ino) != self._file_id or st.st_size < self._offset:
+            self._reset()
+            self._file_id = (st.st_dev, st.st_ino)
+            if self._is_legacy():
+                with open(json_file, "r") as f:
+                    for an_artifact in json.load(f):
+                        self._index(an_artifact)
+                self._offset = st.st_size
+                return
+        if st.st_size == self._offset:
+            return
+
+        with open(json_file, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A write in progress by a process without locking
+                    break
+                self._offset += len(line)
+                try:
+                    an_artifact = json.loads(line)
+                except ValueError:
+                    # Left behind by an interrupted write
+                    self._stale += 1
+                    continue
+                if not self._index(an_artifact):
+                    self._stale += 1
 
     def _save_to_file(self, json_file: Path) -> None:
-        content = list(self._uuid_artifact_map.values())
-        with open(json_file, "w") as f:
-            json.dump(content, f, indent=4, cls=ArtifactFileDB.ArtifactEncoder)
+        """Compact the journal: rewrite it with one line per artifact.
+        Should be called with the exclusive lock held."""
+        tmp_file = json_file.with_name(json_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            for an_artifact in self._uuid_artifact_map.values():
+                f.write(json.dumps(an_artifact, cls=self.ArtifactEncoder))
+                f.write("\n")
+        os.replace(tmp_file, json_file)
+        st = os.stat(json_file)
+        self._file_id = (st.st_dev, st.st_ino)
+        self._offset = st.st_size
+        self._stale = 0
+
+    def _refresh(self) -> None:
+        """Pick up artifacts added by other processes."""
+        try:
+            st = os.stat(self._json_file)
+        except FileNotFoundError:
+            return
+        if (st.st_dev, st.st_ino) == self._file_id and (
+            st.st_size == self._offset
+        ):
+            return
+        with self._locked(exclusive=False):
+            self._load_from_file(self._json_file)
+
+    def compact(self) -> None:
+        """Rewrite the journal without duplicate or damaged lines."""
+        with self._locked(exclusive=True):
+            self._load_from_file(self._json_file)
+            self._save_to_file(self._json_file)
 
     def has_uuid(self, the_uuid: UUID) -> bool:
         return str(the_uuid) in self._uuid_artifact_map
@@ -365,15 +526,20 @@ class ArtifactFileDB(ArtifactDB):
         to calling this function; return False otherwise.
         """
         uuid_str = str(the_uuid)
-        if uuid_str in self._uuid_artifact_map:
-            return False
-        artifact_copy = copy.deepcopy(the_artifact)
-        artifact_copy["_id"] = str(artifact_copy["_id"])
-        self._uuid_artifact_map[uuid_str] = artifact_copy  # type: ignore
-        if not the_hash in self._hash_uuid_map:
-            self._hash_uuid_map[the_hash] = []
-        self._hash_uuid_map[the_hash].append(uuid_str)
-        self._save_to_file(self._json_file)
+        with self._locked(exclusive=True):
+            self._load_from_file(self._json_file)
+            if uuid_str in self._uuid_artifact_map:
+                return False
+            artifact_copy = copy.deepcopy(the_artifact)
+            artifact_copy["_id"] = str(artifact_copy["_id"])
+            artifact_copy["hash"] = the_hash
+            line = json.dumps(artifact_copy, cls=self.ArtifactEncoder) + "\n"
+            with open(self._json_file, "a") as f:
+                f.write(line)
+            self._offset += len(line.encode())
+            self._index(artifact_copy)  # type: ignore
+            if self._stale >= self.compact_threshold:
+                self._save_to_file(self._json_file)
         return True
 
     def find_exact(
@@ -382,14 +548,33 @@ class ArtifactFileDB(ArtifactDB):
         """
         Return all artifacts such that, for every yielded artifact,
         and for every (k,v) in attr, the attribute `k` of the artifact has
-        the value of `v`.
+        the value of `v`. As with MongoDB, a limit of 0 means no limit.
         """
+        self._refresh()
+        candidates: Iterable[str] = self._uuid_artifact_map.keys()
+        if "_id" in attr:
+            candidates = [str(attr["_id"])]
+        else:
+            # Narrow the scan down with the smallest matching index
+            for index, key in (
+                (self._hash_uuid_map, "hash"),
+                (self._name_uuid_map, "name"),
+                (self._type_uuid_map, "type"),
+            ):
+                if key in attr:
+                    uuids = index.get(attr[key], [])
+                    if not isinstance(candidates, list) or len(uuids) < len(
+                        candidates
+                    ):
+                        candidates = uuids
         count = 0
-        if count >= limit:
-            return
-        for artifact in self._uuid_artifact_map.values():
-            #https://docs.python.org/3/library/stdtypes.html#frozenset.issubset
-            if attr.items() <= artifact.items():
+        for the_uuid in list(candidates):
+            if 0 < limit <= count:
+                return
+            artifact = self._uuid_artifact_map.get(the_uuid)
+            # https://docs.python.org/3/library/stdtypes.html#frozenset.issubset
+            if artifact is not None and attr.items() <= artifact.items():
+                count += 1
                 yield artifact
 
 
@@ -415,8 +600,8 @@ def _getDBType(uri: str) -> Type[ArtifactDB]:
             See http://dochub.mongodb.org/core/connections for details.
         **ArtifactFileDB**: file://...
             A simple flat file database with optional storage for the binary
-            artifacts. The filepath is where the json file is stored and the
-            data storage can be specified with GEM5ART_STORAGE
+            artifacts. The filepath is where the JSON lines file is stored and
+            the data storage can be specified with GEM5ART_STORAGE
     """
     result = urlparse(uri)
     if result.scheme in _db_schemes:
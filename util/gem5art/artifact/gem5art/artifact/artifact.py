@@ -27,33 +27,230 @@
 """File contains the Artifact class and helper functions
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 from inspect import cleandoc
 import json
+import os
 from pathlib import Path
 import subprocess
+import threading
 import time
-from typing import Any, Dict, List, Union, Optional
+from typing import Any, Dict, Iterable, List, Union, Optional, Sequence, Tuple
 from uuid import UUID, uuid4
 import json
 
-from ._artifactdb import getDBConnection
+from ._artifactdb import getDBConnection, LOCK_SUPPORT
 
+if LOCK_SUPPORT:
+    import fcntl
 
-def getHash(path: Path) -> str:
+
+class _HashCache:
     """
-    Returns an md5 hash for the file in self.path.
+    Cache of file digests keyed on the file's path, device, inode, size, and
+    modification time, so an unchanged file is only hashed once.
+
+    Entries are kept in memory and, unless GEM5ART_HASH_CACHE is set to an
+    empty string, in a JSON lines file (by default
+    ~/.cache/gem5art/hashes.jsonl) shared by all processes. The last entry
+    for a path wins. The file is rewritten without the superseded entries
+    once they make up most of it.
     """
-    BUF_SIZE = 65536
-    md5 = hashlib.md5()
-    with open(path, "rb") as f:
+
+    _Key = Tuple[str, int, int, int, int]
+
+    def __init__(self, cache_file: Optional[Path]) -> None:
+        self._file = cache_file
+        self._entries: Dict[str, Tuple["_HashCache._Key", Dict[str, str]]]
+        self._entries = {}
+        self._file_id = (0, 0)
+        self._offset = 0
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(path: Path, st: os.stat_result) -> "_HashCache._Key":
+        return (str(path), st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _open(self, mode: str, exclusive: bool) -> Any:
+        """Open and lock the cache file. If another process replaced the
+        file (e.g., compacted it) while waiting for the lock, the new file
+        is opened instead."""
+        assert self._file is not None
         while True:
-            data = f.read(BUF_SIZE)
-            if not data:
+            f = open(self._file, mode)
+            if not LOCK_SUPPORT:
+                return f
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            st = os.fstat(f.fileno())
+            try:
+                current = os.stat(self._file)
+                if (st.st_dev, st.st_ino) == (current.st_dev, current.st_ino):
+                    return f
+            except FileNotFoundError:
+                pass
+            f.close()
+
+    def _read(self, f: Any) -> None:
+        """Read any entries appended since the last read. If the file was
+        replaced (e.g., compacted by another process) or is shorter than
+        what was read, it is reread from the start."""
+        st = os.fstat(f.fileno())
+        if (st.st_dev, st.st_ino) != self._file_id or (
+            st.st_size < self._offset
+        ):
+            self._entries = {}
+            self._file_id = (st.st_dev, st.st_ino)
+            self._offset = 0
+            self._lines = 0
+        if st.st_size == self._offset:
+            return
+        f.seek(self._offset)
+        for line in f:
+            if not line.endswith(b"\n"):
                 break
-            md5.update(data)
+            self._offset += len(line)
+            self._lines += 1
+            try:
+                entry = json.loads(line)
+                key = tuple(entry["key"])
+                self._entries[key[0]] = (key, entry["digests"])
+            except (ValueError, KeyError, IndexError):
+                continue
+
+    def lookup(self, path: Path, st: os.stat_result) -> Dict[str, str]:
+        key = self._key(path, st)
+        with self._lock:
+            if self._file is not None and self._file.exists():
+                try:
+                    with self._open("rb", exclusive=False) as f:
+                        self._read(f)
+                except FileNotFoundError:
+                    pass
+            entry = self._entries.get(key[0])
+            if entry is not None and entry[0] == key:
+                return dict(entry[1])
+        return {}
+
+    def store(
+        self, path: Path, st: os.stat_result, digests: Dict[str, str]
+    ) -> None:
+        key = self._key(path, st)
+        with self._lock:
+            self._entries[key[0]] = (key, dict(digests))
+            if self._file is None:
+                return
+            try:
+                self._file.parent.mkdir(parents=True, exist_ok=True)
+                with self._open("ab+", exclusive=True) as f:
+                    self._read(f)
+                    self._entries[key[0]] = (key, dict(digests))
+                    line = json.dumps({"key": key, "digests": digests})
+                    f.write(line.encode() + b"\n")
+                    self._offset += len(line) + 1
+                    self._lines += 1
+                    if self._lines > 1000 and (
+                        self._lines > 2 * len(self._entries)
+                    ):
+                        self._compact()
+            except OSError:
+                # The cache is only an optimization
+                pass
+
+    def _compact(self) -> None:
+        assert self._file is not None
+        tmp_file = self._file.with_name(self._file.name + ".tmp")
+        with open(tmp_file, "wb") as f:
+            for key, digests in self._entries.values():
+                line = json.dumps({"key": key, "digests": digests})
+                f.write(line.encode() + b"\n")
+        os.replace(tmp_file, self._file)
+        st = self._file.stat()
+        self._file_id = (st.st_dev, st.st_ino)
+        self._offset = st.st_size
+        self._lines = len(self._entries)
+
+
+def _defaultHashCache() -> _HashCache:
+    cache_file = os.environ.get(
+        "GEM5ART_HASH_CACHE",
+        str(Path.home() / ".cache" / "gem5art" / "hashes.jsonl"),
+    )
+    return _HashCache(Path(cache_file) if cache_file else None)
+
+
+_hash_cache = _defaultHashCache()
+
+
+def getDigestAlgorithms() -> List[str]:
+    """
+    Returns the digest algorithms recorded for file artifacts: md5 (which is
+    the artifact's hash) and any others (e.g., "blake2b" or "sha256")
+    listed, comma separated, in the environment variable GEM5ART_DIGESTS.
+    """
+    extra = os.environ.get("GEM5ART_DIGESTS", "")
+    algorithms = ["md5"]
+    for algorithm in extra.split(","):
+        algorithm = algorithm.strip()
+        if algorithm and algorithm not in algorithms:
+            algorithms.append(algorithm)
+    return algorithms
+
+
+def getDigests(
+    path: Path, algorithms: Sequence[str] = ("md5",)
+) -> Dict[str, str]:
+    """
+    Returns the hex digests of the file in path for each of the hashlib
+    algorithms. Digests that are not already cached for the file in its
+    current state are all computed in a single pass over the file.
+    """
+    path = Path(path).resolve()
+    st = path.stat()
+    digests = _hash_cache.lookup(path, st)
+    missing = [a for a in algorithms if a not in digests]
+    if missing:
+        BUF_SIZE = 1 << 20
+        hashers = [hashlib.new(a) for a in missing]
+        buf = bytearray(BUF_SIZE)
+        view = memoryview(buf)
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                for hasher in hashers:
+                    hasher.update(view[:n])
+        for a, hasher in zip(missing, hashers):
+            digests[a] = hasher.hexdigest()
+        # Don't cache a digest of a file that changed while it was read
+        if _HashCache._key(path, path.stat()) == _HashCache._key(path, st):
+            _hash_cache.store(path, st, digests)
+    return {a: digests[a] for a in algorithms}
+
 
-    return md5.hexdigest()
+def getHash(path: Path) -> str:
+    """
+    Returns an md5 hash for the file in self.path.
+    """
+    return getDigests(path, ("md5",))["md5"]
+
+
+def hashFiles(
+    paths: Iterable[Union[str, Path]], max_workers: Optional[int] = None
+) -> Dict[Path, Dict[str, str]]:
+    """
+    Hashes files in parallel threads, returning the digests (see
+    getDigestAlgorithms) of each. The results are cached, so calling this
+    with the paths of several artifacts before registering them lets the
+    files be read concurrently.
+    """
+    files = [Path(path) for path in paths]
+    algorithms = getDigestAlgorithms()
+    with ThreadPoolExecutor(max_workers) as executor:
+        results = executor.map(lambda p: getDigests(p, algorithms), files)
+        return dict(zip(files, results))
 
 
 def getGit(path: Path) -> Dict[str, str]:
@@ -110,6 +307,9 @@ class Artifact:
     7) inputs: list of the input artifacts used to create this artifact stored
        as a list of uuids
 
+    The hash of a file artifact is the file's md5. Digests with any other
+    algorithms listed in GEM5ART_DIGESTS are recorded in `digests`.
+
     Optional fields:
     a) architecture: name of the ISA (e.g. x86, riscv) ("" by default)
     b) size: size of the artifact in bytes (None by default)
@@ -133,6 +333,7 @@ class Artifact:
     hash: str
     time: float
     git: Dict[str, str]
+    digests: Dict[str, str]
     cwd: Path
     inputs: List["Artifact"]
 
@@ -197,9 +398,11 @@ class Artifact:
         ppath = Path(path)
         data["path"] = ppath
         if ppath.is_file():
-            data["hash"] = getHash(ppath)
+            data["digests"] = getDigests(ppath, getDigestAlgorithms())
+            data["hash"] = data["digests"].pop("md5")
             data["git"] = {}
         elif ppath.is_dir():
+            data["digests"] = {}
             data["git"] = getGit(ppath)
             data["hash"] = data["git"]["hash"]
         else:
@@ -320,6 +523,11 @@ class Artifact:
         self.hash = other["hash"]
         assert isinstance(other["git"], dict)
         self.git = other["git"]
+        # Digests other than md5 (the hash), if any were recorded
+        self.digests = {}
+        digests = other.get("digests")
+        if isinstance(digests, dict):
+            self.digests = dict(digests)
         self.cwd = Path(other["cwd"])
         self.inputs = [Artifact(i) for i in other["inputs"]]
 
@@ -27,7 +27,9 @@
 """Tests for the Artifact object and associated functions"""
 
 import hashlib
+import os
 from pathlib import Path
+import tempfile
 import unittest
 from uuid import uuid4, UUID
 import sys
@@ -95,6 +97,80 @@ class TestGit(unittest.TestCase):
         )
 
 
+class TestHash(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = Path(self.tmpdir.name) / "hashes.jsonl"
+        self.old_cache = artifact.artifact._hash_cache
+        artifact.artifact._hash_cache = artifact.artifact._HashCache(
+            self.cache_file
+        )
+        self.path = Path(self.tmpdir.name) / "file"
+        self.path.write_bytes(b"0123456789" * 300000)
+
+    def tearDown(self):
+        artifact.artifact._hash_cache = self.old_cache
+        self.tmpdir.cleanup()
+
+    def test_md5(self):
+        self.assertEqual(
+            artifact.artifact.getHash(self.path),
+            hashlib.md5(self.path.read_bytes()).hexdigest(),
+        )
+
+    def test_digests(self):
+        digests = artifact.artifact.getDigests(self.path, ("md5", "blake2b"))
+        data = self.path.read_bytes()
+        self.assertEqual(digests["md5"], hashlib.md5(data).hexdigest())
+        self.assertEqual(digests["blake2b"], hashlib.blake2b(data).hexdigest())
+
+    def test_cache(self):
+        md5 = artifact.artifact.getHash(self.path)
+        self.assertTrue(self.cache_file.exists())
+        # A new cache reads the entry back from the file
+        cache = artifact.artifact._HashCache(self.cache_file)
+        st = self.path.resolve().stat()
+        self.assertEqual(cache.lookup(self.path.resolve(), st)["md5"], md5)
+
+        # Changing the file invalidates the entry
+        with open(self.path, "ab") as f:
+            f.write(b"more")
+        self.assertEqual(
+            artifact.artifact.getHash(self.path),
+            hashlib.md5(self.path.read_bytes()).hexdigest(),
+        )
+
+    def test_cache_replaced(self):
+        # Another process compacting the file swaps in a new, shorter, file
+        # under a reader that has already read past its end
+        reader = artifact.artifact._HashCache(self.cache_file)
+        for i in range(10):
+            path = Path(self.tmpdir.name) / f"old{i}"
+            path.write_bytes(bytes(i))
+            reader.store(Path("file"), path.stat(), {"md5": str(i)})
+
+        writer = artifact.artifact._HashCache(self.cache_file)
+        st = self.path.stat()
+        self.assertEqual(writer.lookup(Path("file"), st), {})
+        with writer._lock:
+            writer._compact()
+        writer.store(self.path, st, {"md5": "new"})
+        self.assertLess(self.cache_file.stat().st_size, reader._offset)
+
+        self.assertEqual(reader.lookup(self.path, st), {"md5": "new"})
+
+    def test_hash_files(self):
+        paths = [Path(self.tmpdir.name) / f"file{i}" for i in range(4)]
+        for i, path in enumerate(paths):
+            path.write_bytes(bytes([i]) * 1000)
+        results = artifact.hashFiles(paths, max_workers=4)
+        for path in paths:
+            self.assertEqual(
+                results[path]["md5"],
+                hashlib.md5(path.read_bytes()).hexdigest(),
+            )
+
+
 class TestArtifact(unittest.TestCase):
     def setUp(self):
         self.artifact = artifact.Artifact(
@@ -28,13 +28,30 @@
 
 
 import json
+from multiprocessing import Pool
 import os
 from pathlib import Path
 import unittest
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from gem5art.artifact import Artifact
-from gem5art.artifact._artifactdb import getDBConnection
+from gem5art.artifact._artifactdb import ArtifactFileDB, getDBConnection
+
+
+def _insert_artifacts(args):
+    db_file, worker, count = args
+    db = ArtifactFileDB(f"file://{db_file}")
+    for i in range(count):
+        the_uuid = uuid4()
+        db.put(
+            the_uuid,
+            {
+                "_id": the_uuid,
+                "hash": f"{worker}-{i}",
+                "name": f"artifact-{i}",
+                "type": f"worker-{worker}",
+            },
+        )
 
 
 class TestArtifactFileDB(unittest.TestCase):
@@ -57,14 +74,72 @@ class TestArtifactFileDB(unittest.TestCase):
     def tearDown(self):
         os.remove("test-file.txt")
         os.remove("test.json")
+        if os.path.exists("test.json.lock"):
+            os.remove("test.json.lock")
 
     def test_init_function(self):
         self.assertTrue(Path("test.json").exists())
 
     def test_json_content(self):
         with open("test.json", "r") as f:
-            artifacts = json.load(f)
+            artifacts = [json.loads(line) for line in f]
         self.assertTrue(len(artifacts) == 1)
         artifact = artifacts[0]
         self.assertTrue(artifact["hash"] == self.artifact.hash)
         self.assertTrue(UUID(artifact["_id"]) == self.artifact._id)
+
+    def test_reopen(self):
+        db = ArtifactFileDB("file://test.json")
+        self.assertTrue(self.artifact._id in db)
+        self.assertTrue(self.artifact.hash in db)
+        found = list(db.searchByNameType("test-artifact", "text", limit=10))
+        self.assertEqual(len(found), 1)
+        self.assertEqual(UUID(found[0]["_id"]), self.artifact._id)
+
+
+class TestArtifactFileDBJournal(unittest.TestCase):
+    def setUp(self):
+        self.db_file = Path("test-journal.json")
+
+    def tearDown(self):
+        for path in (self.db_file, Path("test-journal.json.lock")):
+            if path.exists():
+                path.unlink()
+
+    def test_legacy_file(self):
+        artifacts = [
+            {"_id": str(uuid4()), "hash": str(i), "name": "a", "type": "t"}
+            for i in range(3)
+        ]
+        with open(self.db_file, "w") as f:
+            json.dump(artifacts, f, indent=4)
+        db = ArtifactFileDB(f"file://{self.db_file}")
+        self.assertEqual(len(list(db.searchByName("a", limit=10))), 3)
+        # The file is rewritten as a journal when it is first opened
+        with open(self.db_file, "r") as f:
+            self.assertEqual([json.loads(line) for line in f], artifacts)
+
+    def test_find_exact_limit(self):
+        db = ArtifactFileDB(f"file://{self.db_file}")
+        for i in range(5):
+            the_uuid = uuid4()
+            db.put(
+                the_uuid,
+                {"_id": the_uuid, "hash": str(i), "name": "a", "type": "t"},
+            )
+        self.assertEqual(len(list(db.find_exact({"type": "t"}, 3))), 3)
+        self.assertEqual(len(list(db.searchByType("t", limit=10))), 5)
+        self.assertEqual(len(list(db.searchByType("t", limit=0))), 5)
+        self.assertEqual(list(db.find_exact({"hash": "2", "name": "b"}, 1)), [])
+
+    def test_concurrent_writers(self):
+        with Pool(4) as pool:
+            pool.map(
+                _insert_artifacts, [(self.db_file, i, 25) for i in range(4)]
+            )
+        db = ArtifactFileDB(f"file://{self.db_file}")
+        for i in range(4):
+            found = list(db.searchByType(f"worker-{i}", limit=100))
+            self.assertEqual(len(found), 25)
+        with open(self.db_file, "r") as f:
+            self.assertEqual(len(f.readlines()), 100)
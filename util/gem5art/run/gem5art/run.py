@@ -32,22 +32,386 @@ This class works closely with the artifact module to ensure that the gem5
 experiment is reproducible and the output is saved to the database.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
 import json
 import os
 from pathlib import Path
 import signal
+import struct
 import subprocess
+import tempfile
+import threading
 import time
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    IO,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from uuid import UUID, uuid4
 import zipfile
+import zlib
 
 from gem5art import artifact
 from gem5art.artifact import Artifact
 from gem5art.artifact._artifactdb import ArtifactDB
 
 
+# Files with these suffixes are already compressed and are stored as-is
+_COMPRESSED_SUFFIXES = {
+    ".gz",
+    ".tgz",
+    ".bz2",
+    ".xz",
+    ".zst",
+    ".lz4",
+    ".zip",
+    ".png",
+    ".jpg",
+    ".jpeg",
+}
+
+# Files that compress worse than this in a sample of their first block are
+# stored as-is
+_STORE_RATIO = 0.9
+
+_BLOCK_SIZE = 1 << 20
+
+
+def _isCompressible(path: Path, sample: bytes) -> bool:
+    """Guess if deflating the file at path, which starts with sample, is
+    worthwhile."""
+    if path.suffix.lower() in _COMPRESSED_SUFFIXES:
+        return False
+    # gzip magic number (e.g., gzipped traces or checkpoints without a
+    # .gz suffix)
+    if sample[:2] == b"\x1f\x8b":
+        return False
+    if len(sample) < 512:
+        return True
+    return len(zlib.compress(sample, 1)) < _STORE_RATIO * len(sample)
+
+
+def _compressMember(
+    path: Path, arcname: str, tmpdir: Path
+) -> Tuple[zipfile.ZipInfo, Optional[str], Optional[IO[bytes]]]:
+    """Deflate one file ahead of the writer, in a worker thread.
+
+    Returns the ZipInfo for the member, the md5 of the file's contents and
+    a temporary file holding the raw deflate stream. Files not worth
+    compressing are only sampled: the md5 and temporary file are None and
+    the writer copies and checksums the file itself. zlib and hashlib
+    release the GIL while working on large buffers, so files deflate in
+    parallel.
+    """
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    with open(path, "rb") as f:
+        block = f.read(_BLOCK_SIZE)
+        if not _isCompressible(path, block[: 1 << 16]):
+            zinfo.compress_type = zipfile.ZIP_STORED
+            return zinfo, None, None
+
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        out = tempfile.TemporaryFile(dir=tmpdir)
+        compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS
+        )
+        md5 = hashlib.md5()
+        crc = 0
+        size = 0
+        while block:
+            md5.update(block)
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            out.write(compressor.compress(block))
+            block = f.read(_BLOCK_SIZE)
+        out.write(compressor.flush())
+    zinfo.file_size = size
+    zinfo.CRC = crc
+    zinfo.compress_size = out.tell()
+    out.seek(0)
+    return zinfo, md5.hexdigest(), out
+
+
+class _ZipWriter:
+    """Write a zip archive whose deflated members were compressed ahead of
+    time.
+
+    zipfile.ZipFile can only compress members itself, in the thread that
+    writes them, so the headers and central directory are written here.
+    The member metadata (name, date, attributes) comes from ZipInfo.
+    """
+
+    _LOCAL = struct.Struct("<4s5H3L2H")
+    _CENTRAL = struct.Struct("<4s6H3L5H2L")
+    _END64 = struct.Struct("<4sQ2H2L4Q")
+    _LOCATOR64 = struct.Struct("<4sLQL")
+    _END = struct.Struct("<4s4H2LH")
+
+    def __init__(self, f: IO[bytes]):
+        self.f = f
+        self.members: List[Tuple[zipfile.ZipInfo, int, bool]] = []
+
+    @staticmethod
+    def _dosTime(zinfo: zipfile.ZipInfo) -> Tuple[int, int]:
+        year, month, day, hour, minute, second = zinfo.date_time
+        return (
+            hour << 11 | minute << 5 | second // 2,
+            (year - 1980) << 9 | month << 5 | day,
+        )
+
+    @staticmethod
+    def _flags(zinfo: zipfile.ZipInfo) -> int:
+        try:
+            zinfo.filename.encode("ascii")
+            return 0
+        except UnicodeEncodeError:
+            return 0x800
+
+    def _localHeader(self, zinfo: zipfile.ZipInfo, zip64: bool) -> bytes:
+        name = zinfo.filename.encode("utf-8")
+        time, date = self._dosTime(zinfo)
+        if zip64:
+            extra = struct.pack(
+                "<2H2Q", 1, 16, zinfo.file_size, zinfo.compress_size
+            )
+            sizes = (0xFFFFFFFF, 0xFFFFFFFF)
+        else:
+            extra = b""
+            sizes = (zinfo.compress_size, zinfo.file_size)
+        return (
+            self._LOCAL.pack(
+                b"PK\x03\x04",
+                45 if zip64 else 20,
+                self._flags(zinfo),
+                zinfo.compress_type,
+                time,
+                date,
+                zinfo.CRC,
+                *sizes,
+                len(name),
+                len(extra),
+            )
+            + name
+            + extra
+        )
+
+    def write(
+        self,
+        zinfo: zipfile.ZipInfo,
+        data: Optional[IO[bytes]],
+        hasher: Optional[Any] = None,
+    ) -> None:
+        """Add a member, copying its (already compressed, if it is
+        deflated) bytes from data. The CRC and compressed size of stored
+        members are found while copying, and hasher is updated with the
+        bytes copied."""
+        offset = self.f.tell()
+        if zinfo.compress_type == zipfile.ZIP_STORED:
+            zinfo.CRC = 0
+            zinfo.compress_size = zinfo.file_size
+        zip64 = (
+            max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+        )
+        header = self._localHeader(zinfo, zip64)
+        self.f.write(header)
+        if data is not None:
+            crc = 0
+            size = 0
+            while True:
+                block = data.read(_BLOCK_SIZE)
+                if not block:
+                    break
+                if zinfo.compress_type == zipfile.ZIP_STORED:
+                    crc = zlib.crc32(block, crc)
+                if hasher is not None:
+                    hasher.update(block)
+                size += len(block)
+                self.f.write(block)
+            if zinfo.compress_type == zipfile.ZIP_STORED:
+                zinfo.CRC = crc
+                zinfo.file_size = size
+            zinfo.compress_size = size
+            # Fill in the sizes and CRC now they are known
+            end = self.f.tell()
+            self.f.seek(offset)
+            self.f.write(self._localHeader(zinfo, zip64))
+            self.f.seek(end)
+        self.members.append((zinfo, offset, zip64))
+
+    def close(self) -> None:
+        """Write the central directory."""
+        start = self.f.tell()
+        for zinfo, offset, zip64 in self.members:
+            name = zinfo.filename.encode("utf-8")
+            time, date = self._dosTime(zinfo)
+            fields = []
+            sizes = [zinfo.compress_size, zinfo.file_size]
+            if zip64:
+                fields = [zinfo.file_size, zinfo.compress_size]
+                sizes = [0xFFFFFFFF, 0xFFFFFFFF]
+            if offset > zipfile.ZIP64_LIMIT:
+                fields.append(offset)
+                offset = 0xFFFFFFFF
+            extra = b""
+            if fields:
+                extra = struct.pack(
+                    "<2H%dQ" % len(fields), 1, 8 * len(fields), *fields
+                )
+            self.f.write(
+                self._CENTRAL.pack(
+                    b"PK\x01\x02",
+                    3 << 8 | 45 if fields else 3 << 8 | 20,
+                    45 if fields else 20,
+                    self._flags(zinfo),
+                    zinfo.compress_type,
+                    time,
+                    date,
+                    zinfo.CRC,
+                    *sizes,
+                    len(name),
+                    len(extra),
+                    0,
+                    0,
+                    0,
+                    zinfo.external_attr,
+                    offset,
+                )
+                + name
+                + extra
+            )
+        end = self.f.tell()
+        count = len(self.members)
+        size = end - start
+        if (
+            count >= 0xFFFF
+            or start > zipfile.ZIP64_LIMIT
+            or size > zipfile.ZIP64_LIMIT
+        ):
+            self.f.write(
+                self._END64.pack(
+                    b"PK\x06\x06",
+                    self._END64.size - 12,
+                    3 << 8 | 45,
+                    45,
+                    0,
+                    0,
+                    count,
+                    count,
+                    size,
+                    start,
+                )
+            )
+            self.f.write(self._LOCATOR64.pack(b"PK\x06\x07", 0, end, 1))
+            count = min(count, 0xFFFF)
+            size = min(size, 0xFFFFFFFF)
+            start = min(start, 0xFFFFFFFF)
+        self.f.write(
+            self._END.pack(b"PK\x05\x06", 0, 0, count, count, size, start, 0)
+        )
+
+
+def archiveDirectory(
+    directory: Path,
+    zip_path: Path,
+    root: Optional[Path] = None,
+    threads: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Zip up a directory, compressing its files in parallel threads.
+
+    Files that are already compressed (by suffix or gzip header) or that do
+    not compress well are stored without compression. Each file is read
+    once: compressed files by a worker, which deflates it into a temporary
+    file next to zip_path while checksumming it, and stored files by the
+    writer as it copies them. Member names are relative to root (by
+    default, the parent of directory).
+
+    Returns an index of the archive: for each member file, a record with
+    its name, size, size in the archive, md5, and whether it was
+    compressed. It is a list rather than a dict keyed by name so it can be
+    stored in MongoDB, which does not allow '.' in field names.
+    """
+    root = directory.parent if root is None else root
+    threads = threads or os.cpu_count() or 1
+    paths = sorted(
+        path
+        for path in directory.glob("**/*")
+        if path.resolve() != zip_path.resolve()
+    )
+    index: List[Dict[str, Any]] = []
+    with open(zip_path, "wb") as f, ThreadPoolExecutor(threads) as executor:
+        zipw = _ZipWriter(f)
+        # Keep a bounded number of members in flight ahead of the writer
+        pending: List[Any] = []
+
+        def writeOldest() -> None:
+            path, future = pending.pop(0)
+            zinfo, md5, data = future.result()
+            if data is None:
+                hasher = hashlib.md5()
+                with open(path, "rb") as member:
+                    zipw.write(zinfo, member, hasher)
+                md5 = hasher.hexdigest()
+            else:
+                with data:
+                    zipw.write(zinfo, data)
+            index.append(
+                {
+                    "name": zinfo.filename,
+                    "size": zinfo.file_size,
+                    "compressed_size": zinfo.compress_size,
+                    "md5": md5,
+                    "compressed": zinfo.compress_type
+                    == zipfile.ZIP_DEFLATED,
+                }
+            )
+
+        try:
+            for path in paths:
+                arcname = str(path.relative_to(root))
+                if path.is_dir():
+                    while pending:
+                        writeOldest()
+                    zipw.write(zipfile.ZipInfo.from_file(path, arcname), None)
+                    continue
+                pending.append(
+                    (
+                        path,
+                        executor.submit(
+                            _compressMember, path, arcname, zip_path.parent
+                        ),
+                    )
+                )
+                if len(pending) >= 2 * threads:
+                    writeOldest()
+            while pending:
+                writeOldest()
+        finally:
+            # Close the temporary files of members not written
+            for _, future in pending:
+                data = future.result()[2]
+                if data is not None:
+                    data.close()
+        zipw.close()
+    return index
+
+
+# Background threads archiving the results of finished runs
+_archive_threads: List[threading.Thread] = []
+
+
+def waitForArchives() -> None:
+    """Wait until the results of all runs have been archived and stored."""
+    while _archive_threads:
+        _archive_threads.pop(0).join()
+
+
 class gem5Run:
     """
     This class holds all of the info required to run gem5.
@@ -92,6 +456,7 @@ class gem5Run:
     task_id: Any
 
     results: Optional[Artifact]
+    results_files: List[Dict[str, Any]]
     artifacts: List[Artifact]
 
     rerunnable: bool
@@ -147,6 +512,7 @@ class gem5Run:
 
         # Initially, there are no results
         run.results = None
+        run.results_files = []
 
         run.rerunnable = False
 
@@ -341,12 +707,16 @@ class gem5Run:
         For the git repos, this checks the git hash, for binary artifacts this
         checks the md5 hash.
         """
+        # Hash the (independent) file artifacts concurrently
+        digests = artifact.hashFiles(
+            cwd / v.path for v in self.artifacts if v.type != "git repo"
+        )
         for v in self.artifacts:
             if v.type == "git repo":
                 new = artifact.artifact.getGit(cwd / v.path)["hash"]
                 old = v.git["hash"]
             else:
-                new = artifact.artifact.getHash(cwd / v.path)
+                new = digests[cwd / v.path]["md5"]
                 old = v.hash
 
             if new != old:
@@ -445,7 +815,9 @@ class gem5Run:
         d = self._convertForJson(self._getSerializable())
         return json.dumps(d)
 
-    def _run(self, task: Any = None, cwd: str = ".") -> None:
+    def _run(
+        self, task: Any = None, cwd: str = ".", background_archive: bool = False
+    ) -> None:
         """Actually run the test.
 
         Calls Popen with the command to fork a new process.
@@ -458,10 +830,12 @@ class gem5Run:
         cwd is the directory to change to before running. This allows a server
         process to run in a different directory than the running process. Note
         that only the spawned process runs in the new directory.
-        """
-        # Connect to the database
-        db = artifact.getDBConnection()
 
+        If background_archive is True, the results are archived and stored in
+        a background thread so this returns as soon as gem5 finishes. Only
+        one run's results are archived at a time: this waits for the
+        previous archive (which has overlapped with this run) first.
+        """
         self.status = "Begin run"
         self.dumpJson("info.json")
 
@@ -535,6 +909,19 @@ class gem5Run:
 
         self.dumpJson("info.json")
 
+        if background_archive:
+            waitForArchives()
+            thread = threading.Thread(target=self._storeResults)
+            thread.start()
+            _archive_threads.append(thread)
+        else:
+            self._storeResults()
+
+    def _storeResults(self) -> None:
+        """Archive the results and store this run in the database."""
+        # Connect to the database
+        db = artifact.getDBConnection()
+
         self.saveResults()
 
         # Store current gem5 run in the database
@@ -542,7 +929,9 @@ class gem5Run:
 
         print("Done storing the results of {}".format(" ".join(self.command)))
 
-    def run(self, task: Any = None, cwd: str = ".") -> None:
+    def run(
+        self, task: Any = None, cwd: str = ".", background_archive: bool = False
+    ) -> None:
         """Actually run the test.
 
         Calls Popen with the command to fork a new process.
@@ -561,9 +950,11 @@ class gem5Run:
         if self.hash in db:
             print(f"Error: Have already run {self.command}. Exiting!")
             return
-        self._run(task, cwd)
+        self._run(task, cwd, background_archive)
 
-    def rerun(self, task: Any = None, cwd: str = ".") -> None:
+    def rerun(
+        self, task: Any = None, cwd: str = ".", background_archive: bool = False
+    ) -> None:
         """Rerun the test.
 
         Calls Popen with the command to fork a new process.
@@ -578,19 +969,20 @@ class gem5Run:
         that only the spawned process runs in the new directory.
         """
         # TODO: remove the old runs?
-        self._run(task, cwd)
+        self._run(task, cwd, background_archive)
 
-    def saveResults(self) -> None:
+    def saveResults(self, threads: Optional[int] = None) -> None:
         """Zip up the output directory and store the results in the
-        database."""
+        database.
 
-        with zipfile.ZipFile(
-            self.outdir / "results.zip", "w", zipfile.ZIP_DEFLATED
-        ) as zipf:
-            for path in self.outdir.glob("**/*"):
-                if path.name == "results.zip":
-                    continue
-                zipf.write(path, path.relative_to(self.outdir.parent))
+        Files are compressed and checksummed in parallel threads (see
+        archiveDirectory), and the name, size and md5 of each are recorded
+        in results_files so a single file can be found and extracted from
+        the archive."""
+
+        self.results_files = archiveDirectory(
+            self.outdir, self.outdir / "results.zip", threads=threads
+        )
 
         self.results = Artifact.registerArtifact(
             command=f"zip results.zip -r {self.outdir}",
@@ -26,14 +26,18 @@
 
 """Tests for gem5Run object"""
 
+import gzip
 import hashlib
 from pathlib import Path
 import os
+import tempfile
 import unittest
+from unittest import mock
 from uuid import uuid4
+import zipfile
 
 from gem5art.artifact import artifact
-from gem5art.run import gem5Run
+from gem5art.run import archiveDirectory, gem5Run
 
 
 class TestSERun(unittest.TestCase):
@@ -120,5 +124,58 @@ class TestSERun(unittest.TestCase):
         )
 
 
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.outdir = Path(self.tmpdir.name) / "out"
+        (self.outdir / "cpt.1").mkdir(parents=True)
+        self.files = {
+            "out/stats.txt": b"system.cpu.numCycles 1234 # cycles\n" * 5000,
+            "out/trace.gz": gzip.compress(os.urandom(10000)),
+            "out/cpt.1/system.physmem.store0.pmem": os.urandom(100000),
+            "out/empty": b"",
+        }
+        for name, data in self.files.items():
+            (Path(self.tmpdir.name) / name).write_bytes(data)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_archive(self):
+        zip_path = self.outdir / "results.zip"
+        records = archiveDirectory(self.outdir, zip_path, threads=2)
+        index = {record["name"]: record for record in records}
+        with zipfile.ZipFile(zip_path) as zipf:
+            self.assertIsNone(zipf.testzip())
+            self.assertNotIn("out/results.zip", zipf.namelist())
+            self.assertIn("out/cpt.1/", zipf.namelist())
+            for name, data in self.files.items():
+                self.assertEqual(zipf.read(name), data)
+                self.assertEqual(index[name]["size"], len(data))
+                self.assertEqual(
+                    index[name]["md5"], hashlib.md5(data).hexdigest()
+                )
+        self.assertTrue(index["out/stats.txt"]["compressed"])
+        self.assertFalse(index["out/trace.gz"]["compressed"])
+        self.assertFalse(
+            index["out/cpt.1/system.physmem.store0.pmem"]["compressed"]
+        )
+        # Stored in the run document, where MongoDB rejects dotted keys
+        for record in records:
+            self.assertTrue(all("." not in key for key in record))
+
+    def test_archive_zip64(self):
+        # Lower the limit so every member and the central directory need
+        # the zip64 extensions
+        zip_path = self.outdir / "results.zip"
+        with mock.patch("zipfile.ZIP64_LIMIT", 1000):
+            records = archiveDirectory(self.outdir, zip_path, threads=2)
+        self.assertEqual(len(records), len(self.files))
+        with zipfile.ZipFile(zip_path) as zipf:
+            self.assertIsNone(zipf.testzip())
+            for name, data in self.files.items():
+                self.assertEqual(zipf.read(name), data)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,412 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All Rights Reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""A resumable job queue for running gem5 experiments on one machine
+
+Unlike run_job_pool, the queue's state is kept in a SQLite database, so a
+driver that is stopped (or dies) can be restarted and will carry on without
+rerunning the jobs that finished. Unlike Celery, no broker is needed.
+
+Each job is a gem5Run with a reservation of CPUs and memory and a priority.
+Jobs are started, highest priority first, whenever their reservation fits
+in what is left of the machine. Jobs whose guest kernel panics are retried.
+"""
+
+import fcntl
+import json
+import multiprocessing as mp
+import os
+import pickle
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from gem5art import artifact
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    hash TEXT PRIMARY KEY,
+    name TEXT,
+    run BLOB NOT NULL,
+    cwd TEXT NOT NULL,
+    state TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    cpus INTEGER NOT NULL,
+    memory INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    pid INTEGER,
+    enqueue_time REAL,
+    start_time REAL,
+    end_time REAL,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state_priority ON jobs (state, priority);
+"""
+
+# Job states
+PENDING = "pending"
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+
+_SIZE_UNITS = {
+    "": 1,
+    "B": 1,
+    "K": 1 << 10,
+    "KB": 1 << 10,
+    "KIB": 1 << 10,
+    "M": 1 << 20,
+    "MB": 1 << 20,
+    "MIB": 1 << 20,
+    "G": 1 << 30,
+    "GB": 1 << 30,
+    "GIB": 1 << 30,
+    "T": 1 << 40,
+    "TB": 1 << 40,
+    "TIB": 1 << 40,
+}
+
+
+def _parseSize(size: Union[int, str]) -> int:
+    """Returns a size in bytes from an int or a string like "4GiB"."""
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*([\d.]+)\s*([A-Za-z]*)\s*", size)
+    if not match or match.group(2).upper() not in _SIZE_UNITS:
+        raise ValueError(f"Cannot parse memory size {size}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+def _totalMemory() -> int:
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+def _isAlive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _runJob(pickled_run: bytes, cwd: str, rerun: bool) -> None:
+    """Runs one job. This is the target of each job's process."""
+    run = pickle.loads(pickled_run)
+    if rerun:
+        # The failed attempt is already stored under the run's _id, so
+        # this attempt is stored as a run document of its own
+        run._id = uuid4()
+        run.rerun(cwd=cwd)
+    else:
+        run.run(cwd=cwd)
+
+
+class JobQueue:
+    """
+    A SQLite-backed queue of gem5Run jobs on the local machine.
+
+    Jobs are identified by the hash of their gem5Run (which covers the
+    artifacts, run script, and parameters), so adding the same experiment
+    twice has no effect. The database file can be shared between sessions:
+    add jobs, call process(), and if the driver is stopped, call process()
+    again later to continue. Only one driver may process a queue at a time.
+    """
+
+    def __init__(
+        self,
+        path: str = "gem5art-jobs.sqlite",
+        cpus: Optional[int] = None,
+        memory: Optional[Union[int, str]] = None,
+        max_retries: int = 2,
+        poll_interval: float = 5.0,
+    ) -> None:
+        """
+        path is the SQLite database holding the queue.
+        cpus and memory (in bytes, or a string like "64GiB") are the
+        resources of the machine that jobs reserve from; by default, all of
+        them. A job whose guest kernel panics is retried up to max_retries
+        times.
+        """
+        self.path = path
+        self.cpus = cpus or os.cpu_count() or 1
+        self.memory = (
+            _totalMemory() if memory is None else _parseSize(memory)
+        )
+        self.max_retries = max_retries
+        self.poll_interval = poll_interval
+        self._db = sqlite3.connect(path, timeout=60)
+        self._db.row_factory = sqlite3.Row
+        with self._db:
+            self._db.executescript(_SCHEMA)
+        self._procs: Dict[str, Any] = {}
+
+    def close(self) -> None:
+        self._db.close()
+
+    def add(
+        self,
+        run: Any,
+        cpus: int = 1,
+        memory: Union[int, str] = 0,
+        priority: int = 0,
+        cwd: str = ".",
+    ) -> bool:
+        """
+        Adds a gem5Run to the queue, reserving cpus and memory for it while
+        it runs. Jobs with a higher priority are started first.
+
+        Returns False if a run with the same hash is already queued.
+        """
+        memory = _parseSize(memory)
+        if cpus > self.cpus or memory > self.memory:
+            raise ValueError(
+                f"Job {run.name} needs more resources ({cpus} cpus, "
+                f"{memory} bytes) than the queue has ({self.cpus} cpus, "
+                f"{self.memory} bytes)"
+            )
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO jobs (hash, name, run, cwd, state, "
+                "priority, cpus, memory, enqueue_time) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run.hash,
+                    run.name,
+                    pickle.dumps(run),
+                    cwd,
+                    PENDING,
+                    priority,
+                    cpus,
+                    memory,
+                    time.time(),
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def counts(self) -> Dict[str, int]:
+        """Returns the number of jobs in each state."""
+        return {
+            row["state"]: row["n"]
+            for row in self._db.execute(
+                "SELECT state, COUNT(*) AS n FROM jobs GROUP BY state"
+            )
+        }
+
+    def jobs(self, state: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Returns the jobs (without their gem5Runs), optionally only those
+        in the given state."""
+        query = (
+            "SELECT hash, name, cwd, state, priority, cpus, memory, "
+            "attempts, pid, enqueue_time, start_time, end_time, status "
+            "FROM jobs"
+        )
+        if state is None:
+            rows = self._db.execute(query + " ORDER BY rowid")
+        else:
+            rows = self._db.execute(
+                query + " WHERE state = ? ORDER BY rowid", (state,)
+            )
+        return [dict(row) for row in rows]
+
+    def retryFailed(self) -> int:
+        """Puts failed jobs back in the queue. Returns how many."""
+        with self._db:
+            cursor = self._db.execute(
+                "UPDATE jobs SET state = ?, attempts = 0 WHERE state = ?",
+                (PENDING, FAILED),
+            )
+        return cursor.rowcount
+
+    def process(self) -> None:
+        """
+        Runs jobs until none are pending or running.
+
+        Jobs left running by a previous driver are waited for if their
+        process is still alive, and put back in the queue otherwise. If the
+        driver is interrupted, its running jobs are stopped and put back in
+        the queue.
+        """
+        with open(self.path + ".lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise Exception(f"{self.path} is being processed elsewhere")
+            try:
+                self._process()
+            except BaseException:
+                self._stopRunning()
+                raise
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _process(self) -> None:
+        # Jobs left running by a previous driver
+        adopted: Dict[str, int] = {}
+        for row in self._db.execute(
+            "SELECT hash, pid FROM jobs WHERE state = ?", (RUNNING,)
+        ).fetchall():
+            if row["pid"] and _isAlive(row["pid"]):
+                adopted[row["hash"]] = row["pid"]
+            else:
+                self._finish(row["hash"])
+
+        while True:
+            for job_hash, proc in list(self._procs.items()):
+                if not proc.is_alive():
+                    proc.join()
+                    del self._procs[job_hash]
+                    self._finish(job_hash)
+            for job_hash, pid in list(adopted.items()):
+                if not _isAlive(pid):
+                    del adopted[job_hash]
+                    self._finish(job_hash)
+
+            self._startJobs()
+
+            if not self._procs and not adopted:
+                pending = self._db.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE state = ?", (PENDING,)
+                ).fetchone()[0]
+                if not pending:
+                    break
+            time.sleep(self.poll_interval)
+
+    def _free(self) -> Tuple[int, int]:
+        used_cpus, used_memory = self._db.execute(
+            "SELECT COALESCE(SUM(cpus), 0), COALESCE(SUM(memory), 0) "
+            "FROM jobs WHERE state = ?",
+            (RUNNING,),
+        ).fetchone()
+        return self.cpus - used_cpus, self.memory - used_memory
+
+    def _startJobs(self) -> None:
+        """Starts the pending jobs that fit, highest priority first."""
+        free_cpus, free_memory = self._free()
+        pending = self._db.execute(
+            "SELECT hash, cpus, memory FROM jobs WHERE state = ? "
+            "ORDER BY priority DESC, rowid",
+            (PENDING,),
+        ).fetchall()
+        for row in pending:
+            if row["cpus"] > free_cpus or row["memory"] > free_memory:
+                continue
+            self._start(row["hash"])
+            free_cpus -= row["cpus"]
+            free_memory -= row["memory"]
+
+    def _start(self, job_hash: str) -> None:
+        row = self._db.execute(
+            "SELECT run, cwd, attempts FROM jobs WHERE hash = ?", (job_hash,)
+        ).fetchone()
+        if row["attempts"] == 0 and job_hash in artifact.getDBConnection():
+            # Run before, outside of this queue
+            with self._db:
+                self._db.execute(
+                    "UPDATE jobs SET state = ?, status = ? WHERE hash = ?",
+                    (FINISHED, "Already run", job_hash),
+                )
+            return
+        # Retries must rerun: the panicked attempt is in the artifact DB.
+        # The start time is taken before the job can write its info.json,
+        # which _finish compares against it.
+        start_time = time.time()
+        proc = mp.Process(
+            target=_runJob,
+            args=(row["run"], row["cwd"], row["attempts"] > 0),
+        )
+        proc.start()
+        self._procs[job_hash] = proc
+        with self._db:
+            self._db.execute(
+                "UPDATE jobs SET state = ?, pid = ?, attempts = attempts + 1, "
+                "start_time = ?, end_time = NULL, status = NULL "
+                "WHERE hash = ?",
+                (RUNNING, proc.pid, start_time, job_hash),
+            )
+
+    def _finish(self, job_hash: str) -> None:
+        """Records the outcome of a job whose process has exited, from the
+        info.json that gem5Run keeps in its outdir."""
+        row = self._db.execute(
+            "SELECT run, attempts, start_time FROM jobs WHERE hash = ?",
+            (job_hash,),
+        ).fetchone()
+        run = pickle.loads(row["run"])
+        info: Dict[str, Any] = {}
+        try:
+            with open(run.outdir / "info.json") as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        status = info.get("status", "")
+        if (info.get("start_time") or 0) < (row["start_time"] or 0):
+            # Stale info from an earlier attempt: the job did not get far
+            # enough to write its own
+            status = ""
+        if info.get("kill_reason") == "kernel panic" or (
+            status and run.checkKernelPanic()
+        ):
+            status = "Kernel panic"
+
+        if status in ("", "Begin run", "Spawning", "Running"):
+            # The job's process died (or was killed) before gem5 finished
+            status = "Interrupted"
+
+        if status == "Finished":
+            state = FINISHED
+        elif (
+            status in ("Kernel panic", "Interrupted")
+            and row["attempts"] <= self.max_retries
+        ):
+            state = PENDING
+        else:
+            state = FAILED
+        with self._db:
+            self._db.execute(
+                "UPDATE jobs SET state = ?, status = ?, end_time = ?, "
+                "pid = NULL WHERE hash = ?",
+                (state, status, time.time(), job_hash),
+            )
+
+    def _stopRunning(self) -> None:
+        """Stops this driver's running jobs and requeues them."""
+        for job_hash, proc in self._procs.items():
+            # gem5Run kills gem5 when it gets a SIGTERM
+            proc.terminate()
+            proc.join()
+            # Being stopped does not count as an attempt
+            with self._db:
+                self._db.execute(
+                    "UPDATE jobs SET state = ?, status = ?, pid = NULL, "
+                    "attempts = attempts - 1 WHERE hash = ?",
+                    (PENDING, "Interrupted", job_hash),
+                )
+        self._procs.clear()
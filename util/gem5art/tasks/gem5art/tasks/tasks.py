@@ -25,6 +25,7 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 from .celery import gem5app
+from functools import partial
 import multiprocessing as mp
 import time
 
@@ -39,10 +40,10 @@ def run_gem5_instance(self, gem5_run, cwd="."):
     gem5_run.run(self, cwd=cwd)
 
 
-def run_single_job(run):
+def run_single_job(run, background_archive=False):
     start_time = time.time()
     print(f"Running {' '.join(run.command)} at {time.time()}")
-    run.run()
+    run.run(background_archive=background_archive)
     finish_time = time.time()
     print(
         f"Finished {' '.join(run.command)} at {time.time()}. "
@@ -50,16 +51,23 @@ def run_single_job(run):
     )
 
 
-def run_job_pool(job_list, num_parallel_jobs=mp.cpu_count() // 2):
+def run_job_pool(
+    job_list, num_parallel_jobs=mp.cpu_count() // 2, overlap_archiving=True
+):
     """
     Runs gem5 jobs in parallel when Celery is not used.
     Creates as many parallel jobs as core count if no explicit
     job count is provided
     Receives a list of run objects created by the launch script
+    If overlap_archiving is True, each job's results are archived while the
+    next job in the same worker runs
     """
 
     pool = mp.Pool(num_parallel_jobs)
-    pool.map(run_single_job, job_list)
+    pool.map(
+        partial(run_single_job, background_archive=overlap_archiving),
+        job_list,
+    )
     pool.close()
     pool.join()
     print(f"All jobs done running!")
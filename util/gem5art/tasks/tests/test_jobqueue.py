@@ -0,0 +1,180 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All Rights Reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Tests for JobQueue"""
+
+import hashlib
+import json
+from pathlib import Path
+import tempfile
+import time
+import unittest
+from uuid import uuid4
+
+from gem5art.artifact import artifact
+from gem5art.tasks.jobqueue import JobQueue, FAILED, FINISHED
+
+
+class FakeRun:
+    """
+    Stands in for a gem5Run. Its first panics attempts end in a kernel
+    panic, and every attempt is logged and stored in the artifact database
+    like gem5Run._storeResults does.
+    """
+
+    def __init__(self, name, outdir, log, panics=0):
+        self._id = uuid4()
+        self.name = name
+        self.hash = hashlib.md5(name.encode()).hexdigest()
+        self.outdir = Path(outdir) / name
+        self.log = log
+        self.panics = panics
+
+    def _attempt(self):
+        with open(self.log) as f:
+            attempt = [line.split()[0] for line in f].count(self.name) + 1
+        with open(self.log, "a") as f:
+            f.write(f"{self.name} {self._id}\n")
+        info = {"start_time": time.time()}
+        if attempt <= self.panics:
+            info.update(status="Failed", kill_reason="kernel panic")
+        else:
+            info.update(status="Finished")
+        self.outdir.mkdir(parents=True, exist_ok=True)
+        with open(self.outdir / "info.json", "w") as f:
+            json.dump(info, f)
+        artifact.getDBConnection().put(
+            self._id,
+            {
+                "_id": self._id,
+                "hash": self.hash,
+                "name": self.name,
+                "type": "gem5 run",
+                "status": info["status"],
+            },
+        )
+
+    def run(self, cwd="."):
+        self._attempt()
+
+    def rerun(self, cwd="."):
+        self._attempt()
+
+    def checkKernelPanic(self):
+        return False
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.db = artifact.getDBConnection(f"file://{self.dir}/db.json")
+        self.log = self.dir / "log"
+        self.log.touch()
+        self.queue = JobQueue(
+            str(self.dir / "jobs.sqlite"),
+            cpus=1,
+            memory="1GiB",
+            max_retries=2,
+            poll_interval=0.01,
+        )
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmp.cleanup()
+
+    def run_(self, name, **kwargs):
+        return FakeRun(name, self.dir, self.log, **kwargs)
+
+    def started(self):
+        with open(self.log) as f:
+            return [line.split() for line in f]
+
+    def stored(self, run):
+        return list(self.db.find_exact({"hash": run.hash}, limit=0))
+
+    def test_add_once(self):
+        run = self.run_("a")
+        self.assertTrue(self.queue.add(run))
+        self.assertFalse(self.queue.add(run))
+        self.assertEqual(self.queue.counts(), {"pending": 1})
+
+    def test_priority_order(self):
+        for name, priority in (("low", 0), ("high", 2), ("mid", 1)):
+            self.queue.add(self.run_(name), priority=priority)
+        self.queue.process()
+        self.assertEqual(
+            [name for name, _ in self.started()], ["high", "mid", "low"]
+        )
+        self.assertEqual(self.queue.counts(), {FINISHED: 3})
+
+    def test_results_stored(self):
+        run = self.run_("a")
+        self.queue.add(run)
+        self.queue.process()
+        stored = self.stored(run)
+        self.assertEqual(len(stored), 1)
+        self.assertEqual(stored[0]["status"], "Finished")
+
+    def test_retry(self):
+        run = self.run_("a", panics=1)
+        self.queue.add(run)
+        self.queue.process()
+        (job,) = self.queue.jobs()
+        self.assertEqual(job["state"], FINISHED)
+        self.assertEqual(job["attempts"], 2)
+        # Each attempt is stored as a run document of its own
+        ids = [run_id for _, run_id in self.started()]
+        self.assertEqual(len(set(ids)), 2)
+        self.assertEqual(
+            sorted(doc["status"] for doc in self.stored(run)),
+            ["Failed", "Finished"],
+        )
+
+    def test_retry_limit(self):
+        run = self.run_("a", panics=5)
+        self.queue.add(run)
+        self.queue.process()
+        (job,) = self.queue.jobs()
+        self.assertEqual(job["state"], FAILED)
+        self.assertEqual(job["status"], "Kernel panic")
+        self.assertEqual(job["attempts"], 3)
+        self.assertEqual(len(self.stored(run)), 3)
+
+    def test_already_run(self):
+        run = self.run_("a")
+        run.run()
+        self.queue.add(run)
+        self.queue.process()
+        (job,) = self.queue.jobs()
+        self.assertEqual(job["state"], FINISHED)
+        self.assertEqual(job["status"], "Already run")
+        self.assertEqual(len(self.started()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -67,11 +67,14 @@ if __name__ == '__main__':
         help='time of last event to load from file')
     parser.add_argument('--mini-views', action='store_true', default=False,
         help='show tiny views of the next 10 time steps')
+    parser.add_argument('--windowed', action='store_true', default=False,
+        help='index the event file and only decode the events around the'
+            + ' time being viewed (for large traces)')
     parser.add_argument('eventFile', metavar='event-file', default='ev')
 
     args = parser.parse_args(sys.argv[1:])
 
-    model = BlobModel(unitNamePrefix=args.prefix)
+    model = BlobModel(unitNamePrefix=args.prefix, windowed=args.windowed)
 
     if args.picture and os.access(args.picture, os.O_RDONLY):
         model.load_picture(args.picture)
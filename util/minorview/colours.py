@@ -33,26 +33,32 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import gtk
+try:
+    import gtk
+    color_parse = gtk.gdk.color_parse
+except ImportError:
+    # Without PyGTK (e.g. when only loading event files) colours are left
+    #   as their names.  Drawing them needs PyGTK anyway
+    color_parse = str
 
 # All the miscellaneous colours used in the interface
-unknownColour = gtk.gdk.color_parse('magenta')
-blockedColour = gtk.gdk.color_parse('grey')
-bubbleColour = gtk.gdk.color_parse('bisque')
-emptySlotColour = gtk.gdk.color_parse('grey90')
-reservedSlotColour = gtk.gdk.color_parse('cyan')
-errorColour = gtk.gdk.color_parse('blue')
-backgroundColour = gtk.gdk.color_parse('white')
-faultColour = gtk.gdk.color_parse('dark cyan')
-readColour = gtk.gdk.color_parse('red')
-writeColour = gtk.gdk.color_parse('white')
+unknownColour = color_parse('magenta')
+blockedColour = color_parse('grey')
+bubbleColour = color_parse('bisque')
+emptySlotColour = color_parse('grey90')
+reservedSlotColour = color_parse('cyan')
+errorColour = color_parse('blue')
+backgroundColour = color_parse('white')
+faultColour = color_parse('dark cyan')
+readColour = color_parse('red')
+writeColour = color_parse('white')
 
-black = gtk.gdk.color_parse('black')
+black = color_parse('black')
 
 def name_to_colour(name):
     """Convert a colour name to a GdkColor"""
     try:
-        ret = gtk.gdk.color_parse(name)
+        ret = color_parse(name)
     except:
         ret = unknownColour
     return ret
@@ -38,8 +38,11 @@ from . import colours
 from .colours import unknownColour
 from .point import Point
 import re
-from . import blobs
 from time import time as wall_time
+from collections import OrderedDict
+import bisect
+import itertools
+import json
 import os
 
 id_parts = "TSPLFE"
@@ -61,6 +64,8 @@ class BlobDataSelect(object):
 
 class BlobVisualData(object):
     """Super class for block data colouring"""
+    __slots__ = ()
+
     def to_striped_block(self, select):
         """Return an array of colours to use for a striped block"""
         return unknownColour
@@ -82,6 +87,9 @@ class BlobVisualData(object):
 
 class Id(BlobVisualData):
     """A line or instruction id"""
+    __slots__ = ('isFault', 'threadId', 'streamSeqNum', 'predictionSeqNum',
+        'lineSeqNum', 'fetchSeqNum', 'execSeqNum')
+
     def __init__(self):
         self.isFault = False
         self.threadId = 0
@@ -98,6 +106,9 @@ class Id(BlobVisualData):
     def __cmp__(self, right):
         return cmp(self.as_list(), right.as_list())
 
+    def __lt__(self, right):
+        return self.as_list() < right.as_list()
+
     def from_string(self, string):
         m = re.match('^(F;)?(\d+)/(\d+)\.(\d+)/(\d+)(/(\d+)(\.(\d+))?)?',
             string)
@@ -175,6 +186,9 @@ class Id(BlobVisualData):
 class Branch(BlobVisualData):
     """Branch data new stream and prediction sequence numbers, a branch
     reason and a new PC"""
+    __slots__ = ('newStreamSeqNum', 'newPredictionSeqNum', 'newPC', 'reason',
+        'id')
+
     def __init__(self):
         self.newStreamSeqNum = 0
         self.newPredictionSeqNum = 0
@@ -206,6 +220,8 @@ class Branch(BlobVisualData):
 class Counts(BlobVisualData):
     """Treat the input data as just a /-separated list of count values (or
     just a single value)"""
+    __slots__ = ('counts',)
+
     def __init__(self):
         self.counts = []
 
@@ -218,6 +234,8 @@ class Counts(BlobVisualData):
 
 class Colour(BlobVisualData):
     """A fixed colour block, used for special colour decoding"""
+    __slots__ = ('colour',)
+
     def __init__(self, colour):
         self.colour = colour
 
@@ -226,6 +244,8 @@ class Colour(BlobVisualData):
 
 class DcacheAccess(BlobVisualData):
     """Data cache accesses [RW];id"""
+    __slots__ = ('direc', 'id')
+
     def __init__(self):
         self.direc = 'R'
         self.id = Id()
@@ -250,6 +270,8 @@ class DcacheAccess(BlobVisualData):
 class ColourPattern(object):
     """Super class for decoders that make 2D grids rather than just single
     striped blocks"""
+    __slots__ = ()
+
     def elems(self):
         return []
 
@@ -269,6 +291,8 @@ def special_view_decoder(class_):
 
 class TwoDColours(ColourPattern):
     """A 2D grid pattern decoder"""
+    __slots__ = ('blockss',)
+
     def __init__(self, blockss):
         self.blockss = blockss
 
@@ -313,7 +337,7 @@ class TwoDColours(ColourPattern):
 
                 for index, value in parsed:
                     try:
-                        array[index % strips][index / strips] = \
+                        array[index % strips][index // strips] = \
                             special_view_decoder(elemClass)(value)
                     except:
                         print("Element out of range strips: %d," \
@@ -338,6 +362,8 @@ class FrameColours(ColourPattern):
     """Decode to a 2D grid which has a single occupied row from the event
     data and some blank rows forming a frame with the occupied row as a
     'title' coloured stripe"""
+    __slots__ = ('numBlankSlots', 'block')
+
     def __init__(self, block, numBlankSlots):
         self.numBlankSlots = numBlankSlots
         self.block = block
@@ -420,6 +446,7 @@ def find_colour_decoder(stripSpace, decoderName, dataName, picPairs):
 class IdedObj(object):
     """An object identified by an Id carrying paired data.
     The super class for Inst and Line"""
+    __slots__ = ('id', 'pairs')
 
     def __init__(self, id, pairs={}):
         self.id = id
@@ -428,6 +455,9 @@ class IdedObj(object):
     def __cmp__(self, right):
         return cmp(self.id, right.id)
 
+    def __lt__(self, right):
+        return self.id < right.id
+
     def table_line(self):
         """Represent the object as a list of table row data"""
         return []
@@ -439,6 +469,8 @@ class IdedObj(object):
 
 class Inst(IdedObj):
     """A non-fault instruction"""
+    __slots__ = ('nextAddr', 'disassembly', 'addr')
+
     def __init__(self, id, disassembly, addr, pairs={}):
         super(Inst,self).__init__(id, pairs)
         if 'nextAddr' in pairs:
@@ -461,6 +493,8 @@ class Inst(IdedObj):
 
 class InstFault(IdedObj):
     """A fault instruction"""
+    __slots__ = ('fault', 'addr')
+
     def __init__(self, id, fault, addr, pairs={}):
         super(InstFault,self).__init__(id, pairs)
         self.fault = fault
@@ -474,6 +508,8 @@ class InstFault(IdedObj):
 
 class Line(IdedObj):
     """A fetched line"""
+    __slots__ = ('vaddr', 'paddr', 'size')
+
     def __init__(self, id, vaddr, paddr, size, pairs={}):
         super(Line,self).__init__(id, pairs)
         self.vaddr = vaddr
@@ -488,6 +524,8 @@ class Line(IdedObj):
 
 class LineFault(IdedObj):
     """A faulting line"""
+    __slots__ = ('vaddr', 'fault')
+
     def __init__(self, id, fault, vaddr, pairs={}):
         super(LineFault,self).__init__(id, pairs)
         self.vaddr = vaddr
@@ -501,6 +539,8 @@ class LineFault(IdedObj):
 
 class BlobEvent(object):
     """Time event for a single blob"""
+    __slots__ = ('unit', 'time', 'visuals', 'pairs', 'comments')
+
     def __init__(self, unit, time, pairs = {}):
         # blob's unit name
         self.unit = unit
@@ -535,16 +575,161 @@ class BlobEvent(object):
             list(map(find_inst, blocks))
         return sorted(ret)
 
+match_line_re = re.compile(
+    '^\s*(\d+):\s*([\w\.]+):\s*(Minor\w+:)?\s*(.*)$')
+
+class EventIndex(object):
+    """Index of an event file for loading it a window of times at a time.
+
+    The index holds all the event times (as BlobModel.times would after a
+    full load), and splits them into windows of timesPerWindow times. For
+    each window it records the file offset of the window's first line and,
+    for each unit, the offsets of the last MinorTrace line before the window
+    that changed the unit's state and of any comment lines after it that
+    made a later event. Decoding those lines first recreates the events
+    that are still current at the start of the window.  As with
+    BlobModel.times, only units which appear in the picture (those in
+    unitEvents) contribute times.  numEvents counts events, including
+    those made by comments, as BlobModel.parse_lines does.
+
+    The index is built with one pass over the file and saved next to it as
+    <file>.mvidx for later runs"""
+    version = 'minorview index v2'
+
+    def __init__(self):
+        self.times = []
+        self.windowOffsets = []
+        self.windowSeeds = []
+        self.numEvents = 0
+        self.lastTime = 0
+
+    @classmethod
+    def stamp(class_, file, unitNamePrefix, units, timesPerWindow):
+        st = os.stat(file)
+        return [class_.version, st.st_size, st.st_mtime_ns, unitNamePrefix,
+            sorted(units), timesPerWindow]
+
+    @classmethod
+    def load(class_, file, unitNamePrefix, units, timesPerWindow):
+        """Load the index for file, building it if needed"""
+        stamp = class_.stamp(file, unitNamePrefix, units, timesPerWindow)
+        try:
+            with open(file + '.mvidx') as f:
+                saved = json.load(f)
+            if saved['stamp'] == stamp:
+                index = class_()
+                index.__dict__.update(saved['index'])
+                return index
+        except (IOError, ValueError, KeyError):
+            pass
+
+        index = class_()
+        index.build(file, unitNamePrefix, units, timesPerWindow)
+        try:
+            with open(file + '.mvidx', 'w') as f:
+                json.dump({'stamp': stamp, 'index': index.__dict__}, f)
+        except IOError:
+            # The index is only a cache
+            pass
+        return index
+
+    def build(self, file, unitNamePrefix, units, timesPerWindow):
+        """Scan the whole of file, following the same rules as
+        BlobModel.parse_lines for which lines make events"""
+        unit_re = re.compile('^' + unitNamePrefix + '\\.?(.*)$')
+        last_time_lines = {}
+        last_trace_offsets = {}
+        last_offsets = {}
+        time = -1
+        time_offset = 0
+        time_seeds = {}
+        time_has_event = False
+        time_event_units = set()
+        time_comments = {}
+
+        def end_time():
+            # Resolve comments as parse_lines does: a unit's comments land
+            #   on its event at this time or make one new event, and
+            #   comments on units not in the picture make an event each
+            for unit, offsets in time_comments.items():
+                if unit not in units:
+                    self.numEvents += len(offsets)
+                    continue
+                if unit not in time_event_units:
+                    self.numEvents += 1
+                last_offsets[unit] = (
+                    [last_trace_offsets[unit]]
+                    if unit in last_trace_offsets else []) + offsets
+            if time_has_event:
+                if len(self.times) % timesPerWindow == 0:
+                    self.windowOffsets.append(time_offset)
+                    self.windowSeeds.append(time_seeds)
+                self.times.append(time)
+
+        offset = 0
+        with open(file, 'rb') as f:
+            for l in f:
+                line_offset = offset
+                offset += len(l)
+                match = match_line_re.match(l.decode('latin-1'))
+                if match is None:
+                    continue
+                event_time, unit, line_type, rest = match.groups()
+                event_time = int(event_time)
+                unit = unit_re.sub('\\1', unit)
+
+                if event_time != time:
+                    end_time()
+                    time = event_time
+                    time_offset = line_offset
+                    # Only the first time of each window needs its seeds
+                    if len(self.times) % timesPerWindow == 0:
+                        time_seeds = dict(last_offsets)
+                    time_has_event = False
+                    time_event_units = set()
+                    time_comments = {}
+
+                if line_type is None:
+                    # Comments always make (or land on) an event
+                    time_comments.setdefault(unit, []).append(line_offset)
+                    self.lastTime = max(self.lastTime, event_time)
+                    if unit in units:
+                        time_has_event = True
+                elif line_type == 'MinorTrace:':
+                    if last_time_lines.get(unit, None) != rest:
+                        last_time_lines[unit] = rest
+                        self.numEvents += 1
+                        self.lastTime = max(self.lastTime, event_time)
+                        if unit in units:
+                            last_trace_offsets[unit] = line_offset
+                            last_offsets[unit] = [line_offset]
+                            time_event_units.add(unit)
+                            time_has_event = True
+            end_time()
+
+    def window_index(self, time, timesPerWindow):
+        """The window holding the last time <= time"""
+        time_index = max(0, bisect.bisect_right(self.times, time) - 1)
+        return min(time_index // timesPerWindow, len(self.windowOffsets) - 1)
+
 class BlobModel(object):
     """Model bringing together blob definitions and parsed events"""
-    def __init__(self, unitNamePrefix=''):
+    def __init__(self, unitNamePrefix='', windowed=False, timesPerWindow=1000,
+        maxWindows=8):
         self.blobs = []
         self.unitNameToBlobs = {}
         self.unitEvents = {}
+        self.index = None
         self.clear_events()
         self.picSize = Point(20,10)
         self.lastTime = 0
         self.unitNamePrefix = unitNamePrefix
+        # With windowed set, events are not all loaded up front but
+        #   decoded maxWindows windows of timesPerWindow times at a time
+        #   as they are looked at
+        self.windowed = windowed
+        self.timesPerWindow = timesPerWindow
+        self.maxWindows = maxWindows
 
     def clear_events(self):
         """Drop all events and times"""
@@ -553,6 +738,8 @@ class BlobModel(object):
         self.insts = {}
         self.lines = {}
         self.numEvents = 0
+        self.index = None
+        self.windows = OrderedDict()
 
         for unit, events in self.unitEvents.items():
             self.unitEvents[unit] = []
@@ -579,6 +766,14 @@ class BlobModel(object):
 
     def find_inst(self, id):
         """Find an instruction either as a microop or macroop"""
+        if self.index is not None:
+            # Look in the most recently used windows first
+            for window in reversed(self.windows.values()):
+                inst = window.find_inst(id)
+                if inst is not None:
+                    return inst
+            return None
+
         macroop_key = (id.fetchSeqNum, 0)
         full_key = (id.fetchSeqNum, id.execSeqNum)
 
@@ -616,6 +811,13 @@ class BlobModel(object):
 
     def find_line(self, id):
         """Find a line by id"""
+        if self.index is not None:
+            for window in reversed(self.windows.values()):
+                line = window.find_line(id)
+                if line is not None:
+                    return line
+            return None
+
         key = id.lineSeqNum
         return self.lines.get(key, None)
 
@@ -623,7 +825,7 @@ class BlobModel(object):
         lower_index, upper_index):
         """Find an event by binary search on time indices"""
         while lower_index <= upper_index:
-            pivot = (upper_index + lower_index) / 2
+            pivot = (upper_index + lower_index) // 2
             pivotEvent = events[pivot]
             event_equal = (pivotEvent.time == time or
                 (pivotEvent.time < time and
@@ -648,7 +850,14 @@ class BlobModel(object):
 
     def find_unit_event_by_time(self, unit, time):
         """Find the last event for the given unit at time <= time"""
-        if unit in self.unitEvents:
+        if self.index is not None:
+            if len(self.index.windowOffsets) == 0:
+                return None
+            return self.load_window(
+                self.index.window_index(time,
+                self.timesPerWindow)).find_unit_event_by_time(
+                unit, time)
+        elif unit in self.unitEvents:
             events = self.unitEvents[unit]
             ret = self.find_event_bisection(unit, time, events,
                 0, len(events)-1)
@@ -660,11 +869,7 @@ class BlobModel(object):
     def find_time_index(self, time):
         """Find a time index close to the given time (where
         times[return] <= time and times[return+1] > time"""
-        ret = 0
-        lastIndex = len(self.times) - 1
-        while ret < lastIndex and self.times[ret + 1] <= time:
-            ret += 1
-        return ret
+        return max(0, bisect.bisect_right(self.times, time) - 1)
 
     def add_minor_inst(self, rest):
         """Parse and add a MinorInst line to the model"""
@@ -717,8 +922,10 @@ class BlobModel(object):
 
             self.add_line(LineFault(id, pairs['fault'], vaddr, other_pairs))
 
-    def load_events(self, file, startTime=0, endTime=None):
-        """Load an event file and add everything to this model"""
+    def parse_lines(self, lines, endTime=None, progress=True):
+        """Parse event file lines, from an iterable, into this model until
+        the lines run out or a time after endTime is reached. Returns
+        the number of MinorTrace lines seen"""
         def update_comments(comments, time):
             # Add a list of comments to an existing event, if there is one at
             #   the given time, or create a new, correctly-timed, event from
@@ -739,49 +946,17 @@ class BlobModel(object):
                     self.add_unit_event(event)
                 event.comments.append(commentRest)
 
-        self.clear_events()
-
         # A negative time will *always* be different from an event time
         time = -1
-        time_events = {}
         last_time_lines = {}
         minor_trace_line_count = 0
         comments = []
 
-        default_colour = [[colours.unknownColour]]
         next_progress_print_event_count = 1000
 
-        if not os.access(file, os.R_OK):
-            print('Can\'t open file', file)
-            exit(1)
-        else:
-            print('Opening file', file)
-
-        f = open(file)
-
-        start_wall_time = wall_time()
-
-        # Skip leading events
-        still_skipping = True
-        l = f.readline()
-        while l and still_skipping:
-            match = re.match('^\s*(\d+):', l)
-            if match is not None:
-                event_time = match.groups()
-                if int(event_time[0]) >= startTime:
-                    still_skipping = False
-                else:
-                    l = f.readline()
-            else:
-                l = f.readline()
-
-        match_line_re = re.compile(
-            '^\s*(\d+):\s*([\w\.]+):\s*(Minor\w+:)?\s*(.*)$')
-
         # Parse each line of the events file, accumulating comments to be
         #   attached to MinorTrace events when the time changes
-        reached_end_time = False
-        while not reached_end_time and l:
+        for l in lines:
             match = match_line_re.match(l)
             if match is not None:
                 event_time, unit, line_type, rest = match.groups()
@@ -792,7 +967,8 @@ class BlobModel(object):
 
                 # When the time changes, resolve comments
                 if event_time != time:
-                    if self.numEvents > next_progress_print_event_count:
+                    if progress and \
+                        self.numEvents > next_progress_print_event_count:
                         print(('Parsed to time: %d' % event_time))
                         next_progress_print_event_count = (
                             self.numEvents + 1000)
@@ -828,11 +1004,113 @@ class BlobModel(object):
                     self.add_minor_line(rest)
 
             if endTime is not None and time > endTime:
-                reached_end_time = True
-
-            l = f.readline()
+                break
 
         update_comments(comments, time)
+        return minor_trace_line_count
+
+    def load_window(self, window_index):
+        """Return the (sub-)model holding the events of one window of the
+        event file, decoding it if it isn't in the cache"""
+        window = self.windows.get(window_index, None)
+        if window is not None:
+            self.windows.move_to_end(window_index)
+            return window
+
+        index = self.index
+        window = BlobModel(self.unitNamePrefix)
+        window.blobs = self.blobs
+        window.unitNameToBlobs = self.unitNameToBlobs
+        window.unitEvents = dict((unit, []) for unit in self.unitEvents)
+
+        first = window_index * self.timesPerWindow
+        last = min(first + self.timesPerWindow, len(index.times)) - 1
+        offset = index.windowOffsets[window_index]
+
+        with open(self.eventFile, 'rb') as f:
+            # Instructions and lines are often referred to for a while
+            #   after they're defined, so pick up the definitions from the
+            #   previous window too
+            if window_index > 0:
+                f.seek(index.windowOffsets[window_index - 1])
+                lookback = offset - index.windowOffsets[window_index - 1]
+                for l in f.read(lookback).decode('latin-1').splitlines():
+                    match = match_line_re.match(l)
+                    if match is not None:
+                        line_type, rest = match.groups()[2:]
+                        if line_type == 'MinorInst:':
+                            window.add_minor_inst(rest)
+                        elif line_type == 'MinorLine:':
+                            window.add_minor_line(rest)
+
+            # The events still current at the start of the window, with
+            #   the comments which made the latest of them
+            seeds = []
+            for seed_offset in sorted(itertools.chain.from_iterable(
+                index.windowSeeds[window_index].values())):
+                f.seek(seed_offset)
+                seeds.append(f.readline().decode('latin-1'))
+
+            f.seek(offset)
+            lines = (l.decode('latin-1') for l in f)
+            window.parse_lines(itertools.chain(seeds, lines),
+                endTime=index.times[last], progress=False)
+
+        self.windows[window_index] = window
+        if len(self.windows) > self.maxWindows:
+            self.windows.popitem(last=False)
+        return window
+
+    def load_events(self, file, startTime=0, endTime=None):
+        """Load an event file and add everything to this model"""
+        self.clear_events()
+
+        if not os.access(file, os.R_OK):
+            print('Can\'t open file', file)
+            exit(1)
+        else:
+            print('Opening file', file)
+
+        start_wall_time = wall_time()
+
+        if self.windowed:
+            self.eventFile = file
+            self.index = EventIndex.load(file, self.unitNamePrefix,
+                self.unitEvents.keys(), self.timesPerWindow)
+            first = bisect.bisect_left(self.index.times, startTime)
+            last = len(self.index.times) if endTime is None else \
+                bisect.bisect_right(self.index.times, endTime)
+            self.times = self.index.times[first:last]
+            self.numEvents = self.index.numEvents
+            self.lastTime = self.index.lastTime
+
+            print('Indexed times:', len(self.index.times), 'unique events:', \
+                self.numEvents)
+            print('Time to index:', wall_time() - start_wall_time)
+            return
+
+        f = open(file)
+
+        # Skip leading events
+        still_skipping = True
+        l = f.readline()
+        while l and still_skipping:
+            match = re.match('^\s*(\d+):', l)
+            if match is not None:
+                event_time = match.groups()
+                if int(event_time[0]) >= startTime:
+                    still_skipping = False
+                else:
+                    l = f.readline()
+            else:
+                l = f.readline()
+
+        if l:
+            minor_trace_line_count = self.parse_lines(
+                itertools.chain([l], f), endTime)
+        else:
+            minor_trace_line_count = 0
+
         self.extract_times()
         f.close()
 
@@ -844,6 +1122,9 @@ class BlobModel(object):
 
     def add_blob_picture(self, offset, pic, nameDict):
         """Add a parsed ASCII-art pipeline markup to the model"""
+        # Blobs are drawn with PyGTK, which loading events alone doesn't need
+        from . import blobs
+
         pic_width = 0
         for line in pic:
             pic_width = max(pic_width, len(line))
@@ -960,6 +1241,8 @@ class BlobModel(object):
 
     def load_picture(self, filename):
         """Load a picture file into the model"""
+        from . import blobs
+
         def parse_blob_description(char, unit, macros, pairsList):
             # Parse the name value pairs in a blob-describing line
             def expand_macros(pairs, newPairs):
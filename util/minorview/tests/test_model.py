@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Loading events doesn't need PyGTK, so these run without a display
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+
+from minorview.model import BlobModel
+
+UNITS = ['fetch1', 'fetch2', 'decode', 'execute']
+
+def make_trace(path):
+    """Write a synthetic trace with comments landing on MinorTrace events,
+    making events of their own (including just before window starts) and
+    on units outside the picture"""
+    rng = random.Random(1)
+    lines = []
+    for time in range(0, 100000, 500):
+        if rng.random() < 0.2:
+            continue
+        for unit in UNITS:
+            if rng.random() < 0.4:
+                lines.append('%d: system.cpu.%s: MinorTrace: stage=%d '
+                    'insts=0/1.1/%d/%d' % (time, unit, rng.randint(0, 2),
+                    rng.randint(1, 3), rng.randint(1, 3)))
+            if rng.random() < 0.1:
+                lines.append('%d: system.cpu.%s: comment %d' %
+                    (time, unit, time))
+        if rng.random() < 0.05:
+            lines.append('%d: system.cpu.other: comment %d' % (time, time))
+        if rng.random() < 0.2:
+            lines.append('%d: system.cpu.execute: MinorInst: id=0/%d.%d/%d '
+                'addr=0x%x inst="add r1, r2"' % (time, time, time, time,
+                time))
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+class WindowedLoadTestSuite(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.trace = os.path.join(self.dir, 'trace.out')
+        make_trace(self.trace)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def load(self, windowed):
+        model = BlobModel('system.cpu', windowed=windowed, timesPerWindow=7,
+            maxWindows=3)
+        model.unitEvents = dict((unit, []) for unit in UNITS)
+        model.load_events(self.trace)
+        return model
+
+    def assertSameEvents(self, full, windowed):
+        self.assertEqual(windowed.times, full.times)
+        self.assertEqual(windowed.numEvents, full.numEvents)
+        self.assertEqual(windowed.lastTime, full.lastTime)
+
+        def key(event):
+            if event is None:
+                return None
+            return (event.time, event.pairs, event.comments)
+
+        for time in range(-500, full.lastTime + 1000, 250):
+            for unit in UNITS:
+                self.assertEqual(
+                    key(windowed.find_unit_event_by_time(unit, time)),
+                    key(full.find_unit_event_by_time(unit, time)),
+                    '%s at %d' % (unit, time))
+
+    def test_windowed_matches_full(self):
+        full = self.load(False)
+        self.assertSameEvents(full, self.load(True))
+        # Again from the saved index
+        self.assertTrue(os.path.exists(self.trace + '.mvidx'))
+        self.assertSameEvents(full, self.load(True))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -38,9 +38,11 @@
 # Pipeline activity viewer for the O3 CPU model.
 
 import argparse
+import bisect
+import collections
+import heapq
 import os
 import sys
-import copy
 
 # Temporary storage for instructions. The queue is filled in out-of-order
 # until it reaches 'max_threshold' number of instructions. It is then
@@ -65,6 +67,83 @@ insts = {
     'only_committed':0,   # Set if only committed instructions are printed.
 }
 
+# A retired instruction. Records are ordered by sequence number, which is
+# what the print queue (a heap) relies on.
+Inst = collections.namedtuple('Inst', ['sn', 'fetch', 'decode', 'rename',
+                                       'dispatch', 'issue', 'complete',
+                                       'retire', 'store', 'pc', 'upc',
+                                       'disasm'])
+
+# Sidecar index of a trace file, stored next to it as <trace>.idx. The trace
+# is split into blocks of 'index_block' lines, and for each block the index
+# holds its byte offset together with the largest tick and fetch sequence
+# number seen in the trace up to the end of that block. Both of these are
+# non-decreasing, so the first block that can contain the start of a tick or
+# instruction range is found with a binary search.
+index_block = 4096
+index_version = 'o3-pipeview index v1'
+
+def index_stamp(tracefile):
+    st = os.stat(tracefile)
+    return '%s %d %d' % (index_version, st.st_size, st.st_mtime_ns)
+
+def build_index(tracefile):
+    offsets, ticks, sns = [], [], []
+    max_tick = max_sn = 0
+    offset = 0
+    with open(tracefile, 'rb') as trace:
+        for n, line in enumerate(trace):
+            if n % index_block == 0:
+                if n:
+                    ticks.append(max_tick)
+                    sns.append(max_sn)
+                offsets.append(offset)
+            offset += len(line)
+            if not line.startswith(b'O3PipeView:'):
+                continue
+            fields = line.split(b':', 6)
+            max_tick = max(max_tick, int(fields[2]))
+            if fields[1] == b'fetch':
+                max_sn = max(max_sn, int(fields[5]))
+    ticks.append(max_tick)
+    sns.append(max_sn)
+    try:
+        with open(tracefile + '.idx', 'w') as idx:
+            idx.write(index_stamp(tracefile) + '\n')
+            for entry in zip(offsets, ticks, sns):
+                idx.write('%d %d %d\n' % entry)
+    except IOError:
+        # The index is only a cache; carry on if it can't be saved.
+        pass
+    return offsets, ticks, sns
+
+def load_index(tracefile, rebuild=False):
+    try:
+        if not rebuild:
+            with open(tracefile + '.idx', 'r') as idx:
+                if idx.readline().rstrip('\n') == index_stamp(tracefile):
+                    entries = [ tuple(int(i) for i in line.split())
+                                for line in idx ]
+                    return tuple(list(col) for col in zip(*entries))
+    except (IOError, ValueError):
+        pass
+    return build_index(tracefile)
+
+# Moves the trace to the start of the first block that may hold the line
+# the range starts at. process_trace then skips to that line as usual.
+def seek_trace(trace, index, start_tick, start_sn):
+    offsets, ticks, sns = index
+    if start_tick != 0:
+        block = bisect.bisect_left(ticks, start_tick)
+    elif start_sn != 0:
+        block = bisect.bisect_left(sns, start_sn)
+    else:
+        return
+    if block < len(offsets):
+        trace.seek(offsets[block])
+    else:
+        trace.seek(0, os.SEEK_END)
+
 def process_trace(trace, outfile, cycle_time, width, color, timestamps,
                   committed_only, store_completions, start_tick, stop_tick, start_sn, stop_sn):
     global insts
@@ -140,7 +219,9 @@ def process_trace(trace, outfile, cycle_time, width, color, timestamps,
                     curr_inst['disasm'] = '-----' + curr_inst['disasm']
                 if store_completions:
                     curr_inst[fields[3]] = int(fields[4])
-                queue_inst(outfile, curr_inst, cycle_time, width, color, timestamps, store_completions)
+                inst = Inst(*(curr_inst.get(field, 0)
+                              for field in Inst._fields))
+                queue_inst(outfile, inst, cycle_time, width, color, timestamps, store_completions)
 
         line = trace.readline()
         if not line:
@@ -153,33 +234,31 @@ def process_trace(trace, outfile, cycle_time, width, color, timestamps,
 # Sorts out and prints instructions when their number reaches threshold value
 def queue_inst(outfile, inst, cycle_time, width, color, timestamps, store_completions):
     global insts
-    l_copy = copy.deepcopy(inst)
-    insts['queue'].append(l_copy)
+    heapq.heappush(insts['queue'], inst)
     if len(insts['queue']) > insts['max_threshold']:
         print_insts(outfile, cycle_time, width, color, timestamps, store_completions, insts['min_threshold'])
 
 # Sorts out and prints instructions in print queue
 def print_insts(outfile, cycle_time, width, color, timestamps, store_completions, lower_threshold):
     global insts
-    # sort the list of insts by sequence numbers
-    insts['queue'].sort(key=lambda inst: inst['sn'])
+    # take the insts out in order of sequence numbers
     while len(insts['queue']) > lower_threshold:
-        print_item=insts['queue'].pop(0)
+        print_item=heapq.heappop(insts['queue'])
         # As the instructions are processed out of order the main loop starts
         # earlier then specified by start_sn/tick and finishes later then what
         # is defined in stop_sn/tick.
         # Therefore, here we have to filter out instructions that reside out of
         # the specified boundaries.
-        if (insts['sn_start'] > 0 and print_item['sn'] < insts['sn_start']):
+        if (insts['sn_start'] > 0 and print_item.sn < insts['sn_start']):
             continue; # earlier then the starting sequence number
-        if (insts['sn_stop'] > 0 and print_item['sn'] > insts['sn_stop']):
+        if (insts['sn_stop'] > 0 and print_item.sn > insts['sn_stop']):
             continue; # later then the ending sequence number
-        if (insts['tick_start'] > 0 and print_item['fetch'] < insts['tick_start']):
+        if (insts['tick_start'] > 0 and print_item.fetch < insts['tick_start']):
             continue; # earlier then the starting tick number
-        if (insts['tick_stop'] > 0 and print_item['fetch'] > insts['tick_stop']):
+        if (insts['tick_stop'] > 0 and print_item.fetch > insts['tick_stop']):
             continue; # later then the ending tick number
 
-        if (insts['only_committed'] != 0 and print_item['retire'] == 0):
+        if (insts['only_committed'] != 0 and print_item.retire == 0):
             continue; # retire is set to zero if it hasn't been completed
         print_inst(outfile,  print_item, cycle_time, width, color, timestamps, store_completions)
 
@@ -221,18 +300,18 @@ def print_inst(outfile, inst, cycle_time, width, color, timestamps, store_comple
     # Print
 
     time_width = width * cycle_time
-    base_tick = (inst['fetch'] // time_width) * time_width
+    base_tick = (inst.fetch // time_width) * time_width
 
     # Find out the time of the last event - it may not
     # be 'retire' if the instruction is not comlpeted.
-    last_event_time = max(inst['fetch'], inst['decode'],inst['rename'],
-                      inst['dispatch'],inst['issue'], inst['complete'], inst['retire'])
+    last_event_time = max(inst.fetch, inst.decode,inst.rename,
+                      inst.dispatch,inst.issue, inst.complete, inst.retire)
     if store_completions:
-        last_event_time = max(last_event_time, inst['store'])
+        last_event_time = max(last_event_time, inst.store)
 
     # Timeline shorter then time_width is printed in compact form where
     # the print continues at the start of the same line.
-    if ((last_event_time - inst['fetch']) < time_width):
+    if ((last_event_time - inst.fetch) < time_width):
         num_lines = 1 # compact form
     else:
         num_lines = ((last_event_time - base_tick) // time_width) + 1
@@ -240,17 +319,17 @@ def print_inst(outfile, inst, cycle_time, width, color, timestamps, store_comple
     curr_color = termcap.Normal
 
     # This will visually distinguish completed and abandoned intructions.
-    if inst['retire'] == 0: dot = '=' # abandoned instruction
+    if inst.retire == 0: dot = '=' # abandoned instruction
     else:                   dot = '.' # completed instruction
 
     for i in range(num_lines):
         start_tick = base_tick + i * time_width
         end_tick = start_tick + time_width
         if num_lines == 1:  # compact form
-            end_tick += (inst['fetch'] - base_tick)
+            end_tick += (inst.fetch - base_tick)
         events = []
         for stage_idx in range(len(stages)):
-            tick = inst[stages[stage_idx]['name']]
+            tick = getattr(inst, stages[stage_idx]['name'])
             if tick != 0:
                 if tick >= start_tick and tick < end_tick:
                     events.append((tick % time_width,
@@ -263,7 +342,7 @@ def print_inst(outfile, inst, cycle_time, width, color, timestamps, store_comple
             curr_color = stages[events[0][2] - 1]['color']
         for event in events:
             if (stages[event[2]]['name'] == 'dispatch' and
-                inst['dispatch'] == inst['issue']):
+                inst.dispatch == inst.issue):
                 continue
             outfile.write(curr_color + dot * ((event[0] // cycle_time) - pos))
             outfile.write(stages[event[2]]['color'] +
@@ -279,12 +358,12 @@ def print_inst(outfile, inst, cycle_time, width, color, timestamps, store_comple
                       ']-(' + str(base_tick + i * time_width).rjust(15) + ') ')
         if i == 0:
             outfile.write('%s.%s %s [%s]' % (
-                    inst['pc'].rjust(10),
-                    inst['upc'],
-                    inst['disasm'].ljust(25),
-                    str(inst['sn']).rjust(10)))
+                    inst.pc.rjust(10),
+                    inst.upc,
+                    inst.disasm.ljust(25),
+                    str(inst.sn).rjust(10)))
             if timestamps:
-                outfile.write('  f=%s, r=%s' % (inst['fetch'], inst['retire']))
+                outfile.write('  f=%s, r=%s' % (inst.fetch, inst.retire))
             outfile.write('\n')
         else:
             outfile.write('...'.center(12) + '\n')
@@ -345,6 +424,15 @@ def main():
         '--store_completions',
         action='store_true', default=False,
         help="additionally display store completion ticks")
+    parser.add_argument(
+        '--no-index',
+        action='store_true', default=False,
+        help="don't use (or create) the TRACE_FILE.idx sidecar index to "
+        "seek to the start of a tick or instruction range")
+    parser.add_argument(
+        '--rebuild-index',
+        action='store_true', default=False,
+        help="rebuild the sidecar index even if it is up to date")
     parser.add_argument(
         'tracefile')
 
@@ -360,6 +448,9 @@ def main():
     # Process trace
     print('Processing trace... ', end=' ')
     with open(args.tracefile, 'r') as trace:
+        if not args.no_index and (tick_range[0] or inst_range[0]):
+            index = load_index(args.tracefile, args.rebuild_index)
+            seek_trace(trace, index, tick_range[0], inst_range[0])
         with open(args.outfile, 'w') as out:
             process_trace(trace, out, args.cycle_time, args.width,
                           args.color, args.timestamps,
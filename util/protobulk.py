@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# This script decodes large protobuf packet (--mem-trace) and instruction
+# dependency (elastic) traces into columnar NumPy files, without going
+# through the protobuf Python classes one message at a time.
+#
+# The trace is read in large blocks. Each block is split into messages by
+# walking the varint length prefixes, after which the message bodies are
+# decoded in bulk: every field of Packet and InstDepRecord is a varint, so
+# a body is nothing but a sequence of (tag, value) varints that can be
+# decoded for the whole block with a handful of vectorised operations.
+# Blocks can be decoded by a pool of worker processes.
+#
+# The output directory holds meta.json and one part-NNNNN.npz per block.
+# Each part has a 'records' structured array with one row per message (a
+# has_<field> column is added for optional fields) and, for repeated fields,
+# a flat '<field>' array indexed by '<field>_offsets' (CSR style). Use
+# load() to read a whole directory back.
+#
+# Usage: protobulk.py --type packet|inst_dep [-j N] <trace> <output dir>
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import protolib
+
+# (field number, name, dtype, label), mirroring src/proto/packet.proto and
+# src/proto/inst_dep_record.proto.
+PACKET_SCHEMA = (
+    (1, 'tick', np.uint64, 'required'),
+    (2, 'cmd', np.uint32, 'required'),
+    (3, 'addr', np.uint64, 'required'),
+    (4, 'size', np.uint32, 'required'),
+    (5, 'flags', np.uint32, 'optional'),
+    (6, 'pkt_id', np.uint64, 'optional'),
+    (7, 'pc', np.uint64, 'optional'),
+)
+
+INST_DEP_SCHEMA = (
+    (1, 'seq_num', np.uint64, 'required'),
+    (2, 'type', np.uint8, 'required'),
+    (3, 'p_addr', np.uint64, 'optional'),
+    (4, 'size', np.uint32, 'optional'),
+    (5, 'flags', np.uint32, 'optional'),
+    (6, 'rob_dep', np.uint64, 'repeated'),
+    (7, 'comp_delay', np.uint64, 'required'),
+    (8, 'reg_dep', np.uint64, 'repeated'),
+    (9, 'weight', np.uint32, 'optional'),
+    (10, 'pc', np.uint64, 'optional'),
+    (11, 'v_addr', np.uint64, 'optional'),
+    (12, 'asid', np.uint32, 'optional'),
+)
+
+SCHEMAS = {
+    'packet' : PACKET_SCHEMA,
+    'inst_dep' : INST_DEP_SCHEMA,
+}
+
+# Passes frameMessages makes to drop possible messages that can't be in the
+# chain before following it
+_PRUNE_ROUNDS = 2
+
+def _readVarint(buf, pos):
+    """
+    Decode a varint from buf at pos. Return (value, position after it), or
+    (None, pos) if buf ends in the middle of the varint.
+    """
+    result = 0
+    shift = 0
+    end = min(len(buf), pos + 10)
+    for i in range(pos, end):
+        b = buf[i]
+        result |= (b & 0x7f) << shift
+        if not (b & 0x80):
+            return (result, i + 1)
+        shift += 7
+    if end - pos == 10:
+        raise IOError('Too many bytes when decoding varint.')
+    return (None, pos)
+
+def _frameLoop(buf, pos, starts, ends):
+    """
+    Frame messages one at a time from pos, appending their body offsets to
+    starts and ends. Return the offset just past the last complete message.
+    """
+    n = len(buf)
+    while pos < n:
+        size = buf[pos]
+        # Almost all messages are shorter than 128 bytes.
+        if size < 0x80:
+            body = pos + 1
+        else:
+            size, body = _readVarint(buf, pos)
+            if size is None:
+                break
+        end = body + size
+        if end > n:
+            break
+        starts.append(body)
+        ends.append(end)
+        pos = end
+    return pos
+
+def frameMessages(buf, pos=0, first_tag=None):
+    """
+    Find the length-prefixed messages that are complete in buf, starting at
+    pos. Return arrays of the start and end offsets of the message bodies
+    and the offset just past the last complete message.
+
+    first_tag is the tag byte that every message body normally starts with
+    (gem5 writes the required field 1 first). With it the messages are
+    framed in bulk: the length prefixes that could come before every such
+    byte are decoded at once, the ones that can't be in the chain from pos
+    are mostly dropped, and the chain is followed through the runs of what
+    is left in which each message ends where the next starts. Any message
+    whose body doesn't start with first_tag is framed by itself.
+    """
+    starts = []
+    ends = []
+    if first_tag is None:
+        pos = _frameLoop(buf, pos, starts, ends)
+        return (np.array(starts, dtype=np.int64),
+                np.array(ends, dtype=np.int64), pos)
+
+    data = np.frombuffer(buf, dtype=np.uint8)
+    n = len(data)
+    # The last byte of a length prefix is < 0x80 and the ones before it
+    # are >= 0x80, so a prefix ending before a tag byte can start at that
+    # byte or at any of the four before it in the run of bytes >= 0x80.
+    # Each possible prefix is kept as its start * 8 + its length.
+    tag = np.flatnonzero(data[pos + 1:] == first_tag) + (pos + 1)
+    tag = tag[data[tag - 1] < 0x80]
+    prefixes = [(tag - 1) * 8 + 1]
+    for k in range(2, 6):
+        tag = tag[tag - k >= pos]
+        tag = tag[data[tag - k] >= 0x80]
+        prefixes.append((tag - k) * 8 + k)
+    # Each list is in order, which the stable sort merges quickly. No two
+    # prefixes can start at the same byte.
+    prefixes = np.sort(np.concatenate(prefixes), kind='stable')
+    start = prefixes >> 3
+    prefix_len = prefixes & 7
+    size = (data[start] & 0x7f).astype(np.int64)
+    for k in range(1, 5):
+        more = np.flatnonzero(prefix_len > k)
+        byte = (data[start[more] + k] & 0x7f).astype(np.int64)
+        size[more] |= byte << (7 * k)
+    body = start + prefix_len
+    end = body + size
+    fits = end <= n
+    start = start[fits]
+    body = body[fits]
+    end = end[fits]
+
+    count = len(start)
+    if count == 0:
+        pos = _frameLoop(buf, pos, starts, ends)
+        return (np.array(starts, dtype=np.int64),
+                np.array(ends, dtype=np.int64), pos)
+
+    # Drop most of the possible messages that aren't in the chain from pos:
+    # a message is only in it if it starts at pos or another one ends
+    # where it starts.
+    reached = np.zeros(n + 1, dtype=np.bool_)
+    for _ in range(_PRUNE_ROUNDS):
+        reached[end] = True
+        reached[pos] = True
+        keep = reached[start]
+        reached[end] = False
+        if keep.all():
+            break
+        start = start[keep]
+        body = body[keep]
+        end = end[keep]
+    count = len(start)
+
+    # What is left is split into runs in which each message ends where the
+    # next starts. Follow the chain from pos run by run, framing any message
+    # that isn't in one by itself.
+    last = np.append(np.flatnonzero(end[:-1] != start[1:]), count - 1)
+    while pos < n:
+        i = np.searchsorted(start, pos)
+        if i < count and start[i] == pos:
+            j = last[np.searchsorted(last, i)] + 1
+            starts.append(body[i:j])
+            ends.append(end[i:j])
+            pos = int(end[j - 1])
+            continue
+        size, first = _readVarint(buf, pos)
+        if size is None or first + size > n:
+            break
+        starts.append(np.array([first], dtype=np.int64))
+        ends.append(np.array([first + size], dtype=np.int64))
+        pos = first + size
+    if not starts:
+        return (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                pos)
+    return np.concatenate(starts), np.concatenate(ends), pos
+
+def recordDtype(schema):
+    fields = []
+    for number, name, dtype, label in schema:
+        if label == 'repeated':
+            continue
+        fields.append((name, dtype))
+        if label == 'optional':
+            fields.append(('has_' + name, np.bool_))
+    return np.dtype(fields)
+
+def decodeMessages(buf, starts, ends, schema):
+    """
+    Decode the message bodies buf[starts[i]:ends[i]], whose fields must all
+    be varints. Return the structured array of the non-repeated fields and a
+    dict of (values, offsets) for the repeated fields.
+    """
+    count = len(starts)
+    records = np.zeros(count, dtype=recordDtype(schema))
+    repeated = {}
+
+    data = np.frombuffer(buf, dtype=np.uint8)
+    # Select the bytes of the message bodies, skipping the length prefixes.
+    marks = np.zeros(len(data) + 1, dtype=np.int8)
+    marks[starts] = 1
+    marks[ends] -= 1
+    in_body = np.cumsum(marks[:-1], dtype=np.int8).view(np.bool_)
+    body = data[in_body]
+    first = np.zeros(len(body) + 1, dtype=np.bool_)
+    first[np.cumsum(ends - starts) - (ends - starts)] = True
+
+    # Decode every varint in the bodies at once. Most of them (and all
+    # tags) are a single byte, so only a shrinking subset of the varints
+    # is looked at for each further byte.
+    more = body >= 0x80
+    begin = np.flatnonzero(~np.concatenate(([False], more[:-1])))
+    values = (body[begin] & 0x7f).astype(np.uint64)
+    pending = np.flatnonzero(more[begin])
+    shift = 0
+    while len(pending):
+        shift += 7
+        if shift >= 70:
+            raise ValueError('Too many bytes when decoding varint')
+        pos = begin[pending] + shift // 7
+        values[pending] |= (body[pos] & 0x7f).astype(np.uint64) << \
+            np.uint64(min(shift, 63))
+        pending = pending[more[pos]]
+
+    if len(values) % 2:
+        raise ValueError('Truncated field in message body')
+    tags = values[0::2]
+    values = values[1::2]
+    if np.any(tags & 0x7):
+        raise ValueError('Only varint fields can be decoded in bulk')
+    numbers = tags >> 3
+    msgs = np.cumsum(first[begin[0::2]]) - 1
+
+    for number, name, dtype, label in schema:
+        sel = numbers == number
+        if label == 'repeated':
+            which = msgs[sel]
+            offsets = np.searchsorted(which, np.arange(count + 1))
+            repeated[name] = (values[sel].astype(dtype), offsets)
+            continue
+        which = msgs[sel]
+        if len(which) == count and label == 'required' and \
+                np.all(which[1:] != which[:-1]):
+            # Each message holds the field exactly once, in order.
+            records[name] = values[sel]
+            continue
+        records[name][which] = values[sel]
+        if label == 'optional':
+            records['has_' + name][which] = True
+
+    return records, repeated
+
+def _decodePart(buf, starts, ends, schema, path):
+    records, repeated = decodeMessages(buf, starts, ends, schema)
+    arrays = { 'records' : records }
+    for name, (values, offsets) in repeated.items():
+        arrays[name] = values
+        arrays[name + '_offsets'] = offsets
+    np.savez(path, **arrays)
+    return len(records)
+
+def _readHeader(proto_in):
+    """
+    Check the magic number and return the fields of the header message as
+    a dict of field number to raw value (an int or bytes).
+    """
+    if proto_in.read(4) != b'gem5':
+        raise IOError('Unrecognized file')
+    size, _ = protolib._DecodeVarint32(proto_in)
+    buf = proto_in.read(size)
+    fields = {}
+    pos = 0
+    while pos < len(buf):
+        tag, pos = _readVarint(buf, pos)
+        if tag & 0x7 == 0:
+            fields[tag >> 3], pos = _readVarint(buf, pos)
+        elif tag & 0x7 == 2:
+            length, pos = _readVarint(buf, pos)
+            fields.setdefault(tag >> 3, buf[pos:pos + length])
+            pos += length
+        else:
+            raise IOError('Unexpected wire type in header')
+    return fields
+
+def decodeTrace(in_file, out_dir, trace_type, jobs=1, block_size=64 << 20):
+    """
+    Decode a whole trace into out_dir, using up to jobs worker processes.
+    Return the number of messages decoded.
+    """
+    schema = SCHEMAS[trace_type]
+    # Field 1 is required in both message types and written first
+    first_tag = schema[0][0] << 3
+    proto_in = protolib.openFileRd(in_file)
+    header = _readHeader(proto_in)
+
+    os.makedirs(out_dir, exist_ok=True)
+    pool = ProcessPoolExecutor(jobs) if jobs > 1 else None
+    pending = []
+    parts = 0
+    total = 0
+    leftover = b''
+    while True:
+        block = proto_in.read(block_size)
+        buf = leftover + block
+        starts, ends, pos = frameMessages(buf, first_tag=first_tag)
+        if len(starts):
+            path = os.path.join(out_dir, 'part-%05d.npz' % parts)
+            parts += 1
+            if pool is None:
+                total += _decodePart(buf, starts, ends, schema, path)
+            else:
+                pending.append(pool.submit(_decodePart, buf, starts, ends,
+                                           schema, path))
+                # Bound the number of blocks held in memory.
+                while len(pending) > 2 * jobs:
+                    total += pending.pop(0).result()
+        leftover = buf[pos:]
+        if not block:
+            break
+    for future in pending:
+        total += future.result()
+    if pool is not None:
+        pool.shutdown()
+    proto_in.close()
+
+    if leftover:
+        print('Warning: ignoring %d trailing bytes of a truncated message' %
+              len(leftover))
+
+    with open(os.path.join(out_dir, 'meta.json'), 'w') as meta:
+        json.dump({
+            'type' : trace_type,
+            'obj_id' : header.get(1, b'').decode(),
+            'tick_freq' : header.get(3, 0),
+            'parts' : parts,
+            'messages' : total,
+        }, meta, indent=4)
+    return total
+
+def load(out_dir):
+    """
+    Read a directory written by decodeTrace. Return the concatenated
+    records and a dict of (values, offsets) for the repeated fields.
+    """
+    with open(os.path.join(out_dir, 'meta.json')) as meta:
+        meta = json.load(meta)
+    schema = SCHEMAS[meta['type']]
+    names = [ name for _, name, _, label in schema if label == 'repeated' ]
+
+    records = []
+    values = { name : [] for name in names }
+    offsets = { name : [np.zeros(1, dtype=np.int64)] for name in names }
+    base = { name : 0 for name in names }
+    for part in range(meta['parts']):
+        with np.load(os.path.join(out_dir, 'part-%05d.npz' % part)) as f:
+            records.append(f['records'])
+            for name in names:
+                values[name].append(f[name])
+                offsets[name].append(f[name + '_offsets'][1:] + base[name])
+                base[name] += len(f[name])
+
+    if records:
+        records = np.concatenate(records)
+    else:
+        records = np.zeros(0, dtype=recordDtype(schema))
+    repeated = {}
+    for name in names:
+        dtype = dict((n, d) for _, n, d, _ in schema)[name]
+        flat = np.concatenate(values[name]) if values[name] else \
+            np.zeros(0, dtype=dtype)
+        repeated[name] = (flat, np.concatenate(offsets[name]))
+    return records, repeated
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Decode a protobuf trace into columnar NumPy files.')
+    parser.add_argument('--type', choices=sorted(SCHEMAS), required=True,
+                        help='packet for --mem-trace style packet traces, '
+                        'inst_dep for elastic instruction dependency traces')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes')
+    parser.add_argument('--block-size', type=int, default=64,
+                        help='Block size in MiB')
+    parser.add_argument('trace', help='Protobuf trace (optionally gzipped)')
+    parser.add_argument('out_dir', help='Output directory')
+    args = parser.parse_args()
+
+    total = decodeTrace(args.trace, args.out_dir, args.type, args.jobs,
+                        args.block_size << 20)
+    print('Decoded messages:', total)
+
+if __name__ == '__main__':
+    main()
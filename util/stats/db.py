@@ -24,7 +24,7 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import MySQLdb, re, string
+import math, re
 
 def statcmp(a, b):
     v1 = a.split('.')
@@ -117,8 +117,29 @@ class Result(object):
             self.data[run] = [ [ 0.0 ] * self.y for i in range(self.x) ]
         return self.data[run]
 
+class StdDev(object):
+    '''Sample standard deviation aggregate for SQLite, which has none.'''
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def step(self, value):
+        if value is None:
+            return
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+
+    def finalize(self):
+        if self.n < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.n - 1))
+
 class Database(object):
     def __init__(self):
+        self.backend = 'mysql'
         self.host = 'zizzer.pool'
         self.user = ''
         self.passwd = ''
@@ -168,7 +189,7 @@ class Database(object):
 
         return None
 
-    def query(self, sql):
+    def execute(self, sql):
         self.cursor.execute(sql)
 
     def update_dict(self, dict):
@@ -176,7 +197,7 @@ class Database(object):
 
     def append(self, stat):
         statname = re.sub(':', '__', stat.name)
-        path = string.split(statname, '.')
+        path = statname.split('.')
         pathtop = path[0]
         fullname = ''
 
@@ -197,15 +218,21 @@ class Database(object):
 
     def connect(self):
         # connect
-        self.thedb = MySQLdb.connect(db=self.db,
-                                     host=self.host,
-                                     user=self.user,
-                                     passwd=self.passwd)
+        if self.backend == 'sqlite':
+            import sqlite3
+            self.thedb = sqlite3.connect(self.db)
+            self.thedb.create_aggregate('stddev', 1, StdDev)
+        else:
+            import MySQLdb
+            self.thedb = MySQLdb.connect(db=self.db,
+                                         host=self.host,
+                                         user=self.user,
+                                         passwd=self.passwd)
 
         # create a cursor
         self.cursor = self.thedb.cursor()
 
-        self.query('''select rn_id,rn_name,rn_sample,rn_user,rn_project
+        self.execute('''select rn_id,rn_name,rn_sample,rn_user,rn_project
                    from runs''')
         for result in self.cursor.fetchall():
             run = RunData(result);
@@ -213,7 +240,7 @@ class Database(object):
             self.allRunIds[run.run] = run
             self.allRunNames[run.name] = run
 
-        self.query('select sd_stat,sd_x,sd_y,sd_name,sd_descr from subdata')
+        self.execute('select sd_stat,sd_x,sd_y,sd_name,sd_descr from subdata')
         for result in self.cursor.fetchall():
             subdata = SubData(result)
             if subdata.stat in self.allSubData:
@@ -221,12 +248,14 @@ class Database(object):
             else:
                 self.allSubData[subdata.stat] = [ subdata ]
 
-        self.query('select * from formulas')
+        self.execute('select * from formulas')
         for id,formula in self.cursor.fetchall():
-            self.allFormulas[int(id)] = formula.tostring()
+            if not isinstance(formula, str):
+                formula = formula.tostring()
+            self.allFormulas[int(id)] = formula
 
         StatData.db = self
-        self.query('select * from stats')
+        self.execute('select * from stats')
         from . import info
         for result in self.cursor.fetchall():
             stat = info.NewStat(self, StatData(result))
@@ -261,7 +290,7 @@ class Database(object):
                    sql += ' or'
                sql += ' dt_run=%s' % run.run
             sql += ')'
-        self.query(sql)
+        self.execute(sql)
         for r in self.cursor.fetchall():
             print(r[0])
 
@@ -278,7 +307,7 @@ class Database(object):
                    sql += ' or'
                sql += ' dt_run=%s' % run.run
             sql += ')'
-        self.query(sql)
+        self.execute(sql)
         ret = []
         for r in self.cursor.fetchall():
             ret.append(r[0])
@@ -379,13 +408,13 @@ class Database(object):
 
     # Name: avg
     # Desc: given a run, a stat and an array of samples, average the samples
-    def avg(self, stat, ticks):
+    def avg(self, *args, **kwargs):
         return self.query('avg', *args, **kwargs)
 
     # Name: stdev
     # Desc: given a run, a stat and an array of samples, get the standard
     #       deviation
-    def stdev(self, stat, ticks):
+    def stdev(self, *args, **kwargs):
         return self.query('stddev', *args, **kwargs)
 
     def __setattr__(self, attr, value):
@@ -394,11 +423,11 @@ class Database(object):
             return
 
         if value == 'sum':
-            self._method = self.sum
+            self._method = type(self).sum
         elif value == 'avg':
-            self._method = self.avg
+            self._method = type(self).avg
         elif value == 'stdev':
-            self._method = self.stdev
+            self._method = type(self).stdev
         else:
             raise AttributeError("can only set get to: sum | avg | stdev")
 
@@ -406,7 +435,7 @@ class Database(object):
         if ticks is None:
             ticks = self.ticks
         sql = self._method(self, stat, ticks)
-        self.query(sql)
+        self.execute(sql)
 
         runs = {}
         xmax = 0
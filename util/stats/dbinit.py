@@ -24,8 +24,6 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import MySQLdb
-
 class MyDB(object):
     def __init__(self, options):
         self.name = options.db
@@ -36,12 +34,14 @@ class MyDB(object):
         self.cursor = None
 
     def admin(self):
+        import MySQLdb
         self.close()
         self.mydb = MySQLdb.connect(db='mysql', host=self.host, user=self.user,
                                     passwd=self.passwd)
         self.cursor = self.mydb.cursor()
 
     def connect(self):
+        import MySQLdb
         self.close()
         self.mydb = MySQLdb.connect(db=self.name, host=self.host,
                                     user=self.user, passwd=self.passwd)
@@ -381,3 +381,194 @@ class MyDB(object):
         FROM event_names
         LEFT JOIN events ON en_id=ev_event
         WHERE ev_event IS NULL''')
+
+class LiteDB(MyDB):
+    """
+    An embedded SQLite database with the same tables as MyDB, for machines
+    without a database server. The database name is the path of the file.
+    """
+
+    def __init__(self, options):
+        super(LiteDB, self).__init__(options)
+
+    def admin(self):
+        # There is no server to administer; everything happens on the file.
+        self.close()
+
+    def connect(self):
+        import sqlite3
+        self.close()
+        self.mydb = sqlite3.connect(self.name)
+        self.cursor = self.mydb.cursor()
+
+    def close(self):
+        if self.mydb is not None:
+            self.mydb.commit()
+        super(LiteDB, self).close()
+        self.mydb = None
+
+    def drop(self):
+        import os
+        if os.path.exists(self.name):
+            os.remove(self.name)
+
+    def create(self):
+        # sqlite3 creates the file when it is first connected to.
+        pass
+
+    def populate(self):
+        # See MyDB.populate for a description of the tables and columns.
+        self.mydb.executescript('''
+        CREATE TABLE runs(
+            rn_id	INTEGER		PRIMARY KEY AUTOINCREMENT,
+            rn_name	VARCHAR(200)	NOT NULL,
+            rn_sample	VARCHAR(32)	NOT NULL,
+            rn_user	VARCHAR(32)	NOT NULL,
+            rn_project	VARCHAR(100)	NOT NULL,
+            rn_date	TIMESTAMP	NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            rn_expire	TIMESTAMP	NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (rn_name,rn_sample)
+        );
+
+        CREATE TABLE stats(
+            st_id	INTEGER		PRIMARY KEY,
+            st_name	VARCHAR(255)	NOT NULL,
+            st_descr	TEXT		NOT NULL,
+            st_type	TEXT		NOT NULL CHECK (st_type IN ("SCALAR",
+                "VECTOR", "DIST", "VECTORDIST", "VECTOR2D", "FORMULA")),
+            st_print	BOOL		NOT NULL,
+            st_prereq	INTEGER		NOT NULL,
+            st_prec	INTEGER		NOT NULL,
+            st_nozero	BOOL		NOT NULL,
+            st_nonan	BOOL		NOT NULL,
+            st_total	BOOL		NOT NULL,
+            st_pdf	BOOL		NOT NULL,
+            st_cdf	BOOL		NOT NULL,
+            st_min	DOUBLE		NOT NULL,
+            st_max	DOUBLE		NOT NULL,
+            st_bktsize	DOUBLE		NOT NULL,
+            st_size	INTEGER		NOT NULL,
+            UNIQUE (st_name)
+        );
+
+        CREATE TABLE data(
+            dt_stat	INTEGER		NOT NULL,
+            dt_x	INTEGER		NOT NULL,
+            dt_y	INTEGER		NOT NULL,
+            dt_run	INTEGER		NOT NULL,
+            dt_tick	INTEGER		NOT NULL,
+            dt_data	DOUBLE		NOT NULL,
+            UNIQUE (dt_stat,dt_x,dt_y,dt_run,dt_tick)
+        );
+        CREATE INDEX data_stat ON data(dt_stat);
+        CREATE INDEX data_run_stat_tick ON data(dt_run,dt_stat,dt_tick);
+
+        CREATE TABLE subdata(
+            sd_stat	INTEGER		NOT NULL,
+            sd_x	INTEGER		NOT NULL,
+            sd_y	INTEGER		NOT NULL,
+            sd_name	VARCHAR(255)	NOT NULL,
+            sd_descr	TEXT,
+            UNIQUE (sd_stat,sd_x,sd_y)
+        );
+
+        CREATE TABLE formulas(
+            fm_stat	INTEGER		NOT NULL PRIMARY KEY,
+            fm_formula	BLOB		NOT NULL
+        );
+
+        CREATE TABLE formula_ref(
+            fr_stat	INTEGER		NOT NULL,
+            fr_run	INTEGER		NOT NULL,
+            UNIQUE (fr_stat,fr_run)
+        );
+        CREATE INDEX formula_ref_run ON formula_ref(fr_run);
+
+        CREATE TABLE events(
+            ev_event	INTEGER		NOT NULL,
+            ev_run	INTEGER		NOT NULL,
+            ev_tick	INTEGER		NOT NULL,
+            UNIQUE(ev_event,ev_run,ev_tick)
+        );
+        CREATE INDEX events_run ON events(ev_run);
+        CREATE INDEX events_tick ON events(ev_tick);
+
+        CREATE TABLE event_names(
+            en_id	INTEGER		PRIMARY KEY AUTOINCREMENT,
+            en_name	VARCHAR(255)	NOT NULL,
+            UNIQUE (en_name)
+        );''')
+
+    def clean(self):
+        # SQLite has no multi-table DELETE, so use anti-joins on the keys.
+        self.mydb.executescript('''
+        DELETE FROM data WHERE dt_run NOT IN (SELECT rn_id FROM runs);
+        DELETE FROM formula_ref WHERE fr_run NOT IN (SELECT rn_id FROM runs);
+        DELETE FROM formulas WHERE fm_stat NOT IN
+            (SELECT fr_stat FROM formula_ref);
+        DELETE FROM stats WHERE st_id NOT IN (SELECT dt_stat FROM data);
+        DELETE FROM subdata WHERE sd_stat NOT IN (SELECT dt_stat FROM data);
+        DELETE FROM events WHERE ev_run NOT IN (SELECT rn_id FROM runs);
+        DELETE FROM event_names WHERE en_id NOT IN
+            (SELECT ev_event FROM events);''')
+
+    def ingest(self, root, project=None):
+        """
+        Load every stats.txt[.gz] (and the SALAM validation counters from
+        the run.log next to it) found below root.
+
+        Each directory becomes one run, named by its path relative to the
+        parent of root (e.g. experiments_<stamp>/gemm/latency_10), so trees
+        from different sweeps can live in the same database. Every dump of
+        a stats file is stored at its finalTick. Runs that are already in
+        the database are replaced.
+        """
+        import math, os
+        from . import ingest
+
+        if project is None:
+            project = os.path.basename(os.path.normpath(root))
+
+        self.mydb.execute('PRAGMA synchronous=OFF')
+        self.query('SELECT st_name, st_id FROM stats')
+        stat_ids = dict(self.cursor.fetchall())
+        self.query('SELECT COALESCE(MAX(st_id), 0) FROM stats')
+        next_stat = self.cursor.fetchone()[0] + 1
+
+        runs = 0
+        for run_name, dumps in ingest.find_runs(root):
+            new_stats = []
+            def stat_id(name):
+                nonlocal next_stat
+                if name not in stat_ids:
+                    stat_ids[name] = next_stat
+                    new_stats.append((next_stat, name))
+                    next_stat += 1
+                return stat_ids[name]
+
+            self.cursor.execute('''
+                SELECT rn_id FROM runs WHERE rn_name=? AND rn_sample=?''',
+                (run_name, '0'))
+            row = self.cursor.fetchone()
+            if row is not None:
+                self.cursor.execute('DELETE FROM data WHERE dt_run=?', row)
+                self.cursor.execute('DELETE FROM runs WHERE rn_id=?', row)
+            self.cursor.execute('''
+                INSERT INTO runs(rn_name,rn_sample,rn_user,rn_project)
+                VALUES (?,?,?,?)''', (run_name, '0', self.user, project))
+            run = self.cursor.lastrowid
+
+            rows = [ (stat_id(name), 0, 0, run, tick, value)
+                     for tick, values in dumps
+                     for name, value in values.items()
+                     if not math.isnan(value) ]
+            self.cursor.executemany('''
+                INSERT INTO stats VALUES (?,?,'','SCALAR',1,0,6,
+                                          0,0,0,0,0,0,0,0,0)''',
+                new_stats)
+            self.cursor.executemany('''
+                INSERT OR REPLACE INTO data VALUES (?,?,?,?,?,?)''', rows)
+            self.mydb.commit()
+            runs += 1
+
+        return runs
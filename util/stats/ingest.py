@@ -0,0 +1,96 @@
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Locate gem5/SALAM run directories in an output tree (for example
+BM_ARM_OUT/experiments_<stamp>) and read their statistics for bulk
+loading into a stats database. See LiteDB.ingest.
+"""
+
+import os, sys
+
+_root = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                     os.pardir, os.pardir)
+sys.path.append(os.path.join(_root, 'src', 'python'))
+sys.path.append(os.path.join(_root, 'tools'))
+
+STATS_FILES = ('stats.txt', 'stats.txt.gz')
+
+def _tick(index, values):
+    for name in ('finalTick', 'final_tick'):
+        if name in values:
+            return int(values[name])
+    return index
+
+def _validation_counters(run_log):
+    from experiment_monitor import parse_run_log_stats
+
+    counters = {}
+    for key, value in parse_run_log_stats(run_log).items():
+        try:
+            counters['salam.validation.' + key] = float(value.rstrip('%'))
+        except ValueError:
+            # Flags such as validationEnabled=YES/NO
+            counters['salam.validation.' + key] = float(value == 'YES')
+    return counters
+
+def read_run(path):
+    """
+    Yield (tick, {stat: value}) for each dump of the stats file in path,
+    followed by the SALAM validation counters from run.log (at the tick of
+    the last dump) when there are any.
+    """
+    from m5.ext.pystats.textreader import TextStatsReader
+
+    tick = 0
+    for name in STATS_FILES:
+        stats_file = os.path.join(path, name)
+        if os.path.exists(stats_file):
+            with TextStatsReader(stats_file) as reader:
+                for index in range(len(reader)):
+                    values = reader[index]
+                    tick = _tick(index, values)
+                    yield tick, values
+            break
+
+    run_log = os.path.join(path, 'run.log')
+    if os.path.exists(run_log):
+        counters = _validation_counters(run_log)
+        if counters:
+            yield tick, counters
+
+def find_runs(root):
+    """
+    Yield (run name, dumps) for every directory below root holding a stats
+    file. The run name is the path relative to the parent of root.
+    """
+    root = os.path.normpath(root)
+    base = os.path.dirname(root)
+    for path, dirs, files in os.walk(root):
+        dirs.sort()
+        if any(name in files for name in STATS_FILES):
+            yield os.path.relpath(path, base), read_run(path)
@@ -30,9 +30,12 @@ import re, sys, math
 
 def usage():
     print('''\
-Usage: %s [-E] [-F] [ -G <get> ] [-d <db> ] [-g <graphdir> ] [-h <host>] [-p]
-       [-s <system>] [-r <runs> ] [-T <samples>] [-u <username>]
-       <command> [command args]
+Usage: %s [-E] [-F] [ -G <get> ] [-b <backend>] [-d <db> ] [-g <graphdir> ]
+       [-h <host>] [-p] [-s <system>] [-r <runs> ] [-T <samples>]
+       [-u <username>] <command> [command args]
+
+       The backend is mysql (default) or sqlite. With sqlite, <db> is the
+       path of the database file and no host is needed.
 
        commands    extra parameters   description
        ----------- ------------------ ---------------------------------------
@@ -45,6 +48,8 @@ Usage: %s [-E] [-F] [ -G <get> ] [-d <db> ] [-g <graphdir> ] [-h <host>] [-p]
        stats       [regex]            List all stats (only matching regex)
 
        database    <command>          Where command is drop, init, or clean
+       database    ingest <dir>       Load all stats.txt and SALAM validation
+                                      counters below <dir> (sqlite only)
 
 ''' % sys.argv[0])
     sys.exit(1)
@@ -66,7 +71,10 @@ def commands(options, command, args):
         if len(args) == 0: raise CommandException
 
         from . import dbinit
-        mydb = dbinit.MyDB(options)
+        if options.backend == 'sqlite':
+            mydb = dbinit.LiteDB(options)
+        else:
+            mydb = dbinit.MyDB(options)
 
         if args[0] == 'drop':
             if len(args) > 2: raise CommandException
@@ -92,12 +100,26 @@ def commands(options, command, args):
             if len(args) > 1: raise CommandException
             mydb.connect()
             mydb.clean()
+            mydb.close()
+            return
+
+        if args[0] == 'ingest':
+            if len(args) != 2 or options.backend != 'sqlite':
+                raise CommandException
+            import os
+            new = not os.path.exists(options.db)
+            mydb.connect()
+            if new:
+                mydb.populate()
+            print('ingested %d runs' % mydb.ingest(args[1]))
+            mydb.close()
             return
 
         raise CommandException
 
     from . import db
     source = db.Database()
+    source.backend = options.backend
     source.host = options.host
     source.db = options.db
     source.passwd = options.passwd
@@ -412,6 +434,7 @@ if __name__ == '__main__':
     import getpass
 
     options = Options()
+    options.backend = 'mysql'
     options.host = None
     options.db = None
     options.passwd = ''
@@ -426,8 +449,10 @@ if __name__ == '__main__':
     options.jobfile = None
     options.all = False
 
-    opts, args = getopts(sys.argv[1:], '-EFJad:g:h:j:m:pr:s:u:T:')
+    opts, args = getopts(sys.argv[1:], '-EFJab:d:g:h:j:m:pr:s:u:T:')
     for o,a in opts:
+        if o == '-b':
+            options.backend = a
         if o == '-E':
             options.printmode = 'E'
         if o == '-F':
@@ -466,7 +491,10 @@ if __name__ == '__main__':
         if not options.db:
             options.db = options.jobfile.statdb
 
-    if not options.host:
+    if options.backend not in ('mysql', 'sqlite'):
+        sys.exit('Database backend must be mysql or sqlite')
+
+    if not options.host and options.backend == 'mysql':
         sys.exit('Database server must be provided from a jobfile or -h')
 
     if not options.db:
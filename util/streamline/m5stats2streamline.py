@@ -68,6 +68,11 @@ import zlib
 
 import argparse
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 parser = argparse.ArgumentParser(
         formatter_class=argparse.RawDescriptionHelpFormatter,
         description="""
@@ -106,25 +111,28 @@ parser.add_argument("--gzipped-bmp-not-supported", action="store_true",
 parser.add_argument("--verbose", action="store_true",
                     help="Enable verbose output")
 
-args = parser.parse_args()
-
-if not re.match("(.*)\.apc", args.output_path):
-    print("ERROR: <dest .apc folder> should end with '.apc'!")
-    sys.exit(1)
+# Set from the command line by main()
+args = None
 
 # gzipped BMP files for visual annotation is supported in Streamline 5.14.
 # Setting this to True will significantly compress the .apc binary file that
 # includes frame buffer snapshots.
-gzipped_bmp_supported = not args.gzipped_bmp_not_supported
+gzipped_bmp_supported = True
 
 ticks_in_ns = -1
 
 # Default max # of events. Increase this for longer runs.
-num_events = args.num_events
+num_events = 1000000
 
 start_tick = -1
 end_tick = -1
 
+num_cpus = 0
+num_l2 = 0
+
+# Number of counter frames encoded and written at a time
+counter_block_frames = 1 << 16
+
 # Parse gem5 config.ini file to determine some system configurations.
 # Number of CPUs, L2s, etc.
 def parseConfig(config_file):
@@ -213,6 +221,22 @@ def packed32(x):
 def packed64(x):
     return packed32(x)
 
+# packed32 of every value of an int64 array at once. Returns the encoded
+# bytes of all values back to back (uint8) and the number of bytes of each.
+def packedArray(values):
+    values = np.asarray(values, dtype=np.int64).reshape(-1)
+    # A value takes k bytes if it fits in a (7k)-bit two's complement field
+    magnitude = np.where(values < 0, ~values, values)
+    lengths = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 10):
+        lengths += magnitude >= (1 << (7 * k - 1))
+
+    index = np.arange(10)
+    groups = (values[:, None] >> (7 * index)) & 0x7f
+    groups |= (index < lengths[:, None] - 1) * 0x80
+    encoded = groups[index < lengths[:, None]].astype(np.uint8)
+    return encoded, lengths
+
 #  variable length packed 4-byte signed value
 def unsigned_packed32(x):
     ret = []
@@ -326,17 +350,11 @@ def int16(x):
 
 # a packed32 length followed by the specified number of characters
 def stringList(x):
-    ret = []
-    ret += packed32(len(x))
-    for i in x:
-        ret.append(i)
-    return ret
+    data = x.encode("utf-8")
+    return packed32(len(data)) + list(data)
 
 def utf8StringList(x):
-    ret = []
-    for i in x:
-        ret.append(ord(i))
-    return ret
+    return list(x.encode("utf-8"))
 
 # packed64 time value in nanoseconds relative to the uptime from the
 # Summary message.
@@ -350,37 +368,32 @@ def timestampList(x):
 ############################################################
 
 def writeBinary(outfile, binary_list):
-    for i in binary_list:
-        outfile.write("%c" % i)
+    outfile.write(bytes(binary_list))
 
 ############################################################
 # APC Protocol Frame Types
 ############################################################
 
-def addFrameHeader(frame_type, body, core):
-    ret = []
-
-    if frame_type == "Summary":
-        code = 1
-    elif frame_type == "Backtrace":
-        code = 2
-    elif frame_type == "Name":
-        code = 3
-    elif frame_type == "Counter":
-        code = 4
-    elif frame_type == "Block Counter":
-        code = 5
-    elif frame_type == "Annotate":
-        code = 6
-    elif frame_type == "Sched Trace":
-        code = 7
-    elif frame_type == "GPU Trace":
-        code = 8
-    elif frame_type == "Idle":
-        code = 9
-    else:
+frame_codes = {
+    "Summary": 1,
+    "Backtrace": 2,
+    "Name": 3,
+    "Counter": 4,
+    "Block Counter": 5,
+    "Annotate": 6,
+    "Sched Trace": 7,
+    "GPU Trace": 8,
+    "Idle": 9,
+}
+
+def frameCode(frame_type):
+    if frame_type not in frame_codes:
         print("ERROR: Unknown frame type:", frame_type)
         sys.exit(1)
+    return frame_codes[frame_type]
+
+def addFrameHeader(frame_type, body, core):
+    code = frameCode(frame_type)
 
     packed_code = packed32(code)
 
@@ -466,6 +479,34 @@ def counterFrame(timestamp, core, key, value):
     ret = addFrameHeader(frame_type, body, core)
     return ret
 
+# Many frames of one type, as a single bytearray. core and every field are
+# arrays with one value per frame; each field is encoded with packed32, so
+# encodeFrames("Counter", core, [timestamp, core, key, value]) gives the same
+# bytes as the counterFrame()s of each element.
+def encodeFrames(frame_type, core, fields):
+    core = np.asarray(core, dtype=np.int64)
+    columns = [np.full(len(core), frameCode(frame_type), dtype=np.int64), core]
+    columns += fields
+    encoded = [packedArray(column) for column in columns]
+
+    body_size = sum(lengths for _, lengths in encoded)
+    frame_size = body_size + 4
+    start = np.cumsum(frame_size) - frame_size
+    out = np.empty(int(frame_size.sum()), dtype=np.uint8)
+
+    # int32 little endian length of each frame
+    shift = 8 * np.arange(4)
+    out[start[:, None] + np.arange(4)] = (body_size[:, None] >> shift) & 0xff
+
+    # Scatter the bytes of each column into place, one column at a time
+    pos = start + 4
+    for data, lengths in encoded:
+        first = np.cumsum(lengths) - lengths
+        out[np.repeat(pos - first, lengths) + np.arange(len(data))] = data
+        pos += lengths
+
+    return bytearray(out)
+
 # Block Counter frame message
 #  - key: packed32
 #  - value: packed64
@@ -699,7 +740,7 @@ def ticksToNs(tick):
         print("ticks_in_ns not set properly!")
         sys.exit(1)
 
-    return tick / ticks_in_ns
+    return tick // ticks_in_ns
 
 def writeXmlFile(xml, filename):
     f = open(filename, "w")
@@ -726,9 +767,6 @@ class StatsEntry(object):
         self.short_name = re.sub("system\.", "", name)
         self.short_name = re.sub(":", "_", name)
 
-        # Regex for this stat (string version used to construct union regex)
-        self.regex_string = "^" + name + "\s+([\d\.]+)"
-        self.regex = re.compile("^" + name + "\s+([\d\.e\-]+)\s+# (.*)$", re.M)
         self.description = ""
 
         # Whether this stat is use per CPU or not
@@ -750,10 +788,8 @@ class StatsEntry(object):
         # Field used to hold ElementTree subelement for this stat
         self.ET_element = None
 
-        # Create per-CPU stat name and regex, etc.
+        # Create per-CPU stat name, etc.
         if self.per_cpu:
-            self.per_cpu_regex_string = []
-            self.per_cpu_regex = []
             self.per_cpu_name = []
             self.per_cpu_found = []
             for i in range(num_cpus):
@@ -765,18 +801,14 @@ class StatsEntry(object):
                 self.per_cpu_name.append(per_cpu_name)
                 print("\t", per_cpu_name)
 
-                self.per_cpu_regex_string.\
-                    append("^" + per_cpu_name + "\s+[\d\.]+")
-                self.per_cpu_regex.append(re.compile("^" + per_cpu_name + \
-                    "\s+([\d\.e\-]+)\s+# (.*)$", re.M))
                 self.values.append([])
                 self.per_cpu_found.append(False)
 
     def append_value(self, val, per_cpu_index = None):
         if self.per_cpu:
-            self.values[per_cpu_index].append(str(val))
+            self.values[per_cpu_index].append(int(val))
         else:
-            self.values.append(str(val))
+            self.values.append(int(val))
 
 # Global stats object that contains the list of stats entries
 # and other utility functions
@@ -792,18 +824,18 @@ class Stats(object):
             self.next_key))
         self.next_key += 1
 
-    # Union of all stats to accelerate parsing speed
-    def createStatsRegex(self):
-        regex_strings = [];
+    # Map each stat name in stats.txt to the entries (and CPU) it feeds, so
+    # the stats file can be read with one lookup per line
+    def createStatsIndex(self):
         print("\nnum entries in stats_list", len(self.stats_list))
+        self.index = {}
         for entry in self.stats_list:
             if entry.per_cpu:
                 for i in range(num_cpus):
-                    regex_strings.append(entry.per_cpu_regex_string[i])
+                    self.index.setdefault(entry.per_cpu_name[i], []).\
+                        append((entry, i))
             else:
-                regex_strings.append(entry.regex_string)
-
-        self.regex = re.compile('|'.join(regex_strings))
+                self.index.setdefault(entry.name, []).append((entry, None))
 
 
 def registerStats(config_file):
@@ -853,7 +885,7 @@ def registerStats(config_file):
                 stats.register(item, group, i, False)
                 i += 1
 
-    stats.createStatsRegex()
+    stats.createStatsIndex()
 
     return stats
 
@@ -866,11 +898,9 @@ def readGem5Stats(stats, gem5_stats_file):
     print("===============================\n")
     ext = os.path.splitext(gem5_stats_file)[1]
 
-    window_start_regex = \
-        re.compile("^---------- Begin Simulation Statistics ----------")
-    window_end_regex = \
-        re.compile("^---------- End Simulation Statistics   ----------")
+    window_end = "---------- End Simulation Statistics   ----------"
     final_tick_regex = re.compile("^final_tick\s+(\d+)")
+    stat_regex = re.compile("^\S+\s+([\d\.e\-]+)\s+# (.*)$")
 
     global ticks_in_ns
     sim_freq_regex = re.compile("^sim_freq\s+(\d+)")
@@ -878,47 +908,76 @@ def readGem5Stats(stats, gem5_stats_file):
 
     try:
         if ext == ".gz":
-            f = gzip.open(gem5_stats_file, "r")
+            f = gzip.open(gem5_stats_file, "rt")
         else:
             f = open(gem5_stats_file, "r")
     except:
         print("ERROR opening stats file", gem5_stats_file, "!")
         sys.exit(1)
 
-    stats_not_found_list = stats.stats_list[:]
     window_num = 0
 
+    # Each line is split once and its name looked up in the stats index;
+    # only the lines of registered stats are matched against a regex.
     while (True):
         error = False
         try:
             line = f.readline()
-        except IOError:
+        except (IOError, EOFError):
             print("")
             print("WARNING: IO error in stats file")
             print("(gzip stream not closed properly?)...continuing for now")
             error = True
-        if not line:
+            line = ""
+        if not line and not error:
             break
 
+        name = line.split(None, 1)[0] if line.strip() else ""
+        targets = stats.index.get(name)
+
+        if targets:
+            m = stat_regex.match(line)
+            if m:
+                for stat, i in targets:
+                    if stat.per_cpu:
+                        # Only the first occurrence in a window counts
+                        if stat.per_cpu_found[i]:
+                            continue
+                        if stat.name == "ipc":
+                            value = int(float(m.group(1)) * 1000)
+                        else:
+                            value = int(float(m.group(1)))
+                        stat.per_cpu_found[i] = True
+                    else:
+                        if stat.found:
+                            continue
+                        value = int(float(m.group(1)))
+                        stat.found = True
+                    if args.verbose:
+                        print(name, value)
+                    stat.append_value(value, i)
+                    if stat.description == "":
+                        stat.description = m.group(2)
+
         # Find out how many gem5 ticks in 1ns
-        if sim_freq < 0:
+        elif name == "sim_freq":
             m = sim_freq_regex.match(line)
-            if m:
+            if m and sim_freq < 0:
                 sim_freq = int(m.group(1)) # ticks in 1 sec
                 ticks_in_ns = int(sim_freq / 1e9)
                 print("Simulation frequency found! 1 tick == %e sec\n" \
                         % (1.0 / sim_freq))
 
         # Final tick in gem5 stats: current absolute timestamp
-        m = final_tick_regex.match(line)
-        if m:
-            tick = int(m.group(1))
-            if tick > end_tick:
-                break
-            stats.tick_list.append(tick)
-
+        elif name == "final_tick":
+            m = final_tick_regex.match(line)
+            if m:
+                tick = int(m.group(1))
+                if tick > end_tick:
+                    break
+                stats.tick_list.append(tick)
 
-        if (window_end_regex.match(line) or error):
+        if line.startswith(window_end) or error:
             if args.verbose:
                 print("new window")
             for stat in stats.stats_list:
@@ -931,7 +990,7 @@ def readGem5Stats(stats, gem5_stats_file):
                                 print("suppressing further warnings for " + \
                                     "this stat")
                                 stat.not_found_at_least_once = True
-                            stat.values[i].append(str(0))
+                            stat.values[i].append(0)
                         stat.per_cpu_found[i] = False
                 else:
                     if not stat.found:
@@ -940,48 +999,11 @@ def readGem5Stats(stats, gem5_stats_file):
                                 window_num, ":", stat.name)
                             print("suppressing further warnings for this stat")
                             stat.not_found_at_least_once = True
-                        stat.values.append(str(0))
+                        stat.values.append(0)
                     stat.found = False
-            stats_not_found_list = stats.stats_list[:]
             window_num += 1
             if error:
                 break
-
-        # Do a single regex of the union of all stats first for speed
-        if stats.regex.match(line):
-            # Then loop through only the stats we haven't seen in this window
-            for stat in stats_not_found_list[:]:
-                if stat.per_cpu:
-                    for i in range(num_cpus):
-                        m = stat.per_cpu_regex[i].match(line)
-                        if m:
-                            if stat.name == "ipc":
-                                value = str(int(float(m.group(1)) * 1000))
-                            else:
-                                value = str(int(float(m.group(1))))
-                            if args.verbose:
-                                print(stat.per_cpu_name[i], value)
-                            stat.values[i].append(value)
-                            stat.per_cpu_found[i] = True
-                            all_found = True
-                            for j in range(num_cpus):
-                                if not stat.per_cpu_found[j]:
-                                    all_found = False
-                            if all_found:
-                                stats_not_found_list.remove(stat)
-                            if stat.description == "":
-                                stat.description = m.group(2)
-                else:
-                    m = stat.regex.match(line)
-                    if m:
-                        value = str(int(float(m.group(1))))
-                        if args.verbose:
-                            print(stat.name, value)
-                        stat.values.append(value)
-                        stat.found = True
-                        stats_not_found_list.remove(stat)
-                        if stat.description == "":
-                            stat.description = m.group(2)
     f.close()
 
 
@@ -1097,21 +1119,48 @@ def writeCounters(blob, stats):
             break
         timestamp_list.append(ticksToNs(tick))
 
+    # One column of values per counter, in the order frames are written
+    cores = []
+    keys = []
+    columns = []
     for stat in stats.stats_list:
         if stat.per_cpu:
-            stat_length = len(stat.values[0])
+            for i in range(num_cpus):
+                cores.append(i)
+                keys.append(stat.key)
+                columns.append(stat.values[i])
         else:
-            stat_length = len(stat.values)
+            cores.append(0)
+            keys.append(stat.key)
+            columns.append(stat.values)
 
-    for n in range(len(timestamp_list)):
-        for stat in stats.stats_list:
-            if stat.per_cpu:
-                for i in range(num_cpus):
-                    writeBinary(blob, counterFrame(timestamp_list[n], i, \
-                                    stat.key, int(float(stat.values[i][n]))))
-            else:
-                writeBinary(blob, counterFrame(timestamp_list[n], 0, \
-                                    stat.key, int(float(stat.values[n]))))
+    num_timestamps = len(timestamp_list)
+    if not num_timestamps or not columns:
+        return
+
+    if np is not None:
+        try:
+            values = np.array([column[:num_timestamps]
+                               for column in columns], dtype=np.int64).T
+            timestamps = np.array(timestamp_list, dtype=np.int64)
+        except OverflowError:
+            values = None
+        if values is not None:
+            # Encode a block of timestamps at a time (all counters of each)
+            # and write it in one go
+            block = max(1, counter_block_frames // len(columns))
+            for n in range(0, num_timestamps, block):
+                rows = values[n:n + block]
+                core = np.tile(cores, len(rows))
+                blob.write(encodeFrames("Counter", core, [
+                    np.repeat(timestamps[n:n + block], len(columns)),
+                    core, np.tile(keys, len(rows)), rows.reshape(-1)]))
+            return
+
+    for n in range(num_timestamps):
+        for core, key, column in zip(cores, keys, columns):
+            writeBinary(blob, counterFrame(timestamp_list[n], core, key, \
+                                           int(column[n])))
 
 # Streamline can display LCD frame buffer dumps (gzipped bmp)
 # This function converts the frame buffer dumps to the Streamline format
@@ -1196,53 +1245,68 @@ def createApcProject(input_path, output_path, stats):
 #######################
 # Main Routine
 
-input_path = args.input_path
-output_path = args.output_path
-
-####
-# Make sure input path exists
-####
-if not os.path.exists(input_path):
-    print("ERROR: Input path %s does not exist!" % input_path)
-    sys.exit(1)
-
-####
-# Parse gem5 configuration file to find # of CPUs and L2s
-####
-(num_cpus, num_l2) = parseConfig(input_path + "/config.ini")
-
-####
-# Parse task file to find process/thread info
-####
-parseProcessInfo(input_path + "/system.tasks.txt")
-
-####
-# Parse stat config file and register stats
-####
-stat_config_file = args.stat_config_file
-stats = registerStats(stat_config_file)
-
-####
-# Parse gem5 stats
-####
-# Check if both stats.txt and stats.txt.gz exist and warn if both exist
-if os.path.exists(input_path + "/stats.txt") and \
-    os.path.exists(input_path + "/stats.txt.gz"):
-    print("WARNING: Both stats.txt.gz and stats.txt exist. \
+def main():
+    global args, gzipped_bmp_supported, num_events
+
+    args = parser.parse_args()
+
+    if not re.match("(.*)\.apc", args.output_path):
+        print("ERROR: <dest .apc folder> should end with '.apc'!")
+        sys.exit(1)
+
+    gzipped_bmp_supported = not args.gzipped_bmp_not_supported
+    num_events = args.num_events
+
+    input_path = args.input_path
+    output_path = args.output_path
+
+    ####
+    # Make sure input path exists
+    ####
+    if not os.path.exists(input_path):
+        print("ERROR: Input path %s does not exist!" % input_path)
+        sys.exit(1)
+
+    ####
+    # Parse gem5 configuration file to find # of CPUs and L2s
+    ####
+    parseConfig(input_path + "/config.ini")
+
+    ####
+    # Parse task file to find process/thread info
+    ####
+    parseProcessInfo(input_path + "/system.tasks.txt")
+
+    ####
+    # Parse stat config file and register stats
+    ####
+    stat_config_file = args.stat_config_file
+    stats = registerStats(stat_config_file)
+
+    ####
+    # Parse gem5 stats
+    ####
+    # Check if both stats.txt and stats.txt.gz exist and warn if both exist
+    if os.path.exists(input_path + "/stats.txt") and \
+        os.path.exists(input_path + "/stats.txt.gz"):
+        print("WARNING: Both stats.txt.gz and stats.txt exist. \
             Using stats.txt.gz by default.")
 
-gem5_stats_file = input_path + "/stats.txt.gz"
-if not os.path.exists(gem5_stats_file):
-    gem5_stats_file = input_path + "/stats.txt"
-if not os.path.exists(gem5_stats_file):
-    print("ERROR: stats.txt[.gz] file does not exist in %s!" % input_path)
-    sys.exit(1)
+    gem5_stats_file = input_path + "/stats.txt.gz"
+    if not os.path.exists(gem5_stats_file):
+        gem5_stats_file = input_path + "/stats.txt"
+    if not os.path.exists(gem5_stats_file):
+        print("ERROR: stats.txt[.gz] file does not exist in %s!" % input_path)
+        sys.exit(1)
+
+    readGem5Stats(stats, gem5_stats_file)
 
-readGem5Stats(stats, gem5_stats_file)
+    ####
+    # Create Streamline .apc project folder
+    ####
+    createApcProject(input_path, output_path, stats)
 
-####
-# Create Streamline .apc project folder
-####
-createApcProject(input_path, output_path, stats)
+    print("All done!")
 
-print("All done!")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Tests for checkpoint_aggregator's memory image output modes"""
+
+from configparser import ConfigParser
+import gzip
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import checkpoint_aggregator
+from checkpoint_aggregator import PAGE_SIZE, CHUNK_PAGES, PMEM_FILE
+
+class AggregatorTestSuite(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        rng = random.Random(1)
+
+        def random_page():
+            return rng.getrandbits(PAGE_SIZE * 8).to_bytes(PAGE_SIZE,
+                'little')
+
+        shared = random_page()
+
+        def page():
+            # Zero, shared (to be deduplicated) and unique pages
+            kind = rng.random()
+            if kind < 0.4:
+                return bytes(PAGE_SIZE)
+            elif kind < 0.6:
+                return shared
+            return random_page()
+
+        # The first image starts with a whole chunk of zero pages and is
+        # gzipped, as gem5 writes it. The second is uncompressed and
+        # shorter than its pagePtr, so is padded with zeros.
+        first = bytes(CHUNK_PAGES * PAGE_SIZE) + \
+            b''.join(page() for _ in range(100))
+        second = b''.join(page() for _ in range(50))
+        self.cpts = [
+            self.makeCheckpoint('cpt0', first, len(first) // PAGE_SIZE,
+                1000, compress=True),
+            self.makeCheckpoint('cpt1', second, 60, 2000, compress=False),
+        ]
+        self.memory_size = 512 * PAGE_SIZE
+        self.image = first + second + bytes(10 * PAGE_SIZE)
+        self.image += bytes(self.memory_size - len(self.image))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def makeCheckpoint(self, name, image, pages, tick, compress):
+        cpt = os.path.join(self.dir, name)
+        os.makedirs(cpt)
+        config = checkpoint_aggregator.myCP()
+        config.read_dict({
+            'Globals' : { 'curTick' : str(tick) },
+            'system' : { 'pagePtr' : str(pages) },
+            'system.cpu.workload' : { 'paddr' : '4096' },
+            'system.physmem.store0' : { 'range_size' : '0' },
+        })
+        with open(os.path.join(cpt, 'm5.cpt'), 'w') as f:
+            config.write(f)
+        with (gzip.open if compress else open)(
+                os.path.join(cpt, PMEM_FILE), 'wb') as f:
+            f.write(image)
+        return cpt
+
+    def aggregate(self, name, no_compress, page_store=None):
+        output_dir = os.path.join(self.dir, name)
+        checkpoint_aggregator.aggregate(output_dir, self.cpts, no_compress,
+            self.memory_size, jobs=2, page_store=page_store)
+        return output_dir
+
+    def readImage(self, output_dir, compressed):
+        with (gzip.open if compressed else open)(
+                os.path.join(output_dir, PMEM_FILE), 'rb') as f:
+            return f.read()
+
+    def checkConfig(self, output_dir):
+        config = ConfigParser()
+        config.read(os.path.join(output_dir, 'm5.cpt'))
+        pages = self.memory_size // PAGE_SIZE
+        self.assertEqual(config.getint('system', 'pagePtr'), 356 + 60)
+        self.assertEqual(config.getint('system.physmem.store0',
+            'range_size'), pages * PAGE_SIZE)
+        self.assertEqual(config.getint('Globals', 'curTick'), 2000)
+        self.assertEqual(config.getint('system.cpu0.workload', 'paddr'),
+            4096)
+        self.assertEqual(config.getint('system.cpu1.workload', 'paddr'),
+            4096 + (356 << 12))
+
+    def test_gzip(self):
+        output_dir = self.aggregate('gzip', False)
+        self.checkConfig(output_dir)
+        self.assertEqual(self.readImage(output_dir, True), self.image)
+
+    def test_sparse(self):
+        output_dir = self.aggregate('sparse', True)
+        self.checkConfig(output_dir)
+        self.assertEqual(self.readImage(output_dir, False), self.image)
+
+    def test_page_store(self):
+        store = os.path.join(self.dir, 'store')
+        first = self.aggregate('store0', False, store)
+        self.checkConfig(first)
+        self.assertFalse(os.path.exists(os.path.join(first, PMEM_FILE)))
+
+        # Each distinct non-zero page is stored once, across checkpoints
+        pages = set(self.image[i:i + PAGE_SIZE]
+            for i in range(0, len(self.image), PAGE_SIZE))
+        pages.discard(bytes(PAGE_SIZE))
+        self.assertEqual(len(checkpoint_aggregator.load_page_store(store)),
+            len(pages))
+
+        # Aggregating the same checkpoints again adds nothing to the store
+        packs = sorted(os.listdir(store))
+        second = self.aggregate('store1', False, store)
+        self.assertEqual(sorted(os.listdir(store)), packs)
+
+        for output_dir in (first, second):
+            checkpoint_aggregator.materialize(output_dir, store, False)
+            self.assertEqual(self.readImage(output_dir, True), self.image)
+            checkpoint_aggregator.materialize(output_dir, store, True)
+            self.assertEqual(self.readImage(output_dir, False), self.image)
+
+if __name__ == '__main__':
+    unittest.main()
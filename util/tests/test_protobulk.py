@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2026 The Regents of The University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Round-trip tests for protobulk against the per-message protolib decoder"""
+
+import gzip
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+UTIL = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROTO_DIR = os.path.join(os.path.dirname(UTIL), 'src', 'proto')
+sys.path.insert(0, UTIL)
+
+try:
+    import google.protobuf
+    import numpy
+except ImportError as e:
+    raise unittest.SkipTest('protobulk tests need protobuf and numpy: %s' % e)
+
+import protobulk
+import protolib
+
+def setUpModule():
+    # Generate the proto definitions as the decode_*_trace.py scripts do,
+    # but into a scratch directory rather than the source tree
+    global GEN_DIR, inst_dep_record_pb2, packet_pb2
+    GEN_DIR = tempfile.mkdtemp()
+    try:
+        subprocess.check_call(['protoc', '--python_out=' + GEN_DIR,
+            '--proto_path=' + PROTO_DIR,
+            os.path.join(PROTO_DIR, 'inst_dep_record.proto'),
+            os.path.join(PROTO_DIR, 'packet.proto')])
+    except (OSError, subprocess.CalledProcessError) as e:
+        shutil.rmtree(GEN_DIR)
+        raise unittest.SkipTest('Cannot generate proto definitions: %s' % e)
+    sys.path.insert(0, GEN_DIR)
+    import inst_dep_record_pb2
+    import packet_pb2
+
+def tearDownModule():
+    sys.path.remove(GEN_DIR)
+    shutil.rmtree(GEN_DIR)
+
+def randomValue(rng, bits):
+    # Favour values of every varint length, up to the largest
+    return rng.getrandbits(rng.randint(1, bits))
+
+class RoundTripTestSuite(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.rng = random.Random(1)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def writeTrace(self, header, messages):
+        path = os.path.join(self.dir, 'trace.gz')
+        with gzip.open(path, 'wb') as out:
+            out.write(b'gem5')
+            protolib.encodeMessage(out, header)
+            for message in messages:
+                protolib.encodeMessage(out, message)
+        return path
+
+    def readTrace(self, path, header, message_class):
+        """Decode a trace one message at a time, as the decode_*_trace.py
+        scripts do"""
+        proto_in = protolib.openFileRd(path)
+        self.assertEqual(proto_in.read(4), b'gem5')
+        self.assertTrue(protolib.decodeMessage(proto_in, header))
+        messages = []
+        while True:
+            message = message_class()
+            if not protolib.decodeMessage(proto_in, message):
+                break
+            messages.append(message)
+        proto_in.close()
+        return messages
+
+    def checkRoundTrip(self, trace_type, header, messages):
+        path = self.writeTrace(header, messages)
+        decoded_header = type(header)()
+        expected = self.readTrace(path, decoded_header, type(messages[0]))
+        self.assertEqual(len(expected), len(messages))
+
+        schema = protobulk.SCHEMAS[trace_type]
+        # One large block, then small blocks split across workers so that
+        # messages straddle block boundaries
+        for jobs, block_size in ((1, 64 << 20), (3, 1000)):
+            out_dir = os.path.join(self.dir, 'out-%d' % jobs)
+            total = protobulk.decodeTrace(path, out_dir, trace_type,
+                jobs=jobs, block_size=block_size)
+            self.assertEqual(total, len(expected))
+            records, repeated = protobulk.load(out_dir)
+            self.assertEqual(len(records), len(expected))
+            with open(os.path.join(out_dir, 'meta.json')) as meta:
+                meta = json.load(meta)
+            self.assertEqual(meta['obj_id'], decoded_header.obj_id)
+            self.assertEqual(meta['tick_freq'], decoded_header.tick_freq)
+
+            for i, message in enumerate(expected):
+                for number, name, dtype, label in schema:
+                    if label == 'repeated':
+                        values, offsets = repeated[name]
+                        self.assertEqual(
+                            values[offsets[i]:offsets[i + 1]].tolist(),
+                            list(getattr(message, name)), (jobs, i, name))
+                        continue
+                    if label == 'optional':
+                        self.assertEqual(bool(records['has_' + name][i]),
+                            message.HasField(name), (jobs, i, name))
+                    self.assertEqual(int(records[name][i]),
+                        getattr(message, name), (jobs, i, name))
+
+    def test_inst_dep(self):
+        rng = self.rng
+        header = inst_dep_record_pb2.InstDepRecordHeader(obj_id='cpu',
+            tick_freq=10 ** 12, window_size=64)
+        messages = []
+        for seq_num in range(3000):
+            record = inst_dep_record_pb2.InstDepRecord(
+                seq_num=randomValue(rng, 64), type=rng.randint(0, 3),
+                comp_delay=randomValue(rng, 64))
+            for name, bits in (('p_addr', 64), ('size', 32), ('flags', 32),
+                    ('weight', 32), ('pc', 64), ('v_addr', 64),
+                    ('asid', 32)):
+                if rng.random() < 0.5:
+                    setattr(record, name, randomValue(rng, bits))
+            record.rob_dep.extend(randomValue(rng, 64)
+                for _ in range(rng.randint(0, 4)))
+            record.reg_dep.extend(randomValue(rng, 64)
+                for _ in range(rng.randint(0, 4)))
+            messages.append(record)
+
+        self.checkRoundTrip('inst_dep', header, messages)
+
+    def test_packet(self):
+        rng = self.rng
+        header = packet_pb2.PacketHeader(obj_id='mem', tick_freq=10 ** 12)
+        messages = []
+        for i in range(3000):
+            packet = packet_pb2.Packet(tick=randomValue(rng, 64),
+                cmd=randomValue(rng, 32), addr=randomValue(rng, 64),
+                size=randomValue(rng, 32))
+            for name, bits in (('flags', 32), ('pkt_id', 64), ('pc', 64)):
+                if rng.random() < 0.5:
+                    setattr(packet, name, randomValue(rng, bits))
+            messages.append(packet)
+
+        self.checkRoundTrip('packet', header, messages)
+
+class FramingTestSuite(unittest.TestCase):
+    def frame(self, rng, count, other):
+        """Length-prefix count random bodies, a fraction other of which
+        don't start with the field 1 tag"""
+        out = bytearray()
+        for _ in range(count):
+            size = rng.choice((0, 1, 5, 40, 127, 128, 300, 20000))
+            body = bytes(rng.choice((0x08, 0x80, 0xff, rng.randrange(256)))
+                for _ in range(size))
+            if size and rng.random() >= other:
+                body = b'\x08' + body[1:]
+            size_bytes = bytearray()
+            while True:
+                if size < 0x80:
+                    size_bytes.append(size)
+                    break
+                size_bytes.append(size & 0x7f | 0x80)
+                size >>= 7
+            out += size_bytes + body
+        return bytes(out)
+
+    def checkFraming(self, buf, pos):
+        expected = protobulk.frameMessages(buf, pos)
+        actual = protobulk.frameMessages(buf, pos, first_tag=0x08)
+        self.assertEqual(actual[0].tolist(), expected[0].tolist())
+        self.assertEqual(actual[1].tolist(), expected[1].tolist())
+        self.assertEqual(actual[2], expected[2])
+
+    def test_bulk_framing(self):
+        rng = random.Random(2)
+        for other in (0, 0.01, 0.3, 1):
+            buf = self.frame(rng, 200, other)
+            lead = self.frame(rng, 3, other)
+            for cut in [len(buf)] + [rng.randrange(len(buf))
+                    for _ in range(10)]:
+                self.checkFraming(buf[:cut], 0)
+                self.checkFraming(lead + buf[:cut], len(lead))
+
+if __name__ == '__main__':
+    unittest.main()